@@ -4,6 +4,7 @@ rebuild_fast.py — Full rebuild of snapshot:enriched hashes.
 
 Merges three authoritative data sources, ALL from Polygon:
   1. snapshot:polygon:latest      → real-time: price, volume, change%, OHLC, bid/ask
+     (or snapshot:polygon:latest:columnar with SNAPSHOT_FORMAT=columnar)
   2. metadata:ticker:*            → fundamentals: market_cap, float, sector, industry
   3. screener:daily_indicators    → daily technicals (DuckDB over Polygon FLATS parquets):
      change_1d/3d/5d/10d/20d, avg_volume_5/10/20d, SMA 20/50/200, RSI,
@@ -33,6 +34,7 @@ except ImportError:
 import redis.asyncio as aioredis
 
 POLY_KEY = "snapshot:polygon:latest"
+SNAPSHOT_COLUMNAR_KEY = "snapshot:polygon:latest:columnar"
 ENRICHED_KEY = "snapshot:enriched:latest"
 LAST_CLOSE_KEY = "snapshot:enriched:last_close"
 SCREENER_DAILY_KEY = "screener:daily_indicators:latest"
@@ -49,6 +51,19 @@ def sf(val):
         return None
 
 
+async def load_columnar_snapshot(r):
+    """
+    snapshot_format=columnar: data_ingest solo escribe el valor binario.
+    Devuelve el snapshot con la forma del JSON, o None si no existe.
+    """
+    blob = await r.get(SNAPSHOT_COLUMNAR_KEY)
+    if not blob:
+        return None
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from shared.utils.columnar_snapshot import ColumnarSnapshot
+    return ColumnarSnapshot.from_bytes(blob).to_snapshot_dict()
+
+
 async def main():
     pwd = os.environ.get("REDIS_PASSWORD", "")
     url = os.environ.get("REDIS_URL", f"redis://:{pwd}@localhost:6379")
@@ -58,10 +73,11 @@ async def main():
 
     # ── 1. Polygon snapshot (real-time prices) ──────────────────────
     raw = await r.get(POLY_KEY)
-    if not raw:
+    poly_data = loads(raw) if raw else await load_columnar_snapshot(r)
+    if not poly_data:
         print("[FAIL] No polygon snapshot in Redis")
         return 1
-    tickers_raw = loads(raw).get("tickers", [])
+    tickers_raw = poly_data.get("tickers", [])
     print(f"[2/6] Polygon snapshot: {len(tickers_raw)} tickers")
     if len(tickers_raw) < 2000:
         print("[FAIL] Too few tickers in polygon snapshot")
@@ -3,6 +3,7 @@ rebuild_last_close.py — Emergency rebuild of snapshot:enriched:last_close
 
 Reconstructs the enriched snapshot from available sources:
   1. snapshot:polygon:latest  → base price/volume/change data (ALL tickers)
+     (or snapshot:polygon:latest:columnar with SNAPSHOT_FORMAT=columnar)
   2. metadata:ticker:*        → market_cap, security_type, sector, industry, float
   3. screener:daily_indicators:latest → daily_rsi, daily_sma, change_5d, etc.
 
@@ -40,6 +41,7 @@ import redis.asyncio as aioredis
 
 
 SNAPSHOT_POLYGON_KEY = "snapshot:polygon:latest"
+SNAPSHOT_COLUMNAR_KEY = "snapshot:polygon:latest:columnar"
 SNAPSHOT_ENRICHED_HASH = "snapshot:enriched:latest"
 SNAPSHOT_LAST_CLOSE_HASH = "snapshot:enriched:last_close"
 SCREENER_DAILY_KEY = "screener:daily_indicators:latest"
@@ -50,6 +52,19 @@ LAST_CLOSE_TTL = 604800   # 7 days
 MIN_TICKERS_REQUIRED = 2000
 
 
+async def load_columnar_snapshot(r):
+    """
+    snapshot_format=columnar: data_ingest solo escribe el valor binario.
+    Devuelve el snapshot con la forma del JSON, o None si no existe.
+    """
+    blob = await r.get(SNAPSHOT_COLUMNAR_KEY)
+    if not blob:
+        return None
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from shared.utils.columnar_snapshot import ColumnarSnapshot
+    return ColumnarSnapshot.from_bytes(blob).to_snapshot_dict()
+
+
 async def main():
     pwd = os.environ.get("REDIS_PASSWORD", "")
     redis_url = os.environ.get("REDIS_URL", f"redis://:{pwd}@redis:6379")
@@ -67,11 +82,11 @@ async def main():
 
     # ── 1. Read Polygon snapshot ──────────────────────────────────────────
     poly_raw = await r.get(SNAPSHOT_POLYGON_KEY)
-    if not poly_raw:
+    poly_data = fast_loads(poly_raw) if poly_raw else await load_columnar_snapshot(r)
+    if not poly_data:
         print("[FAIL] snapshot:polygon:latest is empty. Run: curl -X POST http://localhost:8003/api/ingest/fetch-once")
         sys.exit(1)
 
-    poly_data = fast_loads(poly_raw)
     tickers_raw = poly_data.get("tickers", [])
     print(f"[OK] Polygon snapshot: {len(tickers_raw)} tickers, ts={poly_data.get('timestamp', '?')}")
 
@@ -38,6 +38,7 @@ async def main():
     
     keys_to_check = [
         "snapshot:polygon:latest",
+        "snapshot:polygon:latest:columnar",
         "snapshot:enriched:latest",
         "snapshot:enriched:last_close",
         "snapshot:full:latest",
@@ -255,8 +256,16 @@ async def main():
     print("=" * 80)
     
     raw_polygon = await redis.get("snapshot:polygon:latest")
-    if raw_polygon:
-        raw_data = json.loads(raw_polygon)
+    raw_data = json.loads(raw_polygon) if raw_polygon else None
+    if raw_data is None:
+        # SNAPSHOT_FORMAT=columnar: solo existe el valor binario
+        binary = aioredis.from_url(redis_url)
+        raw_polygon = await binary.get("snapshot:polygon:latest:columnar")
+        await binary.close()
+        if raw_polygon:
+            from shared.utils.columnar_snapshot import ColumnarSnapshot
+            raw_data = ColumnarSnapshot.from_bytes(raw_polygon).to_snapshot_dict()
+    if raw_data is not None:
         raw_tickers = raw_data.get("tickers", [])
         
         print(f"  Raw polygon snapshot: {len(raw_polygon)/1024/1024:.2f} MB ({len(raw_tickers)} tickers)")
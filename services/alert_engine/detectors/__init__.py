@@ -1,4 +1,5 @@
 from detectors.base import BaseAlertDetector, CooldownTracker
+from detectors.interest import DetectorInterestIndex
 from detectors.price_alerts import PriceAlertDetector
 from detectors.volume_alerts import VolumeAlertDetector
 from detectors.momentum_alerts import MomentumAlertDetector
@@ -10,8 +10,8 @@ access to the baseline loader for historical data.
 """
 
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+from datetime import datetime, time
+from typing import Optional, List, Dict, Any, FrozenSet, Tuple
 
 from models.alert_types import AlertType
 from models.alert_state import AlertState
@@ -61,6 +61,17 @@ class BaseAlertDetector(ABC):
 
     MIN_VOLUME = 5_000
 
+    # Interest declaration used by DetectorInterestIndex to skip detect()
+    # calls that cannot fire. Only declare guards that detect() checks BEFORE
+    # touching any per-symbol state: a skipped call must be equivalent to
+    # detect() returning [] with no side effects.
+    INTEREST_ENABLED: bool = True
+    INTEREST_MIN_VOLUME: bool = False                      # _has_min_volume() first
+    INTEREST_SESSIONS: Optional[FrozenSet[Optional[str]]] = None
+    INTEREST_TIME_WINDOW: Optional[Tuple[time, Optional[time]]] = None  # [start, end) on naive ts
+    INTEREST_FIELDS: Tuple[str, ...] = ()                  # must not be None
+    INTEREST_POSITIVE: Tuple[str, ...] = ()                # must be truthy and > 0
+
     def __init__(self):
         self.cooldowns = CooldownTracker()
         self.baseline: Optional[BaselineLoader] = None
@@ -68,6 +79,10 @@ class BaseAlertDetector(ABC):
     def set_baseline(self, baseline: BaselineLoader) -> None:
         self.baseline = baseline
 
+    def is_interested(self, current: AlertState) -> bool:
+        """Detector-specific thresholds, evaluated after the declarative guards."""
+        return True
+
     @abstractmethod
     def detect(self, current: AlertState, previous: Optional[AlertState]) -> List[AlertRecord]:
         pass
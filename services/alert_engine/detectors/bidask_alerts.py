@@ -22,6 +22,8 @@ from models.alert_record import AlertRecord
 
 class BidAskAlertDetector(BaseAlertDetector):
 
+    INTEREST_MIN_VOLUME = True
+
     COOLDOWN_LOCKED = 300
     COOLDOWN_SPREAD = 120
 
@@ -23,6 +23,8 @@ EARLIEST_FIRE = dtime(9, 33, 0)
 
 class CheckMarkAlertDetector(BaseAlertDetector):
 
+    INTEREST_MIN_VOLUME = True
+
     COOLDOWN = 600
 
     def __init__(self):
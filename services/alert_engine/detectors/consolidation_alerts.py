@@ -31,6 +31,8 @@ from models.alert_record import AlertRecord
 
 class ConsolidationAlertDetector(BaseAlertDetector):
 
+    INTEREST_MIN_VOLUME = True
+
     MAX_CHG_5MIN = 0.5
     MIN_CHG_1MIN_FAST = 0.3
     MIN_RVOL = 1.0
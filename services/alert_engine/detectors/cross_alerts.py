@@ -23,6 +23,8 @@ from models.alert_record import AlertRecord
 class CrossAlertDetector(BaseAlertDetector):
     """TI cross alerts with volume-confirmed mechanism for MA and VWAP."""
 
+    INTEREST_MIN_VOLUME = True
+
     CONFIRM_TARGET_VOLUME_MINUTES = 15.0
     CONFIRM_MAX_WALL_SECONDS = 120
 
@@ -87,6 +87,8 @@ class _SymbolState:
 
 class FibonacciAlertDetector(BaseAlertDetector):
 
+    INTEREST_MIN_VOLUME = True
+
     COOLDOWN = 300
     MAX_SWINGS = 4
 
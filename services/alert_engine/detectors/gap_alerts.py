@@ -25,6 +25,9 @@ from models.alert_record import AlertRecord
 
 class GapAlertDetector(BaseAlertDetector):
 
+    INTEREST_MIN_VOLUME = True
+    INTEREST_POSITIVE = ("open_price", "prev_close")
+
     MIN_GAP_DOLLARS = 0.01
 
     def __init__(self):
@@ -35,6 +38,9 @@ class GapAlertDetector(BaseAlertDetector):
         self._fgdr_state: Dict[str, dict] = {}
         self._gap_continuation: Dict[str, float] = {}
 
+    def is_interested(self, current: AlertState) -> bool:
+        return abs(current.open_price - current.prev_close) >= self.MIN_GAP_DOLLARS
+
     def detect(self, current: AlertState, previous: Optional[AlertState]) -> List[AlertRecord]:
         alerts: List[AlertRecord] = []
         if not self._has_min_volume(current) or previous is None:
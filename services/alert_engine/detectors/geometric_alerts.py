@@ -49,6 +49,8 @@ class PatternScan:
 
 class GeometricAlertDetector(BaseAlertDetector):
 
+    INTEREST_MIN_VOLUME = True
+
     MIN_TURNING_POINTS = 5
     COOLDOWN = 300
     MIN_REVERSAL_PCT = 0.3
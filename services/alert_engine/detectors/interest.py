@@ -0,0 +1,104 @@
+"""
+Detector Interest Index - cheap pre-filter in front of detect().
+
+Each detector declares the guards its detect() checks before touching state
+(INTEREST_* attributes on BaseAlertDetector). The index groups detectors with
+identical declarations, so per tick every distinct guard set is evaluated
+once instead of once per detector, and detectors that cannot fire are never
+called.
+
+Skipping is exact: a detector is only skipped when its detect() would have
+returned [] without side effects.
+"""
+
+from typing import Dict, List, Tuple
+
+from detectors.base import BaseAlertDetector
+from models.alert_state import AlertState
+
+
+class _InterestGroup:
+    __slots__ = ("min_volume", "sessions", "window", "fields", "positive", "detectors", "custom")
+
+    def __init__(self, key: Tuple):
+        self.min_volume, self.sessions, self.window, self.fields, self.positive = key
+        self.detectors: List[BaseAlertDetector] = []
+        # Detectors that override is_interested() (checked individually)
+        self.custom: List[bool] = []
+
+    def matches(self, state: AlertState, ts_time) -> bool:
+        if self.min_volume is not None and state.volume < self.min_volume:
+            return False
+        if self.sessions is not None and state.market_session not in self.sessions:
+            return False
+        if self.window is not None:
+            start, end = self.window
+            if ts_time < start or (end is not None and ts_time >= end):
+                return False
+        for name in self.fields:
+            if getattr(state, name) is None:
+                return False
+        for name in self.positive:
+            v = getattr(state, name)
+            if not v or v <= 0:
+                return False
+        return True
+
+
+class DetectorInterestIndex:
+    """
+    Groups detectors by their interest declaration, preserving the original
+    detector order in the selected list (alert order in the stream is stable).
+    """
+
+    def __init__(self, detectors: List[BaseAlertDetector]):
+        self._order: Dict[int, int] = {}
+        groups: Dict[Tuple, _InterestGroup] = {}
+        self.disabled: List[BaseAlertDetector] = []
+
+        for pos, det in enumerate(detectors):
+            self._order[id(det)] = pos
+            if not det.INTEREST_ENABLED:
+                self.disabled.append(det)
+                continue
+            key = (
+                det.MIN_VOLUME if det.INTEREST_MIN_VOLUME else None,
+                det.INTEREST_SESSIONS,
+                det.INTEREST_TIME_WINDOW,
+                tuple(det.INTEREST_FIELDS),
+                tuple(det.INTEREST_POSITIVE),
+            )
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = _InterestGroup(key)
+            group.detectors.append(det)
+            group.custom.append(type(det).is_interested is not BaseAlertDetector.is_interested)
+
+        self._groups = list(groups.values())
+        self._needs_time = any(g.window is not None for g in self._groups)
+
+    @property
+    def group_count(self) -> int:
+        return len(self._groups)
+
+    def select(self, state: AlertState) -> List[BaseAlertDetector]:
+        """Detectors that may fire for this state, in registration order."""
+        ts_time = None
+        if self._needs_time:
+            ts = state.timestamp
+            if ts.tzinfo is not None:
+                ts = ts.replace(tzinfo=None)
+            ts_time = ts.time()
+
+        selected: List[BaseAlertDetector] = []
+        for group in self._groups:
+            if not group.matches(state, ts_time):
+                continue
+            for det, custom in zip(group.detectors, group.custom):
+                if custom and not det.is_interested(state):
+                    continue
+                selected.append(det)
+
+        if len(self._groups) > 1:
+            selected.sort(key=lambda d: self._order[id(d)])
+        return selected
@@ -105,6 +105,9 @@ def _bar_start(ts: datetime, period_min: int) -> datetime:
 
 class LinRegAlertDetector(BaseAlertDetector):
 
+    INTEREST_MIN_VOLUME = True
+    INTEREST_TIME_WINDOW = (MARKET_OPEN, None)
+
     COOLDOWN = 300
 
     def __init__(self):
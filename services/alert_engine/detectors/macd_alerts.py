@@ -82,6 +82,9 @@ def _bstart(ts: datetime, pm: int) -> datetime:
 
 class MACDAlertDetector(BaseAlertDetector):
 
+    INTEREST_MIN_VOLUME = True
+    INTEREST_TIME_WINDOW = (MARKET_OPEN, MARKET_CLOSE)
+
     def __init__(self):
         super().__init__()
         self._st: Dict[str, Dict[int, _TFSt]] = {}
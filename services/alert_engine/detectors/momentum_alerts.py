@@ -25,6 +25,8 @@ from models.alert_record import AlertRecord
 
 class MomentumAlertDetector(BaseAlertDetector):
 
+    INTEREST_MIN_VOLUME = True
+
     COOLDOWN_RUNNING_NOW = 120
     COOLDOWN_RUNNING = 120
     COOLDOWN_RUNNING_INTERMEDIATE = 120
@@ -50,6 +50,10 @@ def _lock_time_for_window(window_min: int) -> time:
 
 class ORBAlertDetector(BaseAlertDetector):
 
+    INTEREST_MIN_VOLUME = True
+    INTEREST_FIELDS = ("open_price", "intraday_high", "intraday_low")
+    INTEREST_TIME_WINDOW = (time(9, 30), None)
+
     COOLDOWN = 86400
 
     def __init__(self):
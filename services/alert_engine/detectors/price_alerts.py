@@ -27,6 +27,13 @@ BLACKOUT_END = dtime(9, 31, 0)
 
 class PriceAlertDetector(BaseAlertDetector):
 
+    INTEREST_MIN_VOLUME = True
+    INTEREST_SESSIONS = frozenset({
+        "REGULAR", "MARKET_HOURS", "MARKET_OPEN", None,
+        "PRE_MARKET", "PREMARKET", "PRE",
+        "POST_MARKET", "POSTMARKET", "POST",
+    })
+
     COOLDOWN_NEW_EXTREME = 30
     FILTERED_BASE_COOLDOWN = 60
     FILTERED_MIN_COOLDOWN = 10
@@ -41,6 +41,9 @@ AUTO_ANCHOR_TYPES = (
 
 class PullbackAlertDetector(BaseAlertDetector):
 
+    INTEREST_MIN_VOLUME = True
+    INTEREST_FIELDS = ("intraday_high", "intraday_low")
+
     COOLDOWN = 60
     MIN_INITIAL_MOVE_PCT = 0.3
 
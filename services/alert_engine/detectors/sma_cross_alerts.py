@@ -74,6 +74,9 @@ def _bar_start(ts: datetime, pm: int) -> datetime:
 
 class SMACrossAlertDetector(BaseAlertDetector):
 
+    INTEREST_MIN_VOLUME = True
+    INTEREST_TIME_WINDOW = (MARKET_OPEN, None)
+
     def __init__(self):
         super().__init__()
         self._st: Dict[str, Dict[str, _BarSt]] = {}
@@ -97,6 +97,9 @@ def _compute_stoch(bars: List[_Bar], cur_high: float, cur_low: float,
 
 class StochasticAlertDetector(BaseAlertDetector):
 
+    INTEREST_MIN_VOLUME = True
+    INTEREST_TIME_WINDOW = (MARKET_OPEN, MARKET_CLOSE)
+
     def __init__(self):
         super().__init__()
         self._st: Dict[str, Dict[int, _TFSt]] = {}
@@ -12,5 +12,7 @@ from models.alert_record import AlertRecord
 
 class TechnicalAlertDetector(BaseAlertDetector):
 
+    INTEREST_ENABLED = False
+
     def detect(self, current: AlertState, previous: Optional[AlertState]) -> List[AlertRecord]:
         return []
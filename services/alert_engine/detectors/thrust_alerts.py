@@ -74,6 +74,9 @@ def _next_fire_level(last_fired: int) -> Optional[int]:
 
 class ThrustAlertDetector(BaseAlertDetector):
 
+    INTEREST_MIN_VOLUME = True
+    INTEREST_TIME_WINDOW = (MARKET_OPEN, None)
+
     COOLDOWN = 0
 
     def __init__(self):
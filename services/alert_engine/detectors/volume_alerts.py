@@ -25,6 +25,8 @@ from models.alert_record import AlertRecord
 
 class VolumeAlertDetector(BaseAlertDetector):
 
+    INTEREST_MIN_VOLUME = True
+
     COOLDOWN_HRV = 300
     COOLDOWN_VS1 = 120
     COOLDOWN_BP = 60
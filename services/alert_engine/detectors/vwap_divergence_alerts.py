@@ -26,6 +26,9 @@ from models.alert_record import AlertRecord
 
 class VWAPDivergenceAlertDetector(BaseAlertDetector):
 
+    INTEREST_MIN_VOLUME = True
+    INTEREST_POSITIVE = ("vwap", "price")
+
     def __init__(self):
         super().__init__()
         self._vdu_fired: Dict[str, int] = {}
@@ -17,14 +17,23 @@ import redis.asyncio as aioredis
 
 PARTITION_ID = int(os.environ.get("PARTITION_ID", "0"))
 NUM_PARTITIONS = int(os.environ.get("NUM_PARTITIONS", "4"))
+# Batch mode (opt-in): un XREADGROUP se procesa agrupado por símbolo (HMGET
+# de rvol único, pre-filtro de detectores, un pipeline de alertas por lote).
+ALERT_BATCH_MODE = os.environ.get("ALERT_BATCH_MODE", "false").lower() == "true"
+ALERT_BATCH_SIZE = int(os.environ.get("ALERT_BATCH_SIZE", "500"))
+# Opt-in: varios ticks del mismo símbolo en un lote se funden en el último
+# (volumen por-agregado sumado); detectores corren una vez por símbolo, así
+# que un cruce entre dos ticks fundidos puede no disparar alerta.
+ALERT_BATCH_COALESCE = os.environ.get("ALERT_BATCH_COALESCE", "false").lower() == "true"
 
 from shared.config.settings import settings
 from shared.utils.redis_client import RedisClient
+from shared.utils.alert_partitions import AlertPartitionMap
 from shared.events import EventBus, EventType as BusEventType, Event
 
 from models import AlertType, AlertState, AlertStateCache, AlertRecord
 from baseline import BaselineLoader
-from detectors import ALL_DETECTOR_CLASSES
+from detectors import ALL_DETECTOR_CLASSES, DetectorInterestIndex
 from detectors.price_alerts import PriceAlertDetector
 from persistence import AlertWriter
 
@@ -35,6 +44,9 @@ logger = logging.getLogger("alert-engine")
 
 STREAM_ALERTS = "stream:alerts:market"
 
+# Marca para _build_state: rvol no precargado (hacer HGET)
+_RVOL_NOT_FETCHED = object()
+
 redis_client: Optional[RedisClient] = None
 event_bus: Optional[EventBus] = None
 engine: Optional["AlertEngine"] = None
@@ -109,23 +121,41 @@ class AlertEngine:
         self.baseline = baseline_loader
         self.alert_writer: Optional[AlertWriter] = alert_writer
         self.state_cache = AlertStateCache(max_age_seconds=3600)
+        self.partition_map = AlertPartitionMap(redis_cl, NUM_PARTITIONS)
         self._enriched_cache: Dict[str, Dict] = {}
         self.detectors = [cls() for cls in ALL_DETECTOR_CLASSES]
         if self.baseline:
             for d in self.detectors:
                 d.set_baseline(self.baseline)
+        self.interest = DetectorInterestIndex(self.detectors)
         self.price_detector: Optional[PriceAlertDetector] = None
         for d in self.detectors:
             if isinstance(d, PriceAlertDetector):
                 self.price_detector = d
                 break
-        self._stats = {"alerts": 0, "ticks": 0, "last_alerts": 0, "last_ticks": 0, "tick_times": []}
+        self._stats = self._new_stats()
         logger.info(f"[P{PARTITION_ID}] Loaded {len(self.detectors)} detectors: {[d.__class__.__name__ for d in self.detectors]}")
+        logger.info(
+            f"[P{PARTITION_ID}] Interest index: {self.interest.group_count} groups, "
+            f"batch_mode={ALERT_BATCH_MODE} batch_size={ALERT_BATCH_SIZE} coalesce={ALERT_BATCH_COALESCE}"
+        )
+
+    @staticmethod
+    def _new_stats() -> Dict:
+        return {
+            "alerts": 0, "ticks": 0, "last_alerts": 0, "last_ticks": 0, "tick_times": [],
+            "coalesced": 0, "detector_calls": 0, "detector_skips": 0,
+        }
 
     async def start(self):
         logger.info(f"Starting Alert Engine worker (partition={PARTITION_ID}/{NUM_PARTITIONS})...")
         self.raw_redis = self.redis.client
         self.running = True
+        try:
+            await self.partition_map.load()
+            logger.info(f"[P{PARTITION_ID}] Partition map v{self.partition_map.version} loaded")
+        except Exception as e:
+            logger.warning(f"[P{PARTITION_ID}] Partition map unavailable, stable hash only: {e}")
         await self._refresh_enriched_cache()
         logger.info(f"Enriched cache: {len(self._enriched_cache)} tickers")
         if self.price_detector:
@@ -135,6 +165,7 @@ class AlertEngine:
             asyncio.create_task(self._consume_halts()),
             asyncio.create_task(self._enriched_loop()),
             asyncio.create_task(self._cleanup_loop()),
+            asyncio.create_task(self._partition_loop()),
             asyncio.create_task(self._stats_loop()),
         ]
         if self.alert_writer:
@@ -151,7 +182,7 @@ class AlertEngine:
         self.state_cache.clear()
         # Debe incluir TODAS las claves que leen _stats_loop y el hot path:
         # un reset parcial provocaba KeyError 'last_ticks' y crash diario a las 04:00.
-        self._stats = {"alerts": 0, "ticks": 0, "last_alerts": 0, "last_ticks": 0, "tick_times": []}
+        self._stats = self._new_stats()
         try:
             await self.raw_redis.xtrim(STREAM_ALERTS, maxlen=0)
         except Exception as e:
@@ -185,14 +216,23 @@ class AlertEngine:
                 if is_holiday_mode:
                     await asyncio.sleep(30)
                     continue
-                msgs = await self.raw_redis.xreadgroup(group, consumer, {stream: ">"}, count=100, block=1000)
+                count = ALERT_BATCH_SIZE if ALERT_BATCH_MODE else 100
+                msgs = await self.raw_redis.xreadgroup(group, consumer, {stream: ">"}, count=count, block=1000)
                 if not msgs:
                     continue
                 ids = []
-                for _, entries in msgs:
-                    for mid, data in entries:
-                        ids.append(mid)
-                        await self._process_aggregate(data)
+                if ALERT_BATCH_MODE:
+                    batch = []
+                    for _, entries in msgs:
+                        for mid, data in entries:
+                            ids.append(mid)
+                            batch.append(data)
+                    await self._process_aggregate_batch(batch)
+                else:
+                    for _, entries in msgs:
+                        for mid, data in entries:
+                            ids.append(mid)
+                            await self._process_aggregate(data)
                 if ids:
                     await self.raw_redis.xack(stream, group, *ids)
             except Exception as e:
@@ -247,36 +287,112 @@ class AlertEngine:
             current = await self._build_state(symbol, data)
             if current is None:
                 return
-            previous = self.state_cache.get(symbol)
-            if previous is None:
-                previous = AlertState(symbol=symbol, price=current.price, volume=0,
-                                      timestamp=current.timestamp, rvol=0.0, change_percent=0.0)
-            all_alerts: List[AlertRecord] = []
-            for det in self.detectors:
-                try:
-                    all_alerts.extend(det.detect(current, previous))
-                except Exception as e:
-                    logger.error(f"{det.__class__.__name__} error {symbol}: {e}")
-            self.state_cache.set(symbol, current)
-            self._stats["ticks"] += 1
+            all_alerts = self._run_detectors(symbol, current)
             if all_alerts:
                 pipe = self.raw_redis.pipeline(transaction=False)
-                enriched = self._enriched_cache.get(symbol)
-                for a in all_alerts:
-                    d = a.to_dict()
-                    pipe.xadd(STREAM_ALERTS, d, maxlen=100000)
-                    if self.alert_writer:
-                        self.alert_writer.buffer_alert(d, enriched)
+                self._queue_alerts(pipe, symbol, all_alerts)
                 await pipe.execute()
-                self._stats["alerts"] += len(all_alerts)
-            elapsed_ms = (time.monotonic() - t0) * 1000
-            tick_times = self._stats["tick_times"]
-            tick_times.append(elapsed_ms)
-            if len(tick_times) > 1000:
-                del tick_times[:500]
+            self._record_tick_time((time.monotonic() - t0) * 1000)
         except Exception as e:
             logger.error(f"Aggregate error: {e}")
 
+    async def _process_aggregate_batch(self, batch: List[Dict]):
+        """
+        Procesa un lote de XREADGROUP agrupado por símbolo.
+
+        - Coalescing opcional: un tick por símbolo (el último, con el volumen
+          por-agregado acumulado de los ticks fundidos)
+        - rvol de todos los símbolos en un solo HMGET
+        - Solo los detectores que pueden disparar (DetectorInterestIndex)
+        - Todas las alertas del lote en un único pipeline
+        """
+        try:
+            ticks = self._group_ticks(batch)
+            if not ticks:
+                return
+            symbols = list({symbol for symbol, _ in ticks})
+            rvols = await self._get_rvols(symbols)
+
+            pipe = None
+            for symbol, data in ticks:
+                t0 = time.monotonic()
+                try:
+                    current = await self._build_state(symbol, data, rvol=rvols.get(symbol))
+                    if current is None:
+                        continue
+                    all_alerts = self._run_detectors(symbol, current)
+                    if all_alerts:
+                        if pipe is None:
+                            pipe = self.raw_redis.pipeline(transaction=False)
+                        self._queue_alerts(pipe, symbol, all_alerts)
+                except Exception as e:
+                    logger.error(f"Aggregate error {symbol}: {e}")
+                self._record_tick_time((time.monotonic() - t0) * 1000)
+            if pipe is not None:
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Aggregate batch error: {e}")
+
+    def _group_ticks(self, batch: List[Dict]) -> List[tuple]:
+        """(symbol, data) en orden de llegada; con coalescing, uno por símbolo."""
+        if not ALERT_BATCH_COALESCE:
+            ticks = []
+            for data in batch:
+                symbol = data.get("sym") or data.get("symbol")
+                if symbol:
+                    ticks.append((symbol, data))
+            return ticks
+
+        by_symbol: Dict[str, Dict] = {}
+        for data in batch:
+            symbol = data.get("sym") or data.get("symbol")
+            if not symbol:
+                continue
+            prev = by_symbol.pop(symbol, None)
+            if prev is not None:
+                # El acumulado del día (av) ya es el del último tick; el
+                # volumen del agregado hay que sumarlo para no perderlo.
+                prev_v = int(prev.get("volume", 0) or prev.get("v", 0) or 0)
+                cur_v = int(data.get("volume", 0) or data.get("v", 0) or 0)
+                data = dict(data)
+                data["volume"] = str(prev_v + cur_v)
+                self._stats["coalesced"] += 1
+            by_symbol[symbol] = data
+        return list(by_symbol.items())
+
+    def _run_detectors(self, symbol: str, current: AlertState) -> List[AlertRecord]:
+        previous = self.state_cache.get(symbol)
+        if previous is None:
+            previous = AlertState(symbol=symbol, price=current.price, volume=0,
+                                  timestamp=current.timestamp, rvol=0.0, change_percent=0.0)
+        detectors = self.interest.select(current)
+        self._stats["detector_calls"] += len(detectors)
+        self._stats["detector_skips"] += len(self.detectors) - len(detectors)
+        all_alerts: List[AlertRecord] = []
+        for det in detectors:
+            try:
+                all_alerts.extend(det.detect(current, previous))
+            except Exception as e:
+                logger.error(f"{det.__class__.__name__} error {symbol}: {e}")
+        self.state_cache.set(symbol, current)
+        self._stats["ticks"] += 1
+        return all_alerts
+
+    def _queue_alerts(self, pipe, symbol: str, alerts: List[AlertRecord]):
+        enriched = self._enriched_cache.get(symbol)
+        for a in alerts:
+            d = a.to_dict()
+            pipe.xadd(STREAM_ALERTS, d, maxlen=100000)
+            if self.alert_writer:
+                self.alert_writer.buffer_alert(d, enriched)
+        self._stats["alerts"] += len(alerts)
+
+    def _record_tick_time(self, elapsed_ms: float):
+        tick_times = self._stats["tick_times"]
+        tick_times.append(elapsed_ms)
+        if len(tick_times) > 1000:
+            del tick_times[:500]
+
     async def _process_halt(self, data: Dict):
         try:
             et_raw = data.get("event_type", "").upper()
@@ -329,7 +445,7 @@ class AlertEngine:
         except Exception as e:
             logger.error(f"Halt error [{symbol if 'symbol' in dir() else '?'}]: {e}", exc_info=True)
 
-    async def _build_state(self, symbol, data) -> Optional[AlertState]:
+    async def _build_state(self, symbol, data, rvol=_RVOL_NOT_FETCHED) -> Optional[AlertState]:
         try:
             price = float(data.get("c", 0) or data.get("close", 0))
             if price <= 0:
@@ -337,7 +453,8 @@ class AlertEngine:
             volume = int(data.get("volume_accumulated", 0) or data.get("av", 0) or 0)
             minute_vol = int(data.get("volume", 0) or data.get("v", 0) or 0) or None
             e = self._enriched_cache.get(symbol, {})
-            rvol = await self._get_rvol(symbol)
+            if rvol is _RVOL_NOT_FETCHED:
+                rvol = await self._get_rvol(symbol)
             vwap = e.get("vwap")
             if vwap is None:
                 raw_vw = data.get("vw") or data.get("vwap")
@@ -422,6 +539,15 @@ class AlertEngine:
         except Exception:
             return None
 
+    async def _get_rvols(self, symbols: List[str]) -> Dict[str, Optional[float]]:
+        if not symbols:
+            return {}
+        try:
+            values = await self.raw_redis.hmget("rvol:current_slot", symbols)
+        except Exception:
+            return {s: None for s in symbols}
+        return {s: (float(v) if v else None) for s, v in zip(symbols, values)}
+
     async def _refresh_enriched_cache(self, clear_if_empty: bool = False):
         try:
             raw = await self.raw_redis.hgetall("snapshot:enriched:latest")
@@ -652,6 +778,27 @@ class AlertEngine:
             for d in self.detectors:
                 d.cleanup_old_symbols(active)
 
+    async def _partition_loop(self):
+        """Recarga el mapa de particiones; suelta el estado de los símbolos que se movieron."""
+        while self.running:
+            await asyncio.sleep(30)
+            try:
+                if not await self.partition_map.refresh():
+                    continue
+                moved = [s for s in self.state_cache._states if not self.partition_map.owns(s, PARTITION_ID)]
+                for s in moved:
+                    del self.state_cache._states[s]
+                if moved:
+                    active = set(self.state_cache._states.keys())
+                    for d in self.detectors:
+                        d.cleanup_old_symbols(active)
+                logger.info(
+                    f"[P{PARTITION_ID}] Partition map v{self.partition_map.version}: "
+                    f"released {len(moved)} symbols"
+                )
+            except Exception as e:
+                logger.error(f"Partition map refresh error: {e}")
+
     async def _stats_loop(self):
         while self.running:
             await asyncio.sleep(30)
@@ -672,7 +819,10 @@ class AlertEngine:
                     f"[P{PARTITION_ID}] ticks/s={tps:.0f} alerts/s={aps:.0f} "
                     f"p50={p50:.1f}ms p99={p99:.1f}ms "
                     f"total_ticks={ticks} total_alerts={alerts} "
-                    f"symbols={len(self.state_cache._states)}"
+                    f"symbols={len(self.state_cache._states)} "
+                    f"coalesced={self._stats['coalesced']} "
+                    f"detector_skips={self._stats['detector_skips']}/"
+                    f"{self._stats['detector_calls'] + self._stats['detector_skips']}"
                 )
             else:
                 logger.info(f"[P{PARTITION_ID}] ticks/s={tps:.0f} alerts/s={aps:.0f} total={ticks}/{alerts}")
@@ -0,0 +1,270 @@
+"""
+Parity test: DetectorInterestIndex.select() in front of detect() vs calling
+every detector on every tick. Random ticks (sessions, time of day, None
+fields, low volume) must produce the same alerts and leave every detector
+with the same per-symbol state.
+"""
+from __future__ import annotations
+
+import random
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import pytest
+
+_engine_root = Path(__file__).resolve().parent.parent
+if str(_engine_root) not in sys.path:
+    sys.path.insert(0, str(_engine_root))
+
+import detectors.base  # noqa: E402
+import detectors.bidask_alerts  # noqa: E402
+import detectors.cross_alerts  # noqa: E402
+from detectors import ALL_DETECTOR_CLASSES, DetectorInterestIndex  # noqa: E402
+from models.alert_state import AlertState, DailyExtreme, VolatilityBaseline  # noqa: E402
+
+SYMBOLS = ["AAA", "BBB", "CCC", "DDD", "EEE"]
+SESSIONS = [None, "PRE_MARKET", "MARKET_OPEN", "REGULAR", "POST_MARKET", "CLOSED"]
+ET = ZoneInfo("America/New_York")
+
+# Campos opcionales que pueden llegar a None (p=NONE_PROB por tick)
+NONE_PROB = 0.12
+
+
+class _Walk:
+    """Random walk of one symbol; each tick becomes an AlertState."""
+
+    def __init__(self, rng: random.Random, symbol: str):
+        self.rng = rng
+        self.symbol = symbol
+        self.prev_close = rng.uniform(2, 80)
+        self.open = self.prev_close * rng.uniform(0.85, 1.2)
+        self.price = self.open
+        self.high = self.low = self.price
+        self.volume = rng.choice([0, 2_000, 50_000])
+        self.sma = {n: self.price * rng.uniform(0.95, 1.05) for n in (5, 8, 20, 50, 200)}
+        self.macd = rng.gauss(0, 0.05)
+        self.stoch = rng.uniform(0, 100)
+
+    def _opt(self, value):
+        return None if self.rng.random() < NONE_PROB else value
+
+    def _opt_ref(self, value):
+        """Precio de referencia: a veces None, a veces 0 (INTEREST_POSITIVE)."""
+        return 0.0 if self.rng.random() < 0.03 else self._opt(value)
+
+    def tick(self, ts: datetime, session) -> AlertState:
+        rng = self.rng
+        jump = rng.gauss(0, 0.01) if rng.random() > 0.05 else rng.gauss(0, 0.06)
+        self.price = max(0.5, self.price * (1 + jump))
+        self.high = max(self.high, self.price)
+        self.low = min(self.low, self.price)
+        minute_volume = int(rng.expovariate(1 / 20_000))
+        self.volume += minute_volume
+        for n in self.sma:
+            self.sma[n] += (self.price - self.sma[n]) / n
+        self.macd += rng.gauss(0, 0.04)
+        self.stoch = min(100.0, max(0.0, self.stoch + rng.gauss(0, 15)))
+        p = self.price
+
+        def near(spread=0.02):
+            return p * (1 + rng.uniform(-spread, spread))
+
+        bid = p * (1 - rng.uniform(0, 0.004))
+        ask = p * (1 + rng.uniform(0, 0.004))
+        return AlertState(
+            symbol=self.symbol,
+            timestamp=ts,
+            price=p,
+            volume=self.volume,
+            minute_volume=self._opt(minute_volume),
+            last_trade_size=self._opt(rng.randint(1, 5_000)),
+            bid=self._opt(bid),
+            ask=self._opt(ask),
+            bid_size=self._opt(rng.randint(1, 50_000)),
+            ask_size=self._opt(rng.randint(1, 50_000)),
+            spread=self._opt(ask - bid),
+            vwap=self._opt_ref(near(0.03)),
+            intraday_high=self._opt(self.high),
+            intraday_low=self._opt(self.low),
+            prev_close=self._opt_ref(self.prev_close),
+            prev_open=self._opt(self.prev_close * rng.uniform(0.95, 1.05)),
+            open_price=self._opt_ref(self.open),
+            prev_day_high=self._opt(self.prev_close * 1.05),
+            prev_day_low=self._opt(self.prev_close * 0.95),
+            change_percent=self._opt((p / self.prev_close - 1) * 100),
+            gap_percent=self._opt((self.open / self.prev_close - 1) * 100),
+            change_from_open=self._opt((p / self.open - 1) * 100),
+            chg_1min=self._opt(rng.gauss(0, 1)),
+            chg_5min=self._opt(rng.gauss(0, 2)),
+            chg_10min=self._opt(rng.gauss(0, 3)),
+            chg_15min=self._opt(rng.gauss(0, 3)),
+            chg_30min=self._opt(rng.gauss(0, 4)),
+            chg_60min=self._opt(rng.gauss(0, 5)),
+            vol_1min=self._opt(minute_volume),
+            vol_5min=self._opt(minute_volume * rng.randint(1, 6)),
+            vol_1min_pct=self._opt(rng.uniform(0, 800)),
+            vol_5min_pct=self._opt(rng.uniform(0, 800)),
+            avg_daily_volume=self._opt(rng.uniform(1e5, 5e6)),
+            rvol=self._opt(rng.uniform(0, 8)),
+            premarket_volume=self._opt(rng.randint(0, 500_000)),
+            premarket_rvol=self._opt(rng.uniform(0, 5)),
+            atr=self._opt(p * rng.uniform(0.01, 0.08)),
+            atr_percent=self._opt(rng.uniform(1, 8)),
+            trades_z_score=self._opt(rng.gauss(0, 2)),
+            sma_5=self._opt(self.sma[5]),
+            sma_8=self._opt(self.sma[8]),
+            sma_20=self._opt(self.sma[20]),
+            sma_50=self._opt(self.sma[50]),
+            sma_200=self._opt(self.sma[200]),
+            ema_20=self._opt(self.sma[20] * rng.uniform(0.99, 1.01)),
+            ema_50=self._opt(self.sma[50] * rng.uniform(0.99, 1.01)),
+            bb_upper=self._opt(self.sma[20] * 1.03),
+            bb_lower=self._opt(self.sma[20] * 0.97),
+            rsi=self._opt(rng.uniform(5, 95)),
+            macd_line=self._opt(self.macd),
+            macd_signal=self._opt(self.macd + rng.gauss(0, 0.03)),
+            macd_hist=self._opt(rng.gauss(0, 0.03)),
+            stoch_k=self._opt(self.stoch),
+            stoch_d=self._opt(min(100.0, max(0.0, self.stoch + rng.gauss(0, 8)))),
+            adx_14=self._opt(rng.uniform(5, 60)),
+            daily_sma_20=self._opt(near(0.1)),
+            daily_sma_50=self._opt(near(0.15)),
+            daily_sma_200=self._opt(near(0.3)),
+            high_52w=self._opt(p * rng.uniform(1.0, 1.5)),
+            low_52w=self._opt(p * rng.uniform(0.5, 1.0)),
+            market_cap=self._opt(rng.uniform(1e7, 1e11)),
+            float_shares=self._opt(rng.uniform(1e6, 1e9)),
+            shares_outstanding=self._opt(rng.randint(1_000_000, 2_000_000_000)),
+            security_type=self._opt("CS"),
+            sector=self._opt("Technology"),
+            market_session=session,
+            exchange=self._opt("XNAS"),
+            sma_8_5m=self._opt(self.sma[8] * rng.uniform(0.99, 1.01)),
+            sma_20_5m=self._opt(self.sma[20] * rng.uniform(0.99, 1.01)),
+            macd_line_5m=self._opt(self.macd * rng.uniform(0.5, 1.5)),
+            macd_signal_5m=self._opt(self.macd + rng.gauss(0, 0.05)),
+            stoch_k_5m=self._opt(self.stoch),
+            stoch_d_5m=self._opt(min(100.0, max(0.0, self.stoch + rng.gauss(0, 10)))),
+            **{
+                f"{kind}_bar_{side}_{tf}m": self._opt(near(0.02))
+                for kind in ("prev", "cur")
+                for side in ("high", "low")
+                for tf in (5, 10, 15, 30, 60)
+            },
+            volatility=self._opt(VolatilityBaseline(
+                intraday_vol_1m=rng.uniform(0.001, 0.01),
+                intraday_vol_5m=rng.uniform(0.002, 0.02),
+                intraday_vol_15m=rng.uniform(0.003, 0.03),
+                daily_vol_annual=rng.uniform(0.2, 1.5),
+                avg_dollar_move_1m=p * rng.uniform(0.001, 0.01),
+                avg_daily_volume=rng.uniform(1e5, 5e6),
+            )),
+            daily_extremes=self._opt([
+                DailyExtreme(
+                    trading_date=date(2026, 3, 9) - timedelta(days=d),
+                    days_ago=d,
+                    high=self.prev_close * rng.uniform(1.0, 1.3),
+                    low=self.prev_close * rng.uniform(0.7, 1.0),
+                    close=self.prev_close * rng.uniform(0.85, 1.15),
+                )
+                for d in range(1, 21)
+            ]),
+        )
+
+
+def _ticks(seed: int, count: int):
+    """(symbol, state) desde las 4:00; los dos últimos símbolos con timestamp tz-aware ET."""
+    rng = random.Random(seed)
+    walks = {s: _Walk(rng, s) for s in SYMBOLS}
+    aware = set(SYMBOLS[-2:])
+    ts = datetime(2026, 3, 10, 4, 0)
+    for _ in range(count):
+        ts += timedelta(seconds=rng.randint(1, 40))
+        symbol = rng.choice(SYMBOLS)
+        session = rng.choice(SESSIONS)
+        stamp = ts.replace(tzinfo=ET) if symbol in aware else ts
+        yield symbol, walks[symbol].tick(stamp, session)
+
+
+class _TickClock:
+    """Reloj de pared sustituido por el timestamp del tick (cooldowns, monotonic)."""
+
+    def __init__(self):
+        self.now = datetime(2026, 3, 10)
+
+    def set(self, ts: datetime) -> None:
+        self.now = ts.replace(tzinfo=None)
+
+    def monotonic(self) -> float:
+        return (self.now - datetime(2026, 1, 1)).total_seconds()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _TickClock()
+
+    class _Datetime(datetime):
+        @classmethod
+        def utcnow(cls):
+            return clock.now
+
+    monkeypatch.setattr(detectors.base, "datetime", _Datetime)
+    for module in (detectors.bidask_alerts, detectors.cross_alerts):
+        monkeypatch.setattr(module, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def _previous(cache, symbol, current):
+    # Igual que AlertEngine._run_detectors
+    previous = cache.get(symbol)
+    if previous is None:
+        previous = AlertState(symbol=symbol, price=current.price, volume=0,
+                              timestamp=current.timestamp, rvol=0.0, change_percent=0.0)
+    return previous
+
+
+def _alert_key(alert):
+    d = alert.to_dict()
+    d.pop("id", None)
+    return d
+
+
+def _detector_state(det):
+    state = {k: v for k, v in vars(det).items() if k not in ("cooldowns", "baseline")}
+    state["cooldowns"] = det.cooldowns._last_fired
+    return state
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_interest_index_matches_all_detectors(seed, clock):
+    full = [cls() for cls in ALL_DETECTOR_CLASSES]
+    indexed = [cls() for cls in ALL_DETECTOR_CLASSES]
+    index = DetectorInterestIndex(indexed)
+    assert index.group_count < len(indexed)
+
+    full_prev, indexed_prev = {}, {}
+    alerts = skipped = 0
+    for symbol, current in _ticks(seed, count=2_500):
+        clock.set(current.timestamp)
+        expected = []
+        for det in full:
+            expected.extend(det.detect(current, _previous(full_prev, symbol, current)))
+        full_prev[symbol] = current
+
+        selected = index.select(current)
+        got = []
+        for det in selected:
+            got.extend(det.detect(current, _previous(indexed_prev, symbol, current)))
+        indexed_prev[symbol] = current
+
+        assert [_alert_key(a) for a in got] == [_alert_key(a) for a in expected]
+        alerts += len(expected)
+        skipped += len(indexed) - len(selected)
+
+    # El test solo vale si hubo alertas y detectores saltados
+    assert alerts > 0 and skipped > 0
+    for det_full, det_indexed in zip(full, indexed):
+        assert _detector_state(det_indexed) == _detector_state(det_full), type(det_full).__name__
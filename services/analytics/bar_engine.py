@@ -34,8 +34,9 @@ CPU:    ~100-200ms per minute burst (15K symbols)
 
 Design for sharding:
     - All state is per-symbol, no cross-symbol dependencies
-    - Dict can be split by hash(symbol) % N for N workers
+    - Dict can be split by crc32(symbol) % N for N workers
     - BarEngine code does NOT change when sharding
+    - Runtime: sharded_bar_engine.ShardedBarEngine (settings.bar_engine_shards)
 """
 
 import time
@@ -12,7 +12,8 @@ Responsibilities:
 
 Data Flow:
     snapshot:polygon:latest (JSON STRING, written by data_ingest)
-        ↓ READ
+    or snapshot:polygon:latest:columnar (preferred when present, snapshot_format=columnar)
+        ↓ READ (session trackers, prices and RVOL volumes from columns)
     EnrichmentPipeline.run_cycle()
         ↓ ENRICH (merge snapshot + WebSocket trackers + calculated indicators)
         ↓ CHANGE DETECTION (byte comparison)
@@ -24,11 +25,14 @@ import asyncio
 import json as stdlib_json  # For parsing data with NaN/Inf values (DuckDB screener)
 import orjson
 from datetime import datetime, date
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from zoneinfo import ZoneInfo
 
+import numpy as np
+
 from shared.utils.redis_client import RedisClient
 from shared.utils.logger import get_logger
+from shared.utils.columnar_snapshot import INT_NULL, read_columnar_snapshot
 from .change_detector import ChangeDetector
 from bar_engine import BarEngine
 from shared.enums.market_session import MarketSession
@@ -40,9 +44,23 @@ SNAPSHOT_POLYGON_KEY = "snapshot:polygon:latest"
 SNAPSHOT_ENRICHED_HASH = "snapshot:enriched:latest"
 SNAPSHOT_ENRICHED_META = "snapshot:enriched:latest:__meta__"
 SNAPSHOT_LAST_CLOSE_HASH = "snapshot:enriched:last_close"
+# Per-cycle changed-symbol set, consumed by the scanner to patch its resident
+# snapshot table instead of HGETALL-ing the whole hash every scan.
+SNAPSHOT_ENRICHED_CHANGES_STREAM = "stream:enriched:changes"
+SNAPSHOT_ENRICHED_CHANGES_MAXLEN = 200
 SNAPSHOT_ENRICHED_TTL = 600  # 10 minutes
 SNAPSHOT_LAST_CLOSE_TTL = 604800  # 7 days
 POSTMARKET_FROZEN_TTL = 259200  # 72h — survives the weekend for restart recovery
+# Columnas del snapshot que usa el pre-pass de cada ciclo (mismo nombre que en
+# ColumnarSnapshot.column(); en el camino JSON se extraen de los dicts)
+_CYCLE_COLUMNS = (
+    ("lastTrade", "p", "f8"),
+    ("lastTrade", "t", "i8"),
+    ("day", "c", "f8"),
+    ("day", "v", "f8"),
+    ("min", "av", "i8"),
+    ("min", "vw", "f8"),
+)
 # Margen tras las 16:00 ET antes de congelar el cierre regular: el print de
 # la subasta de cierre tarda en consolidarse y sin esta espera se cuela como
 # movimiento after-hours en los valores poco líquidos.
@@ -118,6 +136,9 @@ class EnrichmentPipeline:
         self._last_slot = -1
         self._is_holiday_mode = False
         self._cycle_count = 0
+        # Sequence of hash writes published on SNAPSHOT_ENRICHED_CHANGES_STREAM.
+        # Consumers resync with a full read when they see a gap or full=1.
+        self._delta_seq = 0
         
         # Pre-market high/low tracker (reset at market open 9:30 ET)
         self._premarket_highs: Dict[str, float] = {}
@@ -218,22 +239,39 @@ class EnrichmentPipeline:
             )
             self._last_slot = current_slot
         
-        # Read raw snapshot
-        snapshot_data = await self.redis.get(SNAPSHOT_POLYGON_KEY)
-        if not snapshot_data:
-            await asyncio.sleep(1)
-            return
+        # Read raw snapshot: columnar value when present, JSON key otherwise
+        snap = await read_columnar_snapshot(self.redis)
+        if snap is not None:
+            snapshot_timestamp = snap.timestamp
+        else:
+            snapshot_data = await self.redis.get(SNAPSHOT_POLYGON_KEY)
+            if not snapshot_data:
+                await asyncio.sleep(1)
+                return
+            snapshot_timestamp = snapshot_data.get('timestamp')
         
         # Check if already processed
-        snapshot_timestamp = snapshot_data.get('timestamp')
         if snapshot_timestamp == self._last_processed_timestamp:
             await asyncio.sleep(0.5)
             return
         
-        tickers_data = snapshot_data.get('tickers', [])
+        if snap is not None:
+            # Pre-pass por columnas (vistas sobre el blob); los dicts solo para
+            # el enriquecimiento por ticker
+            symbols = snap.tickers()
+            cols = {
+                f"{group}_{field}": snap.column(f"{group}_{field}")
+                for group, field, _ in _CYCLE_COLUMNS
+            }
+            tickers_data = snap.to_ticker_dicts()
+        else:
+            tickers_data = snapshot_data.get('tickers', [])
+            symbols, cols = self._columns_from_dicts(tickers_data)
         if not tickers_data:
             await asyncio.sleep(1)
             return
+        last_price = cols['lastTrade_p']
+        day_close = cols['day_c']
         
         # Refresh slow-changing caches (metadata + screener daily) if stale
         await self._maybe_refresh_slow_caches()
@@ -250,11 +288,9 @@ class EnrichmentPipeline:
         if session == MarketSession.POST_MARKET and not self._regular_close_frozen:
             _close_at = now.replace(hour=16, minute=0, second=0, microsecond=0)
             if (now - _close_at).total_seconds() >= _CLOSE_SETTLE_SECONDS:
-                for td in tickers_data:
-                    sym = td.get('ticker')
-                    day_d = td.get('day', {})
-                    if sym and isinstance(day_d, dict) and day_d.get('c') and day_d['c'] > 0:
-                        self._regular_close_cache[sym] = float(day_d['c'])
+                for i in np.flatnonzero(day_close > 0).tolist():
+                    if symbols[i]:
+                        self._regular_close_cache[symbols[i]] = float(day_close[i])
                 self._regular_close_frozen = True
                 self._regular_close_epoch_ns = int(_close_at.timestamp() * 1_000_000_000)
                 logger.info("regular_close_frozen", tickers=len(self._regular_close_cache))
@@ -276,38 +312,31 @@ class EnrichmentPipeline:
         if session == MarketSession.PRE_MARKET:
             self._premarket_frozen = False
             self._premarket_volume_frozen_flag = False
-            for td in tickers_data:
-                sym = td.get('ticker')
+            # Pre-market volume from min.av (accumulated). Fallback to day.v.
+            min_av, day_v = cols['min_av'], cols['day_v']
+            has_av = (min_av != INT_NULL) | ~np.isnan(day_v)
+            premarket_av = np.where(min_av != INT_NULL, min_av, np.nan_to_num(day_v)).astype(np.int64)
+            for sym, p, has, av, vw in zip(
+                symbols, last_price.tolist(), has_av.tolist(),
+                premarket_av.tolist(), cols['min_vw'].tolist()
+            ):
                 if not sym:
                     continue
-                lt = td.get('lastTrade', {})
-                p = lt.get('p') if isinstance(lt, dict) else None
-                if p and p > 0:
+                if p > 0:
                     cur_h = self._premarket_highs.get(sym, 0)
                     cur_l = self._premarket_lows.get(sym, float('inf'))
                     if p > cur_h:
                         self._premarket_highs[sym] = p
                     if p < cur_l:
                         self._premarket_lows[sym] = p
-                # Pre-market volume from min.av (accumulated). Fallback to day.v.
-                min_d = td.get('min', {})
-                av = min_d.get('av') if isinstance(min_d, dict) else None
-                if av is None:
-                    day_d = td.get('day', {})
-                    av = day_d.get('v') if isinstance(day_d, dict) else None
-                if av is not None:
-                    try:
-                        av_int = int(av)
-                        if av_int > self._premarket_volumes.get(sym, 0):
-                            self._premarket_volumes[sym] = av_int
-                        # Track pre-market VWAP for dollar volume (min.vw or session vwap)
-                        vw = min_d.get('vw') if isinstance(min_d, dict) else None
-                        if vw and vw > 0:
-                            self._premarket_vwaps[sym] = float(vw)
-                        elif p and p > 0 and sym not in self._premarket_vwaps:
-                            self._premarket_vwaps[sym] = float(p)
-                    except (TypeError, ValueError):
-                        pass
+                if has:
+                    if av > self._premarket_volumes.get(sym, 0):
+                        self._premarket_volumes[sym] = av
+                    # Track pre-market VWAP for dollar volume (min.vw or session vwap)
+                    if vw > 0:
+                        self._premarket_vwaps[sym] = vw
+                    elif p > 0 and sym not in self._premarket_vwaps:
+                        self._premarket_vwaps[sym] = p
         elif session == MarketSession.MARKET_OPEN and not self._premarket_frozen:
             self._premarket_frozen = True
             # Freeze pre-market volume snapshot ONCE on PRE_MARKET → MARKET_OPEN.
@@ -323,13 +352,14 @@ class EnrichmentPipeline:
         # POST_MARKET (same pattern as premarket_high/low above).
         if session == MarketSession.POST_MARKET:
             self._postmarket_frozen_flag = False
-            for td in tickers_data:
-                sym = td.get('ticker')
-                if not sym:
-                    continue
-                lt = td.get('lastTrade', {})
-                p = lt.get('p') if isinstance(lt, dict) else None
-                if p and p > 0 and self._traded_after_close(lt):
+            if self._regular_close_epoch_ns is not None:
+                # Solo trades posteriores al cierre congelado (_traded_after_close)
+                traded = (last_price > 0) & (cols['lastTrade_t'] >= self._regular_close_epoch_ns)
+                for i in np.flatnonzero(traded).tolist():
+                    sym = symbols[i]
+                    if not sym:
+                        continue
+                    p = float(last_price[i])
                     if p > self._postmarket_highs.get(sym, 0):
                         self._postmarket_highs[sym] = p
                     if p < self._postmarket_lows.get(sym, float('inf')):
@@ -362,12 +392,10 @@ class EnrichmentPipeline:
             self._postmarket_recovered = True
         
         # Get ATR batch from cache
-        symbols = [t.get('ticker') for t in tickers_data if t.get('ticker')]
-        current_prices = {
-            t.get('ticker'): t.get('lastTrade', {}).get('p') or t.get('day', {}).get('c')
-            for t in tickers_data if t.get('ticker')
-        }
-        atr_data = await self.atr_calculator._get_batch_from_cache(symbols)
+        # Current price: lastTrade.p, fallback day.c (NaN = sin precio)
+        prices = np.where(np.isnan(last_price) | (last_price == 0), day_close, last_price)
+        current_prices = dict(zip(symbols, prices.tolist()))
+        atr_data = await self.atr_calculator._get_batch_from_cache([s for s in symbols if s])
         
         # Update ATR percent with current prices
         for symbol, atr_info in atr_data.items():
@@ -376,6 +404,22 @@ class EnrichmentPipeline:
                 if price and price > 0:
                     atr_info['atr_percent'] = round((atr_info['atr'] / price) * 100, 2)
         
+        # RVOL for the whole snapshot in one vectorized pass (baseline matrix
+        # loaded); otherwise None and each ticker falls back to per-symbol RVOL
+        rvols = None
+        if self.rvol_calculator.baseline.ready:
+            # Accumulated volume (priority: min.av > day.v), as _snapshot_volume
+            min_av, day_v = cols['min_av'], cols['day_v']
+            snapshot_volumes = np.where(min_av > 0, min_av, np.where(day_v > 0, day_v, 0))
+            volumes = {
+                symbols[i]: int(snapshot_volumes[i])
+                for i in np.flatnonzero(snapshot_volumes > 0).tolist()
+                if symbols[i]
+            }
+            rvols = await self.rvol_calculator.calculate_rvol_batch(
+                list(volumes.keys()), timestamp=now, volumes=volumes
+            )
+        
         # Enrich all tickers
         enriched_tickers: Dict[str, dict] = {}
         rvol_mapping: Dict[str, str] = {}
@@ -387,7 +431,7 @@ class EnrichmentPipeline:
                     continue
                 
                 enriched = await self._enrich_single_ticker(
-                    ticker_data, symbol, now, atr_data
+                    ticker_data, symbol, now, atr_data, rvols
                 )
                 
                 if enriched:
@@ -399,7 +443,8 @@ class EnrichmentPipeline:
                 logger.error("error_enriching_ticker", symbol=ticker_data.get('ticker'), error=str(e))
         
         # Change detection + incremental write to Redis Hash
-        if self._change_detector.is_first_cycle:
+        full_write = self._change_detector.is_first_cycle
+        if full_write:
             # First cycle: write everything
             changed = self._change_detector.force_full_write(enriched_tickers)
             changed_count = len(changed)
@@ -410,7 +455,7 @@ class EnrichmentPipeline:
         
         # Write to Redis Hash (only changed tickers)
         if changed:
-            await self._write_to_hash(changed, snapshot_timestamp, total_count)
+            await self._write_to_hash(changed, snapshot_timestamp, total_count, full=full_write)
         
         # Write RVOLs to hash
         if rvol_mapping:
@@ -436,12 +481,42 @@ class EnrichmentPipeline:
             cycle=self._cycle_count
         )
     
+    @staticmethod
+    def _columns_from_dicts(tickers_data: List[dict]):
+        """
+        Symbols + _CYCLE_COLUMNS as arrays from the JSON tickers, with the
+        null convention of the columnar snapshot (NaN / INT_NULL).
+        """
+        symbols = [t.get('ticker') or '' for t in tickers_data]
+        cols = {}
+        for group, field, dt in _CYCLE_COLUMNS:
+            null = np.nan if dt == "f8" else INT_NULL
+            values = []
+            for t in tickers_data:
+                sub = t.get(group)
+                v = sub.get(field) if isinstance(sub, dict) else None
+                values.append(null if v is None else v)
+            cols[f"{group}_{field}"] = np.array(values, dtype=dt)
+        return symbols, cols
+    
+    @staticmethod
+    def _snapshot_volume(ticker_data: dict):
+        """Accumulated volume for RVOL (priority: min.av > day.v)."""
+        min_data = ticker_data.get('min', {})
+        day_data = ticker_data.get('day', {})
+        if min_data and min_data.get('av'):
+            return min_data.get('av', 0)
+        if day_data and day_data.get('v'):
+            return day_data.get('v', 0)
+        return 0
+    
     async def _enrich_single_ticker(
         self,
         ticker_data: dict,
         symbol: str,
         now: datetime,
-        atr_data: dict
+        atr_data: dict,
+        rvols: Optional[Dict[str, float]] = None
     ) -> Optional[dict]:
         """
         Enrich a single ticker with all calculated indicators.
@@ -457,14 +532,8 @@ class EnrichmentPipeline:
         - Trades anomaly (from TradesAnomalyDetector)
         """
         # Volume (priority: min.av > day.v)
-        min_data = ticker_data.get('min', {})
         day_data = ticker_data.get('day', {})
-        
-        volume = 0
-        if min_data and min_data.get('av'):
-            volume = min_data.get('av', 0)
-        elif day_data and day_data.get('v'):
-            volume = day_data.get('v', 0)
+        volume = self._snapshot_volume(ticker_data)
         
         # RVOL
         rvol = None
@@ -476,13 +545,17 @@ class EnrichmentPipeline:
             if current_price and current_price > 0:
                 self.intraday_tracker.update(symbol, current_price)
             
-            # Update volume for RVOL
-            await self.rvol_calculator.update_volume_for_symbol(
-                symbol=symbol,
-                volume_accumulated=volume,
-                timestamp=now
-            )
-            rvol = await self.rvol_calculator.calculate_rvol(symbol, timestamp=now)
+            if rvols is not None:
+                # Already computed by calculate_rvol_batch for this cycle
+                rvol = rvols.get(symbol)
+            else:
+                # Update volume for RVOL
+                await self.rvol_calculator.update_volume_for_symbol(
+                    symbol=symbol,
+                    volume_accumulated=volume,
+                    timestamp=now
+                )
+                rvol = await self.rvol_calculator.calculate_rvol(symbol, timestamp=now)
             if rvol and rvol > 0:
                 ticker_data['rvol'] = round(rvol, 2)
         
@@ -1535,21 +1608,28 @@ class EnrichmentPipeline:
         self,
         changed: Dict[str, str],
         timestamp: str,
-        total_count: int
+        total_count: int,
+        full: bool = False
     ) -> None:
         """
         Write changed tickers to Redis Hash using pipeline.
         
+        The same MULTI also appends the changed-symbol set to
+        SNAPSHOT_ENRICHED_CHANGES_STREAM so readers can patch incrementally.
+        
         Args:
             changed: Dict[symbol, serialized_json_str] of changed tickers
             timestamp: Snapshot timestamp
             total_count: Total number of enriched tickers
+            full: True when every ticker was rewritten (first cycle / new day)
         """
         try:
+            self._delta_seq += 1
             meta = orjson.dumps({
                 "timestamp": timestamp,
                 "count": total_count,
                 "changed": len(changed),
+                "seq": self._delta_seq,
                 "version": 2
             }).decode("utf-8")
             
@@ -1565,6 +1645,19 @@ class EnrichmentPipeline:
             # Set TTL
             pipe.expire(SNAPSHOT_ENRICHED_HASH, SNAPSHOT_ENRICHED_TTL)
             
+            # Changed-symbol set for this write (full=1 → readers reload everything)
+            pipe.xadd(
+                SNAPSHOT_ENRICHED_CHANGES_STREAM,
+                {
+                    "seq": self._delta_seq,
+                    "timestamp": timestamp,
+                    "full": 1 if full else 0,
+                    "symbols": "" if full else ",".join(changed.keys()),
+                },
+                maxlen=SNAPSHOT_ENRICHED_CHANGES_MAXLEN,
+                approximate=True,
+            )
+            
             await pipe.execute()
             
         except Exception as e:
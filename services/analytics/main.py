@@ -46,6 +46,7 @@ from fastapi.responses import JSONResponse
 from shared.config.settings import settings
 from shared.utils.redis_client import RedisClient
 from shared.utils.timescale_client import TimescaleClient
+from shared.utils.columnar_snapshot import load_polygon_snapshot
 from shared.utils.logger import configure_logging, get_logger
 from shared.events import EventBus, EventType, Event
 
@@ -67,6 +68,8 @@ from consumers.volume_window_consumer import VolumeWindowConsumer
 from consumers.price_window_consumer import PriceWindowConsumer
 from consumers.minute_bar_consumer import MinuteBarConsumer
 from bar_engine import BarEngine
+from array_bar_engine import ArrayBarEngine
+from sharded_bar_engine import ShardedBarEngine
 from timescale_bar_writer import TimescaleBarWriter
 
 # Configure logger
@@ -259,8 +262,11 @@ async def lifespan(app: FastAPI):
         timescale_client=timescale_client,
         slot_size_minutes=5,
         lookback_days=5,
-        include_extended_hours=True
+        include_extended_hours=True,
+        baseline_dir=settings.rvol_baseline_dir
     )
+    # Matriz de promedios RVOL (memmap local si existe, si no una query a volume_slots)
+    await rvol_calculator.load_baseline()
     atr_calculator = ATRCalculator(
         redis_client=redis_client,
         timescale_client=timescale_client,
@@ -289,7 +295,7 @@ async def lifespan(app: FastAPI):
     # --- Recover intraday data ---
     if not is_holiday_mode:
         try:
-            snapshot_data = await redis_client.get("snapshot:polygon:latest")
+            snapshot_data = await load_polygon_snapshot(redis_client)
             if snapshot_data:
                 tickers_data = snapshot_data.get('tickers', [])
                 active_symbols = [
@@ -308,7 +314,22 @@ async def lifespan(app: FastAPI):
             logger.warning("intraday_recovery_failed", error=str(e))
     
     # --- Initialize BarEngine (AM.* minute bars + streaming indicators) ---
-    bar_engine = BarEngine()  # Uses DEFAULT_RING_SIZE (210)
+    # settings.bar_engine_backend: "talipp" (per-symbol objects) or "array" (numpy slots)
+    # settings.bar_engine_shards > 1: N worker processes (stable crc32 sharding)
+    if settings.bar_engine_shards > 1:
+        bar_engine = ShardedBarEngine(
+            num_shards=settings.bar_engine_shards,
+            backend=settings.bar_engine_backend,
+        )
+    elif settings.bar_engine_backend == "array":
+        bar_engine = ArrayBarEngine()
+    else:
+        bar_engine = BarEngine()  # Uses DEFAULT_RING_SIZE (210)
+    logger.info(
+        "bar_engine_backend_selected",
+        backend=settings.bar_engine_backend,
+        shards=settings.bar_engine_shards,
+    )
     
     # --- Warmup BarEngine from TimescaleDB (load last 200 1-min bars) ---
     timescale_bar_writer = TimescaleBarWriter(
@@ -399,6 +420,8 @@ async def lifespan(app: FastAPI):
                 pass
             logger.info(f"{task_name}_stopped")
     
+    if isinstance(bar_engine, ShardedBarEngine):
+        bar_engine.close()
     if trades_count_tracker:
         await trades_count_tracker.stop()
     if event_bus:
@@ -0,0 +1,199 @@
+"""
+RVOL Baseline Matrix - Promedios históricos por slot residentes en memoria
+
+Matriz densa float32 (símbolos × slots) con el volumen acumulado promedio de
+los últimos N días para cada slot. Sustituye, en el camino de enriquecimiento,
+el HGET por símbolo a rvol:hist:avg:{SYM}:{days} y el fallback HTTP a
+historical: con la matriz cargada, calculate_rvol_batch es una división
+vectorizada por ciclo sin I/O de red.
+
+Construcción (una vez por día de trading):
+    - UNA query set-based sobre volume_slots para todo el universo
+      (últimos N días con datos de cada símbolo, anteriores a hoy)
+    - Fill-forward por día con np.maximum.accumulate y promedio por slot,
+      compartido con historical (shared/utils/rvol_slot_averages.py)
+
+Persistencia (arranque rápido):
+    {dir}/rvol_baseline_{fecha}_{days}d_{slots}s.f32      matriz (np.memmap)
+    {dir}/rvol_baseline_{fecha}_{days}d_{slots}s.symbols  un símbolo por línea
+    Un reinicio en el mismo día mapea el fichero en lugar de ir a la BD.
+"""
+
+import os
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import structlog
+
+from shared.utils.rvol_slot_averages import average_slot_rows, fetch_slot_day_rows
+from shared.utils.timescale_client import TimescaleClient
+
+logger = structlog.get_logger(__name__)
+
+# Ventana natural para buscar los últimos N días con datos (festivos incluidos)
+_CALENDAR_WINDOW_DAYS = 30
+
+
+class RVOLBaselineMatrix:
+    """
+    Matriz (n_symbols, total_slots) float32 + índice símbolo → fila.
+
+    0 = sin histórico para ese slot (calculate_rvol devuelve None, igual que
+    cuando el hash de Redis no tenía el campo).
+    """
+
+    def __init__(
+        self,
+        timescale_client: TimescaleClient,
+        total_slots: int,
+        lookback_days: int = 5,
+        directory: str = "/tmp/rvol_baseline"
+    ):
+        self.db = timescale_client
+        self.total_slots = total_slots
+        self.lookback_days = lookback_days
+        self.directory = directory
+
+        self._index: Dict[str, int] = {}
+        self._matrix: np.ndarray = np.zeros((0, total_slots), dtype=np.float32)
+        self._trading_date: Optional[date] = None
+        self._source: Optional[str] = None
+        self._load_ms = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._index)
+
+    @property
+    def trading_date(self) -> Optional[date]:
+        return self._trading_date
+
+    def row(self, symbol: str) -> Optional[int]:
+        return self._index.get(symbol)
+
+    def value(self, symbol: str, slot_number: int) -> float:
+        """Promedio histórico de un slot (0.0 si no hay datos)."""
+        row = self._index.get(symbol)
+        if row is None or not 0 <= slot_number < self.total_slots:
+            return 0.0
+        return float(self._matrix[row, slot_number])
+
+    def column(self, rows: np.ndarray, slot_number: int) -> np.ndarray:
+        """Promedios de un slot para un vector de filas (gather vectorizado)."""
+        return self._matrix[rows, slot_number]
+
+    # ========================================================================
+    # Carga
+    # ========================================================================
+
+    def _paths(self, trading_date: date) -> tuple:
+        base = os.path.join(
+            self.directory,
+            f"rvol_baseline_{trading_date.isoformat()}_{self.lookback_days}d_{self.total_slots}s"
+        )
+        return base + ".f32", base + ".symbols"
+
+    async def load(self, trading_date: date) -> bool:
+        """
+        Carga la matriz del día: fichero local si existe, si no desde BD.
+
+        Returns:
+            True si la matriz quedó cargada
+        """
+        t_start = time.perf_counter()
+        if self._load_from_file(trading_date):
+            source = "file"
+        else:
+            try:
+                symbols, matrix = await self._build_from_db(trading_date)
+            except Exception as e:
+                logger.error("rvol_baseline_build_failed", error=str(e), trading_date=str(trading_date))
+                return False
+            if not symbols:
+                logger.warning("rvol_baseline_empty", trading_date=str(trading_date))
+                return False
+            self._install(symbols, matrix, trading_date)
+            self._persist(trading_date, symbols, matrix)
+            source = "db"
+
+        self._source = source
+        self._load_ms = (time.perf_counter() - t_start) * 1000
+        logger.info(
+            "rvol_baseline_loaded",
+            source=source,
+            trading_date=str(trading_date),
+            symbols=len(self._index),
+            slots=self.total_slots,
+            mb=round(self._matrix.nbytes / (1024 * 1024), 1),
+            elapsed_ms=round(self._load_ms, 1)
+        )
+        return True
+
+    def _install(self, symbols: List[str], matrix: np.ndarray, trading_date: date) -> None:
+        self._index = {s: i for i, s in enumerate(symbols)}
+        self._matrix = matrix
+        self._trading_date = trading_date
+
+    def _load_from_file(self, trading_date: date) -> bool:
+        matrix_path, symbols_path = self._paths(trading_date)
+        if not (os.path.exists(matrix_path) and os.path.exists(symbols_path)):
+            return False
+        try:
+            with open(symbols_path, "r") as f:
+                symbols = f.read().split("\n") if os.path.getsize(symbols_path) else []
+            matrix = np.memmap(
+                matrix_path, dtype=np.float32, mode="r",
+                shape=(len(symbols), self.total_slots)
+            )
+        except (OSError, ValueError) as e:
+            logger.warning("rvol_baseline_file_unreadable", path=matrix_path, error=str(e))
+            return False
+        if not symbols:
+            return False
+        self._install(symbols, matrix, trading_date)
+        return True
+
+    def _persist(self, trading_date: date, symbols: List[str], matrix: np.ndarray) -> None:
+        """Escribe matriz + índice (tmp + rename) y borra ficheros de otros días."""
+        matrix_path, symbols_path = self._paths(trading_date)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            out = np.memmap(matrix_path + ".tmp", dtype=np.float32, mode="w+", shape=matrix.shape)
+            out[:] = matrix
+            out.flush()
+            del out
+            with open(symbols_path + ".tmp", "w") as f:
+                f.write("\n".join(symbols))
+            os.replace(matrix_path + ".tmp", matrix_path)
+            os.replace(symbols_path + ".tmp", symbols_path)
+
+            keep = {os.path.basename(matrix_path), os.path.basename(symbols_path)}
+            for name in os.listdir(self.directory):
+                if name.startswith("rvol_baseline_") and name not in keep:
+                    os.remove(os.path.join(self.directory, name))
+        except OSError as e:
+            # Sin fichero solo se pierde el arranque rápido
+            logger.warning("rvol_baseline_persist_failed", error=str(e))
+
+    async def _build_from_db(self, trading_date: date):
+        """
+        Una query para todo el universo: volume_accumulated por (símbolo, día)
+        de los últimos N días con datos, agregado en arrays.
+        """
+        window_start = trading_date - timedelta(days=_CALENDAR_WINDOW_DAYS)
+        rows = await fetch_slot_day_rows(
+            self.db, trading_date, window_start, self.lookback_days, self.total_slots
+        )
+        symbols, averages = average_slot_rows(rows, self.total_slots)
+        return symbols, averages.astype(np.float32)
+
+    def get_stats(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "symbols": len(self._index),
+            "trading_date": self._trading_date.isoformat() if self._trading_date else None,
+            "source": self._source,
+            "load_ms": round(self._load_ms, 1),
+        }
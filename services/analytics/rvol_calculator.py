@@ -8,6 +8,7 @@ de PineScript, usando slots temporales y promedios históricos.
 import asyncio
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Optional, Tuple
+import numpy as np
 import structlog
 from zoneinfo import ZoneInfo
 import httpx
@@ -16,6 +17,7 @@ import re
 from shared.utils.redis_client import RedisClient
 from shared.utils.timescale_client import TimescaleClient
 from slot_manager import SlotManager, VolumeSlotCache
+from rvol_baseline import RVOLBaselineMatrix
 
 logger = structlog.get_logger(__name__)
 
@@ -37,7 +39,8 @@ class RVOLCalculator:
         timescale_client: TimescaleClient,
         slot_size_minutes: int = 5,
         lookback_days: int = 5,
-        include_extended_hours: bool = True
+        include_extended_hours: bool = True,
+        baseline_dir: str = "/tmp/rvol_baseline"
     ):
         """
         Inicializa el calculador de RVOL
@@ -48,6 +51,7 @@ class RVOLCalculator:
             slot_size_minutes: Tamaño del slot en minutos (default 5)
             lookback_days: Días históricos a considerar (default 5)
             include_extended_hours: Si incluir pre/post market (default True)
+            baseline_dir: Directorio del memmap de la matriz de promedios
         """
         self.redis = redis_client
         self.db = timescale_client
@@ -62,6 +66,15 @@ class RVOLCalculator:
         # Caché de volúmenes del día actual
         self.volume_cache = VolumeSlotCache()
         
+        # Matriz densa de promedios históricos (símbolos × slots), cargada por
+        # load_baseline(). Mientras no esté lista se usa Redis/HTTP por símbolo.
+        self.baseline = RVOLBaselineMatrix(
+            timescale_client=timescale_client,
+            total_slots=self.slot_manager.total_slots,
+            lookback_days=lookback_days,
+            directory=baseline_dir
+        )
+        
         # Caché de promedios históricos en Redis (OPTIMIZADO CON HASHES)
         # Hash Key: "rvol:hist:avg:{symbol}:{days}" → {slot: avg_volume, ...}
         # Ejemplo: "rvol:hist:avg:AAPL:5" → {"0": "12345", "1": "23456", ...}
@@ -185,11 +198,14 @@ class RVOLCalculator:
             return None
         
         # 2. Obtener promedio histórico del mismo slot
-        historical_avg = await self._get_historical_average_volume(
-            symbol=symbol,
-            slot_number=current_slot,
-            target_date=timestamp.date()
-        )
+        if self.baseline.ready:
+            historical_avg = self._baseline_value(symbol, current_slot)
+        else:
+            historical_avg = await self._get_historical_average_volume(
+                symbol=symbol,
+                slot_number=current_slot,
+                target_date=timestamp.date()
+            )
         
         if historical_avg == 0 or historical_avg is None:
             logger.debug(
@@ -247,6 +263,10 @@ class RVOLCalculator:
         if current_slot < 0:
             return None
         
+        if self.baseline.ready:
+            historical_avg = self._baseline_value(symbol, current_slot)
+            return volume_today / historical_avg if historical_avg > 0 else None
+        
         try:
             # Obtener promedio histórico con timeout
             historical_avg = await asyncio.wait_for(
@@ -276,33 +296,98 @@ class RVOLCalculator:
     async def calculate_rvol_batch(
         self,
         symbols: List[str],
-        timestamp: Optional[datetime] = None
+        timestamp: Optional[datetime] = None,
+        volumes: Optional[Dict[str, int]] = None
     ) -> Dict[str, float]:
         """
         Calcula RVOL para múltiples símbolos en batch
         
+        Con la matriz de promedios cargada es una sola división vectorizada
+        (volumen_hoy / promedio[filas, slot]) sin I/O de red.
+        
         Args:
             symbols: Lista de ticker symbols
             timestamp: Timestamp actual (default: ahora)
+            volumes: Volumen acumulado por símbolo; si se pasa, también se
+                guarda en el caché de slots (equivale a update_volume_for_symbol)
         
         Returns:
             Dict {symbol: rvol}
         """
-        results = {}
+        if timestamp is None:
+            timestamp = datetime.now(ZoneInfo("America/New_York"))
         
-        for symbol in symbols:
-            rvol = await self.calculate_rvol(symbol, timestamp)
-            if rvol is not None:
-                results[symbol] = rvol
+        if not self.baseline.ready:
+            if volumes:
+                for symbol, volume in volumes.items():
+                    await self.update_volume_for_symbol(symbol, volume, timestamp)
+            results = {}
+            for symbol in symbols:
+                rvol = await self.calculate_rvol(symbol, timestamp)
+                if rvol is not None:
+                    results[symbol] = rvol
+            return results
         
-        logger.info(
+        current_slot = self.slot_manager.get_current_slot(timestamp)
+        if current_slot < 0:
+            return {}
+        
+        cache = self.volume_cache
+        if volumes:
+            for symbol, volume in volumes.items():
+                cache.update_volume(symbol, current_slot, volume)
+        
+        # Solo símbolos presentes en la matriz (el resto no tiene histórico)
+        known = [(s, self.baseline.row(s)) for s in symbols]
+        known = [
+            (s, r) for s, r in known
+            if r is not None and not self.preferred_stock_pattern.match(s.upper())
+        ]
+        if not known:
+            return {}
+        
+        rows = np.fromiter((r for _, r in known), dtype=np.intp, count=len(known))
+        volume_today = np.fromiter(
+            (cache.get_volume(s, current_slot) for s, _ in known),
+            dtype=np.float64,
+            count=len(known)
+        )
+        historical_avg = self.baseline.column(rows, current_slot).astype(np.float64)
+        
+        valid = (volume_today > 0) & (historical_avg > 0)
+        rvols = np.zeros(len(known), dtype=np.float64)
+        np.divide(volume_today, historical_avg, out=rvols, where=valid)
+        
+        idx = np.flatnonzero(valid)
+        rvol_list = rvols[idx].tolist()
+        results = {known[i][0]: rvol for i, rvol in zip(idx.tolist(), rvol_list)}
+        
+        logger.debug(
             "rvol_batch_calculated",
             symbols_count=len(symbols),
-            results_count=len(results)
+            results_count=len(results),
+            slot=current_slot
         )
         
         return results
     
+    def _baseline_value(self, symbol: str, slot_number: int) -> float:
+        """Promedio desde la matriz (mismo filtro de preferred que el camino Redis)."""
+        if self.preferred_stock_pattern.match(symbol.upper()):
+            return 0.0
+        return self.baseline.value(symbol, slot_number)
+    
+    async def load_baseline(self, trading_date: Optional[date] = None) -> bool:
+        """
+        Carga la matriz de promedios históricos del día (memmap local o BD).
+        
+        Args:
+            trading_date: Día de trading (default: hoy ET)
+        """
+        if trading_date is None:
+            trading_date = datetime.now(ZoneInfo("America/New_York")).date()
+        return await self.baseline.load(trading_date)
+    
     async def _get_historical_average_volume(
         self,
         symbol: str,
@@ -471,6 +556,9 @@ class RVOLCalculator:
         """
         self.volume_cache.reset()
         
+        # Matriz de promedios del nuevo día (incluye la sesión que acaba de cerrar)
+        await self.load_baseline()
+        
         # ELIMINADO: Analytics NO debe limpiar promedios históricos de Redis
         # Eso es responsabilidad de data_maintenance service
         # pattern = f"{self.hist_cache_prefix}:*"
@@ -490,6 +578,7 @@ class RVOLCalculator:
         """Obtiene estadísticas del caché"""
         return {
             "volume_cache": self.volume_cache.get_cache_stats(),
+            "baseline": self.baseline.get_stats(),
             "slot_manager": {
                 "slot_size_minutes": self.slot_manager.slot_size_minutes,
                 "total_slots": self.slot_manager.total_slots
@@ -0,0 +1,378 @@
+"""
+Sharded Bar Engine - runs N BarEngine shards in worker processes.
+
+The BarEngine keeps all state per symbol, so the universe can be split across
+processes and the minute-close CPU spreads across cores on one host.
+
+Architecture:
+    MinuteBarConsumer → ShardedBarEngine.process_batch(bars)
+        → split bars by shard_for_symbol(sym)          (stable crc32, not hash())
+        → send each slice to its worker (Pipe)         (all shards in parallel)
+        → worker: BarEngine.process_batch + export indicators of closed symbols
+        → coordinator merges the exports into one read view
+    EnrichmentPipeline → ShardedBarEngine.get_indicators(symbol)   (local dict)
+
+The coordinator exposes the same API as BarEngine, so the enrichment pipeline,
+the minute bar consumer and the TimescaleBarWriter work unchanged: reads are
+served from the merged view (no IPC per symbol) and closed bars drained by each
+worker are collected into the coordinator's persistence buffer.
+
+Each worker runs either backend (talipp BarEngine or ArrayBarEngine).
+
+Enabled with settings.bar_engine_shards > 1.
+"""
+
+import multiprocessing
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from bar_engine import BarEngine, BarData, IndicatorValues, DEFAULT_RING_SIZE
+from shared.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Minutes exported for get_price_change_dollars() (all windows the pipeline reads)
+DOLLAR_WINDOWS = (1, 2, 5, 10, 15, 30, 60, 120)
+
+# Seconds to wait for a shard reply before treating it as dead
+SHARD_REPLY_TIMEOUT = 30.0
+
+
+def shard_for_symbol(symbol: str, num_shards: int) -> int:
+    """Stable shard assignment (crc32): identical across processes and restarts."""
+    return zlib.crc32(symbol.encode()) % num_shards
+
+
+# ============================================================================
+# Worker process
+# ============================================================================
+
+def _export(engine: BarEngine, symbols) -> Dict[str, tuple]:
+    """Per-symbol record published to the coordinator view."""
+    records = {}
+    for sym in symbols:
+        indicators = engine.get_indicators(sym)
+        if indicators is None:
+            continue
+        dollars = tuple(engine.get_price_change_dollars(sym, m) for m in DOLLAR_WINDOWS)
+        records[sym] = (indicators, dollars, engine.get_consecutive_candles(sym))
+    return records
+
+
+def _shard_worker(shard_id: int, backend: str, ring_size: int, conn) -> None:
+    """Worker loop: owns one BarEngine and answers coordinator commands."""
+    from shared.utils.logger import configure_logging
+    configure_logging(service_name=f"analytics_bar_shard_{shard_id}")
+
+    if backend == "array":
+        from array_bar_engine import ArrayBarEngine
+        engine = ArrayBarEngine(ring_size=ring_size)
+    else:
+        engine = BarEngine(ring_size=ring_size)
+
+    # Minute start per symbol, to know which symbols closed a bar in a batch
+    last_s: Dict[str, int] = {}
+
+    while True:
+        try:
+            cmd, payload = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+
+        if cmd == "batch":
+            closed_syms = set()
+            for bar in payload:
+                prev = last_s.get(bar.sym)
+                if prev is not None and bar.s > prev:
+                    closed_syms.add(bar.sym)
+                if prev is None or bar.s > prev:
+                    last_s[bar.sym] = bar.s
+            closed = engine.process_batch(payload)
+            conn.send((closed, _export(engine, closed_syms), engine.drain_closed_bars(), engine.get_stats()))
+
+        elif cmd == "warmup":
+            for sym, bars in payload:
+                engine.warmup(sym, bars)
+                if bars:
+                    last_s[sym] = bars[-1].get('s', bars[-1].get('ts', 0))
+            engine.warmup_complete()
+            conn.send((0, _export(engine, [sym for sym, _ in payload]), [], engine.get_stats()))
+
+        elif cmd == "reset":
+            engine.reset()
+            last_s.clear()
+            conn.send((0, {}, [], engine.get_stats()))
+
+        elif cmd == "stop":
+            break
+
+    conn.close()
+
+
+# ============================================================================
+# Coordinator
+# ============================================================================
+
+class ShardedBarEngine(BarEngine):
+    """
+    Coordinator with the BarEngine API over N worker processes.
+
+    Thread-safety: single-threaded asyncio, same as BarEngine. process_batch()
+    blocks while the shards work in parallel (wall time ≈ slowest shard).
+    """
+
+    def __init__(
+        self,
+        num_shards: int,
+        backend: str = "talipp",
+        ring_size: int = DEFAULT_RING_SIZE,
+    ):
+        super().__init__(ring_size=ring_size)
+        self.num_shards = num_shards
+        self.backend = backend
+
+        # Merged read view: symbol → (IndicatorValues, dollar changes, consecutive)
+        self._view: Dict[str, Tuple[IndicatorValues, tuple, int]] = {}
+        self._shard_stats: List[dict] = [{} for _ in range(num_shards)]
+        self._warmup_buffer: List[List[tuple]] = [[] for _ in range(num_shards)]
+        self._shard_restarts = 0
+        self._last_merge_ms = 0.0
+
+        # spawn: never fork an asyncio process with open sockets
+        self._ctx = multiprocessing.get_context("spawn")
+        self._procs: List[Optional[multiprocessing.Process]] = [None] * num_shards
+        self._conns: list = [None] * num_shards
+        for shard_id in range(num_shards):
+            self._start_shard(shard_id)
+
+        logger.info(
+            "sharded_bar_engine_started",
+            shards=num_shards,
+            backend=backend,
+        )
+
+    def _start_shard(self, shard_id: int) -> None:
+        parent_conn, child_conn = self._ctx.Pipe()
+        proc = self._ctx.Process(
+            target=_shard_worker,
+            args=(shard_id, self.backend, self._ring_size, child_conn),
+            name=f"bar_shard_{shard_id}",
+            daemon=True,
+        )
+        proc.start()
+        child_conn.close()
+        self._procs[shard_id] = proc
+        self._conns[shard_id] = parent_conn
+
+    def _restart_shard(self, shard_id: int, error: str) -> None:
+        """Replace a dead worker. Its symbols rebuild state from new bars."""
+        logger.error("bar_engine_shard_failed", shard=shard_id, error=error)
+        proc = self._procs[shard_id]
+        if proc is not None and proc.is_alive():
+            proc.kill()
+        self._start_shard(shard_id)
+        self._shard_restarts += 1
+        self._view = {
+            sym: rec for sym, rec in self._view.items()
+            if shard_for_symbol(sym, self.num_shards) != shard_id
+        }
+
+    def _broadcast(self, commands: Dict[int, tuple]) -> int:
+        """Send one command per shard, then gather and merge all replies."""
+        sent = []
+        for shard_id, command in commands.items():
+            try:
+                self._conns[shard_id].send(command)
+                sent.append(shard_id)
+            except (BrokenPipeError, OSError) as e:
+                self._restart_shard(shard_id, str(e))
+
+        closed_total = 0
+        for shard_id in sent:
+            conn = self._conns[shard_id]
+            try:
+                if not conn.poll(SHARD_REPLY_TIMEOUT):
+                    raise TimeoutError("shard reply timeout")
+                closed, records, closed_bars, stats = conn.recv()
+            except (EOFError, OSError, TimeoutError) as e:
+                self._restart_shard(shard_id, str(e))
+                continue
+
+            t_merge = time.perf_counter()
+            self._view.update(records)
+            if closed_bars:
+                self._bars_closed_buffer.extend(closed_bars)
+            self._shard_stats[shard_id] = stats
+            self._last_merge_ms += (time.perf_counter() - t_merge) * 1000
+            closed_total += closed
+
+        return closed_total
+
+    def close(self) -> None:
+        """Stop all workers (service shutdown)."""
+        for shard_id, conn in enumerate(self._conns):
+            try:
+                conn.send(("stop", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            if proc is not None:
+                proc.join(timeout=5)
+                if proc.is_alive():
+                    proc.kill()
+        logger.info("sharded_bar_engine_stopped", shards=self.num_shards)
+
+    @property
+    def symbol_count(self) -> int:
+        return sum(s.get("symbols", 0) for s in self._shard_stats)
+
+    # ========================================================================
+    # Core: process incoming bars
+    # ========================================================================
+
+    def on_bar(self, bar: BarData) -> bool:
+        """Single-bar convenience; prefer process_batch (one round trip per shard)."""
+        return self.process_batch([bar]) > 0
+
+    def process_batch(self, bars: List[BarData]) -> int:
+        t_start = time.perf_counter()
+        self._last_merge_ms = 0.0
+
+        slices: Dict[int, List[BarData]] = {}
+        for bar in bars:
+            slices.setdefault(shard_for_symbol(bar.sym, self.num_shards), []).append(bar)
+
+        closed = self._broadcast({sid: ("batch", chunk) for sid, chunk in slices.items()})
+
+        self._total_bars_received += len(bars)
+        self._total_bars_closed += closed
+        elapsed_ms = (time.perf_counter() - t_start) * 1000
+        self._last_batch_time_ms = elapsed_ms
+        self._last_batch_size = len(bars)
+        self._batch_times.append(elapsed_ms)
+
+        if len(bars) > 0:
+            logger.info(
+                "bar_engine_batch_processed",
+                bars=len(bars),
+                closed=closed,
+                elapsed_ms=round(elapsed_ms, 1),
+                merge_ms=round(self._last_merge_ms, 1),
+                shards=len(slices),
+                symbols=len(self._view),
+            )
+
+        return closed
+
+    # ========================================================================
+    # Warmup
+    # ========================================================================
+
+    def warmup(self, symbol: str, bars: List[dict]) -> None:
+        """Buffer per shard; sent in one message per shard by warmup_complete()."""
+        self._warmup_buffer[shard_for_symbol(symbol, self.num_shards)].append((symbol, bars))
+
+    def warmup_complete(self) -> None:
+        t_start = time.perf_counter()
+        commands = {
+            sid: ("warmup", buffered)
+            for sid, buffered in enumerate(self._warmup_buffer)
+            if buffered
+        }
+        self._warmup_buffer = [[] for _ in range(self.num_shards)]
+        self._broadcast(commands)
+        # Warmup bars came from TimescaleDB: never re-persist them
+        self._bars_closed_buffer.clear()
+
+        logger.info(
+            "bar_engine_warmup_complete",
+            symbols=len(self._view),
+            shards=len(commands),
+            elapsed_ms=round((time.perf_counter() - t_start) * 1000, 1),
+        )
+
+    def reset(self) -> None:
+        old_count = len(self._view)
+        self._broadcast({sid: ("reset", None) for sid in range(self.num_shards)})
+        self._view.clear()
+        self._bars_closed_buffer.clear()
+        self._warmup_buffer = [[] for _ in range(self.num_shards)]
+        self._total_bars_received = 0
+        self._total_bars_closed = 0
+
+        logger.info(
+            "bar_engine_reset",
+            symbols_cleared=old_count,
+            reason="new_trading_day",
+            shards=self.num_shards,
+        )
+
+    # ========================================================================
+    # Read: merged view
+    # ========================================================================
+
+    def has_data(self, symbol: str) -> bool:
+        return symbol in self._view
+
+    def get_indicators(self, symbol: str) -> Optional[IndicatorValues]:
+        record = self._view.get(symbol)
+        return record[0] if record is not None else None
+
+    def get_volume_window(self, symbol: str, minutes: int) -> Optional[int]:
+        record = self._view.get(symbol)
+        if record is None:
+            return None
+        return getattr(record[0], f"vol_{minutes}m", None)
+
+    def get_price_change(self, symbol: str, minutes: int) -> Optional[float]:
+        record = self._view.get(symbol)
+        if record is None:
+            return None
+        return getattr(record[0], f"chg_{minutes}m", None)
+
+    def get_price_change_dollars(self, symbol: str, minutes: int) -> Optional[float]:
+        record = self._view.get(symbol)
+        if record is None or minutes not in DOLLAR_WINDOWS:
+            return None
+        return record[1][DOLLAR_WINDOWS.index(minutes)]
+
+    def get_consecutive_candles(self, symbol: str, timeframe_minutes: Optional[int] = None) -> int:
+        record = self._view.get(symbol)
+        if record is None:
+            return 0
+        if timeframe_minutes is None:
+            return record[2]
+        tf = record[0].tf or {}
+        return tf.get(timeframe_minutes, {}).get('consecutive_candles', 0)
+
+    # ========================================================================
+    # Observability
+    # ========================================================================
+
+    def get_stats(self) -> dict:
+        batch_times = list(self._batch_times)
+        p95 = sorted(batch_times)[int(len(batch_times) * 0.95)] if batch_times else 0
+
+        return {
+            "backend": self.backend,
+            "shards": self.num_shards,
+            "shard_restarts": self._shard_restarts,
+            "symbols": self.symbol_count,
+            "view_symbols": len(self._view),
+            "total_bars_received": self._total_bars_received,
+            "total_bars_closed": self._total_bars_closed,
+            "last_batch_time_ms": round(self._last_batch_time_ms, 1),
+            "last_batch_size": self._last_batch_size,
+            "p95_batch_time_ms": round(p95, 1),
+            "pending_persistence": len(self._bars_closed_buffer),
+            "rss_mb": round(sum(s.get("rss_mb", 0) for s in self._shard_stats), 1),
+            "per_shard": [
+                {
+                    "symbols": s.get("symbols", 0),
+                    "p95_batch_time_ms": s.get("p95_batch_time_ms", 0),
+                    "rss_mb": s.get("rss_mb", 0),
+                }
+                for s in self._shard_stats
+            ],
+        }
@@ -0,0 +1,21 @@
+"""
+Shared setup for the analytics test suite.
+
+Tests use synthetic rows / arrays only; no Redis, TimescaleDB or Polygon.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+# shared.config exige las API keys al importarse
+os.environ.setdefault("POLYGON_API_KEY", "test")
+os.environ.setdefault("FMP_API_KEY", "test")
+
+# Raíz del servicio (módulos planos) y raíz del repo (paquete shared)
+_analytics_root = Path(__file__).resolve().parent.parent
+_repo_root = _analytics_root.parent.parent
+for _path in (_analytics_root, _repo_root):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
@@ -0,0 +1,101 @@
+"""
+Parity tests: ArrayBarEngine (numpy arrays for all symbols) vs the original
+per-symbol BarEngine (deques + talipp), fed the same warmup and live bars.
+"""
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from array_bar_engine import ArrayBarEngine
+from bar_engine import DEFAULT_RING_SIZE, BarData, BarEngine
+
+_T0 = 1_700_000_000_000
+_LIVE_MINUTES = 300
+
+
+def _close(a, b) -> bool:
+    if a is None or b is None:
+        return a is b
+    return abs(a - b) <= 2e-4 * max(1.0, abs(a))
+
+
+def _assert_same_indicators(ref: BarEngine, arr: ArrayBarEngine, sym: str, minute: int) -> None:
+    x, y = ref.get_indicators(sym), arr.get_indicators(sym)
+    if x is None or y is None:
+        assert x is y, (minute, sym)
+        return
+    for field in x._fields:
+        va, vb = getattr(x, field), getattr(y, field)
+        if field != "tf":
+            assert _close(va, vb), (minute, sym, field, va, vb)
+            continue
+        va, vb = va or {}, vb or {}
+        assert va.keys() == vb.keys(), (minute, sym)
+        for tf in va:
+            assert va[tf].keys() == vb[tf].keys(), (minute, sym, tf)
+            for key in va[tf]:
+                assert _close(va[tf][key], vb[tf][key]), (minute, sym, tf, key, va[tf][key], vb[tf][key])
+
+
+def _warmup(engines, symbols, rng: random.Random) -> None:
+    for sym in symbols:
+        p = 10 + rng.random() * 50
+        bars = []
+        for k in range(150):
+            p *= 1 + rng.gauss(0, 0.01)
+            hi = p * (1 + abs(rng.gauss(0, 0.005)))
+            lo = p * (1 - abs(rng.gauss(0, 0.005)))
+            if k % 17 == 0:
+                hi = lo = p
+            bars.append({
+                "s": _T0 - (150 - k) * 60_000,
+                "o": p, "h": hi, "l": lo, "c": p,
+                "v": rng.randint(0, 10_000),
+            })
+        for engine in engines:
+            engine.warmup(sym, bars)
+    for engine in engines:
+        engine.warmup_complete()
+
+
+@pytest.mark.parametrize("ring_size", [DEFAULT_RING_SIZE, 320])
+def test_array_engine_matches_per_bar_engine(ring_size):
+    rng = random.Random(1)
+    symbols = [f"S{i}" for i in range(40)]
+    ref, arr = BarEngine(ring_size=ring_size), ArrayBarEngine(ring_size=ring_size, capacity=8)
+
+    # Solo parte de los símbolos con warmup: el resto entra en vivo (crece capacity)
+    _warmup((ref, arr), symbols[:25], rng)
+
+    windows = (1, 5, 60, 120, ring_size - 20)
+    prices = {s: 20.0 for s in symbols}
+    for minute in range(_LIVE_MINUTES):
+        batch = []
+        for sym in symbols:
+            if rng.random() < 0.1:
+                continue
+            for _ in range(rng.randint(1, 2)):
+                prices[sym] *= 1 + rng.gauss(0, 0.01)
+                p = prices[sym]
+                batch.append(BarData(
+                    sym, _T0 + minute * 60_000, 0, p, p * 1.002, p * 0.998, p,
+                    rng.randint(0, 5000), 0, p
+                ))
+        ref.process_batch(batch)
+        arr.process_batch(batch)
+
+        if minute % 37 and minute != _LIVE_MINUTES - 1:
+            continue
+        for sym in symbols:
+            _assert_same_indicators(ref, arr, sym, minute)
+            for tf in (None, 2, 5, 60):
+                assert ref.get_consecutive_candles(sym, tf) == arr.get_consecutive_candles(sym, tf)
+            for minutes in windows:
+                assert ref.get_volume_window(sym, minutes) == arr.get_volume_window(sym, minutes), (
+                    minute, sym, minutes
+                )
+                assert ref.get_price_change_dollars(sym, minutes) == arr.get_price_change_dollars(sym, minutes)
+
+    assert len(ref.drain_closed_bars()) == len(arr.drain_closed_bars())
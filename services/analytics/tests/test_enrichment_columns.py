@@ -0,0 +1,43 @@
+"""
+The enrichment pre-pass reads the same columns from the columnar snapshot
+(ColumnarSnapshot.column()) and from the JSON tickers (_columns_from_dicts).
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from enrichment.pipeline import _CYCLE_COLUMNS, EnrichmentPipeline
+from shared.models.polygon import PolygonSnapshot
+from shared.utils.columnar_snapshot import ColumnarSnapshot, encode_snapshot
+
+
+def _models():
+    return [
+        PolygonSnapshot(
+            ticker="AAPL",
+            day={"c": 191.2, "v": 1_234_567},
+            lastTrade={"p": 191.25, "t": 1_784_556_900_000_000_000},
+            min={"av": 1_234_567, "vw": 191.1},
+        ),
+        PolygonSnapshot(ticker="NEWCO", lastTrade={"p": 4.0}, min={}),
+        PolygonSnapshot(ticker="HALT", day={"c": 0.0, "v": 0}),
+    ]
+
+
+def test_json_and_columnar_prepass_columns_match():
+    models = _models()
+    json_tickers = []
+    for s in models:
+        d = s.model_dump(mode="json")
+        d["current_price"] = s.current_price
+        d["current_volume"] = s.current_volume
+        json_tickers.append(d)
+    snap = ColumnarSnapshot.from_bytes(encode_snapshot(models, "2026-07-20T09:00:00")[0])
+
+    symbols, cols = EnrichmentPipeline._columns_from_dicts(json_tickers)
+
+    assert symbols == snap.tickers()
+    for group, field, _ in _CYCLE_COLUMNS:
+        name = f"{group}_{field}"
+        np.testing.assert_array_equal(cols[name], snap.column(name), err_msg=name)
+        assert cols[name].dtype == snap.column(name).dtype, name
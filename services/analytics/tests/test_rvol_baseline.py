@@ -0,0 +1,49 @@
+"""
+RVOLBaselineMatrix._build_from_db: scatter + fill-forward + promedio por slot
+sobre filas sintéticas (la BD se sustituye por un fetch en memoria).
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+
+import numpy as np
+
+from rvol_baseline import RVOLBaselineMatrix
+
+
+class _FakeDB:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def fetch(self, query, *args):
+        return self.rows
+
+
+def _build(rows, total_slots=5):
+    baseline = RVOLBaselineMatrix(_FakeDB(rows), total_slots=total_slots, directory="/nonexistent")
+    return asyncio.run(baseline._build_from_db(date(2026, 1, 10)))
+
+
+def test_average_with_fill_forward():
+    rows = [
+        {"symbol": "AAPL", "slots": [1, 3], "volumes": [10, 30]},
+        {"symbol": "AAPL", "slots": [0, 1, 2, 3, 4], "volumes": [2, 4, 6, 8, 10]},
+        {"symbol": "TSLA", "slots": [2], "volumes": [7]},
+    ]
+    symbols, matrix = _build(rows)
+
+    assert symbols == ["AAPL", "TSLA"]
+    # AAPL día 1 rellenado: [0, 10, 10, 30, 30]
+    np.testing.assert_array_equal(matrix[0], [1, 7, 8, 19, 20])
+    np.testing.assert_array_equal(matrix[1], [0, 0, 7, 7, 7])
+    assert matrix.dtype == np.float32
+
+
+def test_null_volume_does_not_poison_rest_of_day():
+    rows = [{"symbol": "AAPL", "slots": [0, 1, 2, 3, 4], "volumes": [0, 10, None, 30, 0]}]
+    symbols, matrix = _build(rows)
+
+    assert symbols == ["AAPL"]
+    assert not np.isnan(matrix).any()
+    np.testing.assert_array_equal(matrix[0], [0, 10, 10, 30, 30])
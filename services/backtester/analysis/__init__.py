@@ -1,4 +1,5 @@
 from .walk_forward import WalkForwardAnalyzer
 from .monte_carlo import MonteCarloAnalyzer
+from .sweep import SweepExecutor
 
-__all__ = ["WalkForwardAnalyzer", "MonteCarloAnalyzer"]
+__all__ = ["WalkForwardAnalyzer", "MonteCarloAnalyzer", "SweepExecutor"]
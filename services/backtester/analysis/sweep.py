@@ -0,0 +1,270 @@
+"""
+Parallel sweep executor for walk-forward splits and parameter grids.
+
+Every split / grid point is an independent ``engine.run`` over (a date range
+of) the same bars. The executor:
+
+  1. Copies the bar columns ONCE into ``multiprocessing.shared_memory``
+     (numeric/datetime columns as-is, object columns as int32 codes).
+  2. Starts a spawn-based process pool; each worker attaches the segments
+     read-only in its initializer and builds its own DataLayer/engine.
+  3. Ships only (strategy JSON, date range) per task and gets back the
+     CoreMetrics dict, streaming each result to ``on_result`` as it lands.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+import structlog
+
+from core.models import CoreMetrics, StrategyConfig, SweepPoint, SweepResult
+
+logger = structlog.get_logger(__name__)
+
+ResultCallback = Callable[[dict[str, Any], int, int], None]
+
+
+# ── Shared bars ──────────────────────────────────────────────────────────
+
+
+class SharedBars:
+    """Owner side of the shared-memory copy of a bars DataFrame."""
+
+    def __init__(self, bars_df: pd.DataFrame):
+        self._segments: list[SharedMemory] = []
+        columns = []
+        try:
+            for col in bars_df.columns:
+                series = bars_df[col]
+                extra = None
+                if pd.api.types.is_datetime64_dtype(series.dtype):
+                    arr = series.to_numpy()
+                    kind = "array"
+                elif isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf":
+                    arr = series.to_numpy()
+                    kind = "array"
+                else:
+                    codes, uniques = pd.factorize(series)
+                    arr = codes.astype(np.int32)
+                    kind = "codes"
+                    extra = list(uniques)
+                shm = SharedMemory(create=True, size=max(arr.nbytes, 1))
+                self._segments.append(shm)
+                np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+                columns.append((col, kind, shm.name, arr.dtype.str, extra))
+        except Exception:
+            self.close()
+            raise
+        self.spec = {"n": len(bars_df), "columns": columns}
+        self.nbytes = sum(s.size for s in self._segments)
+
+    def close(self) -> None:
+        for shm in self._segments:
+            try:
+                shm.close()
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._segments = []
+
+
+def attach_shared_bars(spec: dict) -> tuple[pd.DataFrame, list[SharedMemory]]:
+    """Worker side: DataFrame over the shared segments (numeric columns zero-copy)."""
+    handles: list[SharedMemory] = []
+    data: dict[str, Any] = {}
+    n = spec["n"]
+    for col, kind, name, dtype, extra in spec["columns"]:
+        # Spawn children share the owner's resource tracker, which unlinks
+        # the segment once when SharedBars.close() runs
+        shm = SharedMemory(name=name)
+        handles.append(shm)
+        arr = np.ndarray((n,), dtype=np.dtype(dtype), buffer=shm.buf)
+        arr.flags.writeable = False
+        if kind == "codes":
+            uniques = np.empty(len(extra) + 1, dtype=object)
+            uniques[:-1] = extra
+            uniques[-1] = None
+            data[col] = uniques[arr]  # code -1 (NA) → None
+        else:
+            data[col] = arr
+    return pd.DataFrame(data, copy=False), handles
+
+
+# ── Worker process ───────────────────────────────────────────────────────
+
+_WORKER: dict[str, Any] = {}
+
+
+def _init_worker(
+    spec: dict, date_col: str, data_dir: str, kernel: str, indicator_cache_dir: str | None,
+) -> None:
+    from core.data_layer import DataLayer
+    from core.engine import BacktestEngine
+
+    bars, handles = attach_shared_bars(spec)
+    data_layer = DataLayer(polygon_data_dir=Path(data_dir), indicator_cache_dir=indicator_cache_dir)
+    # N workers × DuckDB threads would oversubscribe the cores
+    data_layer.connection.execute("SET threads = 1")
+    _WORKER.update(
+        bars=bars,
+        handles=handles,
+        ts=pd.to_datetime(bars[date_col]).to_numpy().astype("datetime64[ns]").view(np.int64),
+        engine=BacktestEngine(data_layer, kernel=kernel),
+    )
+
+
+def _run_task(task: dict[str, Any]) -> dict[str, Any]:
+    bars: pd.DataFrame = _WORKER["bars"]
+    lo, hi = task.get("lo"), task.get("hi")
+    if lo is not None:
+        ts = _WORKER["ts"]
+        bars = bars[(ts >= lo) & (ts <= hi)]
+    out = {"key": task["key"], "core_metrics": None, "error": None}
+    try:
+        strategy = StrategyConfig.model_validate_json(task["strategy"])
+        result = asyncio.run(_WORKER["engine"].run(strategy, bars_df=bars.copy()))
+        out["core_metrics"] = result.core_metrics.model_dump()
+    except ValueError as e:
+        out["error"] = str(e)
+    return out
+
+
+# ── Parameter grid helpers ───────────────────────────────────────────────
+
+
+def apply_params(strategy: StrategyConfig, params: dict[str, Any]) -> StrategyConfig:
+    """Copy of ``strategy`` with dotted paths replaced (``exit_rules.0.value``)."""
+    data = strategy.model_dump(mode="json")
+    for path, value in params.items():
+        node: Any = data
+        parts = path.split(".")
+        try:
+            for part in parts[:-1]:
+                node = node[int(part)] if isinstance(node, list) else node[part]
+            last = parts[-1]
+            if isinstance(node, list):
+                node[int(last)] = value
+            elif last in node:
+                node[last] = value
+            else:
+                raise KeyError(last)
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise ValueError(f"Unknown strategy parameter path '{path}'")
+    return StrategyConfig.model_validate(data)
+
+
+def expand_grid(grid: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    keys = list(grid)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(grid[k] for k in keys))]
+
+
+# ── Executor ─────────────────────────────────────────────────────────────
+
+
+class SweepExecutor:
+    """Fans independent backtests out to a process pool over shared bars."""
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        data_dir: Path | str = ".",
+        kernel: str = "chronological",
+        indicator_cache_dir: Path | str | None = None,
+    ) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.data_dir = str(data_dir)
+        self.kernel = kernel
+        self.indicator_cache_dir = str(indicator_cache_dir) if indicator_cache_dir else None
+
+    async def run_tasks(
+        self,
+        bars_df: pd.DataFrame,
+        tasks: list[dict[str, Any]],
+        on_result: ResultCallback | None = None,
+    ) -> dict[Any, dict[str, Any]]:
+        """
+        Run tasks ({key, strategy JSON, lo/hi ns date bounds}) in parallel.
+
+        Returns key → {core_metrics | None, error | None}; ``on_result`` is
+        called in completion order with (result, done, total).
+        """
+        if not tasks:
+            return {}
+        date_col = "date" if "date" in bars_df.columns else "timestamp"
+        workers = min(self.max_workers, len(tasks))
+        t0 = time.time()
+        shared = SharedBars(bars_df)
+        logger.info("sweep_started", tasks=len(tasks), workers=workers,
+                    shared_mb=round(shared.nbytes / 1e6, 1))
+        results: dict[Any, dict[str, Any]] = {}
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=mp.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(shared.spec, date_col, self.data_dir, self.kernel, self.indicator_cache_dir),
+            ) as pool:
+                futures = [asyncio.wrap_future(pool.submit(_run_task, t)) for t in tasks]
+                for done, fut in enumerate(asyncio.as_completed(futures), 1):
+                    res = await fut
+                    results[res["key"]] = res
+                    if on_result is not None:
+                        on_result(res, done, len(tasks))
+        finally:
+            shared.close()
+        logger.info("sweep_completed", tasks=len(tasks), workers=workers,
+                    elapsed_ms=int((time.time() - t0) * 1000))
+        return results
+
+    async def grid(
+        self,
+        strategy: StrategyConfig,
+        bars_df: pd.DataFrame,
+        grid: dict[str, list[Any]],
+        metric: str = "sharpe_ratio",
+        maximize: bool = True,
+        on_result: ResultCallback | None = None,
+    ) -> SweepResult:
+        """One full-period backtest per grid combination."""
+        if metric not in CoreMetrics.model_fields:
+            raise ValueError(f"Unknown metric '{metric}'")
+        t0 = time.time()
+        combos = expand_grid(grid)
+        # Validate every point before starting processes
+        configs = [apply_params(strategy, p) for p in combos]
+        tasks = [{"key": i, "strategy": c.model_dump_json()} for i, c in enumerate(configs)]
+        results = await self.run_tasks(bars_df, tasks, on_result)
+
+        points: list[SweepPoint] = []
+        best_i, best_v = None, None
+        for i, params in enumerate(combos):
+            res = results.get(i, {"core_metrics": None, "error": "missing result"})
+            cm = CoreMetrics.model_validate(res["core_metrics"]) if res["core_metrics"] else None
+            points.append(SweepPoint(params=params, core_metrics=cm, error=res["error"]))
+            if cm is None:
+                continue
+            v = float(getattr(cm, metric))
+            if not np.isfinite(v):
+                continue
+            if best_v is None or (v > best_v if maximize else v < best_v):
+                best_i, best_v = i, v
+
+        return SweepResult(
+            metric=metric,
+            n_points=len(points),
+            points=points,
+            best_params=combos[best_i] if best_i is not None else None,
+            best_value=best_v,
+            workers=min(self.max_workers, len(tasks)),
+            execution_time_ms=int((time.time() - t0) * 1000),
+        )
@@ -27,6 +27,7 @@ from __future__ import annotations
 
 import json
 import random
+import re
 from bisect import bisect_right
 from collections import Counter, defaultdict
 from datetime import date, datetime, time, timedelta
@@ -37,6 +38,7 @@ from zoneinfo import ZoneInfo
 import duckdb
 
 from matching import boundary
+from matching.sql_pushdown import _quote, subscription_predicates
 from matching.matcher import (
     _chk,
     build_event_payload,
@@ -67,6 +69,9 @@ _SAMPLE_SEED = 20260802
 # más de esto del instante consultado (huecos de datos, no de mercado).
 _INDEX_STALENESS_NS = 10 * 60 * _NS
 
+_DT_IN_PATH = re.compile(r"dt=(\d{4}-\d{2}-\d{2})")
+_CATALOG_VERSION = 1  # shared/utils/lake_catalog.py CATALOG_VERSION
+
 _PREFIX_TO_SYM = dict(INDEX_FILTER_DEFS)  # spyChg -> SPY, qqqChg -> QQQ, ...
 _WINDOW_NS = {"5min": 5, "10min": 10, "15min": 15, "30min": 30}
 
@@ -105,11 +110,23 @@ class TriggerAnalyzer:
         lake_dir: str = "/data/lake",
         minute_dir: str = "/data/polygon/minute_aggs",
         horizons_min: tuple = (5, 15, 60),
+        set_based: bool = True,
     ) -> None:
         self.events_dir = Path(lake_dir) / "events"
         self.snapshot_dir = Path(lake_dir) / "reference" / "enriched_close"
         self.minute_dir = Path(minute_dir)
         self.horizons_min = horizons_min
+        # set_based: un scan multi-partición con predicados en DuckDB;
+        # False = el recorrido original día a día (referencia de paridad)
+        self.set_based = set_based
+        self._con: Optional[duckdb.DuckDBPyConnection] = None
+        self._catalog_index: Optional[Tuple[int, dict]] = None
+
+    def _connection(self) -> duckdb.DuckDBPyConnection:
+        """Conexión DuckDB reutilizada entre días/consultas de este analizador."""
+        if self._con is None:
+            self._con = duckdb.connect()
+        return self._con
 
     # ── público ──────────────────────────────────────────────────────────
 
@@ -160,9 +177,15 @@ class TriggerAnalyzer:
         per_day: Dict[str, dict] = {}
         days_no_quality: List[str] = []
 
-        for dt in dts:
-            day = self._analyze_day(dt, event_types, base_filters, snapshot_keys,
-                                    aq_filters, index_checks)
+        pushed: List[str] = []
+        if self.set_based:
+            days, pushed = self._analyze_days(dts, event_types, base_filters, snapshot_keys,
+                                              aq_filters, index_checks)
+            day_iter = ((dt, days[dt]) for dt in dts)
+        else:
+            day_iter = ((dt, self._analyze_day(dt, event_types, base_filters, snapshot_keys,
+                                               aq_filters, index_checks)) for dt in dts)
+        for dt, day in day_iter:
             per_day[dt] = day["status"]
             if aq_filters and not day["status"].get("quality"):
                 days_no_quality.append(dt)
@@ -237,6 +260,8 @@ class TriggerAnalyzer:
             "provenance": {
                 "source": "L0 — eventos reales del lake (fidelidad 1.0 por definición)",
                 "matcher_defs_sha256": SOURCE_SHA256,
+                "mode": "set_based" if self.set_based else "per_day",
+                "sql_pushdown": pushed,
                 "generated_at": datetime.now(tz=_ET).isoformat(),
             },
         }
@@ -261,7 +286,7 @@ class TriggerAnalyzer:
         if not minute_file.exists() or not symbols:
             return {}
         prev_file = self._prev_minute_file(dt)
-        con = duckdb.connect()
+        con = self._connection()
         out: Dict[str, _IndexSeries] = {}
         ph = ",".join("?" * len(symbols))
         rows = con.execute(
@@ -309,61 +334,85 @@ class TriggerAnalyzer:
             d += timedelta(days=1)
         return out
 
-    def _analyze_day(self, dt: str, event_types: List[str],
-                     base_filters: dict, snapshot_keys: List[str],
-                     aq_filters: dict, index_checks: list) -> dict:
+    def _catalog_day(self, dt: str) -> Optional[dict]:
+        """Manifiesto de events/_catalog (shared/utils/lake_catalog.py) para `dt`.
+
+        El backtester no empaqueta `shared`: se lee el JSON directamente. None
+        si no hay catálogo o el día no está publicado (→ descubrimiento por
+        directorio, como siempre).
+        """
+        index_path = self.events_dir / "_catalog" / "_index.json"
+        try:
+            mtime = index_path.stat().st_mtime_ns
+        except OSError:
+            return None
+        if self._catalog_index is None or self._catalog_index[0] != mtime:
+            try:
+                index = json.loads(index_path.read_text())
+            except (OSError, ValueError):
+                return None
+            self._catalog_index = (mtime, index if index.get("version") == _CATALOG_VERSION else {})
+        if f"dt={dt}" not in self._catalog_index[1].get("partitions", {}):
+            return None
+        try:
+            manifest = json.loads((self.events_dir / "_catalog" / f"dt={dt}.json").read_text())
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get("version") == _CATALOG_VERSION else None
+
+    def _day_globs(self, dt: str, event_types: List[str]) -> List[str]:
+        manifest = self._catalog_day(dt)
+        if manifest is not None:
+            # Ficheros exactos del catálogo: sin glob ni listado de directorios
+            wanted = set(event_types)
+            by_type: Dict[str, List[str]] = defaultdict(list)
+            for f in manifest["files"]:
+                etype = f["partition_values"].get("event_type")
+                if etype in wanted:
+                    by_type[etype].append(str(self.events_dir / f["path"]))
+            files = [p for t in event_types for p in by_type.get(t, [])]
+            # Catálogo desfasado (re-archivado caído antes de publicar): un
+            # fichero listado que ya no existe haría fallar la lectura entera
+            if all(Path(p).exists() for p in files):
+                return files
         parts = [self.events_dir / f"dt={dt}" / f"event_type={t}"
                  for t in event_types]
-        globs = [str(p / "*.parquet") for p in parts if p.is_dir()]
-        status = {"events_scanned": 0, "triggers": 0, "snapshot": False,
-                  "types_present": len(globs)}
-        if not globs:
-            return {"triggers": [], "status": status}
+        return [str(p / "*.parquet") for p in parts if p.is_dir()]
 
-        con = duckdb.connect()
-        rows = con.execute(
-            "SELECT * FROM read_parquet(?, union_by_name=true)", [globs]
-        ).fetchall()
-        cols = [d[0] for d in con.execute(
-            "SELECT * FROM read_parquet(?, union_by_name=true) LIMIT 0", [globs]
-        ).description]
-        status["events_scanned"] = len(rows)
+    def _snapshot_file(self, dt: str) -> Path:
+        return self.snapshot_dir / f"dt={dt}" / "enriched_close.parquet"
 
-        snap_file = self.snapshot_dir / f"dt={dt}" / "enriched_close.parquet"
+    def _load_snapshot_cache(self, con, snap_file: Path, symbols: List[str]) -> Dict[str, dict]:
         cache: Dict[str, dict] = {}
+        if not symbols:
+            return cache
+        sdf = con.execute(
+            f"SELECT * FROM read_parquet('{snap_file}') WHERE symbol IN "
+            f"({','.join('?' * len(symbols))})", symbols
+        ).df()
+        scols = sdf.columns.tolist()
+        for rec in sdf.itertuples(index=False):
+            d = {k: v for k, v in zip(scols, rec) if v is not None and v == v}
+            cache[d["symbol"]] = d
+        return cache
+
+    @staticmethod
+    def _day_filters(base_filters: dict, snapshot_keys: List[str], aq_filters: dict,
+                     has_snapshot: bool, has_quality: bool) -> dict:
         day_filters = dict(base_filters)
-        if snap_file.exists() and snapshot_keys:
-            symbols = sorted({r[cols.index("symbol")] for r in rows})
-            sdf = con.execute(
-                f"SELECT * FROM read_parquet('{snap_file}') WHERE symbol IN "
-                f"({','.join('?' * len(symbols))})", symbols
-            ).df()
-            scols = sdf.columns.tolist()
-            for rec in sdf.itertuples(index=False):
-                d = {k: v for k, v in zip(scols, rec) if v is not None and v == v}
-                cache[d["symbol"]] = d
-            status["snapshot"] = True
-        elif snapshot_keys:
+        if snapshot_keys and not has_snapshot:
             for k in snapshot_keys:
                 day_filters.pop(k, None)
-        elif snap_file.exists():
-            status["snapshot"] = True
-
         # aq: solo si este día persiste quality
-        day_has_quality = "quality" in cols
-        status["quality"] = day_has_quality
-        if aq_filters and day_has_quality:
+        if aq_filters and has_quality:
             day_filters.update(aq_filters)
+        return day_filters
 
-        index_series = (self._load_index_series(dt, sorted({c[0] for c in index_checks}))
-                        if index_checks else {})
-
-        sub = build_event_subscription({"event_types": event_types, **day_filters})
-        watch_fields = sorted({
-            f for k in day_filters
-            if (f := boundary.event_field_for(k)) is not None
-        })
-        null_counts = {f: 0 for f in watch_fields}
+    def _match_rows(self, dt: str, rows: list, cols: List[str], sub: dict,
+                    cache: Dict[str, dict], index_checks: list,
+                    index_series: Dict[str, _IndexSeries],
+                    null_counts: Optional[Dict[str, int]] = None) -> Tuple[List[dict], int]:
+        """Matcher Python fila a fila: (disparos, rechazados por índice)."""
         triggers = []
         index_rejected = 0
         for r in rows:
@@ -373,9 +422,10 @@ class TriggerAnalyzer:
                     continue
                 key = _COL_TO_KEY.get(c, c)
                 evt_fields[key] = v.isoformat() if c == "ts" else v
-            for f in watch_fields:
-                if evt_fields.get(f) is None:
-                    null_counts[f] += 1
+            if null_counts is not None:
+                for f in null_counts:
+                    if evt_fields.get(f) is None:
+                        null_counts[f] += 1
             payload = build_event_payload(evt_fields)
             enrich_event_from_cache(payload, cache)
             if not event_passes_subscription(payload, sub, cache):
@@ -411,17 +461,157 @@ class TriggerAnalyzer:
                 "change_percent": payload.get("change_percent"),
                 "rvol": payload.get("rvol"),
             })
-        status["triggers"] = len(triggers)
-        if index_checks:
-            status["index_rejected"] = index_rejected
-        if rows:
-            degraded = {f: round(c / len(rows), 3) for f, c in null_counts.items()
-                        if c / len(rows) > 0.5}
+        return triggers, index_rejected
+
+    @staticmethod
+    def _finish_status(status: dict, n_rows: int, null_counts: Dict[str, int]) -> None:
+        if n_rows:
+            degraded = {f: round(c / n_rows, 3) for f, c in null_counts.items()
+                        if c / n_rows > 0.5}
             if degraded:
                 # agujero de datos: el filtro descartó por AUSENCIA, no por valor
                 status["data_holes"] = degraded
+
+    def _analyze_day(self, dt: str, event_types: List[str],
+                     base_filters: dict, snapshot_keys: List[str],
+                     aq_filters: dict, index_checks: list) -> dict:
+        globs = self._day_globs(dt, event_types)
+        status = {"events_scanned": 0, "triggers": 0, "snapshot": False,
+                  "types_present": len(globs)}
+        if not globs:
+            return {"triggers": [], "status": status}
+
+        con = duckdb.connect()
+        rows = con.execute(
+            "SELECT * FROM read_parquet(?, union_by_name=true)", [globs]
+        ).fetchall()
+        cols = [d[0] for d in con.execute(
+            "SELECT * FROM read_parquet(?, union_by_name=true) LIMIT 0", [globs]
+        ).description]
+        status["events_scanned"] = len(rows)
+
+        snap_file = self._snapshot_file(dt)
+        cache: Dict[str, dict] = {}
+        if snap_file.exists() and snapshot_keys:
+            symbols = sorted({r[cols.index("symbol")] for r in rows})
+            cache = self._load_snapshot_cache(con, snap_file, symbols)
+        status["snapshot"] = snap_file.exists()
+
+        day_has_quality = "quality" in cols
+        status["quality"] = day_has_quality
+        day_filters = self._day_filters(base_filters, snapshot_keys, aq_filters,
+                                        status["snapshot"], day_has_quality)
+
+        index_series = (self._load_index_series(dt, sorted({c[0] for c in index_checks}))
+                        if index_checks else {})
+
+        sub = build_event_subscription({"event_types": event_types, **day_filters})
+        watch_fields = sorted({
+            f for k in day_filters
+            if (f := boundary.event_field_for(k)) is not None
+        })
+        null_counts = {f: 0 for f in watch_fields}
+        triggers, index_rejected = self._match_rows(
+            dt, rows, cols, sub, cache, index_checks, index_series, null_counts)
+        status["triggers"] = len(triggers)
+        if index_checks:
+            status["index_rejected"] = index_rejected
+        self._finish_status(status, len(rows), null_counts)
         return {"triggers": triggers, "status": status}
 
+    # ── set-based (todos los días en una consulta) ───────────────────────
+
+    def _analyze_days(self, dts: List[str], event_types: List[str],
+                      base_filters: dict, snapshot_keys: List[str],
+                      aq_filters: dict, index_checks: list) -> Tuple[Dict[str, dict], List[str]]:
+        """Mismo resultado que `_analyze_day` día a día, en un solo scan.
+
+        Los checks expresables en SQL (matching/sql_pushdown.py) se evalúan
+        en DuckDB sobre todas las particiones a la vez; el matcher Python
+        solo ve las filas que sobreviven. Devuelve ({dt: día}, subKeys
+        empujados a SQL).
+        """
+        globs_by_dt = {dt: self._day_globs(dt, event_types) for dt in dts}
+        out: Dict[str, dict] = {
+            dt: {"triggers": [], "status": {"events_scanned": 0, "triggers": 0, "snapshot": False,
+                                            "types_present": len(g)}}
+            for dt, g in globs_by_dt.items()
+        }
+        globs = [g for gs in globs_by_dt.values() for g in gs]
+        if not globs:
+            return out, []
+
+        con = self._connection()
+        src = "read_parquet(?, union_by_name=true, hive_partitioning=true)"
+        column_types = {name: ctype for name, ctype, *_ in
+                        con.execute(f"DESCRIBE SELECT * FROM {src}", [globs]).fetchall()}
+        quality_days = {
+            m.group(1) for (fname,) in con.execute(
+                "SELECT DISTINCT file_name FROM parquet_schema(?) WHERE name = 'quality'", [globs]
+            ).fetchall()
+            if (m := _DT_IN_PATH.search(fname))
+        }
+        snapshot_days = {dt for dt, g in globs_by_dt.items() if g and self._snapshot_file(dt).exists()}
+
+        # watch fields: no dependen del día (snapshot/aq: no son campos del evento)
+        key_to_col = {k: c for c, k in _COL_TO_KEY.items()}
+        watch_fields = sorted({
+            f for k in {**base_filters, **aq_filters}
+            if (f := boundary.event_field_for(k)) is not None
+        })
+        null_exprs = [
+            f"count(*) FILTER (WHERE {_quote(key_to_col.get(f, f))} IS NULL)"
+            if key_to_col.get(f, f) in column_types else "count(*)"
+            for f in watch_fields
+        ]
+        totals = {
+            dt: (n, dict(zip(watch_fields, nulls)))
+            for dt, n, *nulls in con.execute(
+                f"SELECT CAST(dt AS VARCHAR), count(*){''.join(', ' + e for e in null_exprs)} "
+                f"FROM {src} GROUP BY 1", [globs]
+            ).fetchall()
+        }
+
+        # Superconjunto conservador de la suscripción más amplia del rango
+        widest = build_event_subscription({"event_types": event_types, **base_filters})
+        clauses, params, pushed = subscription_predicates(
+            widest, column_types, key_to_col,
+            enrichable=bool(snapshot_keys and snapshot_days))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        cur = con.execute(f"SELECT * FROM {src}{where}", [globs, *params])
+        cols = [d[0] for d in cur.description]
+        dt_idx = cols.index("dt")
+        rows_by_dt: Dict[str, list] = defaultdict(list)
+        for r in cur.fetchall():
+            rows_by_dt[str(r[dt_idx])].append(r)
+
+        for dt, g in globs_by_dt.items():
+            if not g:
+                continue
+            status = out[dt]["status"]
+            n_rows, null_counts = totals.get(dt, (0, {f: 0 for f in watch_fields}))
+            status["events_scanned"] = n_rows
+            status["snapshot"] = dt in snapshot_days
+            status["quality"] = dt in quality_days
+            rows = rows_by_dt.get(dt, [])
+            cache: Dict[str, dict] = {}
+            if rows and snapshot_keys and status["snapshot"]:
+                symbols = sorted({r[cols.index("symbol")] for r in rows})
+                cache = self._load_snapshot_cache(con, self._snapshot_file(dt), symbols)
+            day_filters = self._day_filters(base_filters, snapshot_keys, aq_filters,
+                                            status["snapshot"], status["quality"])
+            index_series = (self._load_index_series(dt, sorted({c[0] for c in index_checks}))
+                            if index_checks and rows else {})
+            sub = build_event_subscription({"event_types": event_types, **day_filters})
+            triggers, index_rejected = self._match_rows(
+                dt, rows, cols, sub, cache, index_checks, index_series)
+            status["triggers"] = len(triggers)
+            if index_checks:
+                status["index_rejected"] = index_rejected
+            self._finish_status(status, n_rows, null_counts)
+            out[dt]["triggers"] = triggers
+        return out, pushed
+
     # ── forward returns ──────────────────────────────────────────────────
 
     def _forward_returns(self, triggers: List[dict]) -> dict:
@@ -434,7 +624,7 @@ class TriggerAnalyzer:
         for t in usable:
             by_dt[t["dt"]].append(t)
 
-        con = duckdb.connect()
+        con = self._connection()
         for dt, day_triggers in by_dt.items():
             minute_file = self.minute_dir / f"{dt}.parquet"
             if not minute_file.exists():
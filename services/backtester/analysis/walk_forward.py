@@ -1,56 +1,75 @@
 """Walk-Forward Analysis for overfitting detection."""
 from __future__ import annotations
 from datetime import date
+from typing import TYPE_CHECKING, Any
 import numpy as np
 import pandas as pd
 from core.engine import BacktestEngine
 from core.models import StrategyConfig, WalkForwardResult, WalkForwardSplit
 
+if TYPE_CHECKING:
+    from analysis.sweep import ResultCallback, SweepExecutor
+
+
+def _d(v):
+    return v if isinstance(v, date) else pd.Timestamp(v).date()
+
+
+def walk_forward_windows(
+    unique_dates: list, n_splits: int, train_ratio: float,
+) -> list[tuple[int, list, list]]:
+    """(split_idx, train_dates, test_dates) per split; short splits are skipped."""
+    total = len(unique_dates)
+    split_size = total // n_splits
+    windows = []
+    for s in range(n_splits):
+        start_idx = s * split_size
+        end_idx = min((s + 1) * split_size, total) if s < n_splits - 1 else total
+        if end_idx - start_idx < 20:
+            continue
+        split_dates = unique_dates[start_idx:end_idx]
+        train_end = int(len(split_dates) * train_ratio)
+        train_dates = list(split_dates[:train_end])
+        test_dates = list(split_dates[train_end:])
+        if not train_dates or not test_dates:
+            continue
+        windows.append((s, train_dates, test_dates))
+    return windows
+
 
 class WalkForwardAnalyzer:
-    def __init__(self, engine: BacktestEngine) -> None:
+    def __init__(self, engine: BacktestEngine, executor: SweepExecutor | None = None) -> None:
         self.engine = engine
+        # Con executor, los 2×n_splits backtests corren en paralelo
+        self.executor = executor
 
     async def analyze(
         self, strategy: StrategyConfig, bars_df: pd.DataFrame,
         n_splits: int = 5, train_ratio: float = 0.70,
+        on_result: ResultCallback | None = None,
     ) -> WalkForwardResult:
         date_col = "date" if "date" in bars_df.columns else "timestamp"
         unique_dates = sorted(bars_df[date_col].unique())
-        total = len(unique_dates)
-        split_size = total // n_splits
+        windows = walk_forward_windows(unique_dates, n_splits, train_ratio)
+        if self.executor is not None:
+            metrics = await self._run_parallel(strategy, bars_df, windows, on_result)
+        else:
+            metrics = await self._run_serial(strategy, bars_df, date_col, windows)
+
         splits: list[WalkForwardSplit] = []
-        for s in range(n_splits):
-            start_idx = s * split_size
-            end_idx = min((s + 1) * split_size, total) if s < n_splits - 1 else total
-            if end_idx - start_idx < 20:
-                continue
-            split_dates = unique_dates[start_idx:end_idx]
-            train_end = int(len(split_dates) * train_ratio)
-            train_dates = set(split_dates[:train_end])
-            test_dates = set(split_dates[train_end:])
-            train_df = bars_df[bars_df[date_col].isin(train_dates)].copy()
-            test_df = bars_df[bars_df[date_col].isin(test_dates)].copy()
-            if train_df.empty or test_df.empty:
-                continue
-            try:
-                train_result = await self.engine.run(strategy, bars_df=train_df)
-                test_result = await self.engine.run(strategy, bars_df=test_df)
-            except ValueError:
+        for s, td, ted in windows:
+            train_cm, test_cm = metrics.get((s, "train")), metrics.get((s, "test"))
+            if train_cm is None or test_cm is None:
                 continue
-            ts = train_result.core_metrics.sharpe_ratio
-            xs = test_result.core_metrics.sharpe_ratio
+            ts = train_cm["sharpe_ratio"]
+            xs = test_cm["sharpe_ratio"]
             deg = ((ts - xs) / abs(ts) * 100 if ts != 0 else 0.0)
-            td = sorted(train_dates)
-            ted = sorted(test_dates)
-            def _d(v):
-                return v if isinstance(v, date) else pd.Timestamp(v).date()
             splits.append(WalkForwardSplit(
                 split_idx=s, train_start=_d(td[0]), train_end=_d(td[-1]),
                 test_start=_d(ted[0]), test_end=_d(ted[-1]),
                 train_sharpe=float(ts), test_sharpe=float(xs),
-                train_trades=train_result.core_metrics.total_trades,
-                test_trades=test_result.core_metrics.total_trades,
+                train_trades=train_cm["total_trades"],
+                test_trades=test_cm["total_trades"],
                 degradation_pct=float(deg)))
         if not splits:
             raise ValueError("Walk-forward produced no valid splits")
@@ -61,3 +80,37 @@ class WalkForwardAnalyzer:
         return WalkForwardResult(
             n_splits=len(splits), splits=splits, mean_train_sharpe=mt,
             mean_test_sharpe=mx, mean_degradation_pct=md, overfitting_probability=op)
+
+    async def _run_serial(
+        self, strategy: StrategyConfig, bars_df: pd.DataFrame, date_col: str,
+        windows: list[tuple[int, list, list]],
+    ) -> dict[tuple[int, str], dict[str, Any]]:
+        metrics: dict[tuple[int, str], dict[str, Any]] = {}
+        for s, train_dates, test_dates in windows:
+            train_df = bars_df[bars_df[date_col].isin(set(train_dates))].copy()
+            test_df = bars_df[bars_df[date_col].isin(set(test_dates))].copy()
+            try:
+                train_result = await self.engine.run(strategy, bars_df=train_df)
+                test_result = await self.engine.run(strategy, bars_df=test_df)
+            except ValueError:
+                continue
+            metrics[(s, "train")] = train_result.core_metrics.model_dump()
+            metrics[(s, "test")] = test_result.core_metrics.model_dump()
+        return metrics
+
+    async def _run_parallel(
+        self, strategy: StrategyConfig, bars_df: pd.DataFrame,
+        windows: list[tuple[int, list, list]], on_result: ResultCallback | None,
+    ) -> dict[tuple[int, str], dict[str, Any]]:
+        payload = strategy.model_dump_json()
+
+        def _ns(v) -> int:
+            return pd.Timestamp(v).value
+
+        tasks = []
+        for s, train_dates, test_dates in windows:
+            for phase, dates in (("train", train_dates), ("test", test_dates)):
+                tasks.append({"key": (s, phase), "strategy": payload,
+                              "lo": _ns(dates[0]), "hi": _ns(dates[-1])})
+        results = await self.executor.run_tasks(bars_df, tasks, on_result)
+        return {k: r["core_metrics"] for k, r in results.items() if r["core_metrics"] is not None}
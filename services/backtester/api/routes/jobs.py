@@ -44,8 +44,8 @@ def post_job(
     user_id = body.user_id or x_user_id
     job_type = body.type
     payload = body.request
-    if job_type not in ("template", "code"):
-        raise HTTPException(400, "type must be 'template' or 'code'")
+    if job_type not in ("template", "code", "sweep"):
+        raise HTTPException(400, "type must be 'template', 'code' or 'sweep'")
     try:
         job_id = submit_backtest_job(
             repo,
@@ -5,7 +5,7 @@ from pydantic import BaseModel, Field
 
 
 class SubmitJobRequest(BaseModel):
-    type: Literal["template", "code"]
+    type: Literal["template", "code", "sweep"]
     request: dict[str, Any] = Field(..., description="BacktestRequest or CodeBacktestRequest as dict")
     user_id: str | None = Field(None, description="Optional user id for multi-tenant")
 
@@ -11,7 +11,8 @@ from core.code_executor import CodeExecutor
 from core.data_layer import DataLayer
 from core.engine import BacktestEngine
 from core.metrics import compute_advanced_metrics
-from core.models import BacktestRequest, BacktestResponse, CodeBacktestRequest
+from core.models import BacktestRequest, BacktestResponse, CodeBacktestRequest, SweepRequest, Timeframe
+from analysis.sweep import SweepExecutor
 from analysis.walk_forward import WalkForwardAnalyzer
 from analysis.monte_carlo import MonteCarloAnalyzer
 
@@ -45,11 +46,21 @@ async def execute_backtest_job(
     data_layer: DataLayer,
     engine: BacktestEngine | None,
     progress_callback: Callable[[str, float], None] | None = None,
+    sweep_workers: int = 1,
 ) -> BacktestResponse:
     _p = progress_callback if progress_callback is not None else _noop_progress
+    # sweep_workers: 1 = walk-forward en serie, 0 = os.cpu_count()
+    executor = (
+        SweepExecutor(sweep_workers or None, data_layer.data_dir,
+                      engine.kernel if engine else "chronological", data_layer.indicator_cache_dir)
+        if sweep_workers != 1 and data_layer is not None else None
+    )
     if job_type == "template":
         req = BacktestRequest.model_validate(payload)
-        return await _run_template(req, data_layer, engine, _p)
+        return await _run_template(req, data_layer, engine, _p, executor)
+    if job_type == "sweep":
+        req = SweepRequest.model_validate(payload)
+        return await _run_sweep(req, data_layer, executor or SweepExecutor(1, data_layer.data_dir, indicator_cache_dir=data_layer.indicator_cache_dir), _p)
     if job_type == "code":
         req = CodeBacktestRequest.model_validate(payload)
         return await _run_code(req, data_layer)
@@ -61,6 +72,7 @@ async def _run_template(
     data_layer: DataLayer,
     engine: BacktestEngine | None,
     progress_callback: Callable[[str, float], None] = _noop_progress,
+    executor: SweepExecutor | None = None,
 ) -> BacktestResponse:
     if engine is None:
         raise RuntimeError("Engine not available")
@@ -90,7 +102,7 @@ async def _run_template(
 
         if request.include_walk_forward and data_layer:
             try:
-                wf = WalkForwardAnalyzer(engine)
+                wf = WalkForwardAnalyzer(engine, executor)
                 bars = await data_layer.load_day_bars_adjusted(
                     request.strategy.start_date,
                     request.strategy.end_date,
@@ -98,7 +110,9 @@ async def _run_template(
                 )
                 bars = data_layer.add_indicators_sql(bars)
                 result.walk_forward = await wf.analyze(
-                    request.strategy, bars, request.walk_forward_splits)
+                    request.strategy, bars, request.walk_forward_splits,
+                    on_result=lambda _r, done, total: progress_callback(
+                        f"Walk-forward {done}/{total}", 0.9 + 0.1 * done / total))
             except Exception as exc:
                 logger.warning("walk_forward_skipped", error=str(exc))
 
@@ -120,6 +134,36 @@ async def _run_template(
         return BacktestResponse(status="error", error=f"Internal error: {str(e)}")
 
 
+async def _run_sweep(
+    request: SweepRequest,
+    data_layer: DataLayer,
+    executor: SweepExecutor,
+    progress_callback: Callable[[str, float], None] = _noop_progress,
+) -> BacktestResponse:
+    try:
+        s = request.strategy
+        progress_callback("Cargando datos...", 0.05)
+        if s.timeframe == Timeframe.DAY_1:
+            bars = await data_layer.load_day_bars_adjusted(s.start_date, s.end_date, s.universe.tickers)
+        else:
+            bars = await data_layer.load_minute_bars_adjusted(s.start_date, s.end_date, s.universe.tickers)
+        if bars.empty:
+            return BacktestResponse(status="error", error="No data available for sweep")
+
+        def _on_point(_res: dict, done: int, total: int) -> None:
+            progress_callback(f"Sweep {done}/{total}", 0.1 + 0.9 * done / total)
+
+        sweep = await executor.grid(
+            s, bars, request.grid, request.metric, request.maximize, on_result=_on_point)
+        return _sanitize_response(BacktestResponse(status="success", sweep=sweep))
+
+    except ValueError as e:
+        return BacktestResponse(status="error", error=str(e))
+    except Exception as e:
+        logger.error("sweep_failed", error=str(e))
+        return BacktestResponse(status="error", error=f"Internal error: {str(e)}")
+
+
 async def _run_code(request: CodeBacktestRequest, data_layer: DataLayer) -> BacktestResponse:
     try:
         if request.timeframe == "1d":
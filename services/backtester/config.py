@@ -32,6 +32,15 @@ class Settings(BaseSettings):
     default_risk_free_rate: float = 0.05
     max_execution_seconds: int = 120
     max_symbols_per_backtest: int = 2000
+    # "chronological" (all tickers in one time-ordered sweep) | "legacy"
+    simulation_kernel: str = "chronological"
+    # Procesos para walk-forward / parameter sweeps (0 = os.cpu_count(), 1 = serie)
+    sweep_workers: int = 0
+
+    # Indicator cache (memmap, disco local, compartido por todos los workers)
+    indicator_cache_enabled: bool = True
+    indicator_cache_dir: Path = Path("/data/backtester/indicator_cache")
+    indicator_cache_max_gb: float = 20.0
 
     # Splits cache
     splits_cache_dir: Path = Path("/data/polygon/splits_cache")
@@ -23,6 +23,11 @@ REST schema (Polygon v2/aggs):
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
+import os
+import shutil
+import tempfile
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 from pathlib import Path
@@ -210,6 +215,122 @@ class _RESTCache:
             df.to_parquet(p, index=False)
 
 
+# Bump when any _compute_* / add_indicators_sql formula changes
+_INDICATOR_VERSION = 1
+_INDICATOR_SPEC = {
+    "sma": [5, 8, 20, 50, 200], "ema": [9, 20, 21, 50], "rsi": 14,
+    "macd": [12, 26, 9], "stoch": [14, 3], "bb": [20, 2.0], "adx": 14, "atr": 14,
+}
+
+
+class _IndicatorCache:
+    """
+    Content-addressed on-disk cache for add_indicators_sql output.
+
+    Key = hash(symbol set, date range, indicator spec/version, fingerprint of
+    the input bars). Each entry is a directory of per-column ``.npy`` files
+    opened with ``mmap_mode="c"``: every worker process maps the same pages
+    from the OS page cache, and in-place edits stay private to the caller.
+    Entries are published with an atomic rename, so concurrent writers of
+    the same key are harmless.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 20 * 1024**3):
+        self._dir = cache_dir
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+
+    @staticmethod
+    def key(bars_df: pd.DataFrame, time_col: str) -> str:
+        times = bars_df[time_col]
+        meta = {
+            "v": _INDICATOR_VERSION,
+            "spec": _INDICATOR_SPEC,
+            "symbols": sorted(map(str, bars_df["ticker"].unique())),
+            "range": [str(times.min()), str(times.max())],
+            "columns": [f"{c}:{bars_df[c].dtype}" for c in bars_df.columns],
+            "rows": len(bars_df),
+        }
+        h = hashlib.blake2b(json.dumps(meta, sort_keys=True).encode(), digest_size=20)
+        # Data version: row hashes of the actual input values
+        h.update(pd.util.hash_pandas_object(bars_df, index=False).to_numpy().tobytes())
+        return h.hexdigest()
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        entry = self._dir / key
+        meta_path = entry / "meta.json"
+        if not meta_path.exists():
+            return None
+        try:
+            meta = json.loads(meta_path.read_text())
+            data = {}
+            for i, (col, kind, dtype) in enumerate(meta["columns"]):
+                arr = np.load(entry / f"{i}.npy", mmap_mode="c").view(np.ndarray)
+                if kind == "codes":
+                    uniques = meta["uniques"][col]
+                    lookup = np.empty(len(uniques) + 1, dtype=object)
+                    lookup[:-1] = uniques
+                    lookup[-1] = None
+                    arr = pd.Series(lookup[arr], dtype=dtype)
+                data[col] = arr
+            os.utime(meta_path)
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("indicator_cache_read_failed", key=key, error=str(exc))
+            return None
+        return pd.DataFrame(data, copy=False)
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        entry = self._dir / key
+        if entry.exists():
+            return
+        columns = []
+        arrays = []
+        uniques_by_col = {}
+        for col in df.columns:
+            s = df[col]
+            if isinstance(s.dtype, np.dtype) and s.dtype.kind in "biufM":
+                arrays.append(s.to_numpy())
+                columns.append((col, "array", str(s.dtype)))
+            elif pd.api.types.is_string_dtype(s.dtype) and s.dropna().map(type).eq(str).all():
+                codes, uniques = pd.factorize(s)
+                arrays.append(codes.astype(np.int32))
+                columns.append((col, "codes", str(s.dtype)))
+                uniques_by_col[col] = list(uniques)
+            else:
+                # Dates as python objects, extension dtypes...: not cacheable
+                return
+        tmp = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=self._dir))
+        try:
+            for i, arr in enumerate(arrays):
+                np.save(tmp / f"{i}.npy", arr, allow_pickle=False)
+            (tmp / "meta.json").write_text(json.dumps({"columns": columns, "uniques": uniques_by_col, "rows": len(df)}))
+            os.rename(tmp, entry)
+        except OSError:
+            # Another worker published the same key first
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        self._prune()
+
+    def _prune(self) -> None:
+        entries = []
+        total = 0
+        for entry in self._dir.iterdir():
+            meta_path = entry / "meta.json"
+            if entry.name.startswith(".") or not meta_path.exists():
+                continue
+            size = sum(f.stat().st_size for f in entry.iterdir())
+            entries.append((meta_path.stat().st_mtime, size, entry))
+            total += size
+        if total <= self._max_bytes:
+            return
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            logger.info("indicator_cache_evicted", key=entry.name, bytes=size)
+            if total <= self._max_bytes:
+                break
+
+
 class DataLayer:
     """
     High-performance data access layer backed by DuckDB.
@@ -226,12 +347,18 @@ class DataLayer:
         rest_cache_dir: Path | None = None,
         day_aggs_subdir: str = "day_aggs",
         minute_aggs_dir: Path | None = None,
+        indicator_cache_dir: Path | None = None,
+        indicator_cache_max_gb: float = 20.0,
     ):
         self._data_dir = Path(polygon_data_dir)
         self._day_dir = self._data_dir / day_aggs_subdir
         self._minute_dir = Path(minute_aggs_dir) if minute_aggs_dir else self._data_dir / "minute_aggs"
         self._api_key = polygon_api_key
         self._rest_cache = _RESTCache(rest_cache_dir) if rest_cache_dir else None
+        self._indicator_cache = (
+            _IndicatorCache(Path(indicator_cache_dir), int(indicator_cache_max_gb * 1024**3))
+            if indicator_cache_dir else None
+        )
         self._con = duckdb.connect(":memory:")
         self._configure_duckdb()
 
@@ -243,6 +370,14 @@ class DataLayer:
     def connection(self) -> duckdb.DuckDBPyConnection:
         return self._con
 
+    @property
+    def data_dir(self) -> Path:
+        return self._data_dir
+
+    @property
+    def indicator_cache_dir(self) -> Path | None:
+        return self._indicator_cache._dir if self._indicator_cache else None
+
     def close(self) -> None:
         self._con.close()
 
@@ -618,9 +753,30 @@ class DataLayer:
         - True ATR(14), ATR%
         - VWAP + distance from VWAP
         - Intraday derived: change_pct, change_from_open, pos_in_range, etc.
+
+        With an indicator cache configured, identical inputs (same symbols,
+        range and bar values) are served from the memory-mapped cache.
         """
         time_col = "timestamp" if "timestamp" in bars_df.columns else "date"
 
+        cache_key = None
+        if self._indicator_cache is not None and not bars_df.empty:
+            cache_key = _IndicatorCache.key(bars_df, time_col)
+            cached = self._indicator_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("indicator_cache_hit", key=cache_key, rows=len(cached))
+                return cached
+
+        result = self._compute_indicators(bars_df, time_col)
+        if cache_key is not None:
+            try:
+                self._indicator_cache.put(cache_key, result)
+            except Exception as exc:
+                logger.warning("indicator_cache_write_failed", error=str(exc))
+        return result
+
+    def _compute_indicators(self, bars_df: pd.DataFrame, time_col: str) -> pd.DataFrame:
+
         self._con.register("_bars", bars_df)
         result = self._con.execute(f"""
             SELECT
@@ -3,7 +3,8 @@ Vectorized Backtesting Engine.
 
 Two-phase architecture:
   1. Signal Generation - fully vectorized (numpy/DuckDB)
-  2. Portfolio Simulation - sequential loop with optimised hot path
+  2. Portfolio Simulation - chronological sweep over all tickers
+     (core.simulation); the per-ticker loop is kept as kernel="legacy"
 
 Design ensures ZERO look-ahead bias:
   - Signals on bar[i] can only use data up to bar[i]
@@ -14,7 +15,7 @@ from __future__ import annotations
 
 import time
 from datetime import date
-from typing import Callable
+from typing import Callable, Literal
 
 import numpy as np
 import pandas as pd
@@ -38,6 +39,7 @@ from .models import (
     Timeframe,
     TradeRecord,
 )
+from .simulation import simulate_chronological
 
 logger = structlog.get_logger(__name__)
 
@@ -313,8 +315,15 @@ def _compute_optimization(
 class BacktestEngine:
     """Professional backtesting engine."""
 
-    def __init__(self, data_layer: DataLayer):
+    def __init__(
+        self,
+        data_layer: DataLayer,
+        kernel: Literal["chronological", "legacy"] = "chronological",
+    ):
+        if kernel not in ("chronological", "legacy"):
+            raise ValueError(f"Unknown simulation kernel: {kernel}")
         self._data = data_layer
+        self.kernel = kernel
 
     async def run(
         self,
@@ -462,6 +471,12 @@ class BacktestEngine:
             **streaks)
 
     def _simulate(self, bars_df, entry_mask, exit_sig, strat, date_col, _p):
+        if self.kernel == "legacy":
+            return self._simulate_legacy(bars_df, entry_mask, exit_sig, strat, date_col, _p)
+        return simulate_chronological(bars_df, entry_mask, exit_sig, strat, date_col, _p)
+
+    def _simulate_legacy(self, bars_df, entry_mask, exit_sig, strat, date_col, _p):
+        """Per-ticker loop: each ticker is walked to the end before the next."""
         trades: list[TradeRecord] = []
         equity = strat.initial_capital
         eq_pts: list[tuple[str, float]] = []
@@ -271,6 +271,22 @@ class WalkForwardResult(BaseModel):
     )
 
 
+class SweepPoint(BaseModel):
+    params: dict[str, Any]
+    core_metrics: CoreMetrics | None = None
+    error: str | None = None
+
+
+class SweepResult(BaseModel):
+    metric: str
+    n_points: int
+    points: list[SweepPoint]
+    best_params: dict[str, Any] | None = None
+    best_value: float | None = None
+    workers: int
+    execution_time_ms: int
+
+
 class MonteCarloResult(BaseModel):
     n_simulations: int
     median_final_equity: float
@@ -362,9 +378,20 @@ class BacktestRequest(BaseModel):
     n_trials_for_dsr: int = 1
 
 
+class SweepRequest(BaseModel):
+    """Parameter grid over a base strategy (one backtest per combination)."""
+    strategy: StrategyConfig
+    grid: dict[str, list[Any]] = Field(
+        ..., description="Dotted StrategyConfig paths → values, "
+                         "e.g. {'exit_rules.0.value': [0.02, 0.05], 'max_positions': [5, 10]}")
+    metric: str = Field("sharpe_ratio", description="CoreMetrics field used to rank points")
+    maximize: bool = True
+
+
 class BacktestResponse(BaseModel):
     status: Literal["success", "error"]
     result: BacktestResult | None = None
+    sweep: SweepResult | None = None
     error: str | None = None
 
 
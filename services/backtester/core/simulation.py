@@ -0,0 +1,309 @@
+"""
+Chronological event-driven simulation kernel.
+
+Replaces the per-ticker walk of ``BacktestEngine._simulate_legacy`` (one
+``iloc`` per bar, tickers processed one after another) with a single sweep
+over all bars merged and sorted by timestamp:
+
+  1. Bars of every ticker are flattened into typed numpy columns ordered by
+     (timestamp, ticker) — the "event queue".
+  2. Each event checks exits for the open position of its ticker, then
+     entries, with the same rules as ``_check_exit`` / ``estimate_fill``.
+  3. Equity, ``max_positions`` and ``position_size_pct`` therefore see the
+     portfolio as it was at that moment in time, across all tickers.
+
+Per-ticker bar indices (TIME exits, holding_bars, exit signals) keep the
+legacy meaning, so a single-ticker run produces identical trades.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from .fill_model import FillResult, estimate_fill
+from .models import ExitRule, ExitType, StrategyConfig, TradeRecord
+
+
+def _to_date(val) -> date:
+    if isinstance(val, date):
+        return val
+    return pd.Timestamp(val).date()
+
+
+@dataclass(slots=True)
+class _OpenPosition:
+    ticker: str
+    direction: str
+    entry_bar_idx: int
+    entry_date: object
+    entry_price: float
+    fill_price: float
+    shares: float
+    position_value: float
+    slippage_cost: float
+    commission_cost: float
+    peak: float
+
+
+@dataclass(slots=True)
+class _ExitSpec:
+    """Exit rules pre-resolved to plain floats (None = rule absent)."""
+    time_bars: float | None = None
+    eod: bool = False
+    stop_loss: float | None = None
+    target: float | None = None
+    trailing: float | None = None
+    signal: bool = False
+
+    @classmethod
+    def from_rules(cls, rules: list[ExitRule]) -> "_ExitSpec":
+        spec = cls()
+        for rule in rules:
+            match rule.type:
+                case ExitType.TIME:
+                    if rule.value:
+                        spec.time_bars = rule.value if spec.time_bars is None else min(spec.time_bars, rule.value)
+                case ExitType.EOD:
+                    spec.eod = True
+                case ExitType.STOP_LOSS:
+                    if rule.value:
+                        spec.stop_loss = rule.value if spec.stop_loss is None else min(spec.stop_loss, rule.value)
+                case ExitType.TARGET:
+                    if rule.value:
+                        spec.target = rule.value if spec.target is None else min(spec.target, rule.value)
+                case ExitType.TRAILING_STOP:
+                    if rule.value:
+                        spec.trailing = rule.value if spec.trailing is None else min(spec.trailing, rule.value)
+                case ExitType.SIGNAL:
+                    spec.signal = True
+        return spec
+
+    def should_exit(self, pos: _OpenPosition, close: float, bar_idx: int, exit_flag: bool) -> bool:
+        """Same decision as engine._check_exit (rules are OR-ed)."""
+        if self.eod:
+            return True
+        if self.time_bars is not None and (bar_idx - pos.entry_bar_idx) >= self.time_bars:
+            return True
+        if self.stop_loss is not None or self.target is not None:
+            pnl_pct = ((close - pos.fill_price) / pos.fill_price
+                       if pos.direction == "long"
+                       else (pos.fill_price - close) / pos.fill_price)
+            if self.stop_loss is not None and pnl_pct <= -self.stop_loss:
+                return True
+            if self.target is not None and pnl_pct >= self.target:
+                return True
+        if self.trailing is not None and pos.peak > 0:
+            if pos.direction == "long":
+                if (pos.peak - close) / pos.peak >= self.trailing:
+                    return True
+            elif (close - pos.peak) / pos.peak >= self.trailing:
+                return True
+        if self.signal and exit_flag:
+            return True
+        return False
+
+
+class BarEvents:
+    """
+    All bars as typed columns in event order: by timestamp, then ticker
+    (first-appearance order), then the ticker's own bar order.
+    """
+
+    __slots__ = (
+        "n", "tickers", "ticker_code", "local_idx", "ticker_len", "last_event",
+        "open", "high", "low", "close", "volume", "vwap", "next_open",
+        "date_raw", "date_str", "entry", "exit",
+    )
+
+    def __init__(
+        self,
+        bars_df: pd.DataFrame,
+        entry_mask: pd.Series,
+        exit_sig: pd.Series | None,
+        date_col: str,
+    ):
+        codes, tickers = pd.factorize(bars_df["ticker"], sort=False)
+        codes = codes.astype(np.int64)
+        n = len(codes)
+        self.n = n
+        self.tickers = np.asarray(tickers, dtype=object)
+
+        # Position of each row within its ticker (legacy bar index i)
+        local_idx = pd.Series(codes).groupby(codes).cumcount().to_numpy(dtype=np.int64)
+        ticker_len = np.bincount(codes, minlength=len(tickers)).astype(np.int64)
+
+        # next_open: open of the same ticker's following bar (NaN on its last bar)
+        opens = bars_df["open"].to_numpy(dtype=np.float64)
+        row_of = np.full((n,), -1, dtype=np.int64)
+        by_ticker_pos = np.lexsort((local_idx, codes))
+        same_next = np.zeros(n, dtype=bool)
+        same_next[:-1] = codes[by_ticker_pos[1:]] == codes[by_ticker_pos[:-1]]
+        row_of[by_ticker_pos[:-1][same_next[:-1]]] = by_ticker_pos[1:][same_next[:-1]]
+        next_open = np.where(row_of >= 0, opens[np.maximum(row_of, 0)], np.nan)
+
+        ts = pd.to_datetime(bars_df[date_col]).to_numpy().astype("datetime64[ns]").view(np.int64)
+        order = np.lexsort((local_idx, codes, ts))
+
+        self.ticker_code = codes[order]
+        self.local_idx = local_idx[order]
+        self.ticker_len = ticker_len
+        self.open = opens[order]
+        self.high = bars_df["high"].to_numpy(dtype=np.float64)[order]
+        self.low = bars_df["low"].to_numpy(dtype=np.float64)[order]
+        self.close = bars_df["close"].to_numpy(dtype=np.float64)[order]
+        self.volume = bars_df["volume"].to_numpy()[order]
+        self.vwap = bars_df["vwap"].to_numpy(dtype=np.float64)[order] if "vwap" in bars_df.columns else None
+        self.next_open = next_open[order]
+        self.date_raw = bars_df[date_col].astype(object).to_numpy()[order]
+        self.date_str = bars_df[date_col].astype(str).str[:10].to_numpy()[order]
+        self.entry = entry_mask.fillna(False).to_numpy(dtype=bool)[order]
+        self.exit = (exit_sig.fillna(False).to_numpy(dtype=bool)[order]
+                     if exit_sig is not None else None)
+
+        # Event index of each ticker's final bar (force-close price)
+        last_event = np.full(len(tickers), -1, dtype=np.int64)
+        np.maximum.at(last_event, self.ticker_code, np.arange(n))
+        self.last_event = last_event
+
+
+def simulate_chronological(
+    bars_df: pd.DataFrame,
+    entry_mask: pd.Series,
+    exit_sig: pd.Series | None,
+    strat: StrategyConfig,
+    date_col: str,
+    _p: Callable[[str, float], None],
+) -> tuple[list[TradeRecord], list[tuple[str, float]], list[str]]:
+    """Single chronological sweep; same return contract as the legacy loop."""
+    ev = BarEvents(bars_df, entry_mask, exit_sig, date_col)
+    spec = _ExitSpec.from_rules(strat.exit_rules)
+
+    trades: list[TradeRecord] = []
+    eq_pts: list[tuple[str, float]] = []
+    warns: list[str] = []
+    equity = strat.initial_capital
+    tid = 0
+    open_by_ticker: dict[int, _OpenPosition] = {}
+
+    direction = strat.direction if strat.direction != "both" else "long"
+    entry_side = "buy" if direction == "long" else "sell"
+    timing = strat.entry_timing
+    max_positions = strat.max_positions
+    size_pct = strat.position_size_pct
+    slip_model, slip_bps, commission = strat.slippage_model, strat.slippage_bps, strat.commission_per_trade
+
+    t_code, l_idx = ev.ticker_code, ev.local_idx
+    o_arr, h_arr, lo_arr, c_arr = ev.open, ev.high, ev.low, ev.close
+    v_arr, vw_arr, nx_arr = ev.volume, ev.vwap, ev.next_open
+    d_str, entry_arr, exit_arr = ev.date_str, ev.entry, ev.exit
+    tickers, ticker_len = ev.tickers, ev.ticker_len
+
+    n = ev.n
+    step = max(1, n // 10)
+    cur_day = None
+
+    for k in range(n):
+        if k % step == 0:
+            _p(f"{d_str[k]} ({k+1}/{n})", 0.35 + 0.50 * k / max(n, 1))
+
+        code = t_code[k]
+        i = int(l_idx[k])
+        close = c_arr[k]
+        day = d_str[k]
+        if day != cur_day:
+            if cur_day is not None:
+                eq_pts.append((cur_day, equity))
+            cur_day = day
+
+        # Exit
+        pos = open_by_ticker.get(code)
+        if pos is not None:
+            if pos.direction == "long":
+                pos.peak = max(pos.peak, h_arr[k])
+            else:
+                pos.peak = min(pos.peak, lo_arr[k])
+            if spec.should_exit(pos, close, i, bool(exit_arr[k]) if exit_arr is not None else False):
+                ef = estimate_fill(
+                    "sell" if pos.direction == "long" else "buy",
+                    close, int(v_arr[k]), vw_arr[k] if vw_arr is not None else None,
+                    pos.position_value, slip_model, slip_bps, commission)
+                pnl = ((ef.fill_price - pos.fill_price) if pos.direction == "long"
+                       else (pos.fill_price - ef.fill_price)) * pos.shares
+                pnl -= (pos.slippage_cost + pos.commission_cost
+                        + ef.slippage_cost + ef.commission_cost)
+                ret = pnl / pos.position_value if pos.position_value > 0 else 0.0
+                trades.append(TradeRecord(
+                    trade_id=tid, ticker=pos.ticker, direction=pos.direction,
+                    entry_date=pos.entry_date, entry_price=pos.entry_price,
+                    entry_fill_price=pos.fill_price,
+                    exit_date=_to_date(ev.date_raw[k]),
+                    exit_price=close, exit_fill_price=ef.fill_price,
+                    shares=pos.shares, position_value=pos.position_value,
+                    pnl=pnl, return_pct=ret,
+                    holding_bars=i - pos.entry_bar_idx,
+                    slippage_cost=pos.slippage_cost + ef.slippage_cost,
+                    commission_cost=pos.commission_cost + ef.commission_cost))
+                tid += 1
+                equity += pnl
+                del open_by_ticker[code]
+                pos = None
+
+        # Entry
+        if (entry_arr[k] and pos is None
+                and len(open_by_ticker) < max_positions
+                and equity > 0):
+            if timing == "next_open" and i + 1 < ticker_len[code]:
+                ep, ebi = nx_arr[k], i + 1
+            elif timing == "close":
+                ep, ebi = close, i
+            else:
+                ep, ebi = o_arr[k], i
+            if ep <= 0:
+                continue
+            pv = equity * size_pct
+            fill: FillResult = estimate_fill(
+                entry_side, ep, int(v_arr[k]), vw_arr[k] if vw_arr is not None else None,
+                pv, slip_model, slip_bps, commission)
+            if fill.fill_pct > 0:
+                value = pv * fill.fill_pct
+                open_by_ticker[code] = _OpenPosition(
+                    ticker=tickers[code], direction=direction,
+                    entry_bar_idx=ebi, entry_date=_to_date(ev.date_raw[k]),
+                    entry_price=ep, fill_price=fill.fill_price,
+                    shares=value / fill.fill_price if fill.fill_price > 0 else 0.0,
+                    position_value=value,
+                    slippage_cost=fill.slippage_cost,
+                    commission_cost=fill.commission_cost,
+                    peak=fill.fill_price)
+
+    # Legacy equity curve stops before force-closes
+    if cur_day is not None:
+        eq_pts.append((cur_day, equity))
+
+    # Force close remaining at each ticker's last bar
+    for code, pos in open_by_ticker.items():
+        last = ev.last_event[code]
+        lc = c_arr[last]
+        pnl = ((lc - pos.fill_price) if pos.direction == "long"
+               else (pos.fill_price - lc)) * pos.shares
+        pnl -= pos.slippage_cost + pos.commission_cost
+        ret = pnl / pos.position_value if pos.position_value > 0 else 0.0
+        trades.append(TradeRecord(
+            trade_id=tid, ticker=pos.ticker, direction=pos.direction,
+            entry_date=pos.entry_date, entry_price=pos.entry_price,
+            entry_fill_price=pos.fill_price,
+            exit_date=_to_date(ev.date_raw[last]),
+            exit_price=lc, exit_fill_price=lc,
+            shares=pos.shares, position_value=pos.position_value,
+            pnl=pnl, return_pct=ret,
+            holding_bars=int(ticker_len[code]) - pos.entry_bar_idx,
+            slippage_cost=pos.slippage_cost,
+            commission_cost=pos.commission_cost))
+        tid += 1
+        equity += pnl
+        warns.append(f"Force-closed {pos.ticker} at end of period")
+    return trades, eq_pts, warns
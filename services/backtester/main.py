@@ -50,8 +50,10 @@ async def lifespan(app: FastAPI):
         polygon_api_key=settings.polygon_api_key,
         rest_cache_dir=rest_cache,
         minute_aggs_dir=settings.minute_aggs_dir,
+        indicator_cache_dir=settings.indicator_cache_dir if settings.indicator_cache_enabled else None,
+        indicator_cache_max_gb=settings.indicator_cache_max_gb,
     )
-    engine = BacktestEngine(data_layer)
+    engine = BacktestEngine(data_layer, kernel=settings.simulation_kernel)
 
     try:
         repo = RedisJobRepository(settings.redis_url, settings.job_result_ttl_seconds)
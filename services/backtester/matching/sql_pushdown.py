@@ -0,0 +1,109 @@
+"""Traducción de una suscripción (build_event_subscription) a predicados SQL.
+
+Sirve al modo set-based de analysis/triggers.py: DuckDB descarta en el scan
+las filas que el matcher rechazaría seguro, y el matcher Python sigue siendo
+el juez final sobre las que sobreviven. Por eso la traducción es
+CONSERVADORA — un superconjunto de event_passes_subscription, nunca un
+subconjunto — y la paridad 1:1 con el vivo no depende de ella:
+
+  - Solo se empujan los checks `evt`/`val` sobre columnas numéricas de la
+    fila del evento, y symbols_include/exclude.
+  - NaN pasa siempre (en JS no falla los rangos normales).
+  - Campos int del payload (parseInt) se comparan truncados.
+  - Si el día puede enriquecerse desde el snapshot, los NULL pasan: el
+    enriquecido puede rellenarlos antes del matching.
+  - Todo lo demás (enr, spread, mso, índices, strings, aq:) queda en Python.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+from .matcher_defs_generated import (
+    CHECKS,
+    ENRICHED_FLOAT_FIELDS,
+    ENRICHED_INT_FIELDS,
+    ENRICHED_KEY_REMAP,
+    PAYLOAD_INT_FIELDS,
+)
+
+_INT_TYPES = ("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT",
+              "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT")
+_FLOAT_TYPES = ("FLOAT", "DOUBLE", "REAL", "DECIMAL")
+
+# Campos del evento que enrich_event_from_cache puede rellenar si llegan NULL
+_ENRICHABLE = frozenset(
+    ENRICHED_KEY_REMAP.get(k, k) for k in (*ENRICHED_FLOAT_FIELDS, *ENRICHED_INT_FIELDS)
+) | {"spread"}
+
+
+def _quote(col: str) -> str:
+    return '"' + col.replace('"', '""') + '"'
+
+
+def subscription_predicates(
+    sub: dict,
+    column_types: Dict[str, str],
+    key_to_col: Dict[str, str],
+    enrichable: bool,
+) -> Tuple[List[str], list, List[str]]:
+    """(cláusulas SQL, parámetros, subKeys empujados) para un WHERE con AND.
+
+    `column_types`: columna → tipo DuckDB del scan. `key_to_col`: clave del
+    stream → columna del lake. `enrichable`: algún día del scan tiene
+    snapshot con el que el matcher enriquecerá el evento.
+    """
+    clauses: List[str] = []
+    params: list = []
+    pushed: List[str] = []
+
+    for kind, args, min_key, max_key in CHECKS:
+        if kind not in ("evt", "val"):
+            continue
+        lo, hi = sub.get(min_key), sub.get(max_key)
+        if lo is None and hi is None:
+            continue
+        field = args[0]
+        col = key_to_col.get(field, field)
+        ctype = column_types.get(col, "").upper()
+        is_int = ctype.startswith(_INT_TYPES)
+        is_float = ctype.startswith(_FLOAT_TYPES)
+        if not (is_int or is_float):
+            continue
+
+        c = _quote(col)
+        x = f"trunc({c})" if field in PAYLOAD_INT_FIELDS and is_float else c
+        if lo is not None and hi is not None and lo > hi:
+            rng, rng_params = f"({x} >= ? OR {x} <= ?)", [lo, hi]
+        else:
+            parts, rng_params = [], []
+            if lo is not None:
+                parts.append(f"{x} >= ?")
+                rng_params.append(lo)
+            if hi is not None:
+                parts.append(f"{x} <= ?")
+                rng_params.append(hi)
+            rng = "(" + " AND ".join(parts) + ")"
+
+        escapes = []
+        if ctype.startswith(("FLOAT", "DOUBLE", "REAL")):
+            escapes.append(f"isnan({c})")
+        if enrichable and (kind == "val" or field in _ENRICHABLE):
+            escapes.append(f"{c} IS NULL")
+        clauses.append("(" + " OR ".join([rng, *escapes]) + ")")
+        params.extend(rng_params)
+        pushed.append(min_key[:-3])
+
+    if "symbol" in column_types:
+        inc = sub.get("symbolsInclude")
+        if inc:
+            clauses.append(f"symbol IN ({','.join('?' * len(inc))})")
+            params.extend(sorted(inc))
+            pushed.append("symbolsInclude")
+        exc = sub.get("symbolsExclude")
+        if exc:
+            clauses.append(f"(symbol IS NULL OR symbol NOT IN ({','.join('?' * len(exc))}))")
+            params.extend(sorted(exc))
+            pushed.append("symbolsExclude")
+
+    return clauses, params, pushed
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Simulation kernel benchmark
+===========================
+
+Compares throughput (bars/second) of the chronological kernel against the
+legacy per-ticker loop on synthetic daily bars.
+
+Usage (inside backtester container):
+    python scripts/benchmark_simulation.py
+    python scripts/benchmark_simulation.py --tickers 500 --days 252 --repeat 3
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.engine import BacktestEngine  # noqa: E402
+from core.models import ExitRule, ExitType, StrategyConfig  # noqa: E402
+
+
+def make_bars(n_tickers: int, n_days: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2023-01-02", periods=n_days, freq="B")
+    rets = rng.normal(0, 0.02, size=(n_tickers, n_days))
+    close = 50 * np.exp(np.cumsum(rets, axis=1))
+    open_ = np.concatenate([close[:, :1], close[:, :-1]], axis=1)
+    spread = np.abs(rng.normal(0, 0.01, size=close.shape)) * close
+    return pd.DataFrame({
+        "ticker": np.repeat([f"T{i:04d}" for i in range(n_tickers)], n_days),
+        "date": np.tile(dates, n_tickers),
+        "open": open_.ravel(),
+        "high": (np.maximum(open_, close) + spread).ravel(),
+        "low": (np.minimum(open_, close) - spread).ravel(),
+        "close": close.ravel(),
+        "volume": rng.integers(100_000, 5_000_000, size=close.size),
+        "vwap": ((open_ + close) / 2).ravel(),
+    })
+
+
+def bench(kernel: str, bars: pd.DataFrame, strat: StrategyConfig, repeat: int) -> tuple[float, int]:
+    engine = BacktestEngine(data_layer=None, kernel=kernel)
+    entry = (bars["close"] / bars["open"] - 1) > 0.03
+    best = float("inf")
+    n_trades = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        trades, _, _ = engine._simulate(bars, entry, None, strat, "date", lambda m, p: None)
+        best = min(best, time.perf_counter() - t0)
+        n_trades = len(trades)
+    return best, n_trades
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=200)
+    parser.add_argument("--days", type=int, default=252)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the chronological kernel")
+    args = parser.parse_args()
+
+    bars = make_bars(args.tickers, args.days)
+    strat = StrategyConfig(
+        name="benchmark",
+        start_date=date(2023, 1, 1),
+        end_date=date(2024, 12, 31),
+        max_positions=20,
+        exit_rules=[
+            ExitRule(type=ExitType.STOP_LOSS, value=0.05),
+            ExitRule(type=ExitType.TARGET, value=0.08),
+            ExitRule(type=ExitType.TIME, value=10),
+        ],
+    )
+    n_bars = len(bars)
+    print(f"{n_bars:,} bars ({args.tickers} tickers x {args.days} days), best of {args.repeat}")
+
+    kernels = ["chronological"] if args.skip_legacy else ["chronological", "legacy"]
+    results = {}
+    for kernel in kernels:
+        elapsed, n_trades = bench(kernel, bars, strat, args.repeat)
+        results[kernel] = elapsed
+        print(f"  {kernel:<14} {elapsed:8.3f}s  {n_bars / elapsed:12,.0f} bars/s  {n_trades:6d} trades")
+
+    if "legacy" in results:
+        print(f"  speedup: {results['legacy'] / results['chronological']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
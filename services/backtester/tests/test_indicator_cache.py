@@ -0,0 +1,37 @@
+"""Tests for the DataLayer memory-mapped indicator cache."""
+from __future__ import annotations
+
+import pandas as pd
+
+from core.data_layer import DataLayer
+
+
+def test_cache_hit_matches_fresh_computation(sample_bars_df, tmp_path):
+    fresh = DataLayer(polygon_data_dir=tmp_path).add_indicators_sql(sample_bars_df)
+
+    cached_layer = DataLayer(polygon_data_dir=tmp_path, indicator_cache_dir=tmp_path / "ind")
+    first = cached_layer.add_indicators_sql(sample_bars_df)
+    entries = [p for p in (tmp_path / "ind").iterdir() if not p.name.startswith(".")]
+    assert len(entries) == 1
+
+    # Another worker (new DataLayer) maps the same entry
+    second = DataLayer(polygon_data_dir=tmp_path, indicator_cache_dir=tmp_path / "ind") \
+        .add_indicators_sql(sample_bars_df.copy())
+    pd.testing.assert_frame_equal(first, fresh)
+    pd.testing.assert_frame_equal(second, fresh)
+
+    # Callers may write to the result without touching the cache files
+    second.loc[0, "rsi_14"] = -1.0
+    third = cached_layer.add_indicators_sql(sample_bars_df)
+    pd.testing.assert_frame_equal(third, fresh)
+
+
+def test_changed_bars_miss_cache(sample_bars_df, tmp_path):
+    layer = DataLayer(polygon_data_dir=tmp_path, indicator_cache_dir=tmp_path / "ind")
+    layer.add_indicators_sql(sample_bars_df)
+    changed = sample_bars_df.copy()
+    changed.loc[5, "close"] += 1.0
+    out = layer.add_indicators_sql(changed)
+    expected = DataLayer(polygon_data_dir=tmp_path).add_indicators_sql(changed)
+    pd.testing.assert_frame_equal(out, expected)
+    assert len([p for p in (tmp_path / "ind").iterdir() if not p.name.startswith(".")]) == 2
@@ -0,0 +1,116 @@
+"""Tests for core.simulation – chronological kernel vs the legacy per-ticker loop."""
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from core.engine import BacktestEngine
+from core.models import ExitRule, ExitType, SlippageModel, StrategyConfig
+
+
+# ── Helpers ──────────────────────────────────────────────────────────────
+
+
+def _noop(msg: str, pct: float) -> None:
+    pass
+
+
+def _strategy(**overrides) -> StrategyConfig:
+    base = dict(
+        name="Kernel Test",
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 6, 1),
+        exit_rules=[ExitRule(type=ExitType.TIME, value=5)],
+    )
+    base.update(overrides)
+    return StrategyConfig(**base)
+
+
+def _run(kernel: str, bars: pd.DataFrame, strat: StrategyConfig, entry=None, exit_sig=None):
+    engine = BacktestEngine(data_layer=None, kernel=kernel)
+    if entry is None:
+        entry = bars["close"] > bars["open"]
+    return engine._simulate(bars, entry, exit_sig, strat, "date", _noop)
+
+
+def _trade_tuples(trades):
+    return [
+        (t.ticker, str(t.entry_date), str(t.exit_date), t.holding_bars,
+         round(t.entry_fill_price, 8), round(t.exit_fill_price, 8), round(t.pnl, 6))
+        for t in trades
+    ]
+
+
+# ── Tests ────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize("exit_rules", [
+    [ExitRule(type=ExitType.TIME, value=5)],
+    [ExitRule(type=ExitType.STOP_LOSS, value=0.02), ExitRule(type=ExitType.TARGET, value=0.03)],
+    [ExitRule(type=ExitType.TRAILING_STOP, value=0.02), ExitRule(type=ExitType.TIME, value=20)],
+    [ExitRule(type=ExitType.EOD)],
+])
+@pytest.mark.parametrize("timing", ["next_open", "open", "close"])
+def test_single_ticker_matches_legacy(sample_bars_df, exit_rules, timing):
+    bars = sample_bars_df[sample_bars_df["ticker"] == "AAPL"].reset_index(drop=True)
+    strat = _strategy(exit_rules=exit_rules, entry_timing=timing,
+                      slippage_model=SlippageModel.VOLUME_BASED)
+
+    legacy_trades, legacy_eq, legacy_warns = _run("legacy", bars, strat)
+    new_trades, new_eq, new_warns = _run("chronological", bars, strat)
+
+    assert len(legacy_trades) > 0
+    assert _trade_tuples(new_trades) == _trade_tuples(legacy_trades)
+    assert new_warns == legacy_warns
+    # Equity curve: same last value per day
+    legacy_daily = pd.DataFrame(legacy_eq, columns=["d", "e"]).groupby("d")["e"].last()
+    new_daily = pd.DataFrame(new_eq, columns=["d", "e"]).groupby("d")["e"].last()
+    pd.testing.assert_series_equal(new_daily, legacy_daily)
+
+
+def test_exit_signal_matches_legacy(sample_bars_df):
+    bars = sample_bars_df[sample_bars_df["ticker"] == "TSLA"].reset_index(drop=True)
+    strat = _strategy(exit_rules=[ExitRule(type=ExitType.SIGNAL)])
+    exit_sig = bars["close"] < bars["open"]
+
+    legacy_trades, _, _ = _run("legacy", bars, strat, exit_sig=exit_sig)
+    new_trades, _, _ = _run("chronological", bars, strat, exit_sig=exit_sig)
+    assert _trade_tuples(new_trades) == _trade_tuples(legacy_trades)
+
+
+def test_max_positions_enforced_across_tickers():
+    dates = pd.date_range("2024-01-01", periods=30, freq="B")
+    rows = []
+    for ticker in ["AAA", "BBB", "CCC"]:
+        for d in dates:
+            rows.append({"ticker": ticker, "date": d, "open": 10.0, "high": 10.5,
+                         "low": 9.5, "close": 10.2, "volume": 1_000_000})
+    bars = pd.DataFrame(rows)
+    entry = pd.Series(True, index=bars.index)
+    strat = _strategy(max_positions=1, exit_rules=[ExitRule(type=ExitType.TIME, value=3)])
+
+    trades, _, _ = _run("chronological", bars, strat, entry=entry)
+
+    intervals = sorted((pd.Timestamp(t.entry_date), pd.Timestamp(t.exit_date)) for t in trades)
+    for (_, prev_exit), (next_entry, _) in zip(intervals, intervals[1:]):
+        assert next_entry >= prev_exit
+    # Positions rotate through time instead of one ticker holding the whole period
+    assert {t.ticker for t in trades} == {"AAA"}
+    assert len(trades) > 5
+
+
+def test_events_are_time_ordered(sample_bars_df):
+    shuffled = sample_bars_df.sort_values(["ticker", "date"], ascending=[False, True]).reset_index(drop=True)
+    strat = _strategy()
+    trades, eq, _ = _run("chronological", shuffled, strat)
+    exit_dates = [pd.Timestamp(t.exit_date) for t in trades[:-2]]
+    assert exit_dates == sorted(exit_dates)
+    eq_days = [d for d, _ in eq]
+    assert eq_days == sorted(eq_days)
+
+
+def test_unknown_kernel_rejected():
+    with pytest.raises(ValueError):
+        BacktestEngine(data_layer=None, kernel="numba")
@@ -0,0 +1,75 @@
+"""Tests for analysis.sweep – parallel executor vs serial engine runs."""
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis.sweep import SharedBars, SweepExecutor, apply_params, attach_shared_bars
+from analysis.walk_forward import WalkForwardAnalyzer
+from core.data_layer import DataLayer
+from core.engine import BacktestEngine
+from core.models import Signal, SignalOperator
+
+
+@pytest.fixture()
+def strategy(sample_strategy):
+    return sample_strategy.model_copy(update={
+        "entry_signals": [Signal(indicator="range_pct", operator=SignalOperator.GT, value=1.0)],
+    })
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    return BacktestEngine(DataLayer(polygon_data_dir=tmp_path))
+
+
+def test_shared_bars_roundtrip(sample_bars_df):
+    shared = SharedBars(sample_bars_df)
+    try:
+        df, handles = attach_shared_bars(shared.spec)
+        pd.testing.assert_frame_equal(df, sample_bars_df, check_dtype=False)
+        assert df["date"].dtype == sample_bars_df["date"].dtype
+        for h in handles:
+            h.close()
+    finally:
+        shared.close()
+
+
+def test_apply_params(strategy):
+    out = apply_params(strategy, {"exit_rules.0.value": 3, "max_positions": 7})
+    assert out.exit_rules[0].value == 3
+    assert out.max_positions == 7
+    assert strategy.exit_rules[0].value == 5
+    with pytest.raises(ValueError):
+        apply_params(strategy, {"exit_rules.0.nope": 1})
+
+
+def test_parallel_walk_forward_matches_serial(sample_bars_df, strategy, engine, tmp_path):
+    serial = asyncio.run(WalkForwardAnalyzer(engine).analyze(strategy, sample_bars_df, n_splits=3))
+
+    seen = []
+    executor = SweepExecutor(max_workers=2, data_dir=tmp_path)
+    parallel = asyncio.run(WalkForwardAnalyzer(engine, executor).analyze(
+        strategy, sample_bars_df, n_splits=3, on_result=lambda r, done, total: seen.append(done)))
+
+    assert parallel.model_dump() == serial.model_dump()
+    assert seen == list(range(1, 2 * serial.n_splits + 1))
+
+
+def test_grid_matches_individual_runs(sample_bars_df, strategy, engine, tmp_path):
+    grid = {"exit_rules.0.value": [2, 5, 10]}
+    executor = SweepExecutor(max_workers=2, data_dir=tmp_path)
+    result = asyncio.run(executor.grid(strategy, sample_bars_df, grid, metric="total_return_pct"))
+
+    assert result.n_points == 3
+    expected = []
+    for point in result.points:
+        single = asyncio.run(engine.run(apply_params(strategy, point.params),
+                                        bars_df=sample_bars_df.copy()))
+        assert point.core_metrics.model_dump() == single.core_metrics.model_dump()
+        expected.append(single.core_metrics.total_return_pct)
+    assert result.best_value == pytest.approx(max(expected))
+    assert result.best_params == result.points[int(np.argmax(expected))].params
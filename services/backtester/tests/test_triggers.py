@@ -0,0 +1,125 @@
+"""Tests for analysis.triggers – set-based scan vs the per-day reference path."""
+from __future__ import annotations
+
+import json
+import math
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis.triggers import TriggerAnalyzer
+
+_DAYS = ["2026-07-20", "2026-07-21", "2026-07-22"]
+_TYPES = ["new_high", "new_low"]
+_SYMBOLS = ["AAA", "BBB", "CCC", "DDD"]
+
+
+@pytest.fixture()
+def lake(tmp_path):
+    rng = np.random.default_rng(7)
+    con = duckdb.connect()
+    for d_i, dt in enumerate(_DAYS):
+        for etype in _TYPES:
+            n = 60
+            base = pd.Timestamp(f"{dt} 13:30")  # naive: TIMESTAMPTZ exigiría pytz
+            df = pd.DataFrame({
+                "ts": [base + pd.Timedelta(minutes=int(m)) for m in rng.integers(0, 390, n)],
+                "symbol": rng.choice(_SYMBOLS, n),
+                "price": rng.uniform(1, 50, n).round(2),
+                "rvol": rng.uniform(0, 6, n),
+                "change_pct": rng.normal(0, 5, n),
+                "volume": rng.uniform(1e4, 1e6, n).round(1),
+                "market_cap": np.where(rng.random(n) < 0.3, np.nan, rng.uniform(1e7, 1e10, n)),
+            })
+            df.loc[3, "rvol"] = float("nan")
+            if d_i == 1:
+                df["quality"] = rng.uniform(0, 1, n)
+            out = tmp_path / "events" / f"dt={dt}" / f"event_type={etype}"
+            out.mkdir(parents=True)
+            con.register("_df", df)
+            con.execute(f"COPY (SELECT * FROM _df) TO '{out / 'part-0.parquet'}' (FORMAT parquet)")
+            con.unregister("_df")
+    snap = tmp_path / "reference" / "enriched_close" / f"dt={_DAYS[0]}"
+    snap.mkdir(parents=True)
+    sdf = pd.DataFrame({"symbol": _SYMBOLS, "market_cap": [5e8, 2e9, 8e9, 1e7],
+                        "bid": [1.0, 10.0, 20.0, 3.0], "ask": [1.1, 10.1, 20.2, 3.1]})
+    con.register("_s", sdf)
+    con.execute(f"COPY (SELECT * FROM _s) TO '{snap / 'enriched_close.parquet'}' (FORMAT parquet)")
+    return tmp_path
+
+
+def _strip(result: dict) -> dict:
+    out = {k: v for k, v in result.items() if k != "provenance"}
+    return _nan_safe(out)
+
+
+def _nan_safe(obj):
+    if isinstance(obj, float) and math.isnan(obj):
+        return "nan"
+    if isinstance(obj, dict):
+        return {k: _nan_safe(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_nan_safe(v) for v in obj]
+    return obj
+
+
+@pytest.mark.parametrize("filters", [
+    {"price_min": 5, "price_max": 30},
+    {"rvol_min": 4, "rvol_max": 1},                       # rango invertido
+    {"market_cap_min": 1e9, "volume_max": 500000.5},      # NULL rellenable desde snapshot
+    {"bid_min": 5, "change_min": -2},                     # filtro de snapshot
+    {"aq:new_high": 0.5, "symbols_exclude": ["BBB"]},
+    {"symbols_include": ["AAA", "CCC"], "rvol_min": 1},
+])
+def test_set_based_matches_per_day(lake, tmp_path, filters):
+    strategy = {"event_types": _TYPES, **filters}
+    legacy = TriggerAnalyzer(lake_dir=str(lake), minute_dir=str(tmp_path / "minute"),
+                             set_based=False).run(strategy, _DAYS[0], _DAYS[-1], collect_triggers=True)
+    fast = TriggerAnalyzer(lake_dir=str(lake), minute_dir=str(tmp_path / "minute"),
+                           set_based=True).run(strategy, _DAYS[0], _DAYS[-1], collect_triggers=True)
+    assert legacy["triggers_total"] > 0
+    assert _strip(fast) == _strip(legacy)
+
+
+def test_pushdown_reports_sql_checks(lake, tmp_path):
+    strategy = {"event_types": _TYPES, "price_min": 5, "symbols_exclude": ["BBB"], "bid_min": 5}
+    res = TriggerAnalyzer(lake_dir=str(lake), minute_dir=str(tmp_path / "minute")) \
+        .run(strategy, _DAYS[0], _DAYS[-1])
+    assert res["provenance"]["mode"] == "set_based"
+    assert set(res["provenance"]["sql_pushdown"]) == {"price", "symbolsExclude"}
+
+
+def _write_catalog(lake, days, skip_type=None):
+    """Catálogo mínimo con el formato de shared/utils/lake_catalog.py."""
+    events = lake / "events"
+    cat = events / "_catalog"
+    cat.mkdir()
+    index = {"version": 1, "partitions": {}}
+    for dt in days:
+        files = [
+            {"path": f"dt={dt}/event_type={t}/part-0.parquet", "partition_values": {"event_type": t}}
+            for t in _TYPES if t != skip_type
+        ]
+        (cat / f"dt={dt}.json").write_text(json.dumps({"version": 1, "files": files}))
+        index["partitions"][f"dt={dt}"] = {"files": len(files)}
+    (cat / "_index.json").write_text(json.dumps(index))
+
+
+@pytest.mark.parametrize("set_based", [True, False])
+def test_catalog_files_match_directory_discovery(lake, tmp_path, set_based):
+    strategy = {"event_types": _TYPES, "price_min": 5}
+    kwargs = dict(lake_dir=str(lake), minute_dir=str(tmp_path / "minute"), set_based=set_based)
+    before = TriggerAnalyzer(**kwargs).run(strategy, _DAYS[0], _DAYS[-1], collect_triggers=True)
+    _write_catalog(lake, _DAYS[:2])  # último día sin publicar → glob
+    after = TriggerAnalyzer(**kwargs).run(strategy, _DAYS[0], _DAYS[-1], collect_triggers=True)
+    assert _strip(after) == _strip(before)
+
+
+def test_catalog_is_source_of_truth_for_published_days(lake, tmp_path):
+    _write_catalog(lake, _DAYS, skip_type="new_low")
+    res = TriggerAnalyzer(lake_dir=str(lake), minute_dir=str(tmp_path / "minute")) \
+        .run({"event_types": _TYPES}, _DAYS[0], _DAYS[-1])
+    assert res["triggers_total"] > 0
+    assert set(res["by_type"]) == {"new_high"}
@@ -46,8 +46,10 @@ def main() -> None:
         polygon_api_key=settings.polygon_api_key,
         rest_cache_dir=rest_cache,
         minute_aggs_dir=settings.minute_aggs_dir,
+        indicator_cache_dir=settings.indicator_cache_dir if settings.indicator_cache_enabled else None,
+        indicator_cache_max_gb=settings.indicator_cache_max_gb,
     )
-    engine = BacktestEngine(data_layer)
+    engine = BacktestEngine(data_layer, kernel=settings.simulation_kernel)
     logger.info("backtest_worker_started", queue=queue_name)
 
     while True:
@@ -74,15 +76,19 @@ def main() -> None:
         try:
             response = asyncio.run(
                 execute_backtest_job(
-                    job_type, payload, data_layer, engine, progress_callback=progress_cb
+                    job_type, payload, data_layer, engine, progress_callback=progress_cb,
+                    sweep_workers=settings.sweep_workers,
                 )
             )
-            if response.status == "success" and response.result is not None:
+            if response.status == "success" and (response.result is not None or response.sweep is not None):
                 repo.set_result(job_id, response)
                 repo.update_job(job_id, {"status": "completed", "progress_pct": 100, "message": "Done"})
                 if user_id and hasattr(repo, "remove_from_running"):
                     repo.remove_from_running(user_id, job_id)
-                logger.info("job_completed", job_id=job_id, trades=response.result.core_metrics.total_trades)
+                if response.sweep is not None:
+                    logger.info("job_completed", job_id=job_id, sweep_points=response.sweep.n_points)
+                else:
+                    logger.info("job_completed", job_id=job_id, trades=response.result.core_metrics.total_trades)
             else:
                 err = response.error or "Unknown error"
                 repo.set_error(job_id, err)
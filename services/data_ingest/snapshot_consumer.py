@@ -16,6 +16,12 @@ from shared.config.settings import settings
 from shared.models.polygon import PolygonSnapshot, PolygonSnapshotResponse
 from shared.utils.redis_client import RedisClient
 from shared.utils.logger import get_logger
+from shared.utils.columnar_snapshot import (
+    SNAPSHOT_COLUMNAR_KEY,
+    SNAPSHOT_POLYGON_KEY,
+    SNAPSHOT_SCHEMA_KEY,
+    write_columnar_snapshot,
+)
 from http_clients import http_clients
 
 logger = get_logger(__name__)
@@ -38,6 +44,9 @@ class SnapshotConsumer:
         self.last_snapshot_count = 0
         self.errors = 0
         self.start_time = time.time()
+        # Claves del otro formato borradas (una vez): los lectores prefieren
+        # el columnar y no deben ver un valor viejo tras cambiar snapshot_format
+        self._stale_format_cleared = False
     
     async def consume_snapshot(self) -> int:
         """
@@ -136,6 +145,10 @@ class SnapshotConsumer:
         try:
             # Convertir todos los snapshots a JSON con FILTRO de precio mínimo
             # IMPORTANTE: Agregar campos @property manualmente
+            # En modo columnar no hay model_dump ni JSON: se guardan los modelos
+            # y se empaquetan directamente en el blob binario
+            columnar = settings.snapshot_format == "columnar"
+            kept: List[PolygonSnapshot] = []
             snapshot_list = []
             skipped_low_price = 0
             price_sources = {"lastTrade": 0, "day": 0, "prevDay": 0, "none": 0}
@@ -159,33 +172,52 @@ class SnapshotConsumer:
                 if cp is None or cp < 0.1:
                     skipped_low_price += 1
                     continue
+                if columnar:
+                    kept.append(s)
+                    continue
                 ticker_dict = s.model_dump(mode='json')
                 # Agregar computed fields que no se incluyen automáticamente
                 ticker_dict['current_price'] = cp
                 ticker_dict['current_volume'] = s.current_volume
                 snapshot_list.append(ticker_dict)
             
-            # Metadata del snapshot
-            snapshot_data = {
-                "timestamp": datetime.now().isoformat(),
-                "count": len(snapshot_list),
-                "tickers": snapshot_list
-            }
+            timestamp = datetime.now().isoformat()
+            if columnar:
+                # Un valor binario + schema key (ver shared/utils/columnar_snapshot.py);
+                # los lectores de dicts usan load_polygon_snapshot
+                kept_count = await write_columnar_snapshot(
+                    self.redis, kept, ttl=600, timestamp=timestamp
+                )
+                stale_keys = (SNAPSHOT_POLYGON_KEY,)
+            else:
+                # Metadata del snapshot
+                snapshot_data = {
+                    "timestamp": timestamp,
+                    "count": len(snapshot_list),
+                    "tickers": snapshot_list
+                }
+                
+                # Guardar snapshot COMPLETO en key fijo
+                # El scanner leerá de aquí cuando esté listo
+                await self.redis.set(
+                    SNAPSHOT_POLYGON_KEY,
+                    snapshot_data,
+                    ttl=600  # 10 minutos (suficiente para fin de semana + mercado abierto)
+                )
+                kept_count = len(snapshot_list)
+                stale_keys = (SNAPSHOT_COLUMNAR_KEY, SNAPSHOT_SCHEMA_KEY)
             
-            # Guardar snapshot COMPLETO en key fijo
-            # El scanner leerá de aquí cuando esté listo
-            await self.redis.set(
-                "snapshot:polygon:latest",
-                snapshot_data,
-                ttl=600  # 10 minutos (suficiente para fin de semana + mercado abierto)
-            )
+            if not self._stale_format_cleared:
+                await self.redis.delete(*stale_keys)
+                self._stale_format_cleared = True
             
             # Log de estadísticas de filtro por precio
             logger.info(
                 "low_price_filter_applied",
                 raw_total=len(snapshots),
                 raw_under_0_5=raw_under_0_5,
-                kept=len(snapshot_list),
+                kept=kept_count,
+                format=settings.snapshot_format,
                 filtered_low_price=skipped_low_price,
                 price_sources=price_sources
             )
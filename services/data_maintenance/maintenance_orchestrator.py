@@ -12,6 +12,7 @@ Flujo:
 5. reconcile_parquet    - Reconciliar Parquet flat files afectados por splits (DuckDB/Screener)
 5b. adjust_minute_aggs  - Generar minute_aggs_adjusted del día + re-ajustar por splits recientes
 6. calculate_atr        - Calcular ATR para todos los tickers
+6b. calculate_avg_vols  - Promedios de volumen 5D/10D/3M del universo (scanner)
 6. calculate_rvol       - Calcular RVOL historical averages
 7. sync_ticker_universe - Sincronizar universo de tickers con Polygon (nuevos/delistados/nombres)
 8. export_screener_meta - Exportar metadata para Screener
@@ -92,6 +93,7 @@ class MaintenanceOrchestrator:
                 ("reconcile_parquet_splits", self._task_reconcile_parquet_splits),
                 ("adjust_minute_aggs", self._task_adjust_minute_aggs),
                 ("calculate_atr", self._task_calculate_atr),
+                ("calculate_avg_volumes", self._task_calculate_avg_volumes),
                 ("calculate_rvol", self._task_calculate_rvol),
                 ("calculate_trades_baselines", self._task_calculate_trades_baselines),
                 ("sync_ticker_universe", self._task_sync_ticker_universe),
@@ -109,6 +111,7 @@ class MaintenanceOrchestrator:
                 ("reconcile_parquet_splits", self._task_reconcile_parquet_splits),
                 ("adjust_minute_aggs", self._task_adjust_minute_aggs),
                 ("calculate_atr", self._task_calculate_atr),
+                ("calculate_avg_volumes", self._task_calculate_avg_volumes),
                 ("calculate_rvol", self._task_calculate_rvol),
                 ("calculate_trades_baselines", self._task_calculate_trades_baselines),
                 ("sync_ticker_universe", self._task_sync_ticker_universe),
@@ -198,6 +201,7 @@ class MaintenanceOrchestrator:
                 "load_ohlc": TaskStatus.PENDING,
                 "load_volume_slots": TaskStatus.PENDING,
                 "calculate_atr": TaskStatus.PENDING,
+                "calculate_avg_volumes": TaskStatus.PENDING,
                 "calculate_rvol": TaskStatus.PENDING,
                 "calculate_trades_baselines": TaskStatus.PENDING,
                 "reconcile_splits": TaskStatus.PENDING,
@@ -392,6 +396,25 @@ class MaintenanceOrchestrator:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    async def _task_calculate_avg_volumes(self, target_date: date) -> Dict:
+        """
+        Tarea 4b: Calcular promedios de volumen diario (5D, 10D, 3M)
+        
+        Una query set-based para todo el universo sobre market_data_daily.
+        Guarda en Redis: scanner:avg_volumes → {symbol: "v5,v10,v3m"}
+        El scanner la carga en memoria una vez por día de trading.
+        """
+        try:
+            from tasks.calculate_avg_volumes import CalculateAvgVolumesTask
+            
+            calculator = CalculateAvgVolumesTask(self.redis, self.db)
+            result = await calculator.execute(target_date)
+            
+            return result
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
     async def _task_calculate_rvol(self, target_date: date) -> Dict:
         """
         Tarea 5: Calcular RVOL historical averages
@@ -39,6 +39,7 @@ sys.path.append('/app')
 import pyarrow as pa
 import pyarrow.parquet as pq
 
+from shared.utils.lake_catalog import LakeCatalog
 from shared.utils.logger import get_logger
 from shared.utils.redis_client import RedisClient
 
@@ -155,7 +156,9 @@ class ArchiveEnrichedCloseTask:
         out_path = day_dir / "enriched_close.parquet"
         manifest_path = day_dir / "_manifest.json"
 
+        catalog = LakeCatalog(lake_enriched_dir(), symbol_column="symbol")
         if manifest_path.exists() and not force:
+            catalog.ensure_partition(day_dir.name)
             return {"date": session_date.isoformat(), "status": "skipped"}
 
         records: list[dict] = []
@@ -210,6 +213,7 @@ class ArchiveEnrichedCloseTask:
             "created_at": datetime.now(timezone.utc).isoformat(),
         }
         manifest_path.write_text(json.dumps(manifest, indent=2))
+        catalog.refresh_partition(day_dir.name)
 
         logger.info(
             "archive_enriched_close_done",
@@ -7,6 +7,7 @@ inmutable ANTES de que la retención lo borre:
 
     /data/lake/events/dt=YYYY-MM-DD/event_type=<tipo>/part-000.parquet
     /data/lake/events/dt=YYYY-MM-DD/_manifest.json
+    /data/lake/events/_catalog/dt=YYYY-MM-DD.json   (shared.utils.lake_catalog)
 
 Garantías:
 - Idempotente: un día con `_manifest.json` no se re-archiva (salvo --force).
@@ -40,6 +41,7 @@ sys.path.append('/app')
 import pyarrow as pa
 import pyarrow.parquet as pq
 
+from shared.utils.lake_catalog import LakeCatalog
 from shared.utils.logger import get_logger
 from shared.utils.timescale_client import TimescaleClient
 
@@ -82,6 +84,11 @@ def lake_events_dir() -> Path:
     return Path(os.getenv("LAKE_DIR", "/data/lake")) / "events"
 
 
+def events_catalog() -> LakeCatalog:
+    """Catálogo del lake de eventos (ficheros, rows, rango ts, símbolos)."""
+    return LakeCatalog(lake_events_dir(), ts_column="ts", symbol_column="symbol")
+
+
 def sanitize_partition(value: str) -> str:
     """Nombre de partición seguro para filesystem/Hive-style."""
     cleaned = _UNSAFE_PART.sub("_", value.strip())
@@ -199,6 +206,8 @@ class ArchiveMarketEventsTask:
         manifest_path = day_dir / "_manifest.json"
 
         if manifest_path.exists() and not force:
+            # Día archivado pero ausente del catálogo (caída entre rename y publicación)
+            events_catalog().ensure_partition(day_dir.name)
             return {"date": d.isoformat(), "status": "skipped"}
 
         start, end = day_bounds_utc(d)
@@ -217,6 +226,7 @@ class ArchiveMarketEventsTask:
         columns, schema = await self._table_schema()
 
         tmp_dir = events_dir / f".tmp-dt={d.isoformat()}"
+        old_dir = events_dir / f".old-dt={d.isoformat()}"
         if tmp_dir.exists():
             shutil.rmtree(tmp_dir)
         tmp_dir.mkdir(parents=True)
@@ -257,13 +267,20 @@ class ArchiveMarketEventsTask:
             (tmp_dir / "_manifest.json").write_text(json.dumps(manifest, indent=2))
 
             # Publicación atómica: el directorio final aparece completo o no aparece.
+            # Con --force el día anterior se aparta y se borra solo después de
+            # publicar el nuevo manifiesto en el catálogo.
             if day_dir.exists():
-                shutil.rmtree(day_dir)
+                if old_dir.exists():
+                    shutil.rmtree(old_dir)
+                os.rename(day_dir, old_dir)
             os.rename(tmp_dir, day_dir)
         except BaseException:
             shutil.rmtree(tmp_dir, ignore_errors=True)
             raise
 
+        events_catalog().refresh_partition(day_dir.name)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
         logger.info(
             "market_events archived date=%s rows=%d types=%d dir=%s",
             d.isoformat(), sum(written.values()), len(written), day_dir,
@@ -34,6 +34,7 @@ sys.path.append('/app')
 import pyarrow as pa
 import pyarrow.parquet as pq
 
+from shared.utils.lake_catalog import LakeCatalog
 from shared.utils.logger import get_logger
 from shared.utils.timescale_client import TimescaleClient
 
@@ -95,7 +96,9 @@ class ArchiveReferenceSnapshotsTask:
         out_path = day_dir / "metadata.parquet"
         manifest_path = day_dir / "_manifest.json"
 
+        catalog = LakeCatalog(lake_metadata_dir(), symbol_column="symbol")
         if manifest_path.exists() and not force:
+            catalog.ensure_partition(day_dir.name)
             return {"date": snapshot_date.isoformat(), "status": "skipped"}
 
         col_list = ", ".join(_COLUMNS)
@@ -133,6 +136,7 @@ class ArchiveReferenceSnapshotsTask:
             "created_at": datetime.now(timezone.utc).isoformat(),
         }
         manifest_path.write_text(json.dumps(manifest, indent=2))
+        catalog.refresh_partition(day_dir.name)
 
         logger.info(
             "reference metadata archived date=%s rows=%d (active=%d)",
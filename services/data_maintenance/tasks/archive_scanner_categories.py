@@ -29,6 +29,7 @@ sys.path.append('/app')
 import pyarrow as pa
 import pyarrow.parquet as pq
 
+from shared.utils.lake_catalog import LakeCatalog
 from shared.utils.logger import get_logger
 from shared.utils.redis_client import RedisClient
 
@@ -131,6 +132,9 @@ class ArchiveScannerCategoriesTask:
         tmp = day_dir / f".{out_path.name}.tmp"
         pq.write_table(pa.Table.from_pylist(records, schema=_SCHEMA), tmp, compression="zstd")
         os.rename(tmp, out_path)
+        # Manifiesto del día regenerado con el snap nuevo
+        LakeCatalog(lake_categories_dir(), ts_column="captured_at",
+                    symbol_column="symbol").refresh_partition(day_dir.name)
 
         logger.info(
             "scanner categories archived %s rows=%d categories=%d missing=%s",
@@ -0,0 +1,131 @@
+"""
+Calculate Average Volumes Task
+==============================
+
+Pre-calcula los promedios de volumen diario (5D, 10D, 3M) de TODO el universo
+en una sola query set-based sobre market_data_daily y los publica en Redis.
+
+CONCEPTO:
+- El scanner necesita avg_volume_5d / 10d / 3m para cada ticker en cada ciclo.
+- Antes se calculaba con un ROW_NUMBER() OVER sobre market_data_daily en cada
+  scan (cada ~5s). Los valores solo cambian una vez por día de trading.
+- Esta tarea corre tras load_ohlc (que escribe las barras diarias) y el scanner
+  carga el resultado en un array denso en memoria (ver
+  services/scanner/avg_volume_cache.py).
+
+ALMACENAMIENTO:
+- Redis HASH: scanner:avg_volumes → {SYMBOL: "v5,v10,v3m"}
+- Campo __meta__: {"trading_date", "periods", "count"}
+- TTL: 36 horas (cubre el día de trading aunque la tarea siguiente se retrase)
+"""
+
+import sys
+sys.path.append('/app')
+
+from datetime import date, datetime, timedelta
+from typing import Dict
+
+import orjson
+
+from shared.utils.redis_client import RedisClient
+from shared.utils.timescale_client import TimescaleClient
+from shared.utils.logger import get_logger
+from shared.utils.avg_volumes import (
+    AVG_VOLUMES_HASH,
+    AVG_VOLUME_PERIODS,
+    AVG_VOLUME_WINDOW_CALENDAR_DAYS,
+    avg_volumes_query,
+)
+
+logger = get_logger(__name__)
+
+
+class CalculateAvgVolumesTask:
+    """
+    Tarea: Calcular promedios de volumen diario para todo el universo
+
+    Proceso:
+    1. Una query con ROW_NUMBER() OVER (PARTITION BY symbol) sobre la ventana
+       de los últimos ~100 días naturales
+    2. Escribir una key temporal en lotes de batch_size campos
+    3. __meta__ + RENAME atómico (el scanner recarga cuando cambia trading_date)
+    """
+
+    name = "calculate_avg_volumes"
+
+    def __init__(self, redis_client: RedisClient, timescale_client: TimescaleClient):
+        self.redis = redis_client
+        self.db = timescale_client
+
+        # Configuración
+        self.batch_size = 2000
+        self.redis_ttl = 129600  # 36 horas
+        self.min_days_required = 3
+        self.window_calendar_days = AVG_VOLUME_WINDOW_CALENDAR_DAYS
+
+    async def execute(self, target_date: date) -> Dict:
+        """
+        Ejecutar cálculo de promedios de volumen
+
+        Args:
+            target_date: Último día de trading cargado (normalmente ayer)
+
+        Returns:
+            Dict con resultado
+        """
+        logger.info("avg_volumes_task_starting", target_date=str(target_date))
+        start = datetime.now()
+
+        try:
+            window_start = target_date - timedelta(days=self.window_calendar_days)
+            rows = await self.db.fetch(
+                avg_volumes_query(), window_start, target_date, self.min_days_required
+            )
+
+            if not rows:
+                return {"success": False, "error": "No daily bars found for avg volumes"}
+
+            mapping: Dict[str, str] = {}
+            for row in rows:
+                mapping[row['symbol']] = ",".join(
+                    "" if row[name] is None else str(int(row[name]))
+                    for name, _ in AVG_VOLUME_PERIODS
+                )
+
+            # Construir en una key temporal y RENAME atómico: el scanner nunca
+            # ve un hash a medio escribir ni símbolos que ya no existen
+            building_key = f"{AVG_VOLUMES_HASH}:building"
+            await self.redis.client.delete(building_key)
+
+            symbols = list(mapping.keys())
+            for i in range(0, len(symbols), self.batch_size):
+                chunk = {s: mapping[s] for s in symbols[i:i + self.batch_size]}
+                await self.redis.client.hset(building_key, mapping=chunk)
+
+            meta = orjson.dumps({
+                "trading_date": target_date.isoformat(),
+                "periods": [name for name, _ in AVG_VOLUME_PERIODS],
+                "count": len(mapping),
+            }).decode()
+            pipe = self.redis.client.pipeline(transaction=True)
+            pipe.hset(building_key, "__meta__", meta)
+            pipe.rename(building_key, AVG_VOLUMES_HASH)
+            pipe.expire(AVG_VOLUMES_HASH, self.redis_ttl)
+            await pipe.execute()
+
+            elapsed = (datetime.now() - start).total_seconds()
+            logger.info(
+                "avg_volumes_task_completed",
+                symbols=len(mapping),
+                duration_seconds=round(elapsed, 2)
+            )
+
+            return {
+                "success": True,
+                "symbols": len(mapping),
+                "duration_seconds": round(elapsed, 2)
+            }
+
+        except Exception as e:
+            logger.error("avg_volumes_task_failed", error=str(e))
+            return {"success": False, "error": str(e)}
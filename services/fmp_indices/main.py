@@ -42,6 +42,7 @@ from fastapi import FastAPI
 from shared.config.settings import settings
 from shared.config.index_symbols import INDEX_ALIASES, from_fmp
 from shared.contracts.realtime import build_realtime_aggregate_payload
+from shared.utils.alert_partitions import stable_partition
 from shared.utils.logger import configure_logging, get_logger
 from shared.utils.redis_client import RedisClient
 from shared.utils.timescale_client import TimescaleClient
@@ -182,7 +183,9 @@ async def process_quote(q: dict, source: str) -> None:
     try:
         await redis_client.publish_to_stream(AGGREGATES_STREAM, payload)
         if INDICES_TO_ALERT_STREAMS:
-            partition = hash(symbol) % NUM_ALERT_PARTITIONS
+            # Los índices nunca entran en los overrides de polygon_ws
+            # (no pasan por su contador): basta el hash estable del mapa.
+            partition = stable_partition(symbol, NUM_ALERT_PARTITIONS)
             await redis_client.publish_to_stream(
                 f"stream:agg:p{partition}", payload, maxlen=50000
             )
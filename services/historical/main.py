@@ -41,6 +41,7 @@ from shared.events import (
 from historical_loader import HistoricalLoader
 from ticker_universe_loader import TickerUniverseLoader
 from polygon_data_loader import PolygonDataLoader
+from rvol_hist_builder import RVOLHistAvgBuilder
 from http_clients import http_clients
 
 # Configure logging
@@ -57,6 +58,7 @@ timescale_client: Optional[TimescaleClient] = None
 historical_loader: Optional[HistoricalLoader] = None
 ticker_universe_loader: Optional[TickerUniverseLoader] = None
 polygon_data_loader: Optional[PolygonDataLoader] = None
+rvol_hist_builder: Optional[RVOLHistAvgBuilder] = None
 event_bus: Optional[EventBus] = None
 
 # Lock para prevenir ejecuciones simultáneas de warmup
@@ -355,7 +357,7 @@ async def periodic_warmup_fallback():
 async def lifespan(app: FastAPI):
     """Lifecycle manager con Event Bus integrado"""
     global redis_client, timescale_client, event_bus
-    global historical_loader, ticker_universe_loader, polygon_data_loader
+    global historical_loader, ticker_universe_loader, polygon_data_loader, rvol_hist_builder
     
     logger.info("Starting Historical Service (REFACTORED)")
     
@@ -388,6 +390,7 @@ async def lifespan(app: FastAPI):
         timescale_client=timescale_client,
         polygon_api_key=settings.POLYGON_API_KEY
     )
+    rvol_hist_builder = RVOLHistAvgBuilder(redis_client, timescale_client)
     
     # 5. Register event handlers
     event_bus.subscribe(EventType.SESSION_CHANGED, handle_session_changed)
@@ -577,58 +580,19 @@ async def get_rvol_hist_avg_bulk(
     Calcula el promedio histórico acumulado por slot para TODOS los slots de un símbolo
     en una sola consulta y lo cachea en Redis usando HASH (optimizado):
       - Hash: rvol:hist:avg:{SYMBOL}:{DAYS} con fields {slot -> avg}
-      - TTL: 8 horas (suficiente para día de trading)
+      - TTL: 14 horas (suficiente para día de trading)
       - Límite: 250 slots (4:00 AM - 8:00 PM = 192 slots reales + margen)
+    
+    Usa el mismo builder set-based que /api/rvol/hist-avg/universe restringido
+    a un símbolo (fill-forward por día, 0 antes del primer slot con datos).
     """
     try:
         sym = symbol.upper()
-        # Consulta con ventana para rellenar faltantes por día (running max)
-        query = (
-            "WITH last_days AS ("
-            "  SELECT DISTINCT date"
-            "  FROM volume_slots"
-            "  WHERE symbol = $1 AND date < CURRENT_DATE"
-            "  ORDER BY date DESC"
-            "  LIMIT $2"
-            "), filled AS ("
-            "  SELECT vs.date, vs.slot_number,"
-            "         MAX(vs.volume_accumulated) OVER ("
-            "             PARTITION BY vs.date"
-            "             ORDER BY vs.slot_number"
-            "             ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW"
-            "         ) AS vol_acc"
-            "  FROM volume_slots vs"
-            "  JOIN last_days d ON vs.date = d.date"
-            "  WHERE vs.symbol = $1 AND vs.slot_number <= $3"
-            "), slots AS ("
-            "  SELECT generate_series(0, $3) AS slot_number"
-            ")"
-            "SELECT s.slot_number, AVG("
-            "  (SELECT MAX(f.vol_acc) FROM filled f WHERE f.date = d.date AND f.slot_number <= s.slot_number)"
-            ") AS avg_vol"
-            "  FROM (SELECT date FROM last_days) d"
-            "  CROSS JOIN slots s"
-            " GROUP BY s.slot_number"
-            " ORDER BY s.slot_number"
-        )
-        rows = await timescale_client.fetch(query, sym, days, max_slot)
-        if not rows:
+        stats = await rvol_hist_builder.build(days=days, max_slot=max_slot, symbols=[sym])
+        if not stats["symbols"]:
             raise HTTPException(status_code=404, detail="No historical data")
 
-        # Preparar hash para Redis (SOLO hash, sin claves individuales)
-        hash_key = f"rvol:hist:avg:{sym}:{days}"
-        mapping = {}
-        for row in rows:
-            slot_num = int(row["slot_number"]) if isinstance(row, dict) else int(row[0])
-            raw_avg = (row["avg_vol"]) if isinstance(row, dict) else (row[1])
-            avg_val = int(raw_avg or 0)
-            mapping[str(slot_num)] = str(avg_val)
-
-        # Guardar SOLO hash (optimizado - 1 clave en lugar de 250)
-        await redis_client.hmset(hash_key, mapping, serialize=False)
-        await redis_client.expire(hash_key, 50400)  # 14 horas TTL
-
-        return {"symbol": sym, "days": days, "slots": len(mapping)}
+        return {"symbol": sym, "days": days, "slots": stats["slots"]}
     except HTTPException:
         raise
     except Exception as e:
@@ -636,6 +600,31 @@ async def get_rvol_hist_avg_bulk(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/rvol/hist-avg/universe")
+async def build_rvol_hist_avg_universe(
+    days: int = Query(5, ge=1, le=60, description="Lookback trading days (trading days)"),
+    max_slot: int = Query(191, ge=1, le=250, description="Maximum slot to compute (0-250, trading day slots)")
+):
+    """
+    Construye rvol:hist:avg:{SYMBOL}:{DAYS} para TODO el universo en una pasada:
+      - UNA query set-based sobre volume_slots (últimos N días de cada símbolo)
+      - Fill-forward y promedio vectorizados
+      - Escritura en pipelines por lotes
+    
+    Devuelve tiempos de build y contadores (símbolos, filas, hashes).
+    """
+    try:
+        stats = await rvol_hist_builder.build(days=days, max_slot=max_slot)
+        await redis_client.set(
+            "historical:last_rvol_hist_build",
+            {**stats, "timestamp": datetime.now().isoformat()}
+        )
+        return {"status": "completed", **stats}
+    except Exception as e:
+        logger.error("error_building_rvol_hist_avg_universe", days=days, error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/api/trades/baseline/bulk")
 async def get_trades_baseline_bulk(
     symbol: str = Query(..., description="Ticker symbol"),
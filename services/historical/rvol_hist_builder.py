@@ -0,0 +1,120 @@
+"""
+RVOL Historical Averages - Builder set-based para todo el universo
+
+Calcula rvol:hist:avg:{SYMBOL}:{DAYS} (promedio del volumen ACUMULADO por slot
+en los últimos N días de trading) para todos los símbolos en una pasada:
+
+1-3. Query + fill-forward + promedio por slot, compartidos con la matriz de
+   analytics (shared/utils/rvol_slot_averages.py)
+4. Escritura en Redis con pipelines de `write_batch` hashes (DEL + HSET + EXPIRE)
+
+Sustituye N queries por símbolo (con subquery correlacionada por día×slot)
+por una sola query y un cálculo vectorizado.
+"""
+
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from shared.utils.logger import get_logger
+from shared.utils.rvol_slot_averages import average_slot_rows, fetch_slot_day_rows
+
+logger = get_logger(__name__)
+
+HASH_PREFIX = "rvol:hist:avg"
+HASH_TTL_SECONDS = 50400  # 14 horas (igual que el endpoint por símbolo)
+
+# Ventana natural para encontrar N días con datos (festivos/fines de semana)
+_CALENDAR_DAYS_PER_TRADING_DAY = 2
+_MIN_CALENDAR_WINDOW = 14
+
+
+class RVOLHistAvgBuilder:
+    """Construye los promedios históricos de RVOL con una query para N símbolos."""
+
+    def __init__(self, redis_client, timescale_client, write_batch: int = 500):
+        self.redis = redis_client
+        self.db = timescale_client
+        self.write_batch = write_batch
+
+    async def build(
+        self,
+        days: int = 5,
+        max_slot: int = 191,
+        symbols: Optional[List[str]] = None,
+        as_of: Optional[date] = None
+    ) -> Dict:
+        """
+        Calcula y escribe los hashes de promedios.
+
+        Args:
+            days: Días de trading de lookback
+            max_slot: Último slot a calcular (inclusive)
+            symbols: Restringir a estos símbolos (None = todo volume_slots)
+            as_of: Fecha de referencia (se usan días anteriores); hoy por defecto
+
+        Returns:
+            Stats: símbolos, filas leídas, hashes/campos escritos y tiempos
+        """
+        as_of = as_of or date.today()
+        t_start = time.perf_counter()
+
+        symbols_out, matrix, rows_read = await self._compute(days, max_slot, symbols, as_of)
+        t_query = time.perf_counter()
+
+        hashes_written = await self._write(symbols_out, matrix, days)
+        t_end = time.perf_counter()
+
+        stats = {
+            "symbols": len(symbols_out),
+            "rows_read": rows_read,
+            "slots": max_slot + 1,
+            "days": days,
+            "hashes_written": hashes_written,
+            "fields_written": hashes_written * (max_slot + 1),
+            "compute_seconds": round(t_query - t_start, 3),
+            "write_seconds": round(t_end - t_query, 3),
+            "total_seconds": round(t_end - t_start, 3),
+        }
+        logger.info("rvol_hist_avg_build_completed", **stats)
+        return stats
+
+    async def _compute(
+        self,
+        days: int,
+        max_slot: int,
+        symbols: Optional[List[str]],
+        as_of: date
+    ):
+        window_start = as_of - timedelta(
+            days=max(days * _CALENDAR_DAYS_PER_TRADING_DAY + 7, _MIN_CALENDAR_WINDOW)
+        )
+        rows = await fetch_slot_day_rows(
+            self.db, as_of, window_start, days, max_slot + 1, symbols
+        )
+        symbols_out, averages = average_slot_rows(rows, max_slot + 1)
+        return symbols_out, averages.astype(np.int64), len(rows)
+
+    async def _write(self, symbols: List[str], matrix: np.ndarray, days: int) -> int:
+        """
+        Escribe un hash por símbolo con TODOS los slots (0 incluido: evita
+        que analytics trate un slot sin volumen como miss y llame al bulk).
+        """
+        if not symbols:
+            return 0
+        slot_fields = [str(s) for s in range(matrix.shape[1])]
+        written = 0
+        for start in range(0, len(symbols), self.write_batch):
+            pipe = self.redis.client.pipeline(transaction=False)
+            chunk = symbols[start:start + self.write_batch]
+            for offset, sym in enumerate(chunk):
+                hash_key = f"{HASH_PREFIX}:{sym}:{days}"
+                values = matrix[start + offset].tolist()
+                pipe.delete(hash_key)
+                pipe.hset(hash_key, mapping=dict(zip(slot_fields, map(str, values))))
+                pipe.expire(hash_key, HASH_TTL_SECONDS)
+            await pipe.execute()
+            written += len(chunk)
+        return written
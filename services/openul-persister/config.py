@@ -35,6 +35,15 @@ class Settings(BaseSettings):
     batch_timeout_ms: int = Field(default=2000, description="Flush forzado tras N ms sin llenar el lote")
     block_ms: int = Field(default=2000, description="Bloqueo de XREADGROUP en ms")
 
+    # ── Ingesta de alto throughput ──────────────────────────────────────
+    # "insert": executemany fila a fila (comportamiento original)
+    # "copy":   COPY binario a openul_news_staging (UNLOGGED) + un unico
+    #           INSERT ... SELECT ... ON CONFLICT por lote, con tamano de lote
+    #           adaptativo segun el lag del consumer group
+    ingest_mode: str = Field(default="insert", description="insert | copy")
+    copy_batch_min: int = Field(default=100, description="Lote minimo en modo copy (sin lag)")
+    copy_batch_max: int = Field(default=10000, description="Lote maximo en modo copy (recuperando backlog)")
+
     # ── Servicio ────────────────────────────────────────────────────────
     service_port: int = Field(default=8071, description="Puerto del health server")
     log_level: str = Field(default="INFO", description="Log level")
@@ -10,6 +10,9 @@ Diseno:
   - Consumer group => si el servicio se cae, retoma desde el ultimo XACK.
   - Batch inserts + ON CONFLICT DO NOTHING => idempotente y eficiente.
   - Pending-claim al arrancar => reprocesa lo entregado-pero-no-confirmado.
+  - INGEST_MODE=copy => COPY binario a una tabla UNLOGGED de staging y un
+    unico INSERT ... SELECT ... ON CONFLICT por lote; el tamano de lote se
+    adapta al lag del consumer group (recuperar backlog en segundos).
 """
 
 import asyncio
@@ -45,7 +48,11 @@ structlog.configure(
 
 logger = structlog.get_logger(__name__)
 
-MIGRATION_PATH = os.path.join(os.path.dirname(__file__), "migrations", "001_create_openul_news.sql")
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+MIGRATION_PATHS = [
+    os.path.join(MIGRATIONS_DIR, "001_create_openul_news.sql"),
+    os.path.join(MIGRATIONS_DIR, "002_create_openul_news_staging.sql"),
+]
 
 _INSERT_SQL = """
 INSERT INTO openul_news (
@@ -60,6 +67,24 @@ INSERT INTO openul_news (
 ON CONFLICT (id) DO NOTHING
 """
 
+_NEWS_COLUMNS = (
+    "id", "stream_id", "type", "text", "tickers", "source",
+    "created_at", "received_at", "media", "urls",
+    "ref_id", "direction", "change_pct", "price", "ref_price", "delay_seconds",
+)
+
+# Modo copy: el lote se copia a openul_news_staging y se fusiona en una sola
+# sentencia. Todo ocurre en una transaccion, asi que el merge solo ve las filas
+# de este lote (las de otra replica no estan confirmadas) y el DELETE deja la
+# staging vacia al hacer commit.
+_MERGE_SQL = f"""
+INSERT INTO openul_news ({", ".join(_NEWS_COLUMNS)})
+SELECT {", ".join(_NEWS_COLUMNS)} FROM openul_news_staging
+ON CONFLICT (id) DO NOTHING
+"""
+
+_CLEAR_STAGING_SQL = "DELETE FROM openul_news_staging"
+
 
 class Persister:
     def __init__(self) -> None:
@@ -73,10 +98,16 @@ class Persister:
             "messages_read": 0,
             "errors": 0,
             "last_insert_at": None,
+            "ingest_mode": settings.ingest_mode,
+            "batch_size": self._initial_batch_size(),
+            "stream_lag": None,
         }
 
     # ── Lifecycle ────────────────────────────────────────────────────────
     async def start(self) -> None:
+        if settings.ingest_mode not in ("insert", "copy"):
+            raise ValueError(f"INGEST_MODE debe ser 'insert' o 'copy', no {settings.ingest_mode!r}")
+
         redis_url = (
             f"redis://:{settings.redis_password}@{settings.redis_host}:{settings.redis_port}"
             if settings.redis_password
@@ -121,10 +152,10 @@ class Persister:
     # ── Setup ────────────────────────────────────────────────────────────
     async def _apply_migration(self) -> None:
         try:
-            with open(MIGRATION_PATH, "r", encoding="utf-8") as fh:
-                sql = fh.read()
             async with self.pool.acquire() as conn:
-                await conn.execute(sql)
+                for path in MIGRATION_PATHS:
+                    with open(path, "r", encoding="utf-8") as fh:
+                        await conn.execute(fh.read())
             logger.info("migration_applied")
         except Exception as exc:  # noqa: BLE001
             logger.error("migration_failed", error=str(exc))
@@ -168,11 +199,12 @@ class Persister:
         el bucle continuo de mensajes nuevos.
         """
         while self._running:
+            count = self._stats["batch_size"]
             resp = await self.redis.xreadgroup(
                 groupname=settings.consumer_group,
                 consumername=settings.consumer_name,
                 streams={settings.redis_stream_key: start_id},
-                count=settings.batch_size,
+                count=count,
                 block=settings.block_ms,
             )
             if not resp:
@@ -203,10 +235,58 @@ class Persister:
             if ack_ids:
                 await self.redis.xack(settings.redis_stream_key, settings.consumer_group, *ack_ids)
 
+            if settings.ingest_mode == "copy":
+                await self._adapt_batch_size(len(entries))
+
             # En modo backlog (id="0"), si devolvio menos del batch, ya no queda.
-            if start_id == "0" and len(entries) < settings.batch_size:
+            if start_id == "0" and len(entries) < count:
                 return
 
+    # ── Adaptive batch size (modo copy) ───────────────────────────────────
+    @staticmethod
+    def _initial_batch_size() -> int:
+        if settings.ingest_mode == "copy":
+            return settings.copy_batch_min
+        return settings.batch_size
+
+    async def _stream_lag(self) -> Optional[int]:
+        """
+        Entradas del stream aun no entregadas al consumer group (campo `lag`
+        de XINFO GROUPS, Redis >= 7). None si no se puede determinar.
+        """
+        try:
+            groups = await self.redis.xinfo_groups(settings.redis_stream_key)
+        except aioredis.ResponseError:
+            return None
+        for group in groups:
+            if group.get("name") == settings.consumer_group:
+                lag = group.get("lag")
+                return int(lag) if lag is not None else None
+        return None
+
+    async def _adapt_batch_size(self, last_read: int) -> None:
+        """
+        Ajusta el COUNT del siguiente XREADGROUP: con backlog lee lotes grandes
+        (un COPY + un merge amortizan mejor), al dia vuelve al minimo para no
+        retrasar la persistencia de cada item.
+        """
+        current = self._stats["batch_size"]
+        lag = await self._stream_lag()
+        self._stats["stream_lag"] = lag
+
+        if lag is None:
+            # Sin lag disponible: un lote lleno indica que hay cola.
+            target = current * 2 if last_read >= current else current // 2
+        elif lag > current:
+            target = max(current * 2, lag)
+        else:
+            target = current // 2
+
+        target = max(settings.copy_batch_min, min(settings.copy_batch_max, target))
+        if target != current:
+            self._stats["batch_size"] = target
+            logger.info("batch_size_adjusted", batch_size=target, previous=current, stream_lag=lag)
+
     # ── Parsing / insert ──────────────────────────────────────────────────
     def _build_row(self, entry_id: str, fields: Dict[str, str]) -> Optional[Tuple]:
         try:
@@ -247,11 +327,24 @@ class Persister:
 
     async def _insert_batch(self, rows: List[Tuple]) -> None:
         async with self.pool.acquire() as conn:
-            await conn.executemany(_INSERT_SQL, rows)
+            if settings.ingest_mode == "copy":
+                await self._copy_merge(conn, rows)
+            else:
+                await conn.executemany(_INSERT_SQL, rows)
         self._stats["rows_inserted"] += len(rows)
         self._stats["batches"] += 1
         self._stats["last_insert_at"] = datetime.now(timezone.utc).isoformat()
-        logger.info("batch_inserted", rows=len(rows))
+        logger.info("batch_inserted", rows=len(rows), mode=settings.ingest_mode)
+
+    @staticmethod
+    async def _copy_merge(conn: asyncpg.Connection, rows: List[Tuple]) -> None:
+        """COPY binario a la staging + merge idempotente en una transaccion."""
+        async with conn.transaction():
+            await conn.copy_records_to_table(
+                "openul_news_staging", records=rows, columns=_NEWS_COLUMNS
+            )
+            await conn.execute(_MERGE_SQL)
+            await conn.execute(_CLEAR_STAGING_SQL)
 
     @staticmethod
     def _parse_dt(val: Any) -> Optional[datetime]:
@@ -0,0 +1,28 @@
+-- Migration: tabla de staging para el modo de ingesta COPY (INGEST_MODE=copy)
+-- Ejecutar contra: DB_HOST / openul
+-- Autor: tradeul | Los lotes entran por COPY binario y se fusionan en openul_news
+-- con un unico INSERT ... SELECT ... ON CONFLICT dentro de la misma transaccion.
+--
+-- UNLOGGED: no escribe WAL (es un buffer transitorio; se vacia en cada lote y
+-- tras un crash Postgres la trunca, que es justo lo que queremos).
+-- Sin PK ni indices: COPY escribe a velocidad de append y los duplicados se
+-- resuelven en el merge contra la PK de openul_news.
+
+CREATE UNLOGGED TABLE IF NOT EXISTS openul_news_staging (
+    id            TEXT,
+    stream_id     TEXT,
+    type          TEXT,
+    text          TEXT,
+    tickers       TEXT[],
+    source        TEXT,
+    created_at    TIMESTAMPTZ,
+    received_at   TIMESTAMPTZ,
+    media         JSONB,
+    urls          TEXT[],
+    ref_id        TEXT,
+    direction     TEXT,
+    change_pct    DOUBLE PRECISION,
+    price         DOUBLE PRECISION,
+    ref_price     DOUBLE PRECISION,
+    delay_seconds INTEGER
+);
@@ -160,6 +160,27 @@ def cmd_search(args):
     asyncio.run(do_search())
 
 
+def cmd_build_columns(args):
+    """Export SQLite metadata into the columnar (memory-mapped) store"""
+    import os
+    from config import settings
+    from columnar_metadata import ColumnarMetadata
+    
+    index_dir = args.index_dir or settings.index_dir
+    db_path = os.path.join(index_dir, f"{args.name}_metadata.db")
+    if not os.path.exists(db_path):
+        print(f"❌ Metadata DB not found: {db_path}")
+        sys.exit(1)
+    
+    store = ColumnarMetadata.build_from_sqlite(
+        db_path,
+        os.path.join(index_dir, f"{args.name}_columns"),
+        chunk_size=args.chunk_size
+    )
+    print(f"\n✅ Columnar metadata built: {len(store):,} rows")
+    print("   Enable with METADATA_BACKEND=columnar")
+
+
 def cmd_stats(args):
     """Show index statistics"""
     from pattern_indexer import PatternIndexer
@@ -225,6 +246,12 @@ def main():
     search_parser.add_argument('--k', type=int, default=50, help='Number of neighbors')
     search_parser.add_argument('--same-ticker', action='store_true', help='Same ticker only')
     
+    # Build columns command
+    cols_parser = subparsers.add_parser('build-columns', help='Build columnar metadata from SQLite')
+    cols_parser.add_argument('--name', default='patterns', help='Index name')
+    cols_parser.add_argument('--index-dir', help='Index directory (default: settings.index_dir)')
+    cols_parser.add_argument('--chunk-size', type=int, default=1_000_000, help='Rows per export chunk')
+    
     # Stats command
     stats_parser = subparsers.add_parser('stats', help='Show statistics')
     stats_parser.add_argument('--name', default='patterns', help='Index name')
@@ -239,6 +266,8 @@ def main():
         cmd_build(args)
     elif args.command == 'search':
         cmd_search(args)
+    elif args.command == 'build-columns':
+        cmd_build_columns(args)
     elif args.command == 'stats':
         cmd_stats(args)
     else:
@@ -0,0 +1,242 @@
+"""
+Columnar Pattern Metadata
+Neighbor metadata as memory-mapped column arrays addressed by FAISS id
+
+Layout ({index_dir}/{name}_columns/):
+- symbol.bin, date.bin, start_time.bin: int32 codes into the vocabularies
+  stored in meta.json (-1 = missing row / NULL)
+- final_return.bin: float32 (NaN = NULL)
+- meta.json: row count and vocabularies
+
+Row i of every column belongs to FAISS id i, so a whole (N, k) result
+matrix is resolved with a single fancy-index per column instead of a
+SQLite query per search. Files are raw binaries (like trajectories.npy)
+so the daily updater can append to them; meta.json is rewritten
+atomically after each append and defines the valid row count.
+"""
+
+import os
+import json
+import shutil
+import sqlite3
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+_VERSION = 1
+CODE_COLUMNS = ("symbol", "date", "start_time")
+_DTYPES = {
+    "symbol": np.int32,
+    "date": np.int32,
+    "start_time": np.int32,
+    "final_return": np.float32,
+}
+
+
+class ColumnarMetadata:
+    """
+    Memory-mapped column store for pattern metadata
+
+    Usage:
+        store = ColumnarMetadata.build_from_sqlite(db_path, path)
+        store = ColumnarMetadata(path)
+        cols = store.take(indices)          # indices: any shape, -1 allowed
+        symbols = store.decode("symbol", cols["symbol"])
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        if meta.get("version") != _VERSION:
+            raise ValueError(f"Unsupported columnar metadata version: {meta.get('version')}")
+
+        self.n_rows: int = meta["n_rows"]
+        self.vocab: Dict[str, List[Optional[str]]] = meta["vocab"]
+        self._codes: Dict[str, Dict[str, int]] = {
+            col: {v: i for i, v in enumerate(values)}
+            for col, values in self.vocab.items()
+        }
+        self.columns: Dict[str, np.ndarray] = {
+            col: self._map(col) for col in _DTYPES
+        }
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return os.path.exists(os.path.join(path, "meta.json"))
+
+    @classmethod
+    def create(cls, path: str) -> "ColumnarMetadata":
+        """Create an empty store (overwrites an existing one)"""
+        os.makedirs(path, exist_ok=True)
+        for col in _DTYPES:
+            open(os.path.join(path, f"{col}.bin"), "wb").close()
+        cls._write_meta(path, 0, {col: [] for col in CODE_COLUMNS})
+        return cls(path)
+
+    @staticmethod
+    def _write_meta(path: str, n_rows: int, vocab: Dict[str, list]):
+        tmp = os.path.join(path, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": _VERSION, "n_rows": n_rows, "vocab": vocab}, f)
+        os.replace(tmp, os.path.join(path, "meta.json"))
+
+    def _map(self, col: str) -> np.ndarray:
+        dtype = _DTYPES[col]
+        if self.n_rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(
+            os.path.join(self.path, f"{col}.bin"),
+            dtype=dtype,
+            mode="r",
+            shape=(self.n_rows,)
+        )
+
+    def _encode(self, col: str, values: Sequence[Optional[str]]) -> np.ndarray:
+        """Map values to int32 codes, growing the vocabulary as needed"""
+        uniques, inverse = np.unique(
+            np.array(["" if v is None else str(v) for v in values], dtype=object),
+            return_inverse=True
+        )
+        codes = self._codes[col]
+        lookup = np.empty(len(uniques), dtype=np.int32)
+        for i, value in enumerate(uniques.tolist()):
+            if value == "":
+                lookup[i] = -1
+                continue
+            if value not in codes:
+                codes[value] = len(self.vocab[col])
+                self.vocab[col].append(value)
+            lookup[i] = codes[value]
+        return lookup[inverse.reshape(-1)]
+
+    def append(
+        self,
+        ids: Sequence[int],
+        symbols: Sequence[Optional[str]],
+        dates: Sequence[Optional[str]],
+        start_times: Sequence[Optional[str]],
+        final_returns: Sequence[Optional[float]],
+    ):
+        """
+        Append rows (ids ascending, >= current row count)
+
+        Gaps in ids are filled with missing rows so that position == id.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return
+        if ids[0] < self.n_rows or np.any(np.diff(ids) <= 0):
+            raise ValueError("Columnar metadata ids must be ascending and past the last row")
+
+        n_new = int(ids[-1]) + 1 - self.n_rows
+        pos = ids - self.n_rows
+
+        data = {
+            "symbol": self._encode("symbol", symbols),
+            "date": self._encode("date", dates),
+            "start_time": self._encode("start_time", start_times),
+            "final_return": np.array(
+                [np.nan if v is None else v for v in final_returns], dtype=np.float32
+            ),
+        }
+
+        for col, values in data.items():
+            fill = np.nan if col == "final_return" else -1
+            block = np.full(n_new, fill, dtype=_DTYPES[col])
+            block[pos] = values
+            file_path = os.path.join(self.path, f"{col}.bin")
+            with open(file_path, "r+b") as f:
+                # Drop bytes left by an interrupted append before writing
+                f.truncate(self.n_rows * np.dtype(_DTYPES[col]).itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(block.tobytes())
+
+        self.n_rows += n_new
+        self._write_meta(self.path, self.n_rows, self.vocab)
+        self.columns = {col: self._map(col) for col in _DTYPES}
+
+    def take(self, indices: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Gather every column for an array of FAISS ids
+
+        Returns a dict of arrays shaped like indices plus a boolean
+        'present' mask (False for -1, out-of-range ids and missing rows).
+        """
+        indices = np.asarray(indices)
+        in_range = (indices >= 0) & (indices < self.n_rows)
+        safe = np.where(in_range, indices, 0)
+
+        out = {}
+        for col, values in self.columns.items():
+            fill = np.nan if col == "final_return" else -1
+            if self.n_rows == 0:
+                out[col] = np.full(indices.shape, fill, dtype=_DTYPES[col])
+            else:
+                out[col] = np.where(in_range, values[safe], fill).astype(_DTYPES[col])
+        out["present"] = in_range & (out["symbol"] >= 0)
+        return out
+
+    def decode(self, col: str, codes: np.ndarray) -> List[Optional[str]]:
+        """Codes back to strings (None for -1)"""
+        values = self.vocab[col]
+        return [values[c] if c >= 0 else None for c in codes.tolist()]
+
+    @classmethod
+    def build_from_sqlite(
+        cls,
+        db_path: str,
+        path: str,
+        chunk_size: int = 1_000_000
+    ) -> "ColumnarMetadata":
+        """
+        Export the SQLite patterns table into a new column store
+
+        Built next to the target and swapped in at the end, so a running
+        service never maps a half-written store.
+        """
+        tmp_path = path + ".tmp"
+        if os.path.exists(tmp_path):
+            shutil.rmtree(tmp_path)
+        store = cls.create(tmp_path)
+
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            cursor = conn.execute(
+                "SELECT id, symbol, date, start_time, final_return FROM patterns ORDER BY id"
+            )
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                ids, symbols, dates, start_times, final_returns = zip(*rows)
+                store.append(ids, symbols, dates, start_times, final_returns)
+                logger.info("Columnar metadata chunk exported", rows=store.n_rows)
+        finally:
+            conn.close()
+
+        if os.path.exists(path):
+            old_path = path + ".old"
+            if os.path.exists(old_path):
+                shutil.rmtree(old_path)
+            os.rename(path, old_path)
+            os.rename(tmp_path, path)
+            shutil.rmtree(old_path)
+        else:
+            os.rename(tmp_path, path)
+
+        logger.info(
+            "Columnar metadata built",
+            path=path,
+            n_rows=store.n_rows,
+            n_symbols=len(store.vocab["symbol"]),
+            n_dates=len(store.vocab["date"])
+        )
+        return cls(path)
+
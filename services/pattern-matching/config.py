@@ -56,6 +56,7 @@ class Settings(BaseSettings):
     index_type: str = "IVF4096,PQ30" # PQ30: 90/30=3 dims per subquantizer
     index_nprobe: int = 64            # Number of clusters to search
     use_gpu: bool = False             # Use GPU acceleration
+    metadata_backend: str = "sqlite"  # "sqlite" | "columnar" (memmap columns, see cli.py build-columns)
     
     # Data Paths
     data_dir: str = "/app/data"
@@ -65,6 +66,10 @@ class Settings(BaseSettings):
     cache_ttl_realtime: int = 60      # Real-time prices cache (seconds)
     cache_ttl_forecast: int = 300     # Forecast results cache (5 min)
     
+    # Realtime scanning
+    realtime_scan_batch_size: int = 500  # Symbols per batched FAISS query (parallel engine)
+    realtime_sequential_batch_size: int = 48  # Sequential engine: bars fetched one by one, one FAISS query per chunk
+    
     @property
     def redis_url(self) -> str:
         if self.redis_password:
@@ -15,6 +15,7 @@ import faiss
 import structlog
 
 from config import settings
+from columnar_metadata import ColumnarMetadata
 from flat_files_downloader import FlatFilesDownloader
 
 logger = structlog.get_logger(__name__)
@@ -45,6 +46,7 @@ class DailyUpdater:
         self.index_path = f"{self.index_dir}/patterns_ivfpq.index"
         self.metadata_path = f"{self.index_dir}/patterns_metadata.db"
         self.trajectories_path = f"{self.index_dir}/patterns_trajectories.npy"
+        self.columns_path = f"{self.index_dir}/patterns_columns"
         self.flats_dir = f"{self.data_dir}/minute_aggs"
         
         self.downloader = FlatFilesDownloader()
@@ -254,6 +256,19 @@ class DailyUpdater:
         
         logger.info("Updated SQLite metadata", new_entries=len(metadata))
         
+        # Keep columnar metadata in sync (if built)
+        if ColumnarMetadata.exists(self.columns_path):
+            columns = ColumnarMetadata(self.columns_path)
+            if len(columns) == start_id:
+                columns.append(*zip(*batch))
+                logger.info("Updated columnar metadata", new_entries=len(batch), total_entries=len(columns))
+            else:
+                logger.warning(
+                    "Columnar metadata out of sync, skipping (run: cli.py build-columns)",
+                    n_rows=len(columns),
+                    expected=start_id
+                )
+        
         # Add trajectories to .npy file (append to memmap)
         if os.path.exists(self.trajectories_path):
             # Get current size
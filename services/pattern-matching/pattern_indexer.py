@@ -4,6 +4,7 @@ Builds and manages the FAISS index for ultra-fast pattern similarity search
 
 Supports:
 - IVFPQ index with SQLite metadata (new, memory efficient)
+- Columnar memory-mapped metadata (optional, no SQLite per search)
 - Pickle metadata (legacy fallback)
 """
 
@@ -19,6 +20,7 @@ import faiss
 import structlog
 
 from config import settings
+from columnar_metadata import ColumnarMetadata
 
 logger = structlog.get_logger(__name__)
 
@@ -35,6 +37,8 @@ class PatternIndexer:
     
     Metadata storage:
     - SQLite: For large datasets (362M+ patterns) - memory efficient
+    - Columnar: memory-mapped column arrays addressed by FAISS id
+      (settings.metadata_backend = "columnar", built from SQLite)
     - Pickle: Legacy format for smaller datasets
     
     Trajectories:
@@ -57,6 +61,7 @@ class PatternIndexer:
         self.metadata: List[Dict] = []  # For pickle-based metadata
         self.metadata_db: Optional[sqlite3.Connection] = None  # For SQLite metadata
         self.trajectories: Optional[np.ndarray] = None  # Memory-mapped trajectories
+        self.columns: Optional[ColumnarMetadata] = None  # Memory-mapped metadata columns
         self.use_sqlite = False
         self.is_trained = False
         
@@ -226,13 +231,39 @@ class PatternIndexer:
             indices: Index of each neighbor
             neighbors_metadata: Metadata for each neighbor
         """
+        distances, indices, neighbors_metadata = self.search_batch(query, k=k, nprobe=nprobe)
+        return distances[0], indices[0], neighbors_metadata[0]
+    
+    def search_batch(
+        self,
+        queries: np.ndarray,
+        k: int = 50,
+        nprobe: int = None
+    ) -> Tuple[np.ndarray, np.ndarray, List[List[Optional[Dict]]]]:
+        """
+        Search k nearest neighbors for many query vectors at once
+        
+        One FAISS call for the whole matrix (FAISS parallelizes across
+        queries) and one metadata/trajectory lookup for the union of all
+        neighbor ids.
+        
+        Args:
+            queries: Query vectors (N, dimension) or a single (dimension,)
+            k: Number of neighbors per query
+            nprobe: Number of clusters to search (IVF indexes)
+            
+        Returns:
+            distances: (N, k)
+            indices: (N, k), -1 where FAISS found fewer than k
+            neighbors_metadata: N lists of k metadata dicts (None if missing)
+        """
         if self.index is None:
             raise RuntimeError("Index not loaded")
         
         # Ensure correct shape
-        query = query.astype(np.float32)
-        if query.ndim == 1:
-            query = query.reshape(1, -1)
+        queries = np.ascontiguousarray(queries, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
         
         # Set nprobe for IVF indexes
         nprobe = nprobe or settings.index_nprobe
@@ -240,55 +271,158 @@ class PatternIndexer:
             self.index.nprobe = nprobe
         
         # Search
-        distances, indices = self.index.search(query, k)
+        distances, indices = self.index.search(queries, k)
         
-        # Get metadata for results
-        neighbors_metadata = []
+        return distances, indices, self._resolve_metadata(indices)
+    
+    def _resolve_metadata(self, indices: np.ndarray) -> List[List[Optional[Dict]]]:
+        """Metadata for every neighbor id in an (N, k) result matrix"""
+        if self.columns is not None:
+            return self._resolve_columnar(indices)
         
-        if self.use_sqlite and self.metadata_db:
-            # Fetch from SQLite (batch query for efficiency)
-            valid_indices = [int(idx) for idx in indices[0] if idx >= 0]
-            if valid_indices:
-                placeholders = ','.join('?' * len(valid_indices))
-                cursor = self.metadata_db.execute(
-                    f"SELECT id, symbol, date, start_time, final_return FROM patterns WHERE id IN ({placeholders})",
-                    valid_indices
-                )
-                rows = {row[0]: row for row in cursor.fetchall()}
-                
-                for idx in indices[0]:
-                    if idx >= 0 and idx in rows:
-                        row = rows[idx]
-                        pattern_id = row[0]
-                        
-                        # Get full 15-point trajectory if available
-                        if self.trajectories is not None and pattern_id < len(self.trajectories):
-                            future_returns = self.trajectories[pattern_id].tolist()
-                        else:
-                            # Fallback to final_return only
-                            future_returns = [row[4]] if row[4] else []
-                        
-                        neighbors_metadata.append({
-                            'id': pattern_id,
-                            'symbol': row[1],
-                            'date': row[2],
-                            'start_time': row[3],
-                            'end_time': row[3],  # Same as start for now
-                            'future_returns': future_returns,
-                        })
-                    else:
-                        neighbors_metadata.append(None)
-            else:
-                neighbors_metadata = [None] * len(indices[0])
-        else:
+        if not (self.use_sqlite and self.metadata_db):
             # Use in-memory metadata (legacy)
-            for idx in indices[0]:
-                if idx >= 0 and idx < len(self.metadata):
-                    neighbors_metadata.append(self.metadata[idx])
-                else:
+            n_meta = len(self.metadata)
+            return [
+                [self.metadata[idx] if 0 <= idx < n_meta else None for idx in row.tolist()]
+                for row in indices
+            ]
+        
+        ids = np.unique(indices[indices >= 0])
+        rows = self._fetch_sqlite_rows(ids.tolist())
+        
+        # Get full 15-point trajectories if available (one gather over the memmap)
+        trajectories: Dict[int, list] = {}
+        if self.trajectories is not None and len(ids):
+            traj_ids = ids[ids < len(self.trajectories)]
+            block = np.asarray(self.trajectories[traj_ids])
+            trajectories = dict(zip(traj_ids.tolist(), block.tolist()))
+        
+        out = []
+        for row_ids in indices:
+            neighbors_metadata = []
+            for idx in row_ids.tolist():
+                row = rows.get(idx) if idx >= 0 else None
+                if row is None:
                     neighbors_metadata.append(None)
+                    continue
+                future_returns = trajectories.get(idx)
+                if future_returns is None:
+                    # Fallback to final_return only
+                    future_returns = [row[4]] if row[4] else []
+                neighbors_metadata.append({
+                    'id': row[0],
+                    'symbol': row[1],
+                    'date': row[2],
+                    'start_time': row[3],
+                    'end_time': row[3],  # Same as start for now
+                    'future_returns': future_returns,
+                })
+            out.append(neighbors_metadata)
+        return out
+    
+    def _resolve_columnar(self, indices: np.ndarray) -> List[List[Optional[Dict]]]:
+        """Metadata from the memory-mapped columns (one gather per column)"""
+        cols = self.columns.take(indices)
+        flat = {
+            name: self.columns.decode(name, cols[name].reshape(-1))
+            for name in ("symbol", "date", "start_time")
+        }
+        final_returns = cols["final_return"].reshape(-1).tolist()
+        present = cols["present"].reshape(-1).tolist()
+        ids = indices.reshape(-1).tolist()
+        
+        has_trajectories = np.zeros(indices.size, dtype=bool)
+        block = None
+        if self.trajectories is not None:
+            has_trajectories = cols["present"].reshape(-1) & (indices.reshape(-1) < len(self.trajectories))
+            if has_trajectories.any():
+                block = np.asarray(self.trajectories[indices.reshape(-1)[has_trajectories]]).tolist()
+        
+        neighbors = []
+        traj_iter = iter(block or [])
+        for pos, idx in enumerate(ids):
+            if not present[pos]:
+                neighbors.append(None)
+                continue
+            if has_trajectories[pos]:
+                future_returns = next(traj_iter)
+            else:
+                # Fallback to final_return only (NaN = NULL)
+                fr = final_returns[pos]
+                future_returns = [fr] if fr and fr == fr else []
+            neighbors.append({
+                'id': idx,
+                'symbol': flat["symbol"][pos],
+                'date': flat["date"][pos],
+                'start_time': flat["start_time"][pos],
+                'end_time': flat["start_time"][pos],  # Same as start for now
+                'future_returns': future_returns,
+            })
+        
+        k = indices.shape[1]
+        return [neighbors[i:i + k] for i in range(0, len(neighbors), k)]
+    
+    def gather_futures(self, indices: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Future returns for an (N, k) result matrix as one dense array
+        
+        Feeds ForecastGenerator.generate_batch. Only available with the
+        columnar backend (validity comes from the columns, not from SQLite).
         
-        return distances[0], indices[0], neighbors_metadata
+        Returns:
+            (futures (N, k, T), valid (N, k)) with T = 15 when trajectories
+            cover every neighbor, T = 1 (final_return) without trajectories,
+            or None when the dict-based path must be used
+        """
+        if self.columns is None:
+            return None
+        
+        cols = self.columns.take(indices)
+        present = cols["present"]
+        
+        if self.trajectories is not None:
+            covered = indices < len(self.trajectories)
+            if np.any(present & ~covered):
+                return None  # Mixed trajectory lengths - use dict path
+            safe = np.where(present, indices, 0)
+            futures = np.asarray(self.trajectories[safe.reshape(-1)]).reshape(
+                indices.shape + (self.trajectories.shape[1],)
+            )
+            return futures, present
+        
+        final_returns = cols["final_return"]
+        valid = present & ~np.isnan(final_returns) & (final_returns != 0)
+        return final_returns[..., None], valid
+    
+    def _fetch_sqlite_rows(self, ids: List[int]) -> Dict[int, tuple]:
+        """
+        Fetch metadata rows for a set of ids in a single query
+        
+        The ids travel as one JSON parameter (json_each), which avoids
+        SQLite's bound-variable limit; builds without JSON1 fall back to
+        chunked IN lists.
+        """
+        if not ids:
+            return {}
+        columns = "id, symbol, date, start_time, final_return"
+        try:
+            cursor = self.metadata_db.execute(
+                f"SELECT {columns} FROM patterns WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(ids),)
+            )
+            fetched = cursor.fetchall()
+        except sqlite3.OperationalError:
+            fetched = []
+            for i in range(0, len(ids), 900):
+                chunk = ids[i:i + 900]
+                placeholders = ','.join('?' * len(chunk))
+                cursor = self.metadata_db.execute(
+                    f"SELECT {columns} FROM patterns WHERE id IN ({placeholders})",
+                    chunk
+                )
+                fetched.extend(cursor.fetchall())
+        return {row[0]: row for row in fetched}
     
     def save(self, name: str = "patterns") -> Tuple[str, str]:
         """
@@ -397,6 +531,11 @@ class PatternIndexer:
                     logger.warning("Trajectories file not found", path=trajectories_path)
                     self.trajectories = None
                 
+                # Columnar metadata (optional, replaces per-search SQLite lookups)
+                self.columns = None
+                if settings.metadata_backend == "columnar":
+                    self._load_columns(name)
+                
                 # Get count from SQLite
                 cursor = self.metadata_db.execute("SELECT COUNT(*) FROM patterns")
                 n_metadata = cursor.fetchone()[0]
@@ -458,6 +597,30 @@ class PatternIndexer:
             logger.error("Failed to load index", error=str(e))
             return False
     
+    def _load_columns(self, name: str):
+        """Map the columnar metadata store if present and in sync with the index"""
+        columns_path = os.path.join(self.index_dir, f"{name}_columns")
+        if not ColumnarMetadata.exists(columns_path):
+            logger.warning(
+                "Columnar metadata not found, using SQLite (run: cli.py build-columns)",
+                path=columns_path
+            )
+            return
+        try:
+            columns = ColumnarMetadata(columns_path)
+        except Exception as e:
+            logger.error("Failed to load columnar metadata", error=str(e))
+            return
+        if len(columns) != self.index.ntotal:
+            logger.warning(
+                "Columnar metadata out of sync with index, using SQLite",
+                n_rows=len(columns),
+                n_vectors=self.index.ntotal
+            )
+            return
+        self.columns = columns
+        logger.info("Columnar metadata loaded (memmap)", n_rows=len(columns), path=columns_path)
+    
     def get_stats(self) -> Dict:
         """Get index statistics"""
         if self.index is None:
@@ -476,7 +639,10 @@ class PatternIndexer:
             "n_metadata": n_metadata,
             "dimension": self.dimension,
             "index_type": type(self.index).__name__,
-            "metadata_type": "SQLite" if self.use_sqlite else "pickle",
+            "metadata_type": (
+                "columnar" if self.columns is not None
+                else "SQLite" if self.use_sqlite else "pickle"
+            ),
             "is_trained": self.is_trained,
             "has_trajectories": self.trajectories is not None,
             "trajectory_points": self.trajectories.shape[1] if self.trajectories is not None else 0,
@@ -3,6 +3,7 @@ Pattern Matcher - Main search and forecast engine
 """
 
 import asyncio
+import warnings
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 import numpy as np
@@ -110,6 +111,99 @@ class ForecastGenerator:
             "n_neighbors": len(neighbors_valid),
             "trajectory_points": trajectory_length,
         }
+    
+    @staticmethod
+    def generate_batch(
+        futures: np.ndarray,
+        distances: np.ndarray,
+        valid: np.ndarray,
+        temperature: float = 1.0
+    ) -> List[Dict]:
+        """
+        Vectorized generate() for many queries at once
+        
+        Same outputs as generate(), computed with masked array ops over
+        all queries instead of per-neighbor Python lists.
+        
+        Args:
+            futures: Future returns (n_queries, k, T); T = 15 trajectories or 1 final return
+            distances: Distance to each neighbor (n_queries, k)
+            valid: Neighbors that count for the forecast (n_queries, k)
+            temperature: Softmax temperature (lower = more weight to closest)
+            
+        Returns:
+            One forecast dict per query
+        """
+        futures = futures.astype(np.float64)
+        n_valid = valid.sum(axis=1)
+        trajectory_length = futures.shape[2]
+        
+        # Masked softmax on negative distances
+        logits = np.where(valid, -distances.astype(np.float64) / temperature, -np.inf)
+        shift = logits.max(axis=1, keepdims=True)
+        shift[~np.isfinite(shift)] = 0.0
+        weights = np.exp(logits - shift)
+        weights /= np.maximum(weights.sum(axis=1, keepdims=True), 1e-300)
+        
+        if trajectory_length >= 15:
+            futures = np.where(valid[..., None], futures, 0.0)
+            mean_trajectory = np.einsum('nk,nkt->nt', weights, futures)
+            std_trajectory = np.sqrt(np.einsum(
+                'nk,nkt->nt', weights, (futures - mean_trajectory[:, None, :]) ** 2
+            ))
+            final_returns = futures[:, :, -1]
+            mean_return = mean_trajectory[:, -1]
+            std_return = std_trajectory[:, -1]
+        else:
+            final_returns = np.where(valid, futures[:, :, 0], 0.0)
+            mean_return = (weights * final_returns).sum(axis=1)
+            std_return = np.sqrt((weights * (final_returns - mean_return[:, None]) ** 2).sum(axis=1))
+        
+        # Probabilities and percentiles over valid neighbors only
+        denom = np.maximum(n_valid, 1)
+        prob_up = ((final_returns > 0) & valid).sum(axis=1) / denom
+        prob_down = ((final_returns < 0) & valid).sum(axis=1) / denom
+        masked = np.where(valid, final_returns, np.nan)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # All-NaN rows (no valid neighbors)
+            p10, p50, p90 = np.nanpercentile(masked, [10, 50, 90], axis=1)
+        
+        # Confidence based on consistency (agreement among neighbors)
+        consistency = 1 - (std_return / (np.abs(mean_return) + 1e-6))
+        
+        forecasts = []
+        for i in range(len(valid)):
+            if n_valid[i] == 0:
+                forecasts.append({
+                    "error": "No valid neighbors with future data",
+                    "n_neighbors": 0
+                })
+                continue
+            if trajectory_length >= 15:
+                mean_trajectory_list = [round(float(x), 4) for x in mean_trajectory[i]]
+                std_trajectory_list = [round(float(x), 4) for x in std_trajectory[i]]
+            else:
+                # Only final return available - interpolate simple trajectory
+                mean_trajectory_list = [round(float(mean_return[i]) * (j / 14), 4) for j in range(15)]
+                std_trajectory_list = [round(float(std_return[i]) * (j / 14), 4) for j in range(15)]
+            forecasts.append({
+                "horizon_minutes": 15,
+                "mean_return": round(float(mean_return[i]), 4),
+                "mean_trajectory": mean_trajectory_list,
+                "std_trajectory": std_trajectory_list,
+                "prob_up": round(float(prob_up[i]), 3),
+                "prob_down": round(float(prob_down[i]), 3),
+                "confidence": (
+                    "high" if consistency[i] > 0.7
+                    else "medium" if consistency[i] > 0.4 else "low"
+                ),
+                "best_case": round(float(p90[i]), 4),
+                "worst_case": round(float(p10[i]), 4),
+                "median_return": round(float(p50[i]), 4),
+                "n_neighbors": int(n_valid[i]),
+                "trajectory_points": trajectory_length,
+            })
+        return forecasts
 
 
 class PatternMatcher:
@@ -257,68 +351,12 @@ class PatternMatcher:
                 nprobe=nprobe
             )
             
-            # Filter by symbol if not cross_asset
-            if not cross_asset:
-                filtered = [
-                    (d, i, n) for d, i, n in zip(distances, indices, neighbors)
-                    if n and n.get('symbol') == symbol
-                ]
-                distances = np.array([f[0] for f in filtered[:k]])
-                indices = np.array([f[1] for f in filtered[:k]])
-                neighbors = [f[2] for f in filtered[:k]]
-            
-            # Generate forecast
-            forecast = self.forecast_gen.generate(neighbors, distances)
-            
-            # Build response
-            query_time = (datetime.now() - start_time).total_seconds() * 1000
+            forecasts = self._vectorized_forecasts(distances[None], indices[None], cross_asset)
             
-            # Get the pattern prices used for search (last window_size prices)
-            pattern_prices = prices[-settings.window_size:] if len(prices) >= settings.window_size else prices
-            
-            # Generate pattern times (relative minutes from now)
-            now = datetime.now()
-            pattern_times = [
-                (now - timedelta(minutes=(len(pattern_prices) - i - 1))).strftime('%H:%M')
-                for i in range(len(pattern_prices))
-            ]
-            
-            return {
-                "status": "success",
-                "query": {
-                    "symbol": symbol,
-                    "window_minutes": settings.window_size,
-                    "timestamp": start_time.isoformat(),
-                    "cross_asset": cross_asset,
-                    "mode": "realtime",
-                },
-                "forecast": forecast,
-                "neighbors": [
-                    {
-                        "symbol": n['symbol'],
-                        "date": n['date'],
-                        "start_time": n['start_time'],
-                        "end_time": n['end_time'],
-                        "distance": round(float(d), 4),
-                        "future_returns": n.get('future_returns', []),
-                    }
-                    for n, d in zip(neighbors[:k], distances[:k])
-                    if n is not None
-                ],
-                "historical_context": {
-                    "mode": "realtime",
-                    "pattern_prices": pattern_prices,
-                    "pattern_times": pattern_times,
-                    "pattern_start": pattern_times[0] if pattern_times else None,
-                    "pattern_end": pattern_times[-1] if pattern_times else None,
-                },
-                "stats": {
-                    "query_time_ms": round(query_time, 2),
-                    "index_size": self.indexer.index.ntotal if self.indexer.index else 0,
-                    "k_requested": k,
-                    "k_returned": len([n for n in neighbors if n]),
-                }
-            }
+            return self._build_search_response(
+                symbol, prices, distances, indices, neighbors, k, cross_asset, start_time,
+                forecast=forecasts[0] if forecasts else None
+            )
             
         except Exception as e:
             logger.error("Search failed", symbol=symbol, error=str(e))
@@ -328,6 +366,235 @@ class PatternMatcher:
                 "symbol": symbol,
             }
     
+    def _build_search_response(
+        self,
+        symbol: str,
+        prices: List[float],
+        distances: np.ndarray,
+        indices: np.ndarray,
+        neighbors: List[Optional[Dict]],
+        k: int,
+        cross_asset: bool,
+        start_time: datetime,
+        forecast: Optional[Dict] = None,
+    ) -> Dict:
+        """Filter neighbors, generate forecast (unless precomputed) and build the search response"""
+        # Filter by symbol if not cross_asset
+        if not cross_asset:
+            filtered = [
+                (d, i, n) for d, i, n in zip(distances, indices, neighbors)
+                if n and n.get('symbol') == symbol
+            ]
+            distances = np.array([f[0] for f in filtered[:k]])
+            indices = np.array([f[1] for f in filtered[:k]])
+            neighbors = [f[2] for f in filtered[:k]]
+        
+        # Generate forecast
+        if forecast is None:
+            forecast = self.forecast_gen.generate(neighbors, distances)
+        
+        # Build response
+        query_time = (datetime.now() - start_time).total_seconds() * 1000
+        
+        # Get the pattern prices used for search (last window_size prices)
+        pattern_prices = prices[-settings.window_size:] if len(prices) >= settings.window_size else prices
+        
+        # Generate pattern times (relative minutes from now)
+        now = datetime.now()
+        pattern_times = [
+            (now - timedelta(minutes=(len(pattern_prices) - i - 1))).strftime('%H:%M')
+            for i in range(len(pattern_prices))
+        ]
+        
+        return {
+            "status": "success",
+            "query": {
+                "symbol": symbol,
+                "window_minutes": settings.window_size,
+                "timestamp": start_time.isoformat(),
+                "cross_asset": cross_asset,
+                "mode": "realtime",
+            },
+            "forecast": forecast,
+            "neighbors": [
+                {
+                    "symbol": n['symbol'],
+                    "date": n['date'],
+                    "start_time": n['start_time'],
+                    "end_time": n['end_time'],
+                    "distance": round(float(d), 4),
+                    "future_returns": n.get('future_returns', []),
+                }
+                for n, d in zip(neighbors[:k], distances[:k])
+                if n is not None
+            ],
+            "historical_context": {
+                "mode": "realtime",
+                "pattern_prices": pattern_prices,
+                "pattern_times": pattern_times,
+                "pattern_start": pattern_times[0] if pattern_times else None,
+                "pattern_end": pattern_times[-1] if pattern_times else None,
+            },
+            "stats": {
+                "query_time_ms": round(query_time, 2),
+                "index_size": self.indexer.index.ntotal if self.indexer.index else 0,
+                "k_requested": k,
+                "k_returned": len([n for n in neighbors if n]),
+            }
+        }
+    
+    def _vectorized_forecasts(
+        self,
+        distances: np.ndarray,
+        indices: np.ndarray,
+        cross_asset: bool,
+    ) -> Optional[List[Dict]]:
+        """
+        Forecasts for an (N, k) result matrix in one shot
+        
+        Uses the columnar metadata to gather all future returns at once.
+        Returns None (per-query generate() path) when the index has no
+        columnar metadata or results still need per-symbol filtering.
+        """
+        if not cross_asset:
+            return None
+        gathered = self.indexer.gather_futures(indices)
+        if gathered is None:
+            return None
+        futures, valid = gathered
+        return self.forecast_gen.generate_batch(futures, distances, valid)
+    
+    async def prepare_query(
+        self,
+        symbol: str
+    ) -> Tuple[Optional[Tuple[List[float], np.ndarray]], Optional[Dict]]:
+        """
+        Fetch real-time bars for one symbol and build its query vector
+        
+        Returns:
+            ((prices, query_vector), None), or (None, error response with
+            the same shape search() returns)
+        """
+        try:
+            bars = await self.get_realtime_bars(symbol)
+        except Exception as e:
+            return None, {"status": "error", "error": str(e), "symbol": symbol}
+        prices = bars["prices"]
+        if len(prices) < settings.window_size:
+            return None, {
+                "error": f"Need at least {settings.window_size} prices, got {len(prices)}",
+                "status": "insufficient_data"
+            }
+        try:
+            return (prices, self.processor.get_realtime_pattern(prices, bars["volumes"])), None
+        except Exception as e:
+            return None, {"status": "error", "error": str(e), "symbol": symbol}
+    
+    def search_queries(
+        self,
+        queries: List[Tuple[str, List[float], np.ndarray]],
+        k: int = None,
+        cross_asset: bool = True,
+        nprobe: int = None,
+    ) -> Dict[str, Dict]:
+        """
+        Search prepared queries (see prepare_query) with a single FAISS query
+        
+        Args:
+            queries: (symbol, prices, query_vector) tuples
+            
+        Returns:
+            symbol -> search result (success or error dict), as search()
+        """
+        if not self.is_ready:
+            return {s: {"error": "Index not loaded", "status": "not_ready"} for s, _, _ in queries}
+        if not queries:
+            return {}
+        
+        k = min(k or settings.default_k, settings.max_k)
+        start_time = datetime.now()
+        results: Dict[str, Dict] = {}
+        try:
+            distances, indices, neighbors = self.indexer.search_batch(
+                np.vstack([vector for _, _, vector in queries]),
+                k=k * 2 if not cross_asset else k,  # Get more if filtering
+                nprobe=nprobe
+            )
+        except Exception as e:
+            logger.error("Batch search failed", n_queries=len(queries), error=str(e))
+            return {
+                symbol: {"status": "error", "error": str(e), "symbol": symbol}
+                for symbol, _, _ in queries
+            }
+        
+        forecasts = self._vectorized_forecasts(distances, indices, cross_asset)
+        
+        for row, (symbol, prices, _) in enumerate(queries):
+            try:
+                results[symbol] = self._build_search_response(
+                    symbol, prices, distances[row], indices[row], neighbors[row],
+                    k, cross_asset, start_time,
+                    forecast=forecasts[row] if forecasts else None
+                )
+            except Exception as e:
+                logger.error("Search failed", symbol=symbol, error=str(e))
+                results[symbol] = {"status": "error", "error": str(e), "symbol": symbol}
+        
+        logger.info(
+            "Batch search completed",
+            n_queries=len(queries),
+            elapsed_ms=round((datetime.now() - start_time).total_seconds() * 1000, 2)
+        )
+        return results
+    
+    async def search_batch(
+        self,
+        symbols: List[str],
+        k: int = None,
+        cross_asset: bool = True,
+        nprobe: int = None,
+        max_concurrent_fetches: int = 10,
+    ) -> Dict[str, Dict]:
+        """
+        Search similar patterns for many symbols with a single FAISS query
+        
+        Real-time bars are fetched concurrently (bounded by
+        max_concurrent_fetches), every valid query vector is stacked into
+        one matrix and searched in one call, and each symbol gets the same
+        response dict that search() would return.
+        
+        Args:
+            symbols: Ticker symbols
+            k: Number of neighbors
+            cross_asset: Search all tickers or just same ticker
+            nprobe: FAISS search parameter
+            max_concurrent_fetches: Parallel Polygon requests
+            
+        Returns:
+            symbol -> search result (success or error dict)
+        """
+        if not self.is_ready:
+            return {s: {"error": "Index not loaded", "status": "not_ready"} for s in symbols}
+        
+        semaphore = asyncio.Semaphore(max_concurrent_fetches)
+        
+        async def fetch(symbol: str):
+            async with semaphore:
+                return await self.prepare_query(symbol)
+        
+        prepared = await asyncio.gather(*(fetch(s) for s in symbols))
+        
+        results: Dict[str, Dict] = {}
+        queries: List[Tuple[str, List[float], np.ndarray]] = []
+        for symbol, (query, error) in zip(symbols, prepared):
+            if error is not None:
+                results[symbol] = error
+            else:
+                queries.append((symbol, *query))
+        
+        results.update(self.search_queries(queries, k=k, cross_asset=cross_asset, nprobe=nprobe))
+        return results
+    
     async def search_with_prices(
         self,
         prices: List[float],
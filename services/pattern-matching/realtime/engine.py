@@ -108,31 +108,63 @@ class RealtimeEngine:
         results: List[PredictionResult] = []
         failures: List[FailureResult] = []
         
+        async def record(
+            result: Optional[PredictionResult],
+            failure: Optional[FailureResult]
+        ) -> None:
+            nonlocal completed, failed
+            if result:
+                # Filter by min_edge
+                if result.edge >= request.min_edge:
+                    results.append(result)
+                    await self.db.insert_prediction(result)
+                    await self.ws.send_result(job_id, result)
+                completed += 1
+            elif failure:
+                failures.append(failure)
+                await self.db.insert_failure(job_id, failure)
+                failed += 1
+        
         try:
-            for symbol in symbols:
-                # Check for cancellation
+            for chunk in self._chunks(symbols, settings.realtime_sequential_batch_size):
+                # Bars are fetched one symbol at a time (cancellation and
+                # progress per symbol); only the FAISS query is batched
+                queries: List[Tuple[str, List[float], Any]] = []
+                for symbol in chunk:
+                    # Check for cancellation
+                    if self._active_jobs.get(job_id, True):
+                        break
+                    
+                    failure = self._check_market_hours(symbol, datetime.utcnow())
+                    if failure is None:
+                        query, error = await self.matcher.prepare_query(symbol)
+                        if query is not None:
+                            queries.append((symbol, *query))
+                        else:
+                            await record(*await self._scan_symbol(job_id, symbol, request, error))
+                    else:
+                        await record(None, failure)
+                    
+                    # Update progress (fetched symbols count as in flight)
+                    await self.ws.send_progress(
+                        job_id, 
+                        completed + failed + len(queries), 
+                        len(symbols), 
+                        failed
+                    )
+                
                 if self._active_jobs.get(job_id, True):
                     logger.info("Job cancelled", job_id=job_id)
                     break
                 
-                # Scan single symbol
-                result, failure = await self._scan_symbol(
-                    job_id=job_id,
-                    symbol=symbol,
-                    request=request
+                # Scan the chunk's queries with a single FAISS query
+                search_results = self.matcher.search_queries(
+                    queries, k=request.k, cross_asset=request.cross_asset
                 )
-                
-                if result:
-                    # Filter by min_edge
-                    if result.edge >= request.min_edge:
-                        results.append(result)
-                        await self.db.insert_prediction(result)
-                        await self.ws.send_result(job_id, result)
-                    completed += 1
-                elif failure:
-                    failures.append(failure)
-                    await self.db.insert_failure(job_id, failure)
-                    failed += 1
+                for symbol, _, _ in queries:
+                    await record(*await self._scan_symbol(
+                        job_id, symbol, request, search_results.get(symbol)
+                    ))
                 
                 # Update progress
                 await self.db.update_job_progress(job_id, completed, failed)
@@ -178,15 +210,70 @@ class RealtimeEngine:
         
         return job_id
     
+    def _chunks(self, symbols: List[str], size: int) -> List[List[str]]:
+        """Split symbols into batches for one FAISS query each"""
+        size = max(1, size)
+        return [symbols[i:i + size] for i in range(0, len(symbols), size)]
+    
+    async def _scan_batch(
+        self,
+        job_id: str,
+        symbols: List[str],
+        request: RealtimeJobRequest,
+        max_concurrent: int = 1
+    ) -> List[Tuple[Optional[PredictionResult], Optional[FailureResult]]]:
+        """
+        Scan a batch of symbols with a single FAISS query
+        
+        Symbols outside market hours fail fast; the rest are searched
+        together through PatternMatcher.search_batch and then scored
+        by _scan_symbol.
+        
+        Returns:
+            List of (result, failure) tuples, in the order of symbols
+        """
+        scan_time = datetime.utcnow()
+        
+        pending = [
+            s for s in symbols
+            if self._check_market_hours(s, scan_time) is None
+        ]
+        
+        search_results: Dict[str, Dict[str, Any]] = {}
+        if pending:
+            try:
+                search_results = await self.matcher.search_batch(
+                    symbols=pending,
+                    k=request.k,
+                    cross_asset=request.cross_asset,
+                    max_concurrent_fetches=max_concurrent,
+                )
+            except Exception as e:
+                logger.error("Batch scan failed", symbols=len(pending), error=str(e))
+                search_results = {
+                    s: {"status": "error", "error": str(e), "symbol": s}
+                    for s in pending
+                }
+        
+        return [
+            await self._scan_symbol(job_id, symbol, request, search_results.get(symbol))
+            for symbol in symbols
+        ]
+    
     async def _scan_symbol(
         self,
         job_id: str,
         symbol: str,
-        request: RealtimeJobRequest
+        request: RealtimeJobRequest,
+        search_result: Optional[Dict[str, Any]] = None
     ) -> Tuple[Optional[PredictionResult], Optional[FailureResult]]:
         """
         Scan a single symbol
         
+        Args:
+            search_result: Precomputed PatternMatcher result (batch scans);
+                searches the symbol on its own when None
+        
         Returns:
             Tuple of (result, failure) - one will be None
         """
@@ -199,12 +286,13 @@ class RealtimeEngine:
                 return None, failure
             
             # Call existing PatternMatcher
-            search_result = await self.matcher.search(
-                symbol=symbol,
-                prices=None,  # Fetch real-time
-                k=request.k,
-                cross_asset=request.cross_asset,
-            )
+            if search_result is None:
+                search_result = await self.matcher.search(
+                    symbol=symbol,
+                    prices=None,  # Fetch real-time
+                    k=request.k,
+                    cross_asset=request.cross_asset,
+                )
             
             if search_result.get("status") == "error":
                 return None, FailureResult(
@@ -353,7 +441,8 @@ class ParallelRealtimeEngine(RealtimeEngine):
     """
     Enhanced engine with parallel symbol scanning
     
-    Scans multiple symbols concurrently for faster results.
+    Fetches bars for multiple symbols concurrently and searches each
+    chunk of symbols with a single batched FAISS query.
     Use with caution - may hit rate limits on Polygon API.
     """
     
@@ -391,17 +480,15 @@ class ParallelRealtimeEngine(RealtimeEngine):
         
         self._active_jobs[job_id] = False
         
-        # Create tasks for all symbols
-        async def scan_with_semaphore(symbol: str):
-            async with self._semaphore:
-                if self._active_jobs.get(job_id, True):
-                    return None, None
-                return await self._scan_symbol(job_id, symbol, request)
-        
         try:
-            # Run all scans concurrently
-            tasks = [scan_with_semaphore(s) for s in symbols]
-            results_list = await asyncio.gather(*tasks, return_exceptions=True)
+            # One FAISS query per chunk; Polygon fetches bounded by max_concurrent
+            results_list = []
+            for chunk in self._chunks(symbols, settings.realtime_scan_batch_size):
+                if self._active_jobs.get(job_id, True):
+                    break
+                results_list.extend(
+                    await self._scan_batch(job_id, chunk, request, self.max_concurrent)
+                )
             
             # Process results
             completed = 0
@@ -409,16 +496,8 @@ class ParallelRealtimeEngine(RealtimeEngine):
             results: List[PredictionResult] = []
             failures: List[FailureResult] = []
             
-            for i, item in enumerate(results_list):
-                if isinstance(item, Exception):
-                    failed += 1
-                    failures.append(FailureResult(
-                        symbol=symbols[i],
-                        scan_time=datetime.utcnow(),
-                        error_code=ErrorCode.E_UNKNOWN,
-                        reason=str(item)
-                    ))
-                elif item[0]:  # Result
+            for item in results_list:
+                if item[0]:  # Result
                     result = item[0]
                     if result.edge >= request.min_edge:
                         results.append(result)
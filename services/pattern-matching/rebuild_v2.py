@@ -60,6 +60,8 @@ def main():
     parser.add_argument("--nlist", type=int, default=4096)
     parser.add_argument("--pq-m", type=int, default=30,
                         help="PQ subquantizers (must divide 90 evenly: 30, 18, 45, 9...)")
+    parser.add_argument("--columns", action="store_true",
+                        help="Also build columnar metadata (METADATA_BACKEND=columnar)")
     args = parser.parse_args()
 
     os.makedirs(args.index_dir, exist_ok=True)
@@ -178,6 +180,11 @@ def main():
     np.save(traj_path.replace(".npy", "_tmp.npy"), raw)
     os.replace(traj_path.replace(".npy", "_tmp.npy"), traj_path)
 
+    columns_path = os.path.join(args.index_dir, f"{args.name}_columns")
+    if args.columns:
+        from columnar_metadata import ColumnarMetadata
+        ColumnarMetadata.build_from_sqlite(db_path, columns_path)
+
     log.info("Rebuild v2 complete",
              total_vectors=total_added,
              index=index_path,
@@ -198,6 +205,8 @@ def main():
     print(f"  mv {args.name}_metadata.db patterns_metadata.db")
     print(f"  mv patterns_trajectories.npy patterns_trajectories_v1.npy")
     print(f"  mv {args.name}_trajectories.npy patterns_trajectories.npy")
+    if args.columns:
+        print(f"  rm -rf patterns_columns && mv {args.name}_columns patterns_columns")
     print(f"  docker restart pattern_matching")
 
 
@@ -28,6 +28,22 @@ class Settings(BaseSettings):
     default_lookback_days: int = 365  # 1 year
     max_parallel_downloads: int = 4
     
+    # Parquet layout
+    # "plain": CSV order, default row groups
+    # "clustered": sorted by ticker + window_start, bounded row groups with
+    #              statistics (ticker predicates skip whole row groups)
+    parquet_layout: str = "plain"
+    parquet_row_group_rows: int = 32_768
+    parquet_ticker_index: bool = True  # Sidecar {date}.tickers.json (ticker -> row groups)
+    
+    # CSV -> Parquet conversion
+    # "pandas": full-file DataFrame (inferred dtypes)
+    # "streaming": DuckDB COPY with explicit dtypes; spills to disk instead
+    #              of exceeding converter_memory_limit_mb
+    parquet_converter: str = "pandas"
+    converter_memory_limit_mb: int = 1024  # Shared by all concurrent conversions
+    converter_threads: int = 2
+    
     # Scheduler
     daily_update_hour: int = 6  # UTC - after market close
     daily_update_minute: int = 0
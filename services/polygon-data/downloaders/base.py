@@ -7,19 +7,37 @@ Parquet benefits:
 - Binary: No text parsing overhead
 - Compressed: zstd compression is fast and efficient
 - 10-15x faster queries vs CSV.gz
+
+Clustered layout (settings.parquet_layout = "clustered"):
+- Rows sorted by ticker, then window_start
+- Bounded row groups with min/max statistics, so a ticker predicate in
+  DuckDB/pyarrow skips every row group that cannot contain the ticker
+- Footer key-value marker "clustered_by" with the sort columns
+- Optional sidecar {date}.tickers.json mapping ticker -> row groups
+
+Streaming conversion (settings.parquet_converter = "streaming"):
+- DuckDB COPY read_csv -> Parquet with explicit column types
+- One shared DuckDB instance caps memory for all concurrent conversions
+  (converter_memory_limit_mb) and spills sorts to disk beyond it
 """
 
 import os
+import json
+import threading
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Iterable
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import boto3
+import duckdb
 from botocore.config import Config
+import numpy as np
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 import structlog
 
@@ -27,6 +45,34 @@ from config import settings
 
 logger = structlog.get_logger(__name__)
 
+_duckdb_con: Optional[duckdb.DuckDBPyConnection] = None
+_duckdb_lock = threading.Lock()
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _converter_connection() -> duckdb.DuckDBPyConnection:
+    """
+    Shared DuckDB instance for streaming conversions.
+    
+    Every conversion thread takes its own cursor on this instance, so the
+    memory limit is a ceiling for all of them together, not per file.
+    """
+    global _duckdb_con
+    with _duckdb_lock:
+        if _duckdb_con is None:
+            spill_dir = settings.data_dir / ".duckdb_tmp"
+            os.makedirs(spill_dir, exist_ok=True)
+            con = duckdb.connect()
+            con.execute(f"SET memory_limit = '{int(settings.converter_memory_limit_mb)}MB'")
+            con.execute(f"SET threads = {int(settings.converter_threads)}")
+            con.execute("SET temp_directory = ?", [str(spill_dir)])
+            con.execute("SET preserve_insertion_order = true")
+            _duckdb_con = con
+        return _duckdb_con
+
 
 class BaseDownloader(ABC):
     """
@@ -45,6 +91,26 @@ class BaseDownloader(ABC):
     # Parquet compression - zstd is fast and efficient
     PARQUET_COMPRESSION: str = "zstd"
     
+    # Clustered layout: sort keys (those present in the file are used)
+    SORT_COLUMNS: tuple = ("ticker", "window_start")
+    TICKER_INDEX_EXTENSION: str = ".tickers.json"
+    TICKER_INDEX_VERSION: int = 1
+    CLUSTERED_METADATA_KEY: str = "clustered_by"
+    
+    # Explicit CSV column types for the streaming converter (no inference,
+    # same types the backtester uses for raw flat files);
+    # columns not listed here are auto-detected
+    CSV_COLUMN_TYPES: Dict[str, str] = {
+        "ticker": "VARCHAR",
+        "volume": "DOUBLE",
+        "open": "DOUBLE",
+        "close": "DOUBLE",
+        "high": "DOUBLE",
+        "low": "DOUBLE",
+        "window_start": "BIGINT",
+        "transactions": "DOUBLE",
+    }
+    
     def __init__(
         self,
         access_key: Optional[str] = None,
@@ -101,6 +167,198 @@ class BaseDownloader(ABC):
         date_str = date.strftime("%Y-%m-%d")
         return f"{self.output_dir}/{date_str}{self.PARQUET_EXTENSION}"
     
+    def _get_ticker_index_path(self, parquet_path: str) -> str:
+        """Sidecar ticker -> row groups index for a Parquet file"""
+        return parquet_path[:-len(self.PARQUET_EXTENSION)] + self.TICKER_INDEX_EXTENSION
+    
+    def _write_parquet(self, df: pd.DataFrame, parquet_path: str) -> None:
+        """Write a DataFrame using the configured layout"""
+        if settings.parquet_layout != "clustered":
+            df.to_parquet(
+                parquet_path,
+                compression=self.PARQUET_COMPRESSION,
+                index=False,
+                engine='pyarrow'
+            )
+            return
+        
+        sort_columns = self._write_clustered(df, parquet_path)
+        if settings.parquet_ticker_index and "ticker" in df.columns:
+            self._write_ticker_index(parquet_path, df["ticker"].unique(), sort_columns)
+    
+    def _write_clustered(self, df: pd.DataFrame, parquet_path: str) -> List[str]:
+        """Write sorted by SORT_COLUMNS with bounded row groups; returns the sort columns"""
+        sort_columns = [c for c in self.SORT_COLUMNS if c in df.columns]
+        if sort_columns:
+            df = df.sort_values(sort_columns, kind="stable")
+        
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            self.CLUSTERED_METADATA_KEY: ",".join(sort_columns),
+        })
+        pq.write_table(
+            table,
+            parquet_path,
+            compression=self.PARQUET_COMPRESSION,
+            row_group_size=settings.parquet_row_group_rows,
+            write_statistics=True,
+        )
+        return sort_columns
+    
+    def is_clustered(self, parquet_path: str) -> bool:
+        """
+        Whether a Parquet file already has the clustered layout, from its footer.
+        
+        Files written by this class carry the clustered_by marker. Older
+        clustered files are recognized by their ticker statistics: several
+        bounded row groups whose [min, max] ranges never go backwards. A
+        single unmarked row group says nothing about row order, so it
+        counts as not clustered (rewriting it is cheap).
+        """
+        try:
+            meta = pq.ParquetFile(parquet_path).metadata
+        except Exception:
+            return False
+        
+        if (meta.metadata or {}).get(self.CLUSTERED_METADATA_KEY.encode()) is not None:
+            return True
+        if "ticker" not in meta.schema.names or meta.num_row_groups < 2:
+            return False
+        
+        ticker_col = meta.schema.names.index("ticker")
+        prev_max = None
+        for i in range(meta.num_row_groups):
+            rg = meta.row_group(i)
+            stats = rg.column(ticker_col).statistics
+            if (
+                stats is None
+                or not stats.has_min_max
+                or rg.num_rows > settings.parquet_row_group_rows
+                or (prev_max is not None and stats.min < prev_max)
+            ):
+                return False
+            prev_max = stats.max
+        return True
+    
+    def _write_ticker_index(
+        self,
+        parquet_path: str,
+        tickers: Iterable[str],
+        sort_columns: List[str]
+    ) -> None:
+        """
+        Write the sidecar ticker -> [first_row_group, last_row_group] index.
+        
+        Built from the footer statistics of the sorted file. File size and
+        mtime are recorded so readers ignore the sidecar if the Parquet
+        file is rewritten later.
+        """
+        meta = pq.ParquetFile(parquet_path).metadata
+        ticker_col = meta.schema.names.index("ticker")
+        
+        rg_min, rg_max, rg_rows = [], [], []
+        for i in range(meta.num_row_groups):
+            rg = meta.row_group(i)
+            stats = rg.column(ticker_col).statistics
+            if stats is None or not stats.has_min_max:
+                logger.warning("No ticker statistics, skipping ticker index", path=parquet_path)
+                return
+            rg_min.append(stats.min)
+            rg_max.append(stats.max)
+            rg_rows.append(rg.num_rows)
+        
+        # Sorted file: row group bounds are monotonic, so each ticker maps
+        # to a contiguous range found by binary search
+        tickers = np.sort(np.asarray([t for t in tickers if isinstance(t, str)], dtype=object))
+        first = np.searchsorted(np.asarray(rg_max, dtype=object), tickers, side="left")
+        last = np.searchsorted(np.asarray(rg_min, dtype=object), tickers, side="right") - 1
+        
+        stat = os.stat(parquet_path)
+        index = {
+            "version": self.TICKER_INDEX_VERSION,
+            "sort_columns": sort_columns,
+            "num_rows": meta.num_rows,
+            "file_size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "row_groups": [[lo, hi, n] for lo, hi, n in zip(rg_min, rg_max, rg_rows)],
+            "tickers": {
+                t: [int(a), int(b)] for t, a, b in zip(tickers.tolist(), first, last)
+            },
+        }
+        
+        index_path = self._get_ticker_index_path(parquet_path)
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp_path, index_path)
+    
+    def get_ticker_row_groups(
+        self,
+        parquet_path: str,
+        tickers: Iterable[str]
+    ) -> Optional[List[int]]:
+        """
+        Row groups that may contain any of the tickers, from the sidecar index.
+        
+        Returns None when there is no valid index (missing, other version,
+        or the Parquet file changed since it was written) - callers then
+        read the whole file.
+        """
+        index_path = self._get_ticker_index_path(parquet_path)
+        try:
+            with open(index_path) as f:
+                index = json.load(f)
+            stat = os.stat(parquet_path)
+        except (OSError, ValueError):
+            return None
+        
+        if (
+            index.get("version") != self.TICKER_INDEX_VERSION
+            or index.get("file_size") != stat.st_size
+            or index.get("mtime_ns") != stat.st_mtime_ns
+        ):
+            return None
+        
+        groups = set()
+        for ticker in tickers:
+            bounds = index["tickers"].get(ticker)
+            if bounds:
+                groups.update(range(bounds[0], bounds[1] + 1))
+        return sorted(groups)
+    
+    def read_tickers(
+        self,
+        parquet_path: str,
+        tickers: List[str],
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Read only the rows of the given tickers from a Parquet file.
+        
+        Uses the sidecar index to read just the matching row groups;
+        otherwise relies on pyarrow's statistics-based filter pushdown.
+        Library entry point for in-process readers; the HTTP API does not
+        serve per-ticker reads.
+        """
+        pf = pq.ParquetFile(parquet_path)
+        row_groups = self.get_ticker_row_groups(parquet_path, tickers)
+        
+        if row_groups is None:
+            table = pq.read_table(
+                parquet_path,
+                columns=columns,
+                filters=[("ticker", "in", list(tickers))]
+            )
+        else:
+            read_columns = columns if columns is None or "ticker" in columns else [*columns, "ticker"]
+            table = pf.read_row_groups(row_groups, columns=read_columns)
+            table = table.filter(pc.is_in(table["ticker"], value_set=pa.array(list(tickers))))
+            if columns is not None and "ticker" not in columns:
+                table = table.drop(["ticker"])
+        
+        return table.to_pandas()
+    
     def _convert_csv_to_parquet(self, csv_path: str, parquet_path: str) -> bool:
         """
         Convert CSV.gz to Parquet format.
@@ -113,19 +371,26 @@ class BaseDownloader(ABC):
         
         Returns True if conversion successful.
         """
+        return self._convert(csv_path, parquet_path) is not None
+    
+    def _convert(self, csv_path: str, parquet_path: str) -> Optional[int]:
+        """Convert one file; returns rows written, or None on failure."""
         try:
-            # Read CSV.gz with pandas (handles gzip automatically)
-            df = pd.read_csv(csv_path)
+            started = time.monotonic()
             
-            # Convert to Parquet with zstd compression
-            # row_group_size optimized for typical queries (by ticker)
-            df.to_parquet(
-                parquet_path,
-                compression=self.PARQUET_COMPRESSION,
-                index=False,
-                engine='pyarrow'
-            )
+            if settings.parquet_converter == "streaming":
+                rows = self._convert_streaming(csv_path, parquet_path)
+            else:
+                # Read CSV.gz with pandas (handles gzip automatically)
+                df = pd.read_csv(csv_path)
+                rows = len(df)
+                
+                # Convert to Parquet with zstd compression
+                # (clustered layout: sorted by ticker, bounded row groups)
+                self._write_parquet(df, parquet_path)
+                del df
             
+            elapsed = time.monotonic() - started
             csv_size = os.path.getsize(csv_path)
             parquet_size = os.path.getsize(parquet_path)
             ratio = parquet_size / csv_size if csv_size > 0 else 0
@@ -135,17 +400,70 @@ class BaseDownloader(ABC):
                 csv_path=os.path.basename(csv_path),
                 csv_size_mb=round(csv_size / (1024 * 1024), 2),
                 parquet_size_mb=round(parquet_size / (1024 * 1024), 2),
-                size_ratio=round(ratio, 2)
+                size_ratio=round(ratio, 2),
+                layout=settings.parquet_layout,
+                converter=settings.parquet_converter,
+                rows=rows,
+                rows_per_sec=round(rows / elapsed) if elapsed > 0 else None
             )
             
-            return True
+            return rows
             
         except Exception as e:
             logger.error("Parquet conversion failed", error=str(e), csv_path=csv_path)
-            # Clean up partial parquet file if exists
-            if os.path.exists(parquet_path):
-                os.remove(parquet_path)
-            return False
+            # Clean up partial parquet file (and its index) if exists
+            for path in (parquet_path, self._get_ticker_index_path(parquet_path)):
+                if os.path.exists(path):
+                    os.remove(path)
+            return None
+    
+    def _convert_streaming(self, csv_path: str, parquet_path: str) -> int:
+        """
+        CSV.gz -> Parquet through DuckDB without materializing a DataFrame.
+        
+        Same layouts as _write_parquet: plain keeps CSV order; clustered
+        sorts by SORT_COLUMNS (spilling to disk under the memory limit)
+        and writes bounded row groups plus the ticker sidecar.
+        """
+        cur = _converter_connection().cursor()
+        try:
+            types = ", ".join(
+                f"'{name}': '{sql_type}'" for name, sql_type in self.CSV_COLUMN_TYPES.items()
+            )
+            source = (
+                f"read_csv({_sql_literal(csv_path)}, header = true, "
+                f"compression = 'gzip', types = {{{types}}})"
+            )
+            
+            columns = [d[0] for d in cur.execute(f"SELECT * FROM {source} LIMIT 0").description]
+            options = f"FORMAT parquet, COMPRESSION {self.PARQUET_COMPRESSION}"
+            
+            sort_columns: List[str] = []
+            if settings.parquet_layout == "clustered":
+                sort_columns = [c for c in self.SORT_COLUMNS if c in columns]
+                order_by = ("ORDER BY " + ", ".join(f'"{c}"' for c in sort_columns)) if sort_columns else ""
+                query = f"SELECT * FROM {source} {order_by}"
+                options += f", ROW_GROUP_SIZE {int(settings.parquet_row_group_rows)}"
+                options += (
+                    f", KV_METADATA {{{self.CLUSTERED_METADATA_KEY}: "
+                    f"{_sql_literal(','.join(sort_columns))}}}"
+                )
+            else:
+                query = f"SELECT * FROM {source}"
+            
+            rows = cur.execute(f"COPY ({query}) TO {_sql_literal(parquet_path)} ({options})").fetchone()[0]
+            
+            if settings.parquet_layout == "clustered" and settings.parquet_ticker_index and "ticker" in columns:
+                tickers = [
+                    r[0] for r in cur.execute(
+                        "SELECT DISTINCT ticker FROM read_parquet(?)", [parquet_path]
+                    ).fetchall()
+                ]
+                self._write_ticker_index(parquet_path, tickers, sort_columns)
+            
+            return int(rows)
+        finally:
+            cur.close()
     
     def download_date(self, date: datetime, force: bool = False) -> Optional[str]:
         """
@@ -295,7 +613,9 @@ class BaseDownloader(ABC):
             workers=max_workers
         )
         
-        results = {"converted": 0, "failed": 0, "space_saved_mb": 0}
+        results = {"converted": 0, "failed": 0, "space_saved_mb": 0, "rows": 0}
+        rows_lock = threading.Lock()
+        started = time.monotonic()
         
         def convert_file(csv_name: str) -> bool:
             csv_path = os.path.join(self.output_dir, csv_name)
@@ -303,7 +623,11 @@ class BaseDownloader(ABC):
             parquet_path = os.path.join(self.output_dir, parquet_name)
             
             csv_size = os.path.getsize(csv_path)
-            success = self._convert_csv_to_parquet(csv_path, parquet_path)
+            rows = self._convert(csv_path, parquet_path)
+            success = rows is not None
+            if success:
+                with rows_lock:
+                    results["rows"] += rows
             
             if success and delete_csv:
                 os.remove(csv_path)
@@ -324,6 +648,8 @@ class BaseDownloader(ABC):
                     results["converted"] += 1
         
         results["space_saved_mb"] = round(results["space_saved_mb"], 2)
+        elapsed = time.monotonic() - started
+        results["rows_per_sec"] = round(results["rows"] / elapsed) if elapsed > 0 else 0
         
         logger.info(
             "Batch conversion complete",
@@ -333,6 +659,86 @@ class BaseDownloader(ABC):
         
         return results
     
+    def cluster_existing_parquet(self, max_workers: int = 4) -> Dict:
+        """
+        Rewrite existing plain Parquet files with the clustered layout.
+        
+        Files whose footer already shows the clustered layout are skipped
+        (see is_clustered); a missing ticker index is rebuilt for them when
+        parquet_ticker_index is on. Each file is rewritten to a temporary
+        path and swapped in atomically.
+        
+        Returns:
+            Dict with clustering statistics
+        """
+        if settings.parquet_layout != "clustered":
+            return {"error": "parquet_layout is not 'clustered'", "clustered": 0}
+        if not os.path.exists(self.output_dir):
+            return {"error": "Output directory doesn't exist", "clustered": 0}
+        
+        parquet_files = [
+            os.path.join(self.output_dir, f)
+            for f in sorted(os.listdir(self.output_dir))
+            if f.endswith(self.PARQUET_EXTENSION)
+        ]
+        pending = [p for p in parquet_files if not self.is_clustered(p)]
+        
+        reindexed = 0
+        if settings.parquet_ticker_index:
+            for p in parquet_files:
+                if p in pending or self.get_ticker_row_groups(p, []) is not None:
+                    continue
+                try:
+                    meta = pq.ParquetFile(p).metadata
+                    if "ticker" not in meta.schema.names:
+                        continue
+                    tickers = pq.read_table(p, columns=["ticker"])["ticker"].unique().to_pylist()
+                    sort_columns = [c for c in self.SORT_COLUMNS if c in meta.schema.names]
+                    self._write_ticker_index(p, tickers, sort_columns)
+                    reindexed += 1
+                except Exception as e:
+                    logger.warning("Ticker index rebuild failed", error=str(e), parquet_path=p)
+        
+        logger.info(
+            "Starting Parquet clustering",
+            data_type=self.__class__.__name__,
+            files_to_cluster=len(pending),
+            workers=max_workers
+        )
+        
+        def cluster_file(parquet_path: str) -> bool:
+            tmp_path = parquet_path + ".tmp"
+            try:
+                df = pd.read_parquet(parquet_path, engine='pyarrow')
+                sort_columns = self._write_clustered(df, tmp_path)
+                os.replace(tmp_path, parquet_path)
+                if settings.parquet_ticker_index and "ticker" in df.columns:
+                    self._write_ticker_index(parquet_path, df["ticker"].unique(), sort_columns)
+                return True
+            except Exception as e:
+                logger.error("Parquet clustering failed", error=str(e), parquet_path=parquet_path)
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return False
+        
+        results = {
+            "clustered": 0,
+            "failed": 0,
+            "skipped": len(parquet_files) - len(pending),
+            "reindexed": reindexed,
+        }
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for ok in executor.map(cluster_file, pending):
+                results["clustered" if ok else "failed"] += 1
+        
+        logger.info(
+            "Parquet clustering complete",
+            data_type=self.__class__.__name__,
+            **results
+        )
+        
+        return results
+    
     def get_stats(self) -> Dict:
         """Get statistics about downloaded files (both CSV.gz and Parquet)"""
         if not os.path.exists(self.output_dir):
@@ -372,5 +778,6 @@ class BaseDownloader(ABC):
             "newest_date": all_dates[-1] if all_dates else None,
             "output_dir": self.output_dir,
             "parquet_enabled": self.CONVERT_TO_PARQUET,
+            "parquet_layout": settings.parquet_layout,
         }
 
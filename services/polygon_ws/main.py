@@ -25,8 +25,12 @@ from shared.config.settings import settings
 from shared.config.index_symbols import is_index_symbol
 
 NUM_ALERT_PARTITIONS = int(os.environ.get("NUM_ALERT_PARTITIONS", "4"))
+# 0 = sin rebalanceo (solo hash estable + overrides ya guardados en Redis)
+ALERT_PARTITION_REBALANCE_SECS = int(os.environ.get("ALERT_PARTITION_REBALANCE_SECS", "0"))
+ALERT_PARTITION_HOT_SYMBOLS = int(os.environ.get("ALERT_PARTITION_HOT_SYMBOLS", "200"))
 from shared.utils.redis_client import RedisClient
 from shared.utils.logger import configure_logging, get_logger
+from shared.utils.alert_partitions import AlertPartitionMap
 from shared.utils.redis_stream_manager import (
     initialize_stream_manager,
     get_stream_manager
@@ -35,6 +39,7 @@ from shared.models.polygon import PolygonTrade, PolygonQuote, PolygonAgg, Polygo
 from shared.contracts.realtime import build_realtime_aggregate_payload
 from ws_client import PolygonWebSocketClient
 from subscription_reconciler import SubscriptionReconciler
+from stream_publisher import StreamBatchPublisher
 
 # Configurar logger
 configure_logging(service_name="polygon_ws")
@@ -45,6 +50,9 @@ logger = get_logger(__name__)
 # ============================================================================
 
 redis_client: Optional[RedisClient] = None
+stream_publisher: Optional[StreamBatchPublisher] = None
+partition_map: Optional[AlertPartitionMap] = None
+alert_partition_task: Optional[asyncio.Task] = None
 ws_client: Optional[PolygonWebSocketClient] = None
 subscription_task: Optional[asyncio.Task] = None
 quote_subscription_task: Optional[asyncio.Task] = None  # Nueva tarea para quotes
@@ -74,7 +82,7 @@ catalyst_subscribed_tickers: Set[str] = set()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gestión del ciclo de vida de la aplicación"""
-    global redis_client, ws_client, subscription_task, quote_subscription_task, catalyst_subscription_task, luld_subscription_task, minute_agg_subscription_task, agg_all_subscription_task, reconciler, reconciler_task
+    global redis_client, stream_publisher, partition_map, alert_partition_task, ws_client, subscription_task, quote_subscription_task, catalyst_subscription_task, luld_subscription_task, minute_agg_subscription_task, agg_all_subscription_task, reconciler, reconciler_task
     
     logger.info("polygon_ws_service_starting")
     
@@ -86,6 +94,14 @@ async def lifespan(app: FastAPI):
     stream_manager = initialize_stream_manager(redis_client)
     await stream_manager.start()
     
+    # Publisher micro-batch para los streams de alta frecuencia (T/Q/A/AM)
+    stream_publisher = StreamBatchPublisher(redis_client)
+    stream_publisher.start()
+    
+    # Mapa símbolo → partición de stream:agg:p{N} (compartido con alert_engine)
+    partition_map = AlertPartitionMap(redis_client, NUM_ALERT_PARTITIONS)
+    await partition_map.load(owner=True)
+    
     # Inicializar WebSocket Client
     # Ahora usamos Aggregates (Scanner) + Quotes (Tickers individuales/Watchlists) + LULD (todo mercado)
     ws_client = PolygonWebSocketClient(
@@ -119,6 +135,7 @@ async def lifespan(app: FastAPI):
     nasdaq_rss_task = asyncio.create_task(poll_nasdaq_rss_halts())
     trade_subscription_task = asyncio.create_task(manage_trade_subscriptions())
     reconciler_task = asyncio.create_task(reconciler.start())
+    alert_partition_task = asyncio.create_task(manage_alert_partitions())
     
     logger.info(
         "polygon_ws_service_started",
@@ -188,6 +205,13 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
     
+    if alert_partition_task:
+        alert_partition_task.cancel()
+        try:
+            await alert_partition_task
+        except asyncio.CancelledError:
+            pass
+    
     if nasdaq_rss_task:
         nasdaq_rss_task.cancel()
         try:
@@ -205,6 +229,10 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
     
+    # Flush final de eventos pendientes
+    if stream_publisher:
+        await stream_publisher.stop()
+    
     # Stop Stream Manager
     await stream_manager.stop()
     
@@ -238,8 +266,8 @@ async def handle_trade(trade: PolygonTrade):
         trade: Trade de Polygon
     """
     try:
-        # Publicar a Redis Stream
-        await redis_client.publish_to_stream(
+        # Publicar a Redis Stream (micro-batch pipelined)
+        await stream_publisher.publish(
             "stream:realtime:trades",
             {
                 'symbol': trade.sym,
@@ -283,8 +311,8 @@ async def handle_quote(quote: PolygonQuote):
         quote: Quote de Polygon
     """
     try:
-        # Publicar a Redis Stream
-        await redis_client.publish_to_stream(
+        # Publicar a Redis Stream (micro-batch pipelined)
+        await stream_publisher.publish(
             "stream:realtime:quotes",
             {
                 'symbol': quote.sym,
@@ -319,7 +347,7 @@ async def handle_aggregate(agg: PolygonAgg):
     Procesa un mensaje de Aggregate del WebSocket.
 
     Publica a:
-    1. stream:agg:pN (particionado por hash del símbolo) -- para alert workers
+    1. stream:agg:pN (partición según AlertPartitionMap) -- para alert workers
     2. stream:realtime:aggregates (backward compat) -- para snapshot loop y otros
     """
     try:
@@ -342,11 +370,12 @@ async def handle_aggregate(agg: PolygonAgg):
             otc=bool(agg.otc),
         )
 
-        partition = hash(agg.sym) % NUM_ALERT_PARTITIONS
+        partition_map.record(agg.sym)
+        partition = partition_map.partition_for(agg.sym)
         partitioned_stream = f"stream:agg:p{partition}"
 
-        await redis_client.publish_to_stream(partitioned_stream, payload, maxlen=50000)
-        await redis_client.publish_to_stream("stream:realtime:aggregates", payload)
+        await stream_publisher.publish(partitioned_stream, payload, maxlen=50000)
+        await stream_publisher.publish("stream:realtime:aggregates", payload)
 
     except Exception as e:
         logger.error(
@@ -378,7 +407,7 @@ async def handle_minute_aggregate(agg: PolygonAgg):
         agg: Minute aggregate de Polygon
     """
     try:
-        await redis_client.publish_to_stream(
+        await stream_publisher.publish(
             "stream:market:minutes",
             {
                 'sym': agg.sym,
@@ -1214,6 +1243,47 @@ async def manage_luld_subscription():
             await asyncio.sleep(5)
 
 
+# ============================================================================
+# Alert Partition Map (rebalanceo de stream:agg:p{N})
+# ============================================================================
+
+async def manage_alert_partitions():
+    """
+    Mantiene el mapa de particiones de alertas.
+    
+    Con ALERT_PARTITION_REBALANCE_SECS > 0 reparte periódicamente los
+    ALERT_PARTITION_HOT_SYMBOLS símbolos con más mensajes/s entre las
+    particiones menos cargadas. Sin rebalanceo solo recarga el mapa por si
+    otro proceso lo reescribió.
+    """
+    interval = ALERT_PARTITION_REBALANCE_SECS or 30
+    logger.info(
+        "alert_partition_manager_started",
+        num_partitions=NUM_ALERT_PARTITIONS,
+        rebalance_secs=ALERT_PARTITION_REBALANCE_SECS,
+        hot_symbols=ALERT_PARTITION_HOT_SYMBOLS,
+    )
+    
+    while True:
+        try:
+            await asyncio.sleep(interval)
+            if ALERT_PARTITION_REBALANCE_SECS > 0:
+                await partition_map.rebalance(hot_symbols=ALERT_PARTITION_HOT_SYMBOLS)
+            else:
+                await partition_map.refresh()
+        
+        except asyncio.CancelledError:
+            logger.info("alert_partition_manager_cancelled")
+            raise
+        
+        except Exception as e:
+            logger.error(
+                "alert_partition_manager_error",
+                error=str(e),
+                error_type=type(e).__name__
+            )
+
+
 # ============================================================================
 # Minute Aggregate Subscription Management (AM.* for entire market)
 # ============================================================================
@@ -1723,6 +1793,7 @@ async def health_check():
             "queue_depth": stats["queue_depth"],
             "workers_active": stats["workers_active"],
             "reconnections": stats["reconnections"],
+            "publisher_pending": stream_publisher.get_stats()["pending"] if stream_publisher else 0,
         }
     return {
         "status": "starting",
@@ -1740,6 +1811,10 @@ async def get_stats():
         raise HTTPException(status_code=503, detail="Service not ready")
     
     stats = ws_client.get_stats()
+    if stream_publisher:
+        stats["publisher"] = stream_publisher.get_stats()
+    if partition_map:
+        stats["alert_partitions"] = partition_map.get_stats()
     
     return JSONResponse(content=stats)
 
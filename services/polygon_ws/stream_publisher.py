@@ -0,0 +1,254 @@
+"""
+Stream Publisher — XADD micro-batching para polygon_ws
+
+Los handlers del WebSocket hacían un XADD (un round trip a Redis) por evento.
+Con A.* de todo el mercado eso son decenas de miles de round trips/segundo.
+
+Este componente acumula eventos durante una ventana corta y los publica con
+UN pipeline (sin MULTI/EXEC) por flush, con los XADD agrupados por stream:
+
+    handler → publish() → buffer en memoria
+                              ↓ (cada FLUSH_MS o al llegar a BATCH_SIZE eventos)
+                          pipeline: XADD s1 ×n1, XADD s2 ×n2, ... → execute()
+
+- El orden de llegada se conserva dentro de cada stream.
+- Backpressure: si el buffer supera MAX_PENDING, publish() espera al siguiente
+  flush; los workers de ws_client se frenan y la cola de ws_client absorbe
+  (o descarta, con su propia métrica) el exceso.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+import structlog
+
+from shared.utils.redis_client import RedisClient
+
+logger = structlog.get_logger(__name__)
+
+FLUSH_MS = float(os.environ.get("POLYGON_WS_PUBLISH_FLUSH_MS", "10"))
+BATCH_SIZE = int(os.environ.get("POLYGON_WS_PUBLISH_BATCH_SIZE", "2000"))
+MAX_PENDING = int(os.environ.get("POLYGON_WS_PUBLISH_MAX_PENDING", "50000"))
+
+# (fields, maxlen) por evento
+_Entry = Tuple[Dict[str, str], Optional[int]]
+
+
+def _serialize(fields: Dict[str, Any]) -> Dict[str, str]:
+    """Misma serialización que RedisClient.xadd (no-str → JSON)."""
+    return {
+        k: v if isinstance(v, str) else orjson.dumps(v).decode()
+        for k, v in fields.items()
+    }
+
+
+class StreamBatchPublisher:
+    """
+    Publicador XADD con ventana de micro-batch y flush pipelined.
+
+    Uso:
+        publisher = StreamBatchPublisher(redis_client)
+        publisher.start()
+        await publisher.publish("stream:realtime:quotes", fields, maxlen=10000)
+        ...
+        await publisher.stop()   # flush final
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        flush_ms: float = FLUSH_MS,
+        batch_size: int = BATCH_SIZE,
+        max_pending: int = MAX_PENDING,
+    ):
+        self.redis = redis_client
+        self.flush_interval = max(flush_ms, 0.1) / 1000.0
+        self.batch_size = max(batch_size, 1)
+        self.max_pending = max(max_pending, self.batch_size)
+
+        # stream → entradas pendientes (dict ordenado: orden de primera aparición)
+        self._buffers: Dict[str, List[_Entry]] = {}
+        self._pending = 0
+
+        self._flush_now = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+
+        self.stats = {
+            "events_published": 0,
+            "events_failed": 0,
+            "flushes": 0,
+            "flushes_by_size": 0,
+            "flush_errors": 0,
+            "last_batch_size": 0,
+            "max_batch_size": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "pending_peak": 0,
+            "backpressure_waits": 0,
+            "backpressure_wait_ms": 0.0,
+        }
+
+    # =====================================================================
+    # Lifecycle
+    # =====================================================================
+
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._flush_loop())
+        logger.info(
+            "stream_publisher_started",
+            flush_ms=round(self.flush_interval * 1000, 1),
+            batch_size=self.batch_size,
+            max_pending=self.max_pending,
+        )
+
+    async def stop(self) -> None:
+        """Detiene el loop y publica lo que quede en el buffer."""
+        self._running = False
+        if self._task:
+            self._flush_now.set()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        logger.info("stream_publisher_stopped", **self.stats)
+
+    # =====================================================================
+    # Publish
+    # =====================================================================
+
+    async def publish(
+        self,
+        stream_name: str,
+        fields: Dict[str, Any],
+        maxlen: Optional[int] = 10000,
+    ) -> None:
+        """
+        Encola un XADD. Solo espera (backpressure) si el buffer está lleno.
+
+        Sin loop de flush activo publica directamente (un XADD), para que los
+        handlers funcionen igual antes de start() o tras stop().
+        """
+        if not self._running:
+            await self.redis.xadd(stream_name, fields, maxlen=maxlen)
+            return
+
+        while self._pending >= self.max_pending:
+            self.stats["backpressure_waits"] += 1
+            if self.stats["backpressure_waits"] % 1000 == 1:
+                logger.warning(
+                    "stream_publisher_backpressure",
+                    pending=self._pending,
+                    waits=self.stats["backpressure_waits"],
+                )
+            self._drained.clear()
+            self._flush_now.set()
+            t_wait = time.perf_counter()
+            await self._drained.wait()
+            self.stats["backpressure_wait_ms"] += (time.perf_counter() - t_wait) * 1000
+
+        buffer = self._buffers.get(stream_name)
+        if buffer is None:
+            buffer = self._buffers[stream_name] = []
+        buffer.append((_serialize(fields), maxlen))
+        self._pending += 1
+
+        if self._pending > self.stats["pending_peak"]:
+            self.stats["pending_peak"] = self._pending
+        if self._pending >= self.batch_size:
+            self._flush_now.set()
+
+    # =====================================================================
+    # Flush
+    # =====================================================================
+
+    async def _flush_loop(self) -> None:
+        while self._running:
+            try:
+                try:
+                    await asyncio.wait_for(self._flush_now.wait(), timeout=self.flush_interval)
+                    self.stats["flushes_by_size"] += 1
+                except asyncio.TimeoutError:
+                    pass
+                self._flush_now.clear()
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("stream_publisher_loop_error", error=str(e))
+                await asyncio.sleep(self.flush_interval)
+
+    async def flush(self) -> int:
+        """
+        Publica todo el buffer en un único pipeline.
+
+        Returns:
+            Número de eventos publicados
+        """
+        if not self._pending:
+            self._drained.set()
+            return 0
+
+        buffers, self._buffers = self._buffers, {}
+        count, self._pending = self._pending, 0
+        self._drained.set()
+
+        t_start = time.perf_counter()
+        try:
+            pipe = self.redis.client.pipeline(transaction=False)
+            for stream_name, entries in buffers.items():
+                for fields, maxlen in entries:
+                    pipe.xadd(stream_name, fields, maxlen=maxlen, approximate=True)
+            results = await pipe.execute(raise_on_error=False)
+        except Exception as e:
+            self.stats["flush_errors"] += 1
+            self.stats["events_failed"] += count
+            logger.error(
+                "stream_publisher_flush_error",
+                events=count,
+                streams=len(buffers),
+                error=str(e),
+            )
+            return 0
+
+        failed = sum(1 for r in results if isinstance(r, Exception))
+        if failed:
+            self.stats["events_failed"] += failed
+            logger.error(
+                "stream_publisher_xadd_errors",
+                failed=failed,
+                events=count,
+                error=str(next(r for r in results if isinstance(r, Exception))),
+            )
+
+        elapsed_ms = (time.perf_counter() - t_start) * 1000
+        self.stats["events_published"] += count - failed
+        self.stats["flushes"] += 1
+        self.stats["last_batch_size"] = count
+        self.stats["last_flush_ms"] = round(elapsed_ms, 2)
+        if count > self.stats["max_batch_size"]:
+            self.stats["max_batch_size"] = count
+        if elapsed_ms > self.stats["max_flush_ms"]:
+            self.stats["max_flush_ms"] = round(elapsed_ms, 2)
+        return count - failed
+
+    def get_stats(self) -> Dict[str, Any]:
+        flushes = self.stats["flushes"]
+        return {
+            **self.stats,
+            "pending": self._pending,
+            "avg_batch_size": round(self.stats["events_published"] / flushes, 1) if flushes else 0,
+            "backpressure_wait_ms": round(self.stats["backpressure_wait_ms"], 1),
+            "running": self._running,
+        }
@@ -0,0 +1,173 @@
+"""
+Average Volume Cache
+Promedios de volumen diario (5D, 10D, 3M) residentes en memoria del scanner
+
+Los promedios solo cambian una vez por día de trading. La tarea
+calculate_avg_volumes de data_maintenance los calcula para todo el universo
+tras cargar las barras diarias y los publica en el hash scanner:avg_volumes.
+Este módulo los carga en un array denso (símbolo → fila) y el scanner los
+consulta en cada ciclo sin ir a TimescaleDB.
+
+Recarga cuando cambia __meta__.trading_date (comprobado cada check_interval
+segundos). Si el hash no existe (primer arranque, tarea aún no ejecutada) se
+calcula una vez con la misma query set-based sobre market_data_daily
+(shared/utils/avg_volumes.py).
+"""
+
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import orjson
+
+import sys
+sys.path.append('/app')
+
+from shared.utils.redis_client import RedisClient
+from shared.utils.timescale_client import TimescaleClient
+from shared.utils.logger import get_logger
+from shared.utils.avg_volumes import (
+    AVG_VOLUMES_HASH,
+    AVG_VOLUME_PERIODS,
+    AVG_VOLUME_WINDOW_CALENDAR_DAYS,
+    avg_volumes_query,
+)
+
+logger = get_logger(__name__)
+
+_NULL = -1
+
+
+class AvgVolumeCache:
+    """
+    Array denso (n_symbols, n_periods) int64 con índice symbol → fila.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        timescale_client: TimescaleClient,
+        check_interval: float = 300.0
+    ):
+        self.redis = redis_client
+        self.db = timescale_client
+        self.check_interval = check_interval
+
+        self._index: Dict[str, int] = {}
+        self._values: np.ndarray = np.empty((0, len(AVG_VOLUME_PERIODS)), dtype=np.int64)
+        self._trading_date: Optional[str] = None
+        self._source: Optional[str] = None
+        self._last_check: float = 0.0
+        self._loads = 0
+
+    @property
+    def size(self) -> int:
+        return len(self._index)
+
+    def invalidate(self) -> None:
+        """Fuerza la comprobación en la próxima llamada (p.ej. DAY_CHANGED)."""
+        self._last_check = 0.0
+
+    async def refresh_if_stale(self) -> None:
+        """Recarga si el hash publicado es de otro día de trading. Barato si no toca."""
+        now = time.monotonic()
+        if self._last_check and now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+
+        try:
+            meta_raw = await self.redis.client.hget(AVG_VOLUMES_HASH, "__meta__")
+            if meta_raw:
+                meta = orjson.loads(meta_raw)
+                if meta.get("trading_date") != self._trading_date or self._source != "redis":
+                    await self._load_from_redis(meta)
+                return
+
+            if not self._index:
+                await self._load_from_db()
+        except Exception as e:
+            logger.error("avg_volume_cache_refresh_error", error=str(e))
+
+    def lookup(self, symbols: List[str]) -> Dict[str, Dict[str, int]]:
+        """
+        Returns:
+            Dict symbol → {avg_volume_5d, avg_volume_10d, avg_volume_3m}
+            (símbolos sin datos se omiten, igual que la query original)
+        """
+        results: Dict[str, Dict[str, int]] = {}
+        index = self._index
+        rows = [(s, index[s]) for s in symbols if s in index]
+        if not rows:
+            return results
+
+        block = self._values[[r for _, r in rows]].tolist()
+        names = [name for name, _ in AVG_VOLUME_PERIODS]
+        for (symbol, _), values in zip(rows, block):
+            results[symbol] = {
+                name: (None if v == _NULL else v) for name, v in zip(names, values)
+            }
+        return results
+
+    def _install(self, symbols: List[str], values: np.ndarray, trading_date: Optional[str], source: str) -> None:
+        self._index = {s: i for i, s in enumerate(symbols)}
+        self._values = values
+        self._trading_date = trading_date
+        self._source = source
+        self._loads += 1
+        logger.info(
+            "avg_volume_cache_loaded",
+            source=source,
+            symbols=len(symbols),
+            trading_date=trading_date,
+            bytes=int(values.nbytes)
+        )
+
+    async def _load_from_redis(self, meta: dict) -> None:
+        raw = await self.redis.client.hgetall(AVG_VOLUMES_HASH)
+        raw.pop("__meta__", None)
+        if not raw:
+            return
+
+        periods = meta.get("periods") or [name for name, _ in AVG_VOLUME_PERIODS]
+        positions = [
+            periods.index(name) if name in periods else None
+            for name, _ in AVG_VOLUME_PERIODS
+        ]
+
+        symbols = list(raw.keys())
+        values = np.full((len(symbols), len(AVG_VOLUME_PERIODS)), _NULL, dtype=np.int64)
+        for i, symbol in enumerate(symbols):
+            parts = raw[symbol].split(",")
+            for j, pos in enumerate(positions):
+                if pos is not None and pos < len(parts) and parts[pos]:
+                    values[i, j] = int(parts[pos])
+
+        self._install(symbols, values, meta.get("trading_date"), "redis")
+
+    async def _load_from_db(self) -> None:
+        """Fallback: una query para todo el universo (solo si el hash no existe)."""
+        today = date.today()
+        window_start = today - timedelta(days=AVG_VOLUME_WINDOW_CALENDAR_DAYS)
+        rows = await self.db.fetch(avg_volumes_query(), window_start, today, 3)
+        if not rows:
+            return
+
+        symbols = [row['symbol'] for row in rows]
+        values = np.array(
+            [
+                [_NULL if row[name] is None else int(row[name]) for name, _ in AVG_VOLUME_PERIODS]
+                for row in rows
+            ],
+            dtype=np.int64,
+        )
+        last_date = max(row['last_date'] for row in rows)
+        self._install(symbols, values, last_date.isoformat() if last_date else None, "db")
+
+    def get_stats(self) -> dict:
+        return {
+            "symbols": len(self._index),
+            "trading_date": self._trading_date,
+            "source": self._source,
+            "loads": self._loads,
+        }
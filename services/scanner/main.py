@@ -134,6 +134,8 @@ async def handle_day_changed(event: Event) -> None:
         
         if scanner_engine and scanner_engine.gap_tracker:
             scanner_engine.gap_tracker.clear_for_new_day()
+        if scanner_engine:
+            scanner_engine.avg_volume_cache.invalidate()
         
         if scanner_engine:
             scanner_engine.clear_postmarket_cache()
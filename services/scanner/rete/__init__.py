@@ -17,6 +17,10 @@ from .evaluator import (
     set_market_context,
 )
 
+from .vectorized import (
+    BatchPlan, compile_batch_plan, evaluate_batch_vectorized,
+)
+
 from .system_rules import get_system_rules, CATEGORY_TO_CHANNEL
 
 from .user_rules import (
@@ -29,6 +33,7 @@ __all__ = [
     "compile_network", "add_rule_to_network", "remove_rule_from_network",
     "evaluate_condition", "evaluate_ticker", "get_matching_rules",
     "get_matching_rules_by_owner", "set_market_context",
+    "BatchPlan", "compile_batch_plan", "evaluate_batch_vectorized",
     "get_system_rules", "CATEGORY_TO_CHANNEL",
     "filter_params_to_conditions", "user_filter_to_scan_rule", "convert_user_filters",
 ]
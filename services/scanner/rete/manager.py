@@ -10,6 +10,7 @@ from datetime import datetime
 from .models import ScanRule, RuleOwnerType, ReteNetwork
 from .compiler import compile_network, add_rule_to_network, remove_rule_from_network
 from .evaluator import evaluate_ticker, get_matching_rules
+from .vectorized import BatchPlan, compile_batch_plan, evaluate_batch_vectorized
 from .system_rules import get_system_rules
 from .user_rules import convert_user_filters
 
@@ -41,6 +42,10 @@ class ReteManager:
         
         self.network: Optional[ReteNetwork] = None
         self.last_compile: Optional[datetime] = None
+        
+        # Evaluacion vectorizada (mascaras numpy por alpha) para evaluate_batch
+        self.vectorized = True
+        self._batch_plan: Optional[BatchPlan] = None
         self.active_users: Set[str] = set()
         
         # Estadisticas
@@ -76,6 +81,7 @@ class ReteManager:
             
             # 3. Compilar network
             self.network = compile_network(all_rules)
+            self._batch_plan = compile_batch_plan(self.network)
             self.last_compile = datetime.now()
             
             stats = self.network.get_stats()
@@ -249,6 +255,12 @@ class ReteManager:
         if not self.network:
             return {}
         
+        if self.vectorized:
+            results = evaluate_batch_vectorized(tickers, self.network, self._batch_plan)
+            self.total_evaluations += len(tickers)
+            self.total_matches += sum(len(v) for v in results.values())
+            return results
+        
         results: Dict[str, List[Any]] = {}
         
         for ticker in tickers:
@@ -292,5 +304,6 @@ class ReteManager:
             "active_users": len(self.active_users),
             "total_evaluations": self.total_evaluations,
             "total_matches": self.total_matches,
+            "vectorized": self.vectorized,
             "last_compile": self.last_compile.isoformat() if self.last_compile else None,
         }
@@ -6,6 +6,7 @@ from rete.models import Condition, Operator, ScanRule, RuleOwnerType
 from rete.evaluator import evaluate_condition, evaluate_ticker, get_matching_rules
 from rete.compiler import compile_network
 from rete.system_rules import get_system_rules
+from rete.vectorized import evaluate_batch_vectorized
 from dataclasses import dataclass
 
 
@@ -58,8 +59,37 @@ def test_evaluate():
     print("  OK")
 
 
+def test_vectorized_parity():
+    print("Testing vectorized batch...")
+    rules = get_system_rules() + [
+        ScanRule(id='user:u1:scan:1', owner_type=RuleOwnerType.USER, name='u1', owner_id='u1',
+                 conditions=[Condition('price', Operator.BETWEEN, [1, 10]),
+                             Condition('rvol', Operator.GTE, 2)]),
+        ScanRule(id='user:u2:scan:1', owner_type=RuleOwnerType.USER, name='u2', owner_id='u2',
+                 conditions=[Condition('symbol', Operator.IN, ['TEST', 'ABC']),
+                             Condition('chg_5min', Operator.NOT_NONE, None)]),
+    ]
+    network = compile_network(rules)
+    
+    tickers = [
+        MockTicker(),
+        MockTicker(symbol='ABC', price=0.5, rvol=None, chg_5min=None),
+        MockTicker(symbol='XYZ', price=50.0, gap_percent=-4.0, change_percent=-7.0),
+    ]
+    expected = {}
+    for t in tickers:
+        for rule_id in get_matching_rules(t, network):
+            expected.setdefault(rule_id, []).append(t.symbol)
+    
+    batch = evaluate_batch_vectorized(tickers, network)
+    got = {rule_id: [t.symbol for t in ts] for rule_id, ts in batch.items()}
+    assert got == expected, (got, expected)
+    print(f"  OK: {len(got)} rules matched")
+
+
 if __name__ == '__main__':
     test_conditions()
     test_compile()
     test_evaluate()
+    test_vectorized_parity()
     print("\nAll tests passed!")
@@ -0,0 +1,227 @@
+"""
+RETE Vectorized Evaluator
+Evalua el grafo RETE sobre un batch completo de tickers con mascaras numpy
+
+En lugar de recorrer ticker por ticker (getattr + evaluate_condition por cada
+alpha), se construye una columna por campo usado en el network y cada alpha
+se evalua de una vez como mascara booleana sobre todo el batch. Los beta nodes
+son un AND de filas de la matriz de alphas.
+
+El coste por scan pasa a ser O(alphas x tickers) en operaciones vectoriales,
+de modo que cientos de reglas de usuario que comparten campos no multiplican
+el CPU de forma lineal en Python.
+
+Semantica identica a evaluator.evaluate_condition:
+    - None nunca cumple, salvo IS_NONE / NOT_NONE
+    - Campos no numericos (sector, exchange, ...) se evaluan con el fallback
+      escalar sobre esa columna
+"""
+
+from dataclasses import dataclass
+from numbers import Real
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .models import Condition, Operator, ReteNetwork
+from .evaluator import evaluate_condition
+from . import evaluator as _evaluator
+from .filter_mapping_generated import MARKET_CONTEXT_FIELDS
+
+
+@dataclass
+class BatchPlan:
+    """Network compilado para evaluacion vectorizada."""
+    alpha_ids: List[str]
+    conditions: List[Condition]
+    fields: List[str]
+    beta_parents: List[np.ndarray]        # indices de alpha por beta
+    rule_ids: List[str]                   # rule_id por terminal (mismo orden que beta_parents)
+    signature: Tuple[int, int, int, int] = (0, 0, 0, 0)
+
+
+def _network_signature(network: ReteNetwork) -> Tuple[int, int, int, int]:
+    return (
+        id(network),
+        len(network.alpha_nodes),
+        len(network.beta_nodes),
+        len(network.terminal_nodes),
+    )
+
+
+def compile_batch_plan(network: ReteNetwork) -> BatchPlan:
+    """
+    Compila el network (de compile_network) a un plan de mascaras.
+
+    Cada alpha recibe un indice de fila; cada terminal guarda los indices de
+    las alphas de su beta.
+    """
+    alpha_ids = list(network.alpha_nodes.keys())
+    alpha_index = {aid: i for i, aid in enumerate(alpha_ids)}
+    conditions = [network.alpha_nodes[aid].condition for aid in alpha_ids]
+    fields = sorted({c.field for c in conditions})
+
+    beta_parents: List[np.ndarray] = []
+    rule_ids: List[str] = []
+    for terminal in network.terminal_nodes.values():
+        beta = network.beta_nodes.get(terminal.parent_beta)
+        if beta is None:
+            parents = None
+        else:
+            parents = np.array(
+                [alpha_index[a] for a in beta.parent_alphas if a in alpha_index],
+                dtype=np.intp,
+            )
+            if len(parents) != len(beta.parent_alphas):
+                parents = None
+        beta_parents.append(parents)
+        rule_ids.append(terminal.rule.id)
+
+    return BatchPlan(
+        alpha_ids=alpha_ids,
+        conditions=conditions,
+        fields=fields,
+        beta_parents=beta_parents,
+        rule_ids=rule_ids,
+        signature=_network_signature(network),
+    )
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, Real)
+
+
+def _build_column(tickers: List[Any], field_name: str) -> Tuple[Optional[np.ndarray], np.ndarray, List[Any]]:
+    """
+    Extrae una columna del batch.
+
+    Returns:
+        (valores float64 o None si la columna no es numerica, mascara de None, valores crudos)
+    """
+    raw = [getattr(t, field_name, None) for t in tickers]
+    null = np.fromiter((v is None for v in raw), dtype=bool, count=len(raw))
+    if all(v is None or _is_number(v) for v in raw):
+        values = np.fromiter(
+            (np.nan if v is None else v for v in raw), dtype=np.float64, count=len(raw)
+        )
+        return values, null, raw
+    return None, null, raw
+
+
+def _numeric_mask(values: np.ndarray, null: np.ndarray, condition: Condition) -> Optional[np.ndarray]:
+    """Mascara vectorizada para una condicion sobre una columna numerica."""
+    op = condition.operator
+    cv = condition.value
+
+    if op == Operator.IS_NONE:
+        return null.copy()
+    if op == Operator.NOT_NONE:
+        return ~null
+
+    with np.errstate(invalid="ignore"):
+        if op in (Operator.GT, Operator.GTE, Operator.LT, Operator.LTE, Operator.EQ, Operator.NEQ):
+            if not _is_number(cv):
+                return None
+            if op == Operator.GT:
+                mask = values > cv
+            elif op == Operator.GTE:
+                mask = values >= cv
+            elif op == Operator.LT:
+                mask = values < cv
+            elif op == Operator.LTE:
+                mask = values <= cv
+            elif op == Operator.EQ:
+                mask = values == cv
+            else:
+                mask = values != cv
+        elif op in (Operator.BETWEEN, Operator.OUTSIDE):
+            min_val, max_val = cv
+            if not (_is_number(min_val) and _is_number(max_val)):
+                return None
+            if op == Operator.BETWEEN:
+                mask = (values >= min_val) & (values <= max_val)
+            else:
+                mask = (values >= min_val) | (values <= max_val)
+        elif op in (Operator.IN, Operator.NOT_IN):
+            options = list(cv)
+            if not all(_is_number(o) for o in options):
+                return None
+            mask = np.isin(values, np.asarray(options, dtype=np.float64))
+            if op == Operator.NOT_IN:
+                mask = ~mask
+        else:
+            return np.zeros(len(values), dtype=bool)
+
+    # None nunca cumple condiciones de comparacion
+    return mask & ~null
+
+
+def evaluate_alpha_matrix(tickers: List[Any], plan: BatchPlan) -> np.ndarray:
+    """
+    Evalua todas las alphas del plan sobre el batch.
+
+    Returns:
+        Matriz bool (n_alphas, n_tickers)
+    """
+    n = len(tickers)
+    matrix = np.zeros((len(plan.conditions), n), dtype=bool)
+    columns: Dict[str, Tuple[Optional[np.ndarray], np.ndarray, List[Any]]] = {}
+    market_ctx = _evaluator._market_context
+
+    for row, condition in enumerate(plan.conditions):
+        field_name = condition.field
+
+        # Contexto de mercado: escalar, mismo resultado para todas las filas
+        if field_name in MARKET_CONTEXT_FIELDS:
+            if evaluate_condition(market_ctx.get(field_name), condition):
+                matrix[row] = True
+            continue
+
+        col = columns.get(field_name)
+        if col is None:
+            col = columns[field_name] = _build_column(tickers, field_name)
+        values, null, raw = col
+
+        mask = _numeric_mask(values, null, condition) if values is not None else None
+        if mask is None:
+            # Fallback escalar (strings, listas, tipos mixtos)
+            mask = np.fromiter(
+                (evaluate_condition(v, condition) for v in raw), dtype=bool, count=n
+            )
+        matrix[row] = mask
+
+    return matrix
+
+
+def evaluate_batch_vectorized(
+    tickers: List[Any],
+    network: ReteNetwork,
+    plan: Optional[BatchPlan] = None,
+) -> Dict[str, List[Any]]:
+    """
+    Equivalente vectorizado de ReteManager.evaluate_batch.
+
+    Returns:
+        Dict {rule_id: [tickers_matched]} (solo reglas con al menos un match)
+    """
+    if not tickers:
+        return {}
+    if plan is None or plan.signature != _network_signature(network):
+        plan = compile_batch_plan(network)
+
+    n = len(tickers)
+    alpha_matrix = evaluate_alpha_matrix(tickers, plan)
+
+    results: Dict[str, List[Any]] = {}
+    for rule_id, parents in zip(plan.rule_ids, plan.beta_parents):
+        if parents is None:
+            continue
+        if len(parents) == 0:
+            matched = np.ones(n, dtype=bool)
+        else:
+            matched = alpha_matrix[parents].all(axis=0)
+        idx = np.flatnonzero(matched)
+        if len(idx):
+            results[rule_id] = [tickers[i] for i in idx.tolist()]
+
+    return results
@@ -9,6 +9,7 @@ NOTA: Usa http_clients con connection pooling para llamadas HTTP.
 import asyncio
 import time
 import json
+import orjson
 import traceback
 from datetime import datetime, date, time as time_type, timedelta
 from typing import Optional, List, Dict, Any, Tuple, Set
@@ -37,6 +38,7 @@ from gap_calculator import GapCalculator, GapTracker
 from scanner_categories import ScannerCategorizer, ScannerCategory
 from http_clients import http_clients
 from postmarket_capture import PostMarketVolumeCapture
+from avg_volume_cache import AvgVolumeCache
 
 # Calculadores de metricas (refactorizacion)
 # NOTE: PriceMetricsCalculator/VolumeMetricsCalculator removed — enrichment pipeline
@@ -62,6 +64,12 @@ logger = get_logger(__name__)
 # campos en el catálogo de filtros (spy_chg_5min, qqq_chg_today, ...).
 INDEX_CONTEXT_SYMBOLS = {"SPY": "spy", "QQQ": "qqq", "DIA": "dia"}
 
+# Snapshot enriquecido (analytics) y stream de símbolos cambiados por ciclo.
+# Ver EnrichmentPipeline._write_to_hash.
+SNAPSHOT_ENRICHED_HASH = "snapshot:enriched:latest"
+SNAPSHOT_LAST_CLOSE_HASH = "snapshot:enriched:last_close"
+SNAPSHOT_ENRICHED_CHANGES_STREAM = "stream:enriched:changes"
+
 
 class ScannerEngine:
     """
@@ -136,6 +144,19 @@ class ScannerEngine:
         
         # 🌙 Cache local de volúmenes regulares para acceso síncrono en _build_scanner_ticker_inline
         self._regular_volumes_cache: Dict[str, int] = {}
+        
+        # Promedios de volumen 5D/10D/3M residentes (se recargan una vez por día de trading)
+        self.avg_volume_cache = AvgVolumeCache(redis_client, timescale_client)
+        
+        # Tabla residente del snapshot enriquecido: symbol → (snapshot, rvol, atr_data).
+        # Se parchea con los símbolos publicados en SNAPSHOT_ENRICHED_CHANGES_STREAM
+        # en lugar de hacer HGETALL + parseo del universo completo en cada scan.
+        self.last_snapshot_timestamp: Optional[str] = None
+        self._resident_snapshots: Dict[str, Tuple[PolygonSnapshot, Optional[float], dict]] = {}
+        self._resident_source: Optional[str] = None
+        self._delta_stream_id: Optional[str] = None
+        self._delta_seq: Optional[int] = None
+        self._delta_stats = {"full_reads": 0, "delta_reads": 0, "last_patched": 0}
     
     async def initialize(self) -> None:
         """Initialize the scanner engine"""
@@ -254,15 +275,20 @@ class ScannerEngine:
         Tries snapshot:enriched:latest first, falls back to
         snapshot:enriched:last_close for weekends/holidays when latest expires.
         
+        Sobre latest mantiene una tabla residente en memoria: solo la primera
+        lectura (o tras un hueco en la secuencia) hace HGETALL; el resto de
+        ciclos lee los símbolos cambiados del stream de deltas y hace HMGET
+        únicamente de esos.
+        
         Returns:
             Lista de tuplas (snapshot, rvol, atr_data) del snapshot completo
         """
         try:
             # Try latest first, fall back to last_close (weekends/holidays)
-            snapshot_key = "snapshot:enriched:latest"
+            snapshot_key = SNAPSHOT_ENRICHED_HASH
             meta_raw = await self.redis.client.hget(snapshot_key, "__meta__")
             if not meta_raw:
-                snapshot_key = "snapshot:enriched:last_close"
+                snapshot_key = SNAPSHOT_LAST_CLOSE_HASH
                 meta_raw = await self.redis.client.hget(snapshot_key, "__meta__")
                 if not meta_raw:
                     logger.debug("No enriched snapshot available (latest or last_close)")
@@ -270,70 +296,164 @@ class ScannerEngine:
                 logger.info("using_last_close_snapshot_fallback")
             
             try:
-                import orjson
                 meta = orjson.loads(meta_raw)
             except Exception:
                 meta = json.loads(meta_raw) if isinstance(meta_raw, str) else {}
             
             snapshot_timestamp = meta.get('timestamp')
             
-            if not hasattr(self, 'last_snapshot_timestamp'):
-                self.last_snapshot_timestamp = None
-            
             if snapshot_timestamp == self.last_snapshot_timestamp:
                 return []
             
-            all_data = await self.redis.client.hgetall(snapshot_key)
-            
-            if not all_data:
-                return []
-            
-            all_data.pop("__meta__", None)
-            
-            logger.info(
-                "reading_enriched_hash",
-                source=snapshot_key,
-                tickers=len(all_data),
-                timestamp=snapshot_timestamp
-            )
+            patched = None
+            if snapshot_key == SNAPSHOT_ENRICHED_HASH and self._resident_source == snapshot_key:
+                patched = await self._patch_resident_snapshots(snapshot_key)
             
-            # Parse each ticker from hash fields
-            enriched_snapshots = []
-            parsed_count = 0
-            
-            for symbol, ticker_json in all_data.items():
-                try:
-                    try:
-                        ticker_data = orjson.loads(ticker_json)
-                    except Exception:
-                        ticker_data = json.loads(ticker_json) if isinstance(ticker_json, str) else ticker_json
-                    
-                    snapshot = PolygonSnapshot(**ticker_data)
-                    rvol = ticker_data.get('rvol')
-                    
-                    # Pasar todo el dict enriched como atr_data
-                    # Incluye: ATR, volumes, changes, daily indicators, 52-week,
-                    # multi-day changes, distances, bid/ask, etc.
-                    atr_data = ticker_data
-                    
-                    enriched_snapshots.append((snapshot, rvol, atr_data))
-                    parsed_count += 1
-                
-                except Exception as e:
-                    if parsed_count < 5:
-                        logger.error("Error parsing ticker from hash",
-                                    ticker=symbol, error=str(e))
+            if patched is None:
+                loaded = await self._load_resident_snapshots(snapshot_key, snapshot_timestamp)
+                if not loaded:
+                    return []
+                self._delta_stats["full_reads"] += 1
+            else:
+                self._delta_stats["delta_reads"] += 1
+                self._delta_stats["last_patched"] = patched
+                logger.debug(
+                    "enriched_hash_delta_applied",
+                    patched=patched,
+                    resident=len(self._resident_snapshots),
+                    timestamp=snapshot_timestamp
+                )
             
             self.last_snapshot_timestamp = snapshot_timestamp
             
-            logger.info(f"parsed_snapshots total={len(enriched_snapshots)} from_hash={len(all_data)}")
-            
-            return enriched_snapshots
+            return list(self._resident_snapshots.values())
         
         except Exception as e:
             logger.error("Error reading enriched hash", error=str(e))
             return []
 
+    @staticmethod
+    def _parse_enriched_ticker(ticker_json):
+        """Parsea un campo del hash enriquecido → (snapshot, rvol, atr_data)."""
+        try:
+            ticker_data = orjson.loads(ticker_json)
+        except Exception:
+            ticker_data = json.loads(ticker_json) if isinstance(ticker_json, str) else ticker_json
+        
+        snapshot = PolygonSnapshot(**ticker_data)
+        rvol = ticker_data.get('rvol')
+        
+        # Pasar todo el dict enriched como atr_data
+        # Incluye: ATR, volumes, changes, daily indicators, 52-week,
+        # multi-day changes, distances, bid/ask, etc.
+        return snapshot, rvol, ticker_data
+
+    async def _load_resident_snapshots(self, snapshot_key: str, snapshot_timestamp) -> bool:
+        """
+        Lectura completa (HGETALL) que reconstruye la tabla residente.
+        
+        La posición del stream de deltas se toma ANTES del HGETALL: cualquier
+        escritura posterior aparecerá en el stream y se re-aplicará (idempotente).
+        """
+        last_entry = []
+        if snapshot_key == SNAPSHOT_ENRICHED_HASH:
+            last_entry = await self.redis.client.xrevrange(
+                SNAPSHOT_ENRICHED_CHANGES_STREAM, count=1
+            )
+        
+        all_data = await self.redis.client.hgetall(snapshot_key)
+        
+        if not all_data:
+            return False
+        
+        all_data.pop("__meta__", None)
+        
+        logger.info(
+            "reading_enriched_hash",
+            source=snapshot_key,
+            tickers=len(all_data),
+            timestamp=snapshot_timestamp
+        )
+        
+        # Parse each ticker from hash fields
+        resident: Dict[str, Tuple[PolygonSnapshot, Optional[float], dict]] = {}
+        parsed_count = 0
+        
+        for symbol, ticker_json in all_data.items():
+            try:
+                resident[symbol] = self._parse_enriched_ticker(ticker_json)
+                parsed_count += 1
+            except Exception as e:
+                if parsed_count < 5:
+                    logger.error("Error parsing ticker from hash",
+                                ticker=symbol, error=str(e))
+        
+        self._resident_snapshots = resident
+        self._resident_source = snapshot_key
+        if last_entry:
+            entry_id, fields = last_entry[0]
+            self._delta_stream_id = entry_id
+            self._delta_seq = int(fields.get("seq", 0))
+        else:
+            self._delta_stream_id = None
+            self._delta_seq = None
+        
+        logger.info(f"parsed_snapshots total={len(resident)} from_hash={len(all_data)}")
+        
+        return True
+
+    async def _patch_resident_snapshots(self, snapshot_key: str) -> Optional[int]:
+        """
+        Aplica los deltas publicados desde la última lectura.
+        
+        Returns:
+            Número de símbolos re-leídos, o None si hace falta una lectura
+            completa (sin posición, hueco de secuencia o entrada full=1).
+        """
+        if self._delta_stream_id is None or self._delta_seq is None:
+            return None
+        
+        entries = await self.redis.client.xrange(
+            SNAPSHOT_ENRICHED_CHANGES_STREAM,
+            min=f"({self._delta_stream_id}",
+        )
+        
+        changed: Set[str] = set()
+        expected_seq = self._delta_seq + 1
+        last_id = self._delta_stream_id
+        for entry_id, fields in entries:
+            seq = int(fields.get("seq", 0))
+            if seq != expected_seq or fields.get("full") == "1":
+                logger.info(
+                    "enriched_delta_resync",
+                    expected_seq=expected_seq,
+                    seq=seq,
+                    full=fields.get("full")
+                )
+                return None
+            symbols = fields.get("symbols")
+            if symbols:
+                changed.update(symbols.split(","))
+            expected_seq += 1
+            last_id = entry_id
+        
+        if changed:
+            symbols = list(changed)
+            values = await self.redis.client.hmget(snapshot_key, symbols)
+            for symbol, ticker_json in zip(symbols, values):
+                if ticker_json is None:
+                    # Expirado/eliminado en el hash: mantener paridad con HGETALL
+                    self._resident_snapshots.pop(symbol, None)
+                    continue
+                try:
+                    self._resident_snapshots[symbol] = self._parse_enriched_ticker(ticker_json)
+                except Exception as e:
+                    logger.error("Error parsing ticker from hash", ticker=symbol, error=str(e))
+        
+        self._delta_stream_id = last_id
+        self._delta_seq = expected_seq - 1
+        return len(changed)
+
     # =============================================
     # METADATA BATCH WITH IN-PROCESS CACHE
     # =============================================
@@ -411,7 +531,10 @@ class ScannerEngine:
     
     async def _get_avg_volumes_batch(self, symbols: List[str]) -> Dict[str, Dict[str, int]]:
         """
-        Calcula el promedio de volumen para múltiples períodos (5D, 10D, 3M) para múltiples símbolos.
+        Promedio de volumen para múltiples períodos (5D, 10D, 3M) para múltiples símbolos.
+        
+        Lookup en memoria sobre AvgVolumeCache (calculado una vez por día de
+        trading por data_maintenance); sin round trip a BD por ciclo.
         
         Returns:
             Dict mapping symbol -> {avg_volume_5d, avg_volume_10d, avg_volume_3m}
@@ -419,45 +542,11 @@ class ScannerEngine:
         if not symbols:
             return {}
         
-        results: Dict[str, Dict[str, int]] = {}
+        await self.avg_volume_cache.refresh_if_stale()
+        results = self.avg_volume_cache.lookup(symbols)
+        
+        logger.debug("avg_volumes_lookup", symbols_count=len(symbols), results_count=len(results))
         
-        try:
-            # Crear placeholders para la query
-            placeholders = ', '.join([f"${i+1}" for i in range(len(symbols))])
-            
-            # Calcular los 3 promedios en una sola query
-            query = f"""
-                WITH ranked_data AS (
-                    SELECT symbol, volume, trading_date,
-                           ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY trading_date DESC) as rn
-                    FROM market_data_daily
-                    WHERE symbol IN ({placeholders})
-                )
-                SELECT 
-                    symbol,
-                    AVG(CASE WHEN rn <= 5 THEN volume END)::bigint as avg_volume_5d,
-                    AVG(CASE WHEN rn <= 10 THEN volume END)::bigint as avg_volume_10d,
-                    AVG(CASE WHEN rn <= 63 THEN volume END)::bigint as avg_volume_3m
-                FROM ranked_data
-                WHERE rn <= 63
-                GROUP BY symbol
-                HAVING COUNT(*) >= 3
-            """
-            
-            rows = await self.db.fetch(query, *symbols)
-            
-            for row in rows:
-                results[row['symbol']] = {
-                    'avg_volume_5d': row['avg_volume_5d'],
-                    'avg_volume_10d': row['avg_volume_10d'],
-                    'avg_volume_3m': row['avg_volume_3m']
-                }
-            
-            logger.debug("avg_volumes_calculated", symbols_count=len(symbols), results_count=len(results))
-            
-        except Exception as e:
-            logger.error("Error calculating avg_volumes batch", error=str(e))
-
         return results
     
     async def _process_snapshots_optimized(
@@ -2248,6 +2337,9 @@ class ScannerEngine:
             "current_session": self.current_session.value,
             "filters_loaded": len(self.filters),
             "filters_enabled": sum(1 for f in self.filters if f.enabled),
+            "resident_snapshots": len(self._resident_snapshots),
+            "avg_volume_cache": self.avg_volume_cache.get_stats(),
+            "snapshot_reads": dict(self._delta_stats),
             "uptime_seconds": int(uptime)
         }
     
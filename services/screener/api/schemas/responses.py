@@ -36,6 +36,7 @@ class ScreenerResponse(BaseModel):
     filters_applied: Optional[int] = Field(None, description="Number of filters applied")
     dynamic_indicators: Optional[int] = Field(None, description="Number of dynamic indicator calculations")
     errors: Optional[List[str]] = Field(None, description="Error messages if status is 'error'")
+    cached: Optional[bool] = Field(None, description="Served from the result cache")
 
 
 class IndicatorInfo(BaseModel):
@@ -4,6 +4,7 @@ Screener Service Configuration
 from pydantic_settings import BaseSettings
 from pathlib import Path
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -20,11 +21,18 @@ class Settings(BaseSettings):
     # DuckDB
     duckdb_memory_limit: str = "4GB"
     duckdb_threads: int = 4
+    # Fichero .duckdb persistente (None = todo en memoria, recarga completa al arrancar).
+    # Con fichero: daily_prices/screener_data sobreviven reinicios y refresh()
+    # solo ingiere parquets nuevos y recalcula los símbolos afectados.
+    duckdb_path: Optional[Path] = None
     
     # Cache
     redis_url: str = "redis://localhost:6379"
     cache_ttl_seconds: int = 60
     cache_enabled: bool = True
+    # Cache de resultados de screen() en proceso (invalidado en cada refresh)
+    result_cache_max_entries: int = 256
+    result_cache_max_rows: int = 5000
     
     # API
     api_prefix: str = "/api/v1/screener"
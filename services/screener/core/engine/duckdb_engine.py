@@ -16,6 +16,8 @@ import structlog
 from ..indicators import register_all_indicators
 from ..filters import FilterParser, FilterValidator
 from .dynamic_indicators import extract_custom_indicators, build_hybrid_query, is_precomputed
+from .result_cache import ScreenerResultCache, make_cache_key
+from .vectorized import consecutive_days_latest, consolidation_latest, linear_regression_latest
 from config import settings
 
 logger = structlog.get_logger(__name__)
@@ -23,6 +25,40 @@ logger = structlog.get_logger(__name__)
 # Ruta al archivo de metadata exportado por data_maintenance (Parquet = más eficiente)
 METADATA_PATH = "/data/polygon/screener_metadata.parquet"
 
+# Versión del cálculo de screener_data persistido en el .duckdb.
+# Subirla al cambiar _precompute_indicators_into o los _compute_* para que
+# el siguiente arranque reconstruya la tabla en lugar de reutilizarla.
+SCREENER_DATA_VERSION = "1"
+
+DAILY_PRICES_DDL = """
+    CREATE TABLE IF NOT EXISTS daily_prices (
+        symbol VARCHAR,
+        date DATE,
+        open DOUBLE,
+        high DOUBLE,
+        low DOUBLE,
+        close DOUBLE,
+        volume BIGINT
+    )
+"""
+
+
+def _daily_prices_select(parquet_source: str, with_filename: bool = False) -> str:
+    """SELECT de day_aggs (parquet Polygon) al esquema de daily_prices."""
+    return f"""
+        SELECT
+            {"filename," if with_filename else ""}
+            ticker as symbol,
+            CAST(to_timestamp(window_start / 1000000000) AS DATE) as date,
+            open,
+            high,
+            low,
+            close,
+            CAST(volume AS BIGINT) as volume
+        FROM read_parquet({parquet_source}{", filename = true" if with_filename else ""})
+        WHERE to_timestamp(window_start / 1000000000) >= CURRENT_DATE - INTERVAL '{settings.default_lookback_days} days'
+    """
+
 
 class ScreenerEngine:
     """
@@ -30,11 +66,20 @@ class ScreenerEngine:
     
     Reads parquet files directly and calculates indicators on-the-fly
     using vectorized SQL operations.
+    
+    With settings.duckdb_path set, tables live in a persistent .duckdb file:
+    startup reuses them and only ingests parquet files not seen before.
     """
     
-    def __init__(self, data_path: Optional[Path] = None):
+    def __init__(self, data_path: Optional[Path] = None, db_path: Optional[Path] = None):
         self.data_path = data_path or settings.data_path
-        self.conn = duckdb.connect(":memory:")
+        self.db_path = db_path or settings.duckdb_path
+        self.persistent = self.db_path is not None
+        if self.persistent:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self.conn = duckdb.connect(str(self.db_path))
+        else:
+            self.conn = duckdb.connect(":memory:")
         
         # Configure DuckDB for performance
         self.conn.execute(f"SET memory_limit='{settings.duckdb_memory_limit}'")
@@ -45,6 +90,12 @@ class ScreenerEngine:
         self.parser = FilterParser(self.registry)
         self.validator = FilterValidator(self.registry)
         
+        # Result cache (screen() results until next refresh)
+        self.result_cache = ScreenerResultCache(
+            max_entries=settings.result_cache_max_entries,
+            max_rows=settings.result_cache_max_rows,
+        ) if settings.cache_enabled else None
+        
         # Load metadata first (market_cap, float, sector)
         self._load_metadata()
         
@@ -55,6 +106,10 @@ class ScreenerEngine:
     
     def _setup_views(self):
         """Load CSV.GZ files into memory table for fast queries"""
+        if self.persistent:
+            self._setup_persistent()
+            return
+        
         data_pattern = self.data_path / settings.daily_data_pattern
         
         # Check if files exist
@@ -83,17 +138,7 @@ class ScreenerEngine:
         start = time.time()
         
         self.conn.execute(f"""
-            CREATE TABLE daily_prices AS 
-            SELECT 
-                ticker as symbol,
-                CAST(to_timestamp(window_start / 1000000000) AS DATE) as date,
-                open,
-                high,
-                low,
-                close,
-                CAST(volume AS BIGINT) as volume
-            FROM read_parquet('{data_pattern}')
-            WHERE to_timestamp(window_start / 1000000000) >= CURRENT_DATE - INTERVAL '{settings.default_lookback_days} days'
+            CREATE TABLE daily_prices AS {_daily_prices_select(f"'{data_pattern}'")}
         """)
         
         # Create index for faster lookups
@@ -198,6 +243,26 @@ class ScreenerEngine:
         custom_indicators = extract_custom_indicators(filters)
         use_hybrid = len(custom_indicators) > 0
         
+        # Cached result (same screen since last refresh)
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = make_cache_key(
+                filters, sort_by, sort_order, min(limit, settings.max_results), symbols
+            )
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return {
+                    "status": "ok",
+                    "results": cached,
+                    "count": len(cached),
+                    "total_matched": len(cached),
+                    "query_time_ms": round((time.time() - start_time) * 1000, 2),
+                    "filters_applied": len(filters),
+                    "dynamic_indicators": len(custom_indicators),
+                    "cached": True,
+                }
+            generation = self.result_cache.generation
+        
         # Build and execute query
         try:
             if use_hybrid:
@@ -212,6 +277,9 @@ class ScreenerEngine:
             
             result = self.conn.execute(sql).fetchdf()
             
+            if cache_key is not None:
+                self.result_cache.put(cache_key, result, generation)
+            
             # Convert to list of dicts
             results = result.to_dict(orient="records")
             
@@ -225,6 +293,7 @@ class ScreenerEngine:
                 "query_time_ms": round(query_time, 2),
                 "filters_applied": len(filters),
                 "dynamic_indicators": len(custom_indicators),
+                "cached": False,
             }
             
         except Exception as e:
@@ -346,25 +415,25 @@ class ScreenerEngine:
         import time
         start = time.time()
         
-        logger.info("refresh_starting")
+        logger.info("refresh_starting", persistent=self.persistent)
         
+        try:
+            if self.persistent:
+                return self._refresh_persistent(start)
+            return self._refresh_in_memory(start)
+        finally:
+            # Datos nuevos (o a medio cambiar si falló): descartar resultados
+            if self.result_cache is not None:
+                self.result_cache.invalidate()
+    
+    def _refresh_in_memory(self, start: float) -> Dict[str, Any]:
         try:
             # 1. Reload raw data from parquet files into new tables
             data_pattern = self.data_path / settings.daily_data_pattern
             
             self.conn.execute("DROP TABLE IF EXISTS daily_prices_new")
             self.conn.execute(f"""
-                CREATE TABLE daily_prices_new AS 
-                SELECT 
-                    ticker as symbol,
-                    CAST(to_timestamp(window_start / 1000000000) AS DATE) as date,
-                    open,
-                    high,
-                    low,
-                    close,
-                    CAST(volume AS BIGINT) as volume
-                FROM read_parquet('{data_pattern}')
-                WHERE to_timestamp(window_start / 1000000000) >= CURRENT_DATE - INTERVAL '{settings.default_lookback_days} days'
+                CREATE TABLE daily_prices_new AS {_daily_prices_select(f"'{data_pattern}'")}
             """)
             
             # 2. Reload metadata
@@ -408,6 +477,282 @@ class ScreenerEngine:
                 "error": str(e)
             }
     
+    # =========================================================================
+    # Persistent mode (.duckdb file)
+    # =========================================================================
+    
+    def _setup_persistent(self):
+        """
+        Arranque con fichero .duckdb:
+        - daily_prices/screener_data se reutilizan tal cual si no hay parquets nuevos
+        - parquets nuevos o reescritos se añaden a daily_prices y solo se
+          recalculan los símbolos afectados
+        """
+        start = time.time()
+        self.conn.execute(DAILY_PRICES_DDL)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS ingested_files (
+                path VARCHAR PRIMARY KEY,
+                mtime DOUBLE,
+                size BIGINT,
+                rows BIGINT,
+                min_date DATE,
+                max_date DATE
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS engine_state (
+                key VARCHAR PRIMARY KEY,
+                value VARCHAR
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_daily_symbol ON daily_prices(symbol)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_daily_date ON daily_prices(date)")
+        
+        result = self._sync_persistent()
+        logger.info(
+            "persistent_db_ready",
+            path=str(self.db_path),
+            elapsed_seconds=round(time.time() - start, 2),
+            **result
+        )
+    
+    def _refresh_persistent(self, start: float) -> Dict[str, Any]:
+        try:
+            self._load_metadata()
+            result = self._sync_persistent()
+            count = self.conn.execute("SELECT COUNT(*) FROM screener_data").fetchone()[0]
+            elapsed = time.time() - start
+            logger.info("refresh_completed", rows=count, elapsed_seconds=round(elapsed, 2), **result)
+            return {
+                "status": "ok",
+                "rows": count,
+                "elapsed_seconds": round(elapsed, 2),
+                **result
+            }
+        except Exception as e:
+            logger.error("refresh_failed", error=str(e))
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+    
+    def _sync_persistent(self) -> Dict[str, Any]:
+        """Ingiere parquets nuevos y deja screener_data al día."""
+        ingest = self._ingest_new_files()
+        
+        if self._screener_data_stale():
+            self._rebuild_screener_data()
+            mode = "full"
+        elif ingest["affected_symbols"]:
+            self._update_screener_data()
+            mode = "incremental"
+        else:
+            self._refresh_screener_metadata()
+            mode = "reuse"
+        
+        self.conn.execute("DROP TABLE IF EXISTS _affected_symbols")
+        return {"mode": mode, **ingest}
+    
+    def _ingest_new_files(self) -> Dict[str, Any]:
+        """
+        Añade a daily_prices los parquets no ingeridos (o modificados) y
+        recorta filas fuera del lookback.
+        
+        Deja en _affected_symbols los símbolos cuya ventana cambió: los que
+        reciben filas nuevas y los que pierden filas por el recorte.
+        """
+        import glob
+        import os
+        
+        self.conn.execute("CREATE OR REPLACE TEMP TABLE _affected_symbols (symbol VARCHAR)")
+        
+        files = sorted(glob.glob(str(self.data_path / settings.daily_data_pattern)))
+        known = {
+            row[0]: (row[1], row[2], row[3], row[4])
+            for row in self.conn.execute(
+                "SELECT path, mtime, size, min_date, max_date FROM ingested_files"
+            ).fetchall()
+        }
+        
+        pending = []
+        for path in files:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            prev = known.get(path)
+            if prev is None or prev[0] != st.st_mtime or prev[1] != st.st_size:
+                pending.append((path, st.st_mtime, st.st_size, prev))
+        
+        rows_added = 0
+        if pending:
+            self.conn.execute("BEGIN TRANSACTION")
+            try:
+                # Ficheros reescritos: borrar antes sus fechas
+                for path, _, _, prev in pending:
+                    if prev is not None and prev[2] is not None:
+                        self.conn.execute(
+                            "INSERT INTO _affected_symbols SELECT DISTINCT symbol FROM daily_prices WHERE date BETWEEN ? AND ?",
+                            [prev[2], prev[3]]
+                        )
+                        self.conn.execute(
+                            "DELETE FROM daily_prices WHERE date BETWEEN ? AND ?",
+                            [prev[2], prev[3]]
+                        )
+                
+                # Una sola lectura para todos los ficheros pendientes
+                source = "[" + ", ".join("'" + p.replace("'", "''") + "'" for p, _, _, _ in pending) + "]"
+                self.conn.execute(
+                    f"CREATE OR REPLACE TEMP TABLE _new_rows AS {_daily_prices_select(source, with_filename=True)}"
+                )
+                self.conn.execute("""
+                    INSERT INTO daily_prices
+                    SELECT symbol, date, open, high, low, close, volume FROM _new_rows
+                """)
+                self.conn.execute("INSERT INTO _affected_symbols SELECT DISTINCT symbol FROM _new_rows")
+
+                per_file = {
+                    row[0]: row[1:]
+                    for row in self.conn.execute(
+                        "SELECT filename, COUNT(*), MIN(date), MAX(date) FROM _new_rows GROUP BY filename"
+                    ).fetchall()
+                }
+                files_df = pd.DataFrame(
+                    [(path, mtime, size, *per_file.get(path, (0, None, None))) for path, mtime, size, _ in pending],
+                    columns=["path", "mtime", "size", "rows", "min_date", "max_date"]
+                )
+                self.conn.register("_files_df", files_df)
+                self.conn.execute("""
+                    INSERT OR REPLACE INTO ingested_files
+                    SELECT path, mtime, size, rows, CAST(min_date AS DATE), CAST(max_date AS DATE) FROM _files_df
+                """)
+                self.conn.unregister("_files_df")
+                rows_added = int(files_df["rows"].sum())
+                self.conn.execute("DROP TABLE IF EXISTS _new_rows")
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        
+        # Recorte del lookback (mismo corte que la carga en memoria)
+        cutoff = f"CURRENT_DATE - INTERVAL '{settings.default_lookback_days} days'"
+        self.conn.execute(f"INSERT INTO _affected_symbols SELECT DISTINCT symbol FROM daily_prices WHERE date < {cutoff}")
+        rows_trimmed = self.conn.execute(f"DELETE FROM daily_prices WHERE date < {cutoff}").fetchone()[0]
+        
+        affected = self.conn.execute("SELECT COUNT(DISTINCT symbol) FROM _affected_symbols").fetchone()[0]
+        if pending or rows_trimmed:
+            logger.info(
+                "daily_prices_synced",
+                files_ingested=len(pending),
+                rows_added=rows_added,
+                rows_trimmed=rows_trimmed,
+                affected_symbols=affected
+            )
+        return {
+            "files_ingested": len(pending),
+            "rows_added": rows_added,
+            "rows_trimmed": rows_trimmed,
+            "affected_symbols": affected,
+        }
+    
+    def _get_state(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM engine_state WHERE key = ?", [key]).fetchone()
+        return row[0] if row else None
+    
+    def _set_state(self, key: str, value: str):
+        self.conn.execute("INSERT OR REPLACE INTO engine_state VALUES (?, ?)", [key, value])
+    
+    def _screener_data_stale(self) -> bool:
+        """
+        screener_data debe reconstruirse entera si no existe, si cambió el
+        cálculo, o si cambió el año (change_ytd depende de CURRENT_DATE).
+        """
+        exists = self.conn.execute(
+            "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = 'screener_data'"
+        ).fetchone()[0]
+        if not exists:
+            return True
+        if self._get_state("screener_data_version") != SCREENER_DATA_VERSION:
+            return True
+        built_on = self._get_state("screener_data_built_on")
+        today = self.conn.execute("SELECT CAST(CURRENT_DATE AS VARCHAR)").fetchone()[0]
+        return not built_on or built_on[:4] != today[:4]
+    
+    def _mark_screener_built(self):
+        self._set_state("screener_data_version", SCREENER_DATA_VERSION)
+        self._set_state(
+            "screener_data_built_on",
+            self.conn.execute("SELECT CAST(CURRENT_DATE AS VARCHAR)").fetchone()[0]
+        )
+    
+    def _rebuild_screener_data(self):
+        """Recalcula screener_data completa (primer arranque / cambio de versión)."""
+        logger.info("precomputing_indicators", mode="full")
+        self.conn.execute("DROP TABLE IF EXISTS screener_data_new")
+        self._precompute_indicators_into("daily_prices", "screener_data_new")
+        self.conn.execute("DROP INDEX IF EXISTS idx_screener_symbol")
+        self.conn.execute("DROP TABLE IF EXISTS screener_data")
+        self.conn.execute("ALTER TABLE screener_data_new RENAME TO screener_data")
+        self.conn.execute("CREATE INDEX idx_screener_symbol ON screener_data(symbol)")
+        self._mark_screener_built()
+    
+    def _update_screener_data(self):
+        """
+        Recalcula screener_data solo para los símbolos de _affected_symbols.
+        
+        Las ventanas son por símbolo (PARTITION BY symbol), así que basta con
+        recalcular la historia de esos símbolos y sustituir sus filas.
+        """
+        logger.info("precomputing_indicators", mode="incremental")
+        self.conn.execute("""
+            CREATE OR REPLACE TEMP VIEW _affected_prices AS
+            SELECT * FROM daily_prices
+            WHERE symbol IN (SELECT symbol FROM _affected_symbols)
+        """)
+        self.conn.execute("DROP TABLE IF EXISTS screener_data_delta")
+        self._precompute_indicators_into("_affected_prices", "screener_data_delta")
+        
+        # Columnas opcionales (_compute_* las añaden con ALTER): igualar esquemas
+        existing = {
+            r[0] for r in self.conn.execute(
+                "SELECT column_name FROM information_schema.columns WHERE table_name = 'screener_data'"
+            ).fetchall()
+        }
+        for name, dtype in self.conn.execute(
+            "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = 'screener_data_delta'"
+        ).fetchall():
+            if name not in existing:
+                self.conn.execute(f"ALTER TABLE screener_data ADD COLUMN {name} {dtype}")
+        
+        self.conn.execute("BEGIN TRANSACTION")
+        try:
+            self.conn.execute("""
+                DELETE FROM screener_data
+                WHERE symbol IN (SELECT symbol FROM _affected_symbols)
+                   OR date < CURRENT_DATE - INTERVAL '7 days'
+            """)
+            self.conn.execute("INSERT INTO screener_data BY NAME SELECT * FROM screener_data_delta")
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("DROP TABLE IF EXISTS screener_data_delta")
+        self.conn.execute("DROP VIEW IF EXISTS _affected_prices")
+        self._refresh_screener_metadata()
+        self._mark_screener_built()
+    
+    def _refresh_screener_metadata(self):
+        """Aplica la metadata recargada (market_cap, float, sector) a todas las filas."""
+        self.conn.execute("""
+            UPDATE screener_data t
+            SET market_cap = m.market_cap,
+                free_float = m.free_float,
+                sector = m.sector
+            FROM metadata m
+            WHERE t.symbol = m.symbol
+        """)
+    
     def _precompute_indicators_into(self, source_table: str, target_table: str):
         """Precompute all indicators from source into target table"""
         self.conn.execute(f"""
@@ -671,26 +1016,7 @@ class ScreenerEngine:
         if df.empty:
             return
 
-        df['prev_close'] = df.groupby('symbol')['close'].shift(1)
-        df['up'] = (df['close'] > df['prev_close']).astype(int)
-        df['down'] = (df['close'] < df['prev_close']).astype(int)
-
-        def streak(series):
-            result = []
-            count = 0
-            for val in series:
-                if val:
-                    count += 1
-                else:
-                    count = 0
-                result.append(count)
-            return result
-
-        df['consec_up'] = df.groupby('symbol')['up'].transform(streak)
-        df['consec_down'] = df.groupby('symbol')['down'].transform(streak)
-        df['consecutive_days_up'] = df['consec_up'] - df['consec_down']
-
-        latest = df.sort_values('date').groupby('symbol').tail(1)[['symbol', 'consecutive_days_up']]
+        latest = consecutive_days_latest(df)
 
         if latest.empty:
             return
@@ -770,88 +1096,9 @@ class ScreenerEngine:
             if df.empty:
                 return
 
-            df['daily_range'] = df['high'] - df['low']
-            df['tr'] = np.maximum(
-                df['high'] - df['low'],
-                np.maximum(
-                    abs(df['high'] - df.groupby('symbol')['close'].shift(1)),
-                    abs(df['low'] - df.groupby('symbol')['close'].shift(1))
-                )
-            )
-            df['atr'] = df.groupby('symbol')['tr'].transform(
-                lambda x: x.rolling(ATR_PERIOD, min_periods=ATR_PERIOD).mean()
-            )
-
-            avg_range_20 = df.groupby('symbol')['daily_range'].transform(
-                lambda x: x.rolling(20, min_periods=5).mean()
+            latest = consolidation_latest(
+                df, sqrt_k=SQRT_K, max_days=MAX_CONSOL_DAYS, atr_period=ATR_PERIOD
             )
-            avg_range_5 = df.groupby('symbol')['daily_range'].transform(
-                lambda x: x.rolling(5, min_periods=2).mean()
-            )
-            df['range_contraction'] = np.where(
-                avg_range_20 > 0,
-                (avg_range_5 / avg_range_20).round(4),
-                np.nan
-            )
-
-            df_sorted = df.sort_values(['symbol', 'date'])
-            results = []
-            sqrt_table = [np.sqrt(n) for n in range(MAX_CONSOL_DAYS + 2)]
-
-            for symbol, grp in df_sorted.groupby('symbol'):
-                if len(grp) < ATR_PERIOD + 2:
-                    results.append({
-                        'symbol': symbol,
-                        'consolidation_days': 0,
-                        'consolidation_high': np.nan,
-                        'consolidation_low': np.nan,
-                        'range_contraction': grp['range_contraction'].iloc[-1] if len(grp) > 0 else np.nan,
-                    })
-                    continue
-
-                highs = grp['high'].values
-                lows = grp['low'].values
-                atrs = grp['atr'].values
-                rc = grp['range_contraction'].iloc[-1]
-
-                last_idx = len(highs) - 1
-                last_atr = atrs[last_idx]
-
-                if np.isnan(last_atr) or last_atr <= 0:
-                    results.append({
-                        'symbol': symbol, 'consolidation_days': 0,
-                        'consolidation_high': np.nan, 'consolidation_low': np.nan,
-                        'range_contraction': rc,
-                    })
-                    continue
-
-                con_days = 0
-                rolling_high = highs[last_idx]
-                rolling_low = lows[last_idx]
-
-                for i in range(1, min(MAX_CONSOL_DAYS + 1, last_idx + 1)):
-                    look_idx = last_idx - i
-                    candidate_high = max(rolling_high, highs[look_idx])
-                    candidate_low = min(rolling_low, lows[look_idx])
-                    rng = candidate_high - candidate_low
-                    threshold = last_atr * SQRT_K * sqrt_table[i + 1]
-
-                    if rng < threshold:
-                        rolling_high = candidate_high
-                        rolling_low = candidate_low
-                        con_days += 1
-                    else:
-                        break
-
-                results.append({
-                    'symbol': symbol,
-                    'consolidation_days': con_days,
-                    'consolidation_high': rolling_high if con_days > 0 else np.nan,
-                    'consolidation_low': rolling_low if con_days > 0 else np.nan,
-                    'range_contraction': rc,
-                })
-
-            latest = pd.DataFrame(results)
             if latest.empty:
                 return
 
@@ -879,36 +1126,13 @@ class ScreenerEngine:
     def _compute_linear_regression(self, source_table: str, target_table: str):
         """Compute Linear Regression Divergence [LR130]."""
         try:
-            import numpy as np
             df = self.conn.execute(f"""
                 SELECT symbol, date, close FROM {source_table}
                 WHERE close IS NOT NULL ORDER BY symbol, date
             """).fetchdf()
             if df.empty:
                 return
-            results = []
-            for symbol, grp in df.groupby('symbol'):
-                closes = grp['close'].values
-                if len(closes) < 130:
-                    results.append({'symbol': symbol, 'lr_divergence_130': None})
-                    continue
-                last_130 = closes[-130:]
-                if np.any(np.isnan(last_130)) or np.any(np.isinf(last_130)):
-                    results.append({'symbol': symbol, 'lr_divergence_130': None})
-                    continue
-                x = np.arange(130)
-                coeffs = np.polyfit(x, last_130, 1)
-                lr_value = coeffs[0] * 129 + coeffs[1]
-                if np.isnan(lr_value) or np.isinf(lr_value) or lr_value == 0:
-                    results.append({'symbol': symbol, 'lr_divergence_130': None})
-                    continue
-                current_price = closes[-1]
-                div = round(((current_price - lr_value) / lr_value) * 100, 2)
-                results.append({'symbol': symbol, 'lr_divergence_130': div})
-            if not results:
-                return
-            import pandas as pd
-            lr_df = pd.DataFrame(results)
+            lr_df = linear_regression_latest(df, window=130)
             self.conn.execute(f"ALTER TABLE {target_table} ADD COLUMN IF NOT EXISTS lr_divergence_130 DOUBLE")
             self.conn.register('_lr_update', lr_df)
             self.conn.execute(f"""
@@ -982,6 +1206,7 @@ class ScreenerEngine:
                     "to": str(dates[1]) if dates[1] else None,
                 },
                 "indicators_count": len(self.registry.get_all_indicators()),
+                "result_cache": self.result_cache.get_stats() if self.result_cache else None,
             }
         except Exception as e:
             return {"error": str(e)}
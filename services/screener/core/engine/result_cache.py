@@ -0,0 +1,159 @@
+"""
+Screener result cache
+
+Los datos del screener solo cambian en refresh(), pero cada request vuelve a
+ejecutar el SQL. Este cache guarda el resultado de cada screen por:
+
+    key = (filtros normalizados, sort, limit, symbols)  dentro de una generation
+
+- generation: contador que refresh() incrementa → invalida todo de golpe
+- filtros normalizados: orden de filtros irrelevante (AND), field/operator en
+  minúsculas, params ordenados; dos requests equivalentes comparten entrada
+- resultado guardado en columnas (un ndarray por columna), no en lista de
+  dicts: ~10x menos objetos Python por entrada
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _canonical_filter(f: Dict[str, Any]) -> Dict[str, Any]:
+    out = {
+        "field": str(f.get("field", "")).lower(),
+        "operator": str(f.get("operator", "")).lower(),
+        "value": f.get("value"),
+    }
+    params = f.get("params")
+    if params:
+        out["params"] = {k: v for k, v in sorted(params.items()) if v is not None}
+    return out
+
+
+def make_cache_key(
+    filters: List[Dict[str, Any]],
+    sort_by: str,
+    sort_order: str,
+    limit: int,
+    symbols: Optional[List[str]] = None,
+) -> str:
+    """Clave canónica de un screen (JSON estable)."""
+    canonical = sorted(
+        json.dumps(_canonical_filter(f), sort_keys=True, default=str)
+        for f in filters
+    )
+    return json.dumps(
+        [
+            canonical,
+            sort_by,
+            sort_order.lower(),
+            int(limit),
+            sorted({s.upper() for s in symbols}) if symbols else None,
+        ],
+        separators=(",", ":"),
+    )
+
+
+class _ColumnarResult:
+    """Resultado en columnas; to_records() reproduce DataFrame.to_dict('records')."""
+
+    __slots__ = ("columns", "arrays", "rows", "nbytes")
+
+    def __init__(self, df: pd.DataFrame):
+        self.columns = list(df.columns)
+        self.arrays = []
+        for col in self.columns:
+            series = df[col]
+            if isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf":
+                arr = series.to_numpy()
+            else:
+                # datetime/str/nullable (Int64) → objetos, pd.NA → None como to_dict
+                arr = np.array(
+                    [None if v is pd.NA else v for v in series.astype(object)],
+                    dtype=object,
+                )
+            self.arrays.append(arr)
+        self.rows = len(df)
+        self.nbytes = sum(a.nbytes for a in self.arrays)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        if not self.rows:
+            return []
+        values = [a.tolist() for a in self.arrays]
+        columns = self.columns
+        return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+class ScreenerResultCache:
+    """
+    LRU en memoria de resultados de screen(), invalidado por generación.
+
+    Thread-safe: screen() se llama desde el event loop y desde threads.
+    """
+
+    def __init__(self, max_entries: int = 256, max_rows: int = 5000):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._entries: "OrderedDict[str, _ColumnarResult]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.skipped = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def invalidate(self) -> int:
+        """Nueva generación de datos: descarta todas las entradas."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.invalidations += 1
+            return self._generation
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry.to_records()
+
+    def put(self, key: str, df: pd.DataFrame, generation: int) -> None:
+        """Guarda el resultado si se calculó con la generación vigente."""
+        if len(df) > self.max_rows:
+            self.skipped += 1
+            return
+        entry = _ColumnarResult(df)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "generation": self._generation,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": sum(e.nbytes for e in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "skipped_too_large": self.skipped,
+            }
@@ -0,0 +1,190 @@
+"""
+Vectorized per-symbol indicator kernels
+
+Los _compute_* del engine solo necesitan el valor de la ÚLTIMA fila de cada
+símbolo, pero iteraban en Python símbolo a símbolo (y fila a fila en los
+streaks). Aquí se calculan sobre arrays ordenados por (symbol, date):
+
+- streaks: cumsum/reset con np.maximum.accumulate sobre el índice de ruptura
+- ventanas "mirando hacia atrás" desde la última fila: matriz
+  (n_symbols × ventana) con las últimas filas invertidas (col 0 = última)
+- rolling/polyfit: groupby().rolling() y np.polyfit con Y 2D (una pasada)
+
+Resultados idénticos a las versiones por símbolo (ver tests/test_vectorized.py).
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def group_bounds(symbols: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Grupos contiguos de un array ordenado por símbolo.
+
+    Returns:
+        (símbolos únicos, inicio de cada grupo, fin exclusivo de cada grupo)
+    """
+    values = symbols.to_numpy()
+    n = len(values)
+    if n == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return values[:0], empty, empty
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    ends = np.r_[starts[1:], n]
+    return values[starts], starts, ends
+
+
+def last_rows_matrix(values: np.ndarray, ends: np.ndarray, counts: np.ndarray, width: int) -> np.ndarray:
+    """
+    Últimas `width` filas de cada grupo, invertidas: out[g, j] = fila ends[g]-1-j.
+    Posiciones sin fila (grupo más corto) quedan a NaN.
+    """
+    offsets = np.arange(width)
+    idx = ends[:, None] - 1 - offsets[None, :]
+    valid = offsets[None, :] < counts[:, None]
+    out = np.full(idx.shape, np.nan, dtype=np.float64)
+    out[valid] = values[idx[valid]]
+    return out
+
+
+def _last_per_group(values: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    return values[ends - 1]
+
+
+def consecutive_days_latest(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    consecutive_days_up de la última fila de cada símbolo (racha de cierres
+    al alza positiva, a la baja negativa).
+
+    Args:
+        df: symbol, date, close ordenado por (symbol, date)
+    """
+    uniques, starts, ends = group_bounds(df['symbol'])
+    close = df['close'].to_numpy(dtype=np.float64)
+    prev = np.r_[np.nan, close[:-1]]
+    prev[starts] = np.nan
+
+    pos = np.arange(len(close))
+
+    def streak(flag: np.ndarray) -> np.ndarray:
+        # Racha = distancia a la última fila sin flag (el inicio de grupo nunca tiene flag)
+        breaks = np.where(flag, -1, pos)
+        return pos - np.maximum.accumulate(breaks)
+
+    with np.errstate(invalid='ignore'):
+        up = close > prev
+        down = close < prev
+    consec = streak(up) - streak(down)
+
+    return pd.DataFrame({
+        'symbol': uniques,
+        'consecutive_days_up': _last_per_group(consec, ends),
+    })
+
+
+def consolidation_latest(
+    df: pd.DataFrame,
+    sqrt_k: float = 1.3,
+    max_days: int = 120,
+    atr_period: int = 14,
+) -> pd.DataFrame:
+    """
+    consolidation_days/high/low y range_contraction de la última fila.
+
+    Días de consolidación = mayor N tal que para todo i <= N el rango
+    high/low de las últimas i+1 sesiones < ATR * sqrt_k * sqrt(i+1).
+
+    Args:
+        df: symbol, date, high, low, close ordenado por (symbol, date)
+    """
+    uniques, starts, ends = group_bounds(df['symbol'])
+    counts = ends - starts
+    by_symbol = df.groupby('symbol', sort=False)
+
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    prev_close = by_symbol['close'].shift(1).to_numpy(dtype=np.float64)
+
+    tr = pd.Series(
+        np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close))),
+        index=df.index,
+    )
+    daily_range = pd.Series(high - low, index=df.index)
+    symbol_keys = df['symbol']
+
+    def rolling_mean(series: pd.Series, window: int, min_periods: int) -> np.ndarray:
+        rolled = series.groupby(symbol_keys, sort=False).rolling(window, min_periods=min_periods).mean()
+        return rolled.droplevel(0).reindex(df.index).to_numpy()
+
+    atr = rolling_mean(tr, atr_period, atr_period)
+    avg_range_20 = rolling_mean(daily_range, 20, 5)
+    avg_range_5 = rolling_mean(daily_range, 5, 2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        range_contraction = np.where(
+            avg_range_20 > 0,
+            np.round(avg_range_5 / avg_range_20, 4),
+            np.nan,
+        )
+
+    last_atr = _last_per_group(atr, ends)
+    rc = _last_per_group(range_contraction, ends)
+
+    width = max_days + 1
+    run_high = np.maximum.accumulate(last_rows_matrix(high, ends, counts, width), axis=1)
+    run_low = np.minimum.accumulate(last_rows_matrix(low, ends, counts, width), axis=1)
+
+    sqrt_table = np.sqrt(np.arange(width + 1, dtype=np.float64))
+    threshold = (last_atr * sqrt_k)[:, None] * sqrt_table[None, 2:width + 1]
+    with np.errstate(invalid='ignore'):
+        inside = (run_high[:, 1:] - run_low[:, 1:]) < threshold
+
+    # Número de True iniciales (la expansión para en el primer fallo)
+    con_days = np.where(inside.all(axis=1), inside.shape[1], np.argmin(inside, axis=1))
+    eligible = (counts >= atr_period + 2) & ~np.isnan(last_atr) & (last_atr > 0)
+    con_days = np.where(eligible, con_days, 0)
+
+    rows = np.arange(len(uniques))
+    has_days = con_days > 0
+    return pd.DataFrame({
+        'symbol': uniques,
+        'consolidation_days': con_days.astype(np.int64),
+        'consolidation_high': np.where(has_days, run_high[rows, con_days], np.nan),
+        'consolidation_low': np.where(has_days, run_low[rows, con_days], np.nan),
+        'range_contraction': rc,
+    })
+
+
+def linear_regression_latest(df: pd.DataFrame, window: int = 130) -> pd.DataFrame:
+    """
+    lr_divergence_130: % del último cierre sobre la recta de regresión de los
+    últimos `window` cierres (evaluada en el último punto). None si no hay
+    historia suficiente o datos no finitos.
+
+    Args:
+        df: symbol, date, close ordenado por (symbol, date)
+    """
+    uniques, starts, ends = group_bounds(df['symbol'])
+    counts = ends - starts
+    close = df['close'].to_numpy(dtype=np.float64)
+
+    div = np.full(len(uniques), np.nan)
+    enough = counts >= window
+    if enough.any():
+        # (window × n) en orden cronológico, una columna por símbolo
+        Y = last_rows_matrix(close, ends[enough], counts[enough], window)[:, ::-1].T
+        finite = np.isfinite(Y).all(axis=0)
+        if finite.any():
+            x = np.arange(window)
+            coeffs = np.polyfit(x, Y[:, finite], 1)
+            lr_value = coeffs[0] * (window - 1) + coeffs[1]
+            current = Y[-1, finite]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                pct = np.round(((current - lr_value) / lr_value) * 100, 2)
+            pct[~np.isfinite(lr_value) | (lr_value == 0)] = np.nan
+            sub = np.full(int(enough.sum()), np.nan)
+            sub[finite] = pct
+            div[enough] = sub
+
+    return pd.DataFrame({'symbol': uniques, 'lr_divergence_130': div})
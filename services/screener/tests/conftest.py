@@ -0,0 +1,62 @@
+"""
+Shared fixtures: a small day_aggs flat-file directory (Polygon schema) that
+ScreenerEngine can load, in memory or into a persistent .duckdb file.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+_screener_root = Path(__file__).resolve().parent.parent
+if str(_screener_root) not in sys.path:
+    sys.path.insert(0, str(_screener_root))
+
+SYMBOLS = [f"SYM{i}" for i in range(8)]
+
+
+def write_day(day_dir: Path, day: pd.Timestamp, seed: int, symbols=SYMBOLS) -> Path:
+    """Write one {date}.parquet with random OHLCV for the symbols."""
+    rng = np.random.default_rng(seed)
+    n = len(symbols)
+    close = rng.uniform(5, 50, n)
+    path = day_dir / f"{day.date()}.parquet"
+    pd.DataFrame({
+        "ticker": symbols,
+        "volume": rng.integers(100_000, 10_000_000, n).astype(float),
+        "open": close * rng.uniform(0.97, 1.03, n),
+        "close": close,
+        "high": close * 1.04,
+        "low": close * 0.95,
+        "window_start": np.int64(day.value),
+        "transactions": rng.integers(100, 10_000, n).astype(float),
+    }).to_parquet(path, index=False)
+    return path
+
+
+@pytest.fixture
+def trading_days() -> pd.DatetimeIndex:
+    # Relativo a hoy: la carga filtra por CURRENT_DATE - default_lookback_days
+    yesterday = pd.Timestamp.today().normalize() - pd.Timedelta(days=1)
+    return pd.bdate_range(end=yesterday, periods=60)
+
+
+@pytest.fixture
+def data_path(tmp_path: Path, trading_days: pd.DatetimeIndex) -> Path:
+    """tmp data dir with day_aggs/{date}.parquet for every trading day."""
+    day_dir = tmp_path / "data" / "day_aggs"
+    day_dir.mkdir(parents=True)
+    for i, day in enumerate(trading_days):
+        write_day(day_dir, day, seed=i)
+    return tmp_path / "data"
+
+
+@pytest.fixture
+def write_aggs(data_path: Path):
+    """Write (or rewrite) one day in data_path/day_aggs."""
+    def _write(day: pd.Timestamp, seed: int, symbols=SYMBOLS) -> Path:
+        return write_day(data_path / "day_aggs", day, seed, symbols)
+    return _write
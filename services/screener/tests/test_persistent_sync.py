@@ -0,0 +1,82 @@
+"""
+Persistent .duckdb mode: after appending or rewriting a day of flat files,
+the incremental sync (_ingest_new_files + _update_screener_data) must leave
+screener_data identical to a fresh full rebuild over the same files.
+"""
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from core.engine import ScreenerEngine
+
+
+def _screener_data(engine: ScreenerEngine) -> pd.DataFrame:
+    df = engine.conn.execute("SELECT * FROM screener_data").fetchdf()
+    # El incremental añade columnas con ALTER: comparar sin depender del orden
+    df = df[sorted(df.columns)]
+    return df.sort_values(["symbol", "date"]).reset_index(drop=True)
+
+
+def _full_rebuild(data_path, db_path) -> pd.DataFrame:
+    engine = ScreenerEngine(data_path=data_path, db_path=db_path)
+    try:
+        return _screener_data(engine)
+    finally:
+        engine.close()
+
+
+@pytest.fixture
+def engine(data_path, trading_days, tmp_path):
+    # Arranque sin el último día: se añade después como fichero nuevo
+    (data_path / "day_aggs" / f"{trading_days[-1].date()}.parquet").unlink()
+    eng = ScreenerEngine(data_path=data_path, db_path=tmp_path / "screener.duckdb")
+    yield eng
+    eng.close()
+
+
+def test_incremental_sync_matches_full_rebuild(engine, data_path, trading_days, write_aggs, tmp_path):
+    assert engine._get_state("screener_data_version") is not None
+    assert engine._sync_persistent()["mode"] == "reuse"
+
+    # Día nuevo
+    write_aggs(trading_days[-1], seed=1000)
+    result = engine.refresh()
+    assert result["status"] == "ok"
+    assert result["mode"] == "incremental"
+    assert result["files_ingested"] == 1
+    pd.testing.assert_frame_equal(
+        _screener_data(engine), _full_rebuild(data_path, tmp_path / "full_1.duckdb")
+    )
+
+    # Día existente reescrito con otros precios y un símbolo menos
+    write_aggs(trading_days[-5], seed=2000, symbols=["SYM0", "SYM1", "SYM2"])
+    result = engine.refresh()
+    assert result["mode"] == "incremental"
+    assert result["files_ingested"] == 1
+    pd.testing.assert_frame_equal(
+        _screener_data(engine), _full_rebuild(data_path, tmp_path / "full_2.duckdb")
+    )
+
+    rows = engine.conn.execute(
+        "SELECT COUNT(*) FROM daily_prices WHERE date = ?", [trading_days[-5].date()]
+    ).fetchone()[0]
+    assert rows == 3
+
+
+def test_restart_reuses_persisted_tables(engine, data_path, tmp_path):
+    before = _screener_data(engine)
+    engine.close()
+
+    reopened = ScreenerEngine(data_path=data_path, db_path=tmp_path / "screener.duckdb")
+    try:
+        assert reopened._sync_persistent() == {
+            "mode": "reuse",
+            "files_ingested": 0,
+            "rows_added": 0,
+            "rows_trimmed": 0,
+            "affected_symbols": 0,
+        }
+        pd.testing.assert_frame_equal(_screener_data(reopened), before)
+    finally:
+        reopened.close()
@@ -0,0 +1,135 @@
+"""
+ScreenerResultCache: columnar entries must rebuild exactly what
+DataFrame.to_dict('records') returns, keys must not depend on filter order,
+and refresh() must invalidate every cached screen.
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.engine import ScreenerEngine
+from core.engine.result_cache import (
+    ScreenerResultCache,
+    _ColumnarResult,
+    make_cache_key,
+)
+
+
+def _same(a, b) -> bool:
+    """Igualdad valor a valor, con NaN == NaN y mismo tipo Python."""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, float) and math.isnan(a):
+        return math.isnan(b)
+    if a is pd.NaT:
+        return b is pd.NaT
+    return a == b
+
+
+def _assert_records_equal(got, expected):
+    assert len(got) == len(expected)
+    for row_got, row_expected in zip(got, expected):
+        assert list(row_got) == list(row_expected)
+        for key in row_expected:
+            assert _same(row_got[key], row_expected[key]), (key, row_got[key], row_expected[key])
+
+
+def test_to_records_matches_to_dict():
+    df = pd.DataFrame({
+        "symbol": ["AAA", "BBB", None],
+        "price": [1.5, np.nan, 3.0],
+        "volume": np.array([10, 20, 30], dtype=np.int64),
+        "market_cap": pd.array([1_000, None, 3_000], dtype="Int64"),
+        "date": [pd.Timestamp("2026-01-02"), pd.NaT, pd.Timestamp("2026-01-05")],
+        "squeeze_on": [True, False, True],
+        "above_vwap": pd.array([True, None, False], dtype="boolean"),
+        "sector": pd.array(["Tech", None, "Energy"], dtype="string"),
+    })
+
+    _assert_records_equal(_ColumnarResult(df).to_records(), df.to_dict("records"))
+
+
+def test_to_records_empty():
+    df = pd.DataFrame({"symbol": pd.Series([], dtype=object), "price": pd.Series([], dtype=float)})
+
+    assert _ColumnarResult(df).to_records() == df.to_dict("records") == []
+
+
+def test_cache_key_ignores_filter_order():
+    filters = [
+        {"field": "price", "operator": "gt", "value": 5},
+        {"field": "SMA", "operator": "LT", "value": 50, "params": {"period": 10, "source": None}},
+        {"field": "relative_volume", "operator": "gte", "value": 2},
+    ]
+    reordered = [
+        filters[2],
+        {"field": "sma", "operator": "lt", "value": 50, "params": {"period": 10}},
+        filters[0],
+    ]
+
+    key = make_cache_key(filters, "relative_volume", "desc", 50, ["msft", "AAPL"])
+    assert make_cache_key(reordered, "relative_volume", "DESC", 50, ["AAPL", "MSFT", "aapl"]) == key
+    # Cambios reales sí cambian la clave
+    assert make_cache_key(filters[:2], "relative_volume", "desc", 50, ["msft", "AAPL"]) != key
+    assert make_cache_key(filters, "relative_volume", "desc", 51, ["msft", "AAPL"]) != key
+    assert make_cache_key(filters, "relative_volume", "desc", 50, None) != key
+
+
+def test_put_from_stale_generation_is_dropped():
+    cache = ScreenerResultCache(max_entries=2)
+    df = pd.DataFrame({"symbol": ["AAA"], "price": [1.0]})
+
+    generation = cache.generation
+    cache.invalidate()
+    # Screen calculado antes del refresh: no debe entrar en la nueva generación
+    cache.put("k", df, generation)
+    assert cache.get("k") is None
+
+    cache.put("k", df, cache.generation)
+    assert cache.get("k") == [{"symbol": "AAA", "price": 1.0}]
+
+
+def test_lru_eviction_and_row_limit():
+    cache = ScreenerResultCache(max_entries=2, max_rows=2)
+    df = pd.DataFrame({"price": [1.0]})
+
+    for key in ("a", "b", "c"):
+        cache.put(key, df, cache.generation)
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+
+    cache.put("big", pd.DataFrame({"price": [1.0, 2.0, 3.0]}), cache.generation)
+    assert cache.get("big") is None
+    assert cache.get_stats()["skipped_too_large"] == 1
+
+
+@pytest.fixture
+def engine(data_path):
+    eng = ScreenerEngine(data_path=data_path, db_path=None)
+    yield eng
+    eng.close()
+
+
+def test_refresh_bumps_generation_and_invalidates(engine):
+    filters = [{"field": "price", "operator": "gt", "value": 0}]
+
+    first = engine.screen(filters, sort_by="price", limit=5)
+    assert first["status"] == "ok" and first["count"] > 0
+    assert first["cached"] is False
+
+    cached = engine.screen(list(reversed(filters)), sort_by="price", limit=5)
+    assert cached["cached"] is True
+    _assert_records_equal(cached["results"], first["results"])
+
+    generation = engine.result_cache.generation
+    assert engine.refresh()["status"] == "ok"
+    assert engine.result_cache.generation == generation + 1
+    assert engine.result_cache.get_stats()["entries"] == 0
+
+    after = engine.screen(filters, sort_by="price", limit=5)
+    assert after["cached"] is False
+    _assert_records_equal(after["results"], first["results"])
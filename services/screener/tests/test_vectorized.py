@@ -0,0 +1,205 @@
+"""
+Parity tests: core.engine.vectorized vs the original per-symbol loops of
+ScreenerEngine (_compute_consecutive_days, _compute_consolidation,
+_compute_linear_regression), reproduced here as reference implementations.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+_screener_root = Path(__file__).resolve().parent.parent
+if str(_screener_root) not in sys.path:
+    sys.path.insert(0, str(_screener_root))
+
+from core.engine.vectorized import (  # noqa: E402
+    consecutive_days_latest,
+    consolidation_latest,
+    linear_regression_latest,
+)
+
+
+# ── Reference implementations (pre-vectorization) ───────────────────────
+
+
+def _ref_consecutive_days(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df['prev_close'] = df.groupby('symbol')['close'].shift(1)
+    df['up'] = (df['close'] > df['prev_close']).astype(int)
+    df['down'] = (df['close'] < df['prev_close']).astype(int)
+
+    def streak(series):
+        result = []
+        count = 0
+        for val in series:
+            if val:
+                count += 1
+            else:
+                count = 0
+            result.append(count)
+        return result
+
+    df['consec_up'] = df.groupby('symbol')['up'].transform(streak)
+    df['consec_down'] = df.groupby('symbol')['down'].transform(streak)
+    df['consecutive_days_up'] = df['consec_up'] - df['consec_down']
+    return df.sort_values('date').groupby('symbol').tail(1)[['symbol', 'consecutive_days_up']]
+
+
+def _ref_consolidation(df: pd.DataFrame, SQRT_K=1.3, MAX_CONSOL_DAYS=120, ATR_PERIOD=14) -> pd.DataFrame:
+    df = df.copy()
+    df['daily_range'] = df['high'] - df['low']
+    df['tr'] = np.maximum(
+        df['high'] - df['low'],
+        np.maximum(
+            abs(df['high'] - df.groupby('symbol')['close'].shift(1)),
+            abs(df['low'] - df.groupby('symbol')['close'].shift(1))
+        )
+    )
+    df['atr'] = df.groupby('symbol')['tr'].transform(
+        lambda x: x.rolling(ATR_PERIOD, min_periods=ATR_PERIOD).mean()
+    )
+    avg_range_20 = df.groupby('symbol')['daily_range'].transform(
+        lambda x: x.rolling(20, min_periods=5).mean()
+    )
+    avg_range_5 = df.groupby('symbol')['daily_range'].transform(
+        lambda x: x.rolling(5, min_periods=2).mean()
+    )
+    df['range_contraction'] = np.where(
+        avg_range_20 > 0,
+        (avg_range_5 / avg_range_20).round(4),
+        np.nan
+    )
+
+    results = []
+    sqrt_table = [np.sqrt(n) for n in range(MAX_CONSOL_DAYS + 2)]
+    for symbol, grp in df.sort_values(['symbol', 'date']).groupby('symbol'):
+        rc = grp['range_contraction'].iloc[-1]
+        highs = grp['high'].values
+        lows = grp['low'].values
+        last_idx = len(highs) - 1
+        last_atr = grp['atr'].values[last_idx]
+        if len(grp) < ATR_PERIOD + 2 or np.isnan(last_atr) or last_atr <= 0:
+            results.append({'symbol': symbol, 'consolidation_days': 0,
+                            'consolidation_high': np.nan, 'consolidation_low': np.nan,
+                            'range_contraction': rc})
+            continue
+        con_days = 0
+        rolling_high = highs[last_idx]
+        rolling_low = lows[last_idx]
+        for i in range(1, min(MAX_CONSOL_DAYS + 1, last_idx + 1)):
+            look_idx = last_idx - i
+            candidate_high = max(rolling_high, highs[look_idx])
+            candidate_low = min(rolling_low, lows[look_idx])
+            if candidate_high - candidate_low < last_atr * SQRT_K * sqrt_table[i + 1]:
+                rolling_high = candidate_high
+                rolling_low = candidate_low
+                con_days += 1
+            else:
+                break
+        results.append({
+            'symbol': symbol,
+            'consolidation_days': con_days,
+            'consolidation_high': rolling_high if con_days > 0 else np.nan,
+            'consolidation_low': rolling_low if con_days > 0 else np.nan,
+            'range_contraction': rc,
+        })
+    return pd.DataFrame(results)
+
+
+def _ref_linear_regression(df: pd.DataFrame) -> pd.DataFrame:
+    results = []
+    for symbol, grp in df.groupby('symbol'):
+        closes = grp['close'].values
+        if len(closes) < 130:
+            results.append({'symbol': symbol, 'lr_divergence_130': None})
+            continue
+        last_130 = closes[-130:]
+        if np.any(np.isnan(last_130)) or np.any(np.isinf(last_130)):
+            results.append({'symbol': symbol, 'lr_divergence_130': None})
+            continue
+        coeffs = np.polyfit(np.arange(130), last_130, 1)
+        lr_value = coeffs[0] * 129 + coeffs[1]
+        if np.isnan(lr_value) or np.isinf(lr_value) or lr_value == 0:
+            results.append({'symbol': symbol, 'lr_divergence_130': None})
+            continue
+        results.append({'symbol': symbol,
+                        'lr_divergence_130': round(((closes[-1] - lr_value) / lr_value) * 100, 2)})
+    return pd.DataFrame(results)
+
+
+# ── Fixtures ─────────────────────────────────────────────────────────────
+
+
+@pytest.fixture(params=[0, 1, 2])
+def daily_df(request) -> pd.DataFrame:
+    """Synthetic daily bars: uneven history lengths, flat runs and tight ranges."""
+    rng = np.random.default_rng(request.param)
+    frames = []
+    for i in range(60):
+        n = int(rng.choice([1, 2, 10, 15, 16, 40, 129, 130, 200, 260]))
+        dates = pd.date_range("2024-01-01", periods=n, freq="B")
+        steps = rng.choice([-1.0, 0.0, 1.0], size=n) * rng.uniform(0, 0.5, size=n)
+        close = np.round(20 + np.cumsum(steps), 2)
+        # Tramos planos y rangos estrechos al final para ejercitar rachas/consolidación
+        if i % 5 == 0:
+            close[-min(n, 8):] = close[-1]
+        spread = rng.uniform(0.05, 1.0, size=n) * (0.2 if i % 3 == 0 else 1.0)
+        frames.append(pd.DataFrame({
+            "symbol": f"T{i:03d}",
+            "date": dates,
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+        }))
+    return pd.concat(frames).sort_values(["symbol", "date"]).reset_index(drop=True)
+
+
+def _by_symbol(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values("symbol").reset_index(drop=True)
+
+
+# ── Tests ────────────────────────────────────────────────────────────────
+
+
+def test_consecutive_days_parity(daily_df):
+    expected = _by_symbol(_ref_consecutive_days(daily_df))
+    got = _by_symbol(consecutive_days_latest(daily_df))
+    assert list(got["symbol"]) == list(expected["symbol"])
+    np.testing.assert_array_equal(got["consecutive_days_up"], expected["consecutive_days_up"])
+
+
+def test_consolidation_parity(daily_df):
+    expected = _by_symbol(_ref_consolidation(daily_df))
+    got = _by_symbol(consolidation_latest(daily_df))
+    assert list(got["symbol"]) == list(expected["symbol"])
+    np.testing.assert_array_equal(got["consolidation_days"], expected["consolidation_days"])
+    for col in ("consolidation_high", "consolidation_low", "range_contraction"):
+        np.testing.assert_array_equal(got[col].to_numpy(), expected[col].to_numpy(dtype=float))
+    assert (got["consolidation_days"] > 0).any()
+
+
+def test_linear_regression_parity(daily_df):
+    expected = _by_symbol(_ref_linear_regression(daily_df))
+    got = _by_symbol(linear_regression_latest(daily_df))
+    assert list(got["symbol"]) == list(expected["symbol"])
+    # polyfit batched vs per-column: same lstsq, ulp-level noise before rounding
+    np.testing.assert_allclose(
+        got["lr_divergence_130"].to_numpy(dtype=float),
+        expected["lr_divergence_130"].to_numpy(dtype=float),
+        rtol=0, atol=0.011, equal_nan=True,
+    )
+
+
+def test_consecutive_days_streaks():
+    df = pd.DataFrame({
+        "symbol": ["A"] * 6 + ["B"] * 3,
+        "date": list(pd.date_range("2024-01-01", periods=6)) + list(pd.date_range("2024-01-01", periods=3)),
+        "close": [1, 2, 3, 2, 3, 4, 5, 4, 3],
+    })
+    got = consecutive_days_latest(df).set_index("symbol")["consecutive_days_up"]
+    assert got["A"] == 2
+    assert got["B"] == -2
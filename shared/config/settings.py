@@ -177,6 +177,7 @@ class Settings(BaseSettings):
     initial_universe_size: int = Field(default=11000, description="Initial universe size")
     max_filtered_tickers: int = Field(default=5000, description="Max filtered tickers")
     snapshot_interval: int = Field(default=5, description="Snapshot interval in seconds")
+    snapshot_format: str = Field(default="json", description="Polygon snapshot interchange format (json or columnar)")
     default_gappers_limit: int = Field(default=100, description="Default number of gappers to return")
     default_category_limit: int = Field(default=100, description="Default number of tickers per category")
     default_query_limit: int = Field(default=1000, description="Default query limit for scanner endpoints")
@@ -196,6 +197,7 @@ class Settings(BaseSettings):
     # =============================================
     rvol_slot_minutes: int = Field(default=5, description="RVOL slot size in minutes")
     rvol_lookback_days: int = Field(default=30, description="RVOL lookback period")
+    rvol_baseline_dir: str = Field(default="/tmp/rvol_baseline", description="Local memmap directory for the RVOL baseline matrix")
     
     # =============================================
     # LOGGING
@@ -232,6 +234,8 @@ class Settings(BaseSettings):
     # =============================================
     worker_threads: int = Field(default=4, description="Worker threads")
     max_concurrent_requests: int = Field(default=100, description="Max concurrent requests")
+    bar_engine_backend: str = Field(default="talipp", description="BarEngine indicator backend (talipp or array)")
+    bar_engine_shards: int = Field(default=1, description="BarEngine worker processes (>1 enables sharded mode)")
     
     # =============================================
     # WEBSOCKET
@@ -0,0 +1,18 @@
+"""
+Shared setup for the shared/ test suite.
+
+Tests use in-memory fakes only; no Redis, TimescaleDB or external APIs.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+# shared.config exige las API keys al importarse
+os.environ.setdefault("POLYGON_API_KEY", "test")
+os.environ.setdefault("FMP_API_KEY", "test")
+
+_repo_root = Path(__file__).resolve().parent.parent.parent
+if str(_repo_root) not in sys.path:
+    sys.path.insert(0, str(_repo_root))
@@ -0,0 +1,149 @@
+"""
+Round trip of the columnar Polygon snapshot: PolygonSnapshot models → blob →
+per-ticker dicts must match the JSON path (model_dump + computed fields).
+"""
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import orjson
+import pytest
+
+from shared.models.polygon import PolygonSnapshot
+from shared.utils.columnar_snapshot import (
+    INT_NULL,
+    SNAPSHOT_COLUMNAR_KEY,
+    SNAPSHOT_POLYGON_KEY,
+    SNAPSHOT_SCHEMA_KEY,
+    SNAPSHOT_SCHEMA_VERSION,
+    ColumnarSnapshot,
+    _COLUMNS,
+    _GROUPS,
+    encode_snapshot,
+    load_polygon_snapshot,
+    write_columnar_snapshot,
+)
+
+_TS = "2026-07-20T10:15:00.123456"
+
+
+def _models():
+    return [
+        PolygonSnapshot(
+            ticker="AAPL", updated=1, fmv=None,
+            day={"o": 190.5, "h": 192.0, "l": 189.9, "c": 191.2, "v": 1_234_567.0, "vw": 190.8, "otc": False},
+            lastTrade={"p": 191.25, "s": 100, "c": [12, 37], "i": "x1", "t": 1_784_556_900_000_000_000, "x": 4},
+            lastQuote={"p": 191.2, "s": 3, "P": 191.3, "S": 5, "t": 1_784_556_900_000_000_001},
+            min={"av": 1_234_567, "o": 191.0, "h": 191.3, "l": 190.9, "c": 191.25, "v": 5000,
+                 "vw": 191.1, "n": 42, "t": 1_784_556_840_000, "otc": False},
+            prevDay={"o": 188.0, "h": 190.0, "l": 187.5, "c": 189.0, "v": 9_876_543, "vw": 188.9},
+            todaysChange=2.25, todaysChangePerc=1.19,
+        ),
+        # Pre-market: sin day ni min, lastQuote con campos nulos
+        PolygonSnapshot(
+            ticker="NEWCO",
+            lastTrade={"p": 4.0, "s": 10, "t": 1_784_520_000_000_000_000},
+            lastQuote={},
+            prevDay={"c": 3.5, "v": 0},
+            todaysChange=0.5,
+        ),
+        # Nada más que el símbolo
+        PolygonSnapshot(ticker="EMPTY"),
+    ]
+
+
+def _json_tickers(models):
+    """What the producer's JSON path writes per ticker, limited to the columns."""
+    out = []
+    for s in models:
+        d = s.model_dump(mode="json")
+        d["current_price"] = s.current_price
+        d["current_volume"] = s.current_volume
+        kept = {"ticker": d["ticker"]}
+        for group in _GROUPS:
+            sub = d[group]
+            names = [f for g, f, _ in _COLUMNS if g == group]
+            kept[group] = None if sub is None else {f: sub[f] for f in names}
+        for g, f, _ in _COLUMNS:
+            if g is None:
+                kept[f] = d[f]
+        out.append(kept)
+    return out
+
+
+def test_round_trip_matches_model_dump():
+    models = _models()
+    blob, count = encode_snapshot(models, _TS)
+    snap = ColumnarSnapshot.from_bytes(blob)
+
+    assert count == snap.count == len(models)
+    assert snap.timestamp == _TS
+    # Mismos valores Y mismos tipos (int vs float) que el JSON
+    assert orjson.dumps(snap.to_ticker_dicts()) == orjson.dumps(_json_tickers(models))
+
+
+def test_columns_use_null_sentinels():
+    snap = ColumnarSnapshot.from_bytes(encode_snapshot(_models(), _TS)[0])
+
+    assert snap.tickers() == ["AAPL", "NEWCO", "EMPTY"]
+    price = snap.column("lastTrade_p")
+    assert price[:2].tolist() == [191.25, 4.0] and np.isnan(price[2])
+    assert snap.column("min_av").tolist() == [1_234_567, INT_NULL, INT_NULL]
+    assert snap.present("lastQuote").tolist() == [True, True, False]
+    assert snap.present("day").tolist() == [True, False, False]
+
+
+def test_rejects_other_schema_version():
+    blob = bytearray(encode_snapshot(_models(), _TS)[0])
+    blob[4:6] = (SNAPSHOT_SCHEMA_VERSION + 1).to_bytes(2, "little")
+    with pytest.raises(ValueError):
+        ColumnarSnapshot.from_bytes(bytes(blob))
+
+
+class _FakePipeline:
+    def __init__(self, store):
+        self.store = store
+        self.ops = []
+
+    def setex(self, key, ttl, value):
+        self.ops.append((key, value))
+
+    async def execute(self):
+        self.store.update(self.ops)
+
+
+class _FakeBinary:
+    def __init__(self, store):
+        self.store = store
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self.store)
+
+    async def mget(self, *keys):
+        return [self.store.get(k) for k in keys]
+
+
+class _FakeRedisClient:
+    def __init__(self, store):
+        self.store = store
+        self.binary_client = _FakeBinary(store)
+
+    async def get(self, key):
+        return self.store.get(key)
+
+
+def test_load_prefers_columnar_value():
+    models = _models()
+    client = _FakeRedisClient({SNAPSHOT_POLYGON_KEY: {"timestamp": "old", "count": 0, "tickers": []}})
+
+    assert asyncio.run(load_polygon_snapshot(client))["timestamp"] == "old"
+
+    asyncio.run(write_columnar_snapshot(client, models, timestamp=_TS))
+    assert orjson.loads(client.store[SNAPSHOT_SCHEMA_KEY])["count"] == len(models)
+    data = asyncio.run(load_polygon_snapshot(client))
+    assert data["timestamp"] == _TS
+    assert data["tickers"] == _json_tickers(models)
+
+    del client.store[SNAPSHOT_COLUMNAR_KEY]
+    assert asyncio.run(load_polygon_snapshot(client))["timestamp"] == "old"
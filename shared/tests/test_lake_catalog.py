@@ -0,0 +1,143 @@
+"""
+Tests de LakeCatalog.
+
+ensure_partition: el catálogo se republica cuando el manifiesto no coincide
+con los Parquet en disco (re-archivado --force caído antes de publicar) y se
+limpia si la partición desaparece.
+
+prune: conservador para cualquier tipo de cota temporal (date, naive, aware,
+str) y filtros de símbolos / valores Hive.
+"""
+from __future__ import annotations
+
+import shutil
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from shared.utils.lake_catalog import LakeCatalog
+
+_PART = "dt=2026-07-20"
+
+
+def _write(path, n_rows: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(pa.table({"symbol": [f"S{i}" for i in range(n_rows)]}), path)
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    _write(tmp_path / _PART / "event_type=vwap_cross" / "part-0.parquet", 3)
+    cat = LakeCatalog(tmp_path)
+    cat.publish_partition(_PART)
+    return cat
+
+
+def test_ensure_skips_partition_matching_disk(catalog):
+    assert catalog.ensure_partition(_PART) is False
+
+
+def test_ensure_republishes_missing_partition(catalog):
+    catalog.remove_partition(_PART)
+    assert catalog.ensure_partition(_PART) is True
+    assert catalog.manifest(_PART)["rows"] == 3
+
+
+def test_ensure_republishes_stale_manifest(catalog):
+    # Datos reescritos (mismo path, otro tamaño) sin publicar el catálogo
+    _write(catalog.dataset_dir / _PART / "event_type=vwap_cross" / "part-0.parquet", 50)
+    assert catalog.ensure_partition(_PART) is True
+    assert catalog.manifest(_PART)["rows"] == 50
+
+
+def test_ensure_republishes_when_listed_file_is_gone(catalog):
+    part_dir = catalog.dataset_dir / _PART
+    shutil.rmtree(part_dir)
+    _write(part_dir / "event_type=new_high" / "part-0.parquet", 2)
+    assert catalog.ensure_partition(_PART) is True
+    paths = [f["path"] for f in catalog.manifest(_PART)["files"]]
+    assert paths == [f"{_PART}/event_type=new_high/part-0.parquet"]
+
+
+def test_ensure_ignores_hidden_old_dir(catalog):
+    # El directorio apartado por --force no vive dentro de la partición
+    _write(catalog.dataset_dir / f".old-{_PART}" / "event_type=vwap_cross" / "part-0.parquet", 9)
+    assert catalog.ensure_partition(_PART) is False
+
+
+def test_ensure_drops_partition_whose_dir_is_gone(catalog):
+    shutil.rmtree(catalog.dataset_dir / _PART)
+    assert catalog.ensure_partition(_PART) is False
+    assert _PART not in catalog.partitions()
+
+
+# ── prune ────────────────────────────────────────────────────────────────
+
+_NY = ZoneInfo("America/New_York")
+
+
+def _write_events(path, symbols, first: datetime) -> None:
+    """Un evento por símbolo, de `first` a `first` + 60 min."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    step = timedelta(minutes=60 // (len(symbols) - 1))
+    ts = [first + i * step for i in range(len(symbols))]
+    pq.write_table(pa.table({"symbol": symbols, "ts": ts}), path)
+
+
+@pytest.fixture
+def events(tmp_path):
+    # 14:00Z–15:00Z, timestamps tz-aware (UTC)
+    aware = datetime(2026, 7, 20, 14, 0, tzinfo=timezone.utc)
+    _write_events(tmp_path / _PART / "event_type=vwap_cross" / "part-0.parquet", ["AAPL", "MSFT"], aware)
+    # Mismo rango con timestamps naive (se interpretan como UTC)
+    naive = datetime(2026, 7, 20, 14, 0)
+    _write_events(tmp_path / _PART / "event_type=new_high" / "part-0.parquet", ["TSLA", "NVDA"], naive)
+    cat = LakeCatalog(tmp_path, ts_column="ts")
+    cat.publish_partition(_PART)
+    return cat
+
+
+def _types(catalog, **kwargs):
+    return sorted(p.split("event_type=")[1].split("/")[0] for p in catalog.prune(**kwargs))
+
+
+_BOTH = ["new_high", "vwap_cross"]
+
+
+@pytest.mark.parametrize("kwargs", [
+    dict(end=date(2026, 7, 20)),
+    dict(start=date(2026, 7, 20), end=date(2026, 7, 20)),
+    dict(start="2026-07-20", end="2026-07-20"),
+    dict(end="2026-07-20 14:30"),
+    dict(start="2026-07-20T14:59:00Z"),
+    dict(start=datetime(2026, 7, 20, 14, 30), end=datetime(2026, 7, 20, 14, 31)),
+    dict(start=datetime(2026, 7, 20, 10, 30, tzinfo=_NY)),
+    dict(end=datetime(2026, 7, 20, 14, 0, tzinfo=timezone.utc)),
+    dict(start="not a timestamp"),
+])
+def test_prune_keeps_overlapping_files(events, kwargs):
+    assert _types(events, **kwargs) == _BOTH
+
+
+@pytest.mark.parametrize("kwargs", [
+    dict(end=date(2026, 7, 19)),
+    dict(start=date(2026, 7, 21)),
+    dict(end="2026-07-20 13:59"),
+    dict(start=datetime(2026, 7, 20, 15, 1)),
+    dict(start=datetime(2026, 7, 20, 11, 1, tzinfo=_NY)),
+    dict(end=datetime(2026, 7, 20, 9, 59, tzinfo=_NY)),
+])
+def test_prune_drops_files_outside_range(events, kwargs):
+    assert _types(events, **kwargs) == []
+
+
+def test_prune_filters_by_symbols_and_hive_values(events):
+    assert _types(events, symbols=["AAPL"]) == ["vwap_cross"]
+    assert _types(events, symbols=["NVDA", "MSFT"]) == _BOTH
+    assert _types(events, symbols=["GME"]) == []
+    assert _types(events, where={"event_type": ["new_high"]}) == ["new_high"]
+    assert _types(events, where={"event_type": ["new_high"]}, symbols=["AAPL"]) == []
+    assert _types(events, partitions=["dt=2026-07-21"]) == []
@@ -0,0 +1,134 @@
+"""
+RedisStreamManager: plan de trimming consciente de consumer groups y el
+chequeo batched (XLEN + XINFO GROUPS + MEMORY USAGE, XPENDING, XTRIM) sobre
+un pipeline falso en memoria.
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from shared.utils.redis_stream_manager import RedisStreamManager
+
+STREAM = "stream:ranking:deltas"  # maxlen 5000, threshold 6000 → hard_maxlen 50000
+
+
+def _group(name, last_delivered, lag, pending=0, **extra):
+    return {"name": name, "last-delivered-id": last_delivered, "lag": lag, "pending": pending, **extra}
+
+
+@pytest.fixture()
+def manager():
+    return RedisStreamManager(redis_client=None)
+
+
+def test_below_threshold_is_not_trimmed(manager):
+    assert manager._plan_trim(STREAM, 6000, [], []) is None
+
+
+def test_no_groups_trims_by_maxlen(manager):
+    assert manager._plan_trim(STREAM, 7000, [], []) == ("maxlen", 5000)
+
+
+def test_groups_within_maxlen_trim_by_maxlen(manager):
+    groups = [_group("a", "100-0", 10), _group("b", "90-0", 4999)]
+    assert manager._plan_trim(STREAM, 7000, groups, [10, 4999]) == ("maxlen", 5000)
+
+
+def test_lagging_group_trims_by_minid_of_slowest(manager):
+    groups = [_group("a", "100-1", 10), _group("b", "90-5", 6500)]
+    assert manager._plan_trim(STREAM, 7000, groups, [10, 6500]) == ("minid", "90-5")
+
+
+def test_unknown_lag_trims_by_minid(manager):
+    groups = [_group("a", "100-0", None)]
+    assert manager._plan_trim(STREAM, 7000, groups, [None]) == ("minid", "100-0")
+
+
+def test_minid_keeps_unacked_entries(manager):
+    groups = [
+        _group("a", "100-0", 6500, pending=3, **{"oldest-pending-id": "42-7"}),
+        _group("b", "95-0", 10),
+    ]
+    assert manager._plan_trim(STREAM, 7000, groups, [6500, 10]) == ("minid", "42-7")
+
+
+def test_hard_maxlen_caps_abandoned_group(manager):
+    groups = [_group("dead", "0-0", None)]
+    assert manager._plan_trim(STREAM, 60_000, groups, [None]) == ("maxlen", 50_000)
+    assert manager.stats["hard_cap_trims"] == 1
+
+
+def test_hard_maxlen_not_applied_when_lag_fits(manager):
+    groups = [_group("a", "300-0", 20_000)]
+    assert manager._plan_trim(STREAM, 60_000, groups, [20_000]) == ("minid", "300-0")
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.ops = []
+
+    def __getattr__(self, command):
+        return lambda *args, **kwargs: self.ops.append((command, args, kwargs))
+
+    async def execute(self, raise_on_error=True):
+        self.client.executed.append(self.ops)
+        return [self.client.reply(command, args, kwargs) for command, args, kwargs in self.ops]
+
+
+class _FakeRedis:
+    def __init__(self, streams):
+        self.streams = streams
+        self.executed = []
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def reply(self, command, args, kwargs):
+        stream = self.streams.get(args[0])
+        if command == "xlen":
+            return stream["length"] if stream else 0
+        if command == "xinfo_groups":
+            return [dict(g) for g in stream["groups"]] if stream else Exception("ERR no such key")
+        if command == "memory_usage":
+            return 1024 if stream else None
+        if command == "xpending":
+            return stream["pending"][args[1]]
+        if command == "xtrim":
+            return 7
+        raise AssertionError(command)
+
+
+class _FakeRedisClient:
+    def __init__(self, streams):
+        self.client = _FakeRedis(streams)
+
+
+def test_check_streams_batches_commands_per_round_trip():
+    client = _FakeRedisClient({
+        "snapshots:raw": {"length": 5000, "groups": []},
+        STREAM: {
+            "length": 7000,
+            "groups": [_group("a", "100-0", 6500, pending=2)],
+            "pending": {"a": {"pending": 2, "min": "80-0", "max": "99-0", "consumers": []}},
+        },
+    })
+    manager = RedisStreamManager(client)
+    streams = list(RedisStreamManager.STREAM_CONFIGS)
+
+    asyncio.run(manager._check_streams(streams))
+
+    checks, pending, trims = client.client.executed
+    assert len(checks) == 3 * len(streams)
+    assert [op[0] for op in pending] == ["xpending"]
+    assert [(op[1][0], op[2]) for op in trims] == [
+        ("snapshots:raw", {"maxlen": 1000, "approximate": True}),
+        (STREAM, {"minid": "80-0", "approximate": True}),
+    ]
+    gauges = manager.stream_gauges[STREAM]
+    assert gauges["memory_bytes"] == 1024
+    assert gauges["max_lag"] == 6500
+    assert gauges["slowest_group"] == "a"
+    assert manager.get_stats()["minid_trims"] == 1
@@ -0,0 +1,261 @@
+"""
+Alert Partition Map - Asignación símbolo → partición de stream:agg:p{N}
+
+Sustituye a `hash(symbol) % N`: el hash de Python está salado por proceso, así
+que cada reinicio de polygon_ws reasignaba los símbolos a otras particiones y
+los AlertEngine perdían su AlertStateCache caliente.
+
+Asignación:
+    1. Override explícito en Redis (símbolos calientes rebalanceados)
+    2. Hash estable: zlib.crc32(symbol) % N (igual en todos los procesos)
+
+Claves Redis:
+    alert:partitions:map   HASH symbol → partición (solo overrides)
+    alert:partitions:meta  HASH num_partitions, version, updated_at
+
+El productor (polygon_ws) es el único escritor: cuenta mensajes por símbolo y,
+si el rebalanceo está activo, reparte los símbolos más activos entre las
+particiones menos cargadas (greedy LPT con preferencia por quedarse donde
+están). Los consumidores solo leen y detectan cambios por `version`.
+"""
+
+import time
+import zlib
+from typing import Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+MAP_KEY = "alert:partitions:map"
+META_KEY = "alert:partitions:meta"
+
+
+def stable_partition(symbol: str, num_partitions: int) -> int:
+    """Partición determinista (independiente de PYTHONHASHSEED)."""
+    return zlib.crc32(symbol.encode()) % num_partitions
+
+
+class AlertPartitionMap:
+    """
+    Mapa de particiones compartido vía Redis.
+
+    partition_for() es síncrono y no hace I/O (hot path del productor);
+    refresh() recarga los overrides cuando cambia la versión en Redis.
+    """
+
+    def __init__(self, redis_client, num_partitions: int):
+        if num_partitions < 1:
+            raise ValueError("num_partitions must be >= 1")
+        self.redis = redis_client
+        self.num_partitions = num_partitions
+
+        self._overrides: Dict[str, int] = {}
+        self._version = 0
+
+        # Contadores de mensajes por símbolo (solo productor)
+        self._counts: Dict[str, int] = {}
+        self._rates: Dict[str, float] = {}
+        self._window_start = time.monotonic()
+
+        self._last_rebalance: Optional[Dict] = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def partition_for(self, symbol: str) -> int:
+        partition = self._overrides.get(symbol)
+        if partition is not None:
+            return partition
+        return zlib.crc32(symbol.encode()) % self.num_partitions
+
+    def owns(self, symbol: str, partition_id: int) -> bool:
+        return self.partition_for(symbol) == partition_id
+
+    def record(self, symbol: str) -> None:
+        """Cuenta un mensaje del símbolo (entrada del rebalanceo por carga)."""
+        self._counts[symbol] = self._counts.get(symbol, 0) + 1
+
+    # ========================================================================
+    # Redis
+    # ========================================================================
+
+    async def load(self, owner: bool = False) -> None:
+        """
+        Carga el mapa de Redis.
+
+        Si el mapa guardado se construyó con otro número de particiones sus
+        overrides no son válidos: el productor (owner=True) lo reinicia y los
+        consumidores lo ignoran hasta que el productor lo reescriba.
+        """
+        meta = await self.redis.client.hgetall(META_KEY)
+        stored_partitions = int(meta.get("num_partitions", 0) or 0) if meta else 0
+
+        if meta and stored_partitions != self.num_partitions:
+            logger.warning(
+                "alert_partition_map_size_mismatch",
+                stored=stored_partitions,
+                local=self.num_partitions,
+                owner=owner
+            )
+            if owner:
+                await self._write({}, int(meta.get("version", 0) or 0) + 1)
+            else:
+                self._overrides = {}
+                self._version = int(meta.get("version", 0) or 0)
+            return
+
+        if not meta:
+            if owner:
+                await self._write({}, 1)
+            return
+
+        await self.refresh(force=True)
+
+    async def refresh(self, force: bool = False) -> bool:
+        """
+        Recarga los overrides si la versión en Redis cambió.
+
+        Returns:
+            True si el mapa local cambió
+        """
+        raw_meta = await self.redis.client.hmget(META_KEY, "version", "num_partitions")
+        version = int(raw_meta[0] or 0)
+        stored_partitions = int(raw_meta[1] or 0)
+        if stored_partitions and stored_partitions != self.num_partitions:
+            return False
+        if not force and version == self._version:
+            return False
+
+        raw = await self.redis.client.hgetall(MAP_KEY)
+        overrides = {}
+        for symbol, partition in raw.items():
+            p = int(partition)
+            if 0 <= p < self.num_partitions:
+                overrides[symbol] = p
+        changed = overrides != self._overrides
+        self._overrides = overrides
+        self._version = version
+        if changed:
+            logger.info(
+                "alert_partition_map_loaded",
+                version=version,
+                overrides=len(overrides),
+                num_partitions=self.num_partitions
+            )
+        return changed
+
+    async def _write(self, overrides: Dict[str, int], version: int) -> None:
+        """Reemplaza el mapa de forma atómica (MULTI/EXEC)."""
+        pipe = self.redis.client.pipeline(transaction=True)
+        pipe.delete(MAP_KEY)
+        if overrides:
+            pipe.hset(MAP_KEY, mapping={s: str(p) for s, p in overrides.items()})
+        pipe.hset(META_KEY, mapping={
+            "num_partitions": str(self.num_partitions),
+            "version": str(version),
+            "updated_at": str(int(time.time())),
+        })
+        await pipe.execute()
+        self._overrides = dict(overrides)
+        self._version = version
+
+    # ========================================================================
+    # Rebalanceo por carga
+    # ========================================================================
+
+    def _roll_rates(self, ewma_alpha: float) -> None:
+        """Convierte los contadores de la ventana en msgs/s (EWMA)."""
+        now = time.monotonic()
+        elapsed = max(now - self._window_start, 1e-3)
+        seen = set(self._counts) | set(self._rates)
+        for symbol in seen:
+            rate = self._counts.get(symbol, 0) / elapsed
+            prev = self._rates.get(symbol)
+            self._rates[symbol] = rate if prev is None else prev + ewma_alpha * (rate - prev)
+        # Olvidar símbolos que ya no envían nada
+        self._rates = {s: r for s, r in self._rates.items() if r > 1e-3}
+        self._counts = {}
+        self._window_start = now
+
+    def partition_loads(self) -> List[float]:
+        loads = [0.0] * self.num_partitions
+        for symbol, rate in self._rates.items():
+            loads[self.partition_for(symbol)] += rate
+        return loads
+
+    async def rebalance(
+        self,
+        hot_symbols: int = 200,
+        tolerance: float = 0.10,
+        ewma_alpha: float = 0.5
+    ) -> Dict:
+        """
+        Reparte los `hot_symbols` más activos entre particiones.
+
+        Los demás símbolos conservan su asignación actual (hash estable u
+        override previo) y forman la carga base. Cada símbolo caliente se
+        queda en su partición salvo que la menos cargada mejore en más de
+        `tolerance`, para no mover estado de AlertEngine sin necesidad.
+        """
+        self._roll_rates(ewma_alpha)
+        before = self.partition_loads()
+
+        ranked = sorted(self._rates.items(), key=lambda kv: kv[1], reverse=True)
+        hot = ranked[:hot_symbols]
+        hot_set = {s for s, _ in hot}
+
+        loads = [0.0] * self.num_partitions
+        for symbol, rate in self._rates.items():
+            if symbol not in hot_set:
+                loads[self.partition_for(symbol)] += rate
+
+        assignment: Dict[str, int] = {}
+        moved = 0
+        for symbol, rate in hot:
+            current = self.partition_for(symbol)
+            target = min(range(self.num_partitions), key=loads.__getitem__)
+            if loads[current] + rate <= (loads[target] + rate) * (1 + tolerance):
+                target = current
+            elif target != current:
+                moved += 1
+            assignment[symbol] = target
+            loads[target] += rate
+
+        overrides = {s: p for s, p in self._overrides.items() if s not in hot_set}
+        for symbol, partition in assignment.items():
+            if partition != stable_partition(symbol, self.num_partitions):
+                overrides[symbol] = partition
+
+        if overrides != self._overrides:
+            await self._write(overrides, self._version + 1)
+
+        self._last_rebalance = {
+            "version": self._version,
+            "moved": moved,
+            "overrides": len(self._overrides),
+            "imbalance_before": self._imbalance(before),
+            "imbalance_after": self._imbalance(loads),
+            "loads": [round(l, 1) for l in loads],
+            "at": int(time.time()),
+        }
+        logger.info("alert_partitions_rebalanced", **self._last_rebalance)
+        return self._last_rebalance
+
+    @staticmethod
+    def _imbalance(loads: List[float]) -> float:
+        """max / media (1.0 = reparto perfecto)."""
+        total = sum(loads)
+        if total <= 0:
+            return 1.0
+        return round(max(loads) / (total / len(loads)), 3)
+
+    def get_stats(self) -> Dict:
+        return {
+            "num_partitions": self.num_partitions,
+            "version": self._version,
+            "overrides": len(self._overrides),
+            "tracked_symbols": len(self._rates),
+            "last_rebalance": self._last_rebalance,
+        }
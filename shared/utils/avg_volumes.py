@@ -0,0 +1,48 @@
+"""
+Average Volumes - definición compartida
+
+Periodos, hash de Redis y query set-based de los promedios de volumen diario
+(5D, 10D, 3M). Lo usan:
+    - data_maintenance/tasks/calculate_avg_volumes.py (calcula y publica el hash)
+    - scanner/avg_volume_cache.py (lo carga en memoria; misma query como fallback)
+"""
+
+AVG_VOLUMES_HASH = "scanner:avg_volumes"
+
+# (campo, sesiones). El orden define el formato "v5,v10,v3m" de cada campo del hash
+AVG_VOLUME_PERIODS = (
+    ("avg_volume_5d", 5),
+    ("avg_volume_10d", 10),
+    ("avg_volume_3m", 63),
+)
+
+# 63 sesiones ≈ 90 días naturales; margen para festivos
+AVG_VOLUME_WINDOW_CALENDAR_DAYS = 100
+
+
+def avg_volumes_query() -> str:
+    """
+    Una fila por símbolo con un promedio por periodo y su último trading_date.
+
+    Parámetros: $1 inicio de ventana (exclusivo), $2 último día (inclusive),
+    $3 mínimo de días con datos.
+    """
+    max_period = max(days for _, days in AVG_VOLUME_PERIODS)
+    avg_columns = ",\n".join(
+        f"AVG(CASE WHEN rn <= {days} THEN volume END)::bigint AS {name}"
+        for name, days in AVG_VOLUME_PERIODS
+    )
+    return f"""
+        WITH ranked_data AS (
+            SELECT symbol, volume, trading_date,
+                   ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY trading_date DESC) AS rn
+            FROM market_data_daily
+            WHERE trading_date > $1 AND trading_date <= $2
+        )
+        SELECT symbol, MAX(trading_date) AS last_date,
+               {avg_columns}
+        FROM ranked_data
+        WHERE rn <= {max_period}
+        GROUP BY symbol
+        HAVING COUNT(*) >= $3
+    """
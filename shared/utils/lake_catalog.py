@@ -0,0 +1,413 @@
+"""
+Lake Catalog - manifiestos incrementales por partición del lake Parquet
+
+Los lectores del lake (backtester triggers/portfolio, screener, notebooks)
+descubrían ficheros con glob/is_dir sobre /data/lake/... en cada consulta y
+abrían footers para saber qué había dentro. El catálogo guarda eso una vez,
+al escribir:
+
+    <dataset>/_catalog/_index.json          resumen de TODAS las particiones
+    <dataset>/_catalog/dt=YYYY-MM-DD.json   manifiesto de una partición
+
+Manifiesto de partición:
+    files[]: path relativo al dataset, rows, bytes, min_ts/max_ts (del footer),
+             symbols (lista, o null si supera max_symbols), schema_hash,
+             partition_values (claves Hive del path, p.ej. event_type)
+    rows, min_ts, max_ts, schema_hashes: agregados de la partición
+
+Escritura: cada writer publica SU partición después de renombrar los datos a
+su sitio (publish_partition). Manifiesto e índice se escriben a tmp +
+os.replace, y el índice se actualiza bajo flock: lectores nunca ven JSON a
+medias y dos archivers concurrentes no se pisan. Si un proceso muere entre el
+rename de los datos y la publicación, el catálogo simplemente no tiene esa
+partición (o la lista con ficheros que ya no están) y el lector cae a su
+descubrimiento por directorio; el writer la republica en su siguiente pasada
+(ensure_partition compara manifiesto y disco: paths y tamaños).
+
+Lectura: prune() devuelve ficheros candidatos filtrando por partición,
+valores Hive, rango temporal y símbolos sin listar directorios ni abrir
+footers. El formato es JSON plano a propósito: servicios que no empaquetan
+`shared` (backtester, screener) pueden leerlo directamente.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import date, datetime, time, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+CATALOG_VERSION = 1
+CATALOG_DIRNAME = "_catalog"
+INDEX_FILENAME = "_index.json"
+
+# Por encima de esto un fichero no lista sus símbolos (null = "puede tener cualquiera")
+DEFAULT_MAX_SYMBOLS = 20_000
+
+_TsLike = Union[datetime, date, str, None]
+
+
+def schema_hash(schema) -> str:
+    """Hash estable del schema Arrow (nombres + tipos, sin metadata)."""
+    text = schema.to_string(show_field_metadata=False, show_schema_metadata=False)
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+def _ts_str(value: _TsLike) -> Optional[str]:
+    """Timestamps a ISO comparable: los tz-aware se normalizan a UTC."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def _as_utc(value: _TsLike, end_of_day: bool = False) -> Optional[datetime]:
+    """
+    Cota o estadística temporal como datetime UTC comparable.
+
+    Naive = UTC (mismo criterio que _ts_str al escribir). Un `date` (o un str
+    solo con fecha) es el día entero: inicio, o fin inclusive si end_of_day.
+    None si no se puede interpretar (el llamador no poda con esa cota).
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = (date.fromisoformat(value) if len(value) == 10
+                     else datetime.fromisoformat(value))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        if not isinstance(value, date):
+            return None
+        value = datetime.combine(value, time.max if end_of_day else time.min)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _hive_values(rel_path: str) -> Dict[str, str]:
+    values = {}
+    for part in Path(rel_path).parts[:-1]:
+        if "=" in part:
+            key, _, value = part.partition("=")
+            values[key] = value
+    return values
+
+
+def _write_json_atomic(path: Path, payload: dict) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def describe_file(
+    path: Path,
+    dataset_dir: Path,
+    ts_column: Optional[str] = None,
+    symbol_column: Optional[str] = "symbol",
+    max_symbols: int = DEFAULT_MAX_SYMBOLS,
+) -> Dict[str, Any]:
+    """Entrada de manifiesto de un Parquet: footer + columna de símbolos."""
+    pf = pq.ParquetFile(path)
+    meta = pf.metadata
+    schema = pf.schema_arrow
+    rel = path.relative_to(dataset_dir).as_posix()
+
+    min_ts = max_ts = None
+    if ts_column and ts_column in schema.names:
+        col = schema.names.index(ts_column)
+        for i in range(meta.num_row_groups):
+            stats = meta.row_group(i).column(col).statistics
+            if stats is None or not stats.has_min_max:
+                min_ts = max_ts = None
+                break
+            lo, hi = _ts_str(stats.min), _ts_str(stats.max)
+            if _as_utc(lo) is None or _as_utc(hi) is None:
+                # Columna no temporal: sin estadística (no se poda por tiempo)
+                min_ts = max_ts = None
+                break
+            if min_ts is None or _as_utc(lo) < _as_utc(min_ts):
+                min_ts = lo
+            if max_ts is None or _as_utc(hi, end_of_day=True) > _as_utc(max_ts, end_of_day=True):
+                max_ts = hi
+
+    symbols = None
+    if symbol_column and symbol_column in schema.names:
+        uniques = pc.unique(pf.read(columns=[symbol_column]).column(0)).drop_null()
+        if len(uniques) <= max_symbols:
+            symbols = sorted(uniques.to_pylist())
+
+    return {
+        "path": rel,
+        "rows": meta.num_rows,
+        "bytes": path.stat().st_size,
+        "min_ts": min_ts,
+        "max_ts": max_ts,
+        "symbols": symbols,
+        "schema_hash": schema_hash(schema),
+        "partition_values": _hive_values(rel),
+    }
+
+
+class LakeCatalog:
+    """
+    Catálogo de un dataset del lake (p.ej. /data/lake/events).
+
+    Writers: publish_partition() tras publicar los datos de la partición.
+    Readers: partitions() / manifest() / prune().
+    """
+
+    def __init__(
+        self,
+        dataset_dir: Union[str, Path],
+        ts_column: Optional[str] = None,
+        symbol_column: Optional[str] = "symbol",
+        max_symbols: int = DEFAULT_MAX_SYMBOLS,
+    ):
+        self.dataset_dir = Path(dataset_dir)
+        self.catalog_dir = self.dataset_dir / CATALOG_DIRNAME
+        self.ts_column = ts_column
+        self.symbol_column = symbol_column
+        self.max_symbols = max_symbols
+        self._index_cache: Optional[tuple] = None  # (mtime_ns, index)
+
+    # ── Escritura ────────────────────────────────────────────────────────
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.catalog_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.catalog_dir / ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _manifest_path(self, partition: str) -> Path:
+        return self.catalog_dir / f"{partition}.json"
+
+    def _read_index_file(self) -> Dict[str, Any]:
+        try:
+            with open(self.catalog_dir / INDEX_FILENAME) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {"version": CATALOG_VERSION, "partitions": {}}
+        if index.get("version") != CATALOG_VERSION:
+            return {"version": CATALOG_VERSION, "partitions": {}}
+        return index
+
+    def publish_partition(self, partition: str) -> Dict[str, Any]:
+        """
+        (Re)genera el manifiesto de `partition` (p.ej. "dt=2026-07-20") a
+        partir de sus Parquet y lo registra en el índice.
+
+        Solo se leen footers y la columna de símbolos de ESA partición, así
+        que el coste es incremental. Ficheros ocultos/temporales se ignoran.
+        """
+        files = [
+            describe_file(p, self.dataset_dir, self.ts_column, self.symbol_column, self.max_symbols)
+            for p in self._partition_files(partition)
+        ]
+
+        # Comparación como datetimes UTC, no como texto (naive/aware/date)
+        min_ts = [f["min_ts"] for f in files if _as_utc(f["min_ts"]) is not None]
+        max_ts = [f["max_ts"] for f in files if _as_utc(f["max_ts"]) is not None]
+        manifest = {
+            "version": CATALOG_VERSION,
+            "partition": partition,
+            "partition_values": _hive_values(f"{partition}/_"),
+            "files": files,
+            "rows": sum(f["rows"] for f in files),
+            "bytes": sum(f["bytes"] for f in files),
+            "min_ts": min(min_ts, key=_as_utc) if len(min_ts) == len(files) and files else None,
+            "max_ts": (max(max_ts, key=lambda v: _as_utc(v, end_of_day=True))
+                       if len(max_ts) == len(files) and files else None),
+            "schema_hashes": sorted({f["schema_hash"] for f in files}),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        summary = {k: v for k, v in manifest.items() if k not in ("files", "version", "partition")}
+        summary["files"] = len(files)
+
+        with self._locked():
+            _write_json_atomic(self._manifest_path(partition), manifest)
+            index = self._read_index_file()
+            index["partitions"][partition] = summary
+            index["updated_at"] = manifest["updated_at"]
+            _write_json_atomic(self.catalog_dir / INDEX_FILENAME, index)
+
+        logger.info(
+            "lake_catalog_partition_published",
+            dataset=str(self.dataset_dir),
+            partition=partition,
+            files=len(files),
+            rows=manifest["rows"],
+        )
+        return manifest
+
+    def refresh_partition(self, partition: str) -> bool:
+        """publish_partition para writers: el catálogo es una optimización,
+        un fallo se registra pero nunca aborta el archivado."""
+        try:
+            self.publish_partition(partition)
+            return True
+        except Exception as e:  # noqa: BLE001
+            logger.warning(
+                "lake_catalog_publish_failed",
+                dataset=str(self.dataset_dir),
+                partition=partition,
+                error=repr(e),
+            )
+            return False
+
+    def _partition_files(self, partition: str) -> List[Path]:
+        """Parquet de la partición, sin ficheros ocultos/temporales."""
+        part_dir = self.dataset_dir / partition
+        return [
+            p for p in sorted(part_dir.rglob("*.parquet"))
+            if not any(s.startswith((".", "_")) for s in p.relative_to(part_dir).parts)
+        ]
+
+    def _matches_disk(self, partition: str) -> bool:
+        """El manifiesto lista exactamente los ficheros en disco, con su tamaño."""
+        manifest = self.manifest(partition)
+        if manifest is None:
+            return False
+        listed = {f["path"]: f["bytes"] for f in manifest["files"]}
+        on_disk = self._partition_files(partition)
+        if len(on_disk) != len(listed):
+            return False
+        for path in on_disk:
+            rel = path.relative_to(self.dataset_dir).as_posix()
+            try:
+                if listed.get(rel) != path.stat().st_size:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def ensure_partition(self, partition: str) -> bool:
+        """
+        Publica la partición si existe en disco y el catálogo no la lista o
+        la lista con otros ficheros (p.ej. re-archivado --force caído antes
+        de publicar). Si el directorio ya no existe, la quita del catálogo.
+        """
+        if not (self.dataset_dir / partition).is_dir():
+            if partition in self.partitions():
+                self.remove_partition(partition)
+            return False
+        if partition in self.partitions() and self._matches_disk(partition):
+            return False
+        return self.refresh_partition(partition)
+
+    def remove_partition(self, partition: str) -> None:
+        """Quita una partición del catálogo (p.ej. antes de borrar sus datos)."""
+        with self._locked():
+            index = self._read_index_file()
+            index["partitions"].pop(partition, None)
+            index["updated_at"] = datetime.now(timezone.utc).isoformat()
+            _write_json_atomic(self.catalog_dir / INDEX_FILENAME, index)
+            try:
+                os.remove(self._manifest_path(partition))
+            except FileNotFoundError:
+                pass
+
+    # ── Lectura ──────────────────────────────────────────────────────────
+
+    def exists(self) -> bool:
+        return (self.catalog_dir / INDEX_FILENAME).exists()
+
+    def partitions(self) -> Dict[str, Dict[str, Any]]:
+        """partition → resumen. Cacheado hasta que cambie el mtime del índice."""
+        path = self.catalog_dir / INDEX_FILENAME
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return {}
+        if self._index_cache is None or self._index_cache[0] != mtime:
+            self._index_cache = (mtime, self._read_index_file())
+        return self._index_cache[1]["partitions"]
+
+    def manifest(self, partition: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._manifest_path(partition)) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get("version") == CATALOG_VERSION else None
+
+    def prune(
+        self,
+        partitions: Optional[Iterable[str]] = None,
+        where: Optional[Dict[str, Iterable[str]]] = None,
+        start: _TsLike = None,
+        end: _TsLike = None,
+        symbols: Optional[Iterable[str]] = None,
+    ) -> List[str]:
+        """
+        Ficheros (paths absolutos) que PUEDEN contener filas que cumplan:
+
+            partitions: solo estas particiones (default: todas)
+            where:      {clave Hive: valores admitidos}, p.ej. {"event_type": [...]}
+            start/end:  solapamiento con [min_ts, max_ts] del fichero
+                        (datetime naive = UTC, date = día entero, str ISO)
+            symbols:    intersección con los símbolos del fichero
+
+        Conservador: un fichero sin estadística para un criterio se incluye.
+        """
+        index = self.partitions()
+        names = index.keys() if partitions is None else [p for p in partitions if p in index]
+        where_sets = {k: set(v) for k, v in (where or {}).items()}
+        lo, hi = _as_utc(start), _as_utc(end, end_of_day=True)
+        wanted = set(symbols) if symbols is not None else None
+
+        def overlaps(min_ts: Optional[str], max_ts: Optional[str]) -> bool:
+            if hi is not None:
+                first = _as_utc(min_ts)
+                if first is not None and first > hi:
+                    return False
+            if lo is not None:
+                last = _as_utc(max_ts, end_of_day=True)
+                if last is not None and last < lo:
+                    return False
+            return True
+
+        out: List[str] = []
+        for name in sorted(names):
+            summary = index[name]
+            if not overlaps(summary.get("min_ts"), summary.get("max_ts")):
+                continue
+            manifest = self.manifest(name)
+            if manifest is None:
+                continue
+            for f in manifest["files"]:
+                values = {**manifest.get("partition_values", {}), **f["partition_values"]}
+                if any(k in values and values[k] not in allowed for k, allowed in where_sets.items()):
+                    continue
+                if not overlaps(f["min_ts"], f["max_ts"]):
+                    continue
+                if wanted is not None and f["symbols"] is not None and wanted.isdisjoint(f["symbols"]):
+                    continue
+                out.append(str(self.dataset_dir / f["path"]))
+        return out
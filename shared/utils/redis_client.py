@@ -30,6 +30,7 @@ class RedisClient:
         """
         self.redis_url = redis_url or settings.get_redis_url()
         self._client: Optional[Redis] = None
+        self._binary_client: Optional[Redis] = None
         self._pubsub = None
     
     async def connect(self) -> None:
@@ -57,6 +58,9 @@ class RedisClient:
     
     async def disconnect(self) -> None:
         """Close Redis connection"""
+        if self._binary_client:
+            await self._binary_client.close()
+            self._binary_client = None
         if self._client:
             await self._client.close()
             logger.info("Disconnected from Redis")
@@ -68,6 +72,27 @@ class RedisClient:
             raise RuntimeError("Redis client not connected. Call connect() first.")
         return self._client
     
+    @property
+    def binary_client(self) -> Redis:
+        """
+        Cliente sin decode_responses para valores binarios (snapshots columnares).
+        
+        El cliente principal decodifica UTF-8 todas las respuestas, lo que rompe
+        con buffers numpy. Este pool se crea bajo demanda con la misma URL.
+        """
+        if not self._client:
+            raise RuntimeError("Redis client not connected. Call connect() first.")
+        if self._binary_client is None:
+            self._binary_client = aioredis.from_url(
+                self.redis_url,
+                decode_responses=False,
+                max_connections=20,
+                socket_keepalive=True,
+                health_check_interval=30,
+                retry_on_timeout=True,
+            )
+        return self._binary_client
+    
     # =============================================
     # STRING OPERATIONS
     # =============================================
@@ -1,10 +1,22 @@
 """
 Redis Stream Manager con Auto-Trimming
 Gestiona streams de Redis con límites automáticos para evitar memory leaks
+
+El trimming es consciente de los consumer groups:
+- Si algún group va atrasado (lag >= maxlen o desconocido) se recorta por
+  MINID = el ID más antiguo que algún group aún necesita: su last-delivered-id
+  o, si tiene entregas sin ACK, la más antigua de su PEL (resumen de XPENDING).
+- Si todos los groups van al día (lag < maxlen) se recorta por MAXLEN. Una
+  entrada entregada y sin ACK que haya quedado más atrás de maxlen entradas
+  se pierde (igual que con el MAXLEN de XADD): un XCLAIM posterior no la
+  encuentra. No hay forma barata de saber su posición sin recorrer el stream.
+- Por encima del techo duro (hard_maxlen) se recorta por MAXLEN aunque algún
+  group pierda entradas (warning en log).
 """
 
 import asyncio
-from typing import Dict, Optional, Any, List
+import time
+from typing import Dict, Optional, Any, List, Tuple
 from datetime import datetime
 import structlog
 
@@ -19,10 +31,19 @@ class RedisStreamManager:
     
     Features:
     - MAXLEN automático en cada XADD
-    - Background trimming para cleanup
+    - Background trimming para cleanup: un único loop que chequea todos los
+      streams en un pipeline (XLEN + XINFO GROUPS + MEMORY USAGE)
+    - Trim por MINID del consumer group más lento (conserva lo no entregado
+      y lo pendiente de ACK) con techo duro hard_maxlen
+    - Wakeup inmediato cuando los XADD del manager superan el threshold
     - Configuración centralizada de límites
-    - Métricas de uso
+    - Métricas de uso y gauges por stream (memoria, longitud, lag)
     """
+
+    # Techo duro por defecto = maxlen * factor (si el config no define
+    # hard_maxlen). Por encima se recorta a MAXLEN aunque haya consumidores
+    # atrasados: un group abandonado no puede retener memoria sin límite.
+    HARD_MAXLEN_FACTOR = 10
     
     # Configuración de límites por stream
     STREAM_CONFIGS = {
@@ -78,15 +99,27 @@ class RedisStreamManager:
     
     def __init__(self, redis_client: RedisClient):
         self.redis = redis_client
-        self._trim_tasks: Dict[str, asyncio.Task] = {}
+        self._trim_task: Optional[asyncio.Task] = None
+        self._trim_wakeup = asyncio.Event()
         self._is_running = False
         
+        # Scheduling: próximo check por stream y XADDs desde el último check
+        self._next_check: Dict[str, float] = {}
+        self._adds_since_check: Dict[str, int] = {}
+        
         # Métricas
         self.stats = {
             "adds": 0,
             "trims": 0,
-            "bytes_trimmed": 0
+            "bytes_trimmed": 0,
+            "minid_trims": 0,
+            "hard_cap_trims": 0,
+            "trim_checks": 0
         }
+        
+        # Gauges por stream (último check): length, memory_bytes, groups,
+        # max_lag, max_pending, slowest_group, checked_at
+        self.stream_gauges: Dict[str, Dict[str, Any]] = {}
     
     async def start(self):
         """
@@ -99,18 +132,15 @@ class RedisStreamManager:
         
         self._is_running = True
         
-        # Iniciar trim loops para cada stream configurado
-        for stream_name, config in self.STREAM_CONFIGS.items():
-            task = asyncio.create_task(
-                self._trim_loop(stream_name, config),
-                name=f"trim_{stream_name}"
-            )
-            self._trim_tasks[stream_name] = task
+        # Un único loop de trimming para todos los streams configurados
+        now = time.monotonic()
+        self._next_check = {stream: now for stream in self.STREAM_CONFIGS}
+        self._adds_since_check = {stream: 0 for stream in self.STREAM_CONFIGS}
+        self._trim_task = asyncio.create_task(self._trim_loop(), name="trim_streams")
         
         logger.info(
             "redis_stream_manager_started",
-            streams=list(self.STREAM_CONFIGS.keys()),
-            task_count=len(self._trim_tasks)
+            streams=list(self.STREAM_CONFIGS.keys())
         )
     
     async def stop(self):
@@ -120,19 +150,11 @@ class RedisStreamManager:
         """
         self._is_running = False
         
-        # Cancelar todas las tareas
-        for stream_name, task in self._trim_tasks.items():
-            task.cancel()
-            logger.debug("trim_task_cancelled", stream=stream_name)
-        
-        # Esperar a que terminen
-        if self._trim_tasks:
-            await asyncio.gather(
-                *self._trim_tasks.values(),
-                return_exceptions=True
-            )
+        if self._trim_task:
+            self._trim_task.cancel()
+            await asyncio.gather(self._trim_task, return_exceptions=True)
+            self._trim_task = None
         
-        self._trim_tasks.clear()
         logger.info("redis_stream_manager_stopped")
     
     async def xadd(
@@ -169,6 +191,14 @@ class RedisStreamManager:
             
             self.stats["adds"] += 1
             
+            # Wakeup del trimmer si este stream ya acumuló suficientes XADDs
+            # desde el último check (el MAXLEN aproximado puede quedarse corto)
+            if config and stream in self._adds_since_check:
+                self._adds_since_check[stream] += 1
+                if self._adds_since_check[stream] >= config["trim_threshold"] - config["maxlen"]:
+                    self._next_check[stream] = 0.0
+                    self._trim_wakeup.set()
+            
             return message_id
             
         except Exception as e:
@@ -180,65 +210,227 @@ class RedisStreamManager:
             )
             raise
     
-    async def _trim_loop(self, stream_name: str, config: Dict[str, Any]):
+    async def _trim_loop(self):
         """
-        Loop de background que monitorea y trim un stream
-        Se ejecuta automáticamente mientras el servicio está activo
+        Loop de background que monitorea y trimea todos los streams
+        Duerme hasta el próximo check pendiente o hasta un wakeup de xadd()
         """
-        interval = config["trim_interval"]
-        threshold = config["trim_threshold"]
-        maxlen = config["maxlen"]
-        
         logger.info(
             "trim_loop_started",
-            stream=stream_name,
-            interval=interval,
-            threshold=threshold,
-            maxlen=maxlen
+            streams=len(self.STREAM_CONFIGS),
+            min_interval=min(c["trim_interval"] for c in self.STREAM_CONFIGS.values())
         )
         
         while self._is_running:
             try:
-                # Obtener longitud actual del stream
-                length = await self.redis.xlen(stream_name)
+                now = time.monotonic()
+                due = [s for s, t in self._next_check.items() if t <= now]
+                if due:
+                    await self._check_streams(due)
+                    now = time.monotonic()
+                    for stream in due:
+                        self._next_check[stream] = now + self.STREAM_CONFIGS[stream]["trim_interval"]
+                        self._adds_since_check[stream] = 0
                 
-                # Trim si superó el threshold
-                if length > threshold:
-                    trimmed = await self.redis.xtrim(
-                        stream_name,
-                        maxlen=maxlen,
-                        approximate=config.get("approximate", True)
-                    )
-                    
-                    self.stats["trims"] += 1
-                    self.stats["bytes_trimmed"] += trimmed
-                    
-                    logger.info(
-                        "stream_trimmed",
-                        stream=stream_name,
-                        old_length=length,
-                        new_length=maxlen,
-                        trimmed_count=trimmed,
-                        threshold=threshold
-                    )
-                
-                # Esperar hasta el próximo check
-                await asyncio.sleep(interval)
+                timeout = max(0.0, min(self._next_check.values()) - time.monotonic())
+                self._trim_wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._trim_wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
                 
             except asyncio.CancelledError:
-                logger.info("trim_loop_cancelled", stream=stream_name)
+                logger.info("trim_loop_cancelled")
                 break
                 
             except Exception as e:
                 logger.error(
                     "trim_loop_error",
-                    stream=stream_name,
                     error=str(e),
                     exc_info=True
                 )
                 # Esperar antes de reintentar
                 await asyncio.sleep(5)
     
+    async def _check_streams(self, streams: List[str]):
+        """
+        Chequea varios streams en un solo round-trip y trimea los que superan
+        su threshold (todos los XTRIM también van en un pipeline)
+        """
+        client = self.redis.client
+        pipe = client.pipeline(transaction=False)
+        for stream in streams:
+            pipe.xlen(stream)
+            pipe.xinfo_groups(stream)
+            pipe.memory_usage(stream)
+        results = await pipe.execute(raise_on_error=False)
+        self.stats["trim_checks"] += 1
+        
+        checked_at = datetime.now().isoformat()
+        checked: List[Tuple[str, int, List[Dict[str, Any]], Any]] = []
+        for i, stream in enumerate(streams):
+            length, groups, memory = results[3 * i:3 * i + 3]
+            if isinstance(length, Exception):
+                logger.error("stream_check_failed", stream=stream, error=str(length))
+                continue
+            # XINFO GROUPS falla si el stream no existe todavía
+            groups = [] if isinstance(groups, Exception) else groups
+            memory = None if isinstance(memory, Exception) else memory
+            checked.append((stream, length, groups, memory))
+        
+        await self._load_oldest_pending(client, checked)
+        
+        plans: List[Tuple[str, int, str, Any]] = []
+        for stream, length, groups, memory in checked:
+            lags = [self._group_lag(g) for g in groups]
+            known_lags = [lag for lag in lags if lag is not None]
+            slowest = min(groups, key=self._group_floor, default=None)
+            self.stream_gauges[stream] = {
+                "length": length,
+                "memory_bytes": memory,
+                "groups": len(groups),
+                "max_lag": max(known_lags) if known_lags else None,
+                "max_pending": max((int(g.get("pending") or 0) for g in groups), default=0),
+                "slowest_group": slowest["name"] if slowest else None,
+                "checked_at": checked_at
+            }
+            
+            plan = self._plan_trim(stream, length, groups, lags)
+            if plan:
+                plans.append((stream, length, *plan))
+        
+        if not plans:
+            return
+        
+        pipe = client.pipeline(transaction=False)
+        for stream, _, kind, value in plans:
+            approximate = self.STREAM_CONFIGS[stream].get("approximate", True)
+            if kind == "minid":
+                pipe.xtrim(stream, minid=value, approximate=approximate)
+            else:
+                pipe.xtrim(stream, maxlen=value, approximate=approximate)
+        trimmed_counts = await pipe.execute(raise_on_error=False)
+        
+        for (stream, length, kind, value), trimmed in zip(plans, trimmed_counts):
+            if isinstance(trimmed, Exception):
+                logger.error("stream_trim_failed", stream=stream, mode=kind, error=str(trimmed))
+                continue
+            
+            self.stats["trims"] += 1
+            self.stats["bytes_trimmed"] += trimmed
+            if kind == "minid":
+                self.stats["minid_trims"] += 1
+            
+            logger.info(
+                "stream_trimmed",
+                stream=stream,
+                mode=kind,
+                target=value,
+                old_length=length,
+                trimmed_count=trimmed,
+                threshold=self.STREAM_CONFIGS[stream]["trim_threshold"]
+            )
+    
+    async def _load_oldest_pending(
+        self,
+        client,
+        checked: List[Tuple[str, int, List[Dict[str, Any]], Any]]
+    ):
+        """
+        Añade "oldest-pending-id" (resumen de XPENDING) a los groups con
+        entregas sin ACK, en un solo pipeline y solo en streams que superan
+        su threshold (los únicos que se van a trimear)
+        """
+        targets = [
+            (stream, group)
+            for stream, length, groups, _ in checked
+            if length > self.STREAM_CONFIGS[stream]["trim_threshold"]
+            for group in groups
+            if int(group.get("pending") or 0) > 0
+        ]
+        if not targets:
+            return
+        
+        pipe = client.pipeline(transaction=False)
+        for stream, group in targets:
+            pipe.xpending(stream, group["name"])
+        summaries = await pipe.execute(raise_on_error=False)
+        
+        for (stream, group), summary in zip(targets, summaries):
+            if isinstance(summary, Exception):
+                # Sin resumen no se sabe qué hay pendiente: no trimear por MINID
+                logger.error("stream_xpending_failed", stream=stream, group=group["name"], error=str(summary))
+                group["oldest-pending-id"] = "0-0"
+            elif summary.get("min"):
+                group["oldest-pending-id"] = summary["min"]
+    
+    def _plan_trim(
+        self,
+        stream: str,
+        length: int,
+        groups: List[Dict[str, Any]],
+        lags: List[Optional[int]]
+    ) -> Optional[Tuple[str, Any]]:
+        """
+        Decide cómo trimear un stream: ("maxlen", n), ("minid", id) o None
+        
+        - Sin consumer groups (o todos con lag < maxlen): MAXLEN normal, no
+          se pierde nada que un group no haya recibido (ver docstring del
+          módulo para entregas sin ACK más antiguas que maxlen).
+        - Algún group atrasado (o lag desconocido): MINID = el menor de
+          last-delivered-id y oldest-pending-id entre todos los groups;
+          conserva lo no entregado y lo pendiente de ACK.
+        - Por encima de hard_maxlen con un group que no baja de ahí: MAXLEN
+          hard_maxlen (el group pierde entradas, se loguea como warning).
+        """
+        config = self.STREAM_CONFIGS[stream]
+        maxlen = config["maxlen"]
+        if length <= config["trim_threshold"]:
+            return None
+        if not groups:
+            return ("maxlen", maxlen)
+        
+        lag_known = all(lag is not None for lag in lags)
+        max_lag = max((lag for lag in lags if lag is not None), default=0)
+        if lag_known and max_lag < maxlen:
+            return ("maxlen", maxlen)
+        
+        hard_maxlen = config.get("hard_maxlen", maxlen * self.HARD_MAXLEN_FACTOR)
+        if length > hard_maxlen and (not lag_known or max_lag >= hard_maxlen):
+            self.stats["hard_cap_trims"] += 1
+            logger.warning(
+                "stream_consumer_lag_exceeds_hard_cap",
+                stream=stream,
+                length=length,
+                max_lag=max_lag if lag_known else None,
+                hard_maxlen=hard_maxlen
+            )
+            return ("maxlen", hard_maxlen)
+        
+        floor = min(self._group_floor(g) for g in groups)
+        return ("minid", f"{floor[0]}-{floor[1]}")
+    
+    @staticmethod
+    def _parse_id(entry_id: str) -> Tuple[int, int]:
+        """'<ms>-<seq>' -> (ms, seq) para comparar IDs de stream"""
+        ms, _, seq = str(entry_id).partition("-")
+        return int(ms), int(seq or 0)
+    
+    @classmethod
+    def _group_floor(cls, group: Dict[str, Any]) -> Tuple[int, int]:
+        """ID más antiguo que el group aún necesita (last-delivered o PEL)"""
+        floor = cls._parse_id(group["last-delivered-id"])
+        oldest_pending = group.get("oldest-pending-id")
+        if oldest_pending:
+            floor = min(floor, cls._parse_id(oldest_pending))
+        return floor
+    
+    @staticmethod
+    def _group_lag(group: Dict[str, Any]) -> Optional[int]:
+        """Lag de XINFO GROUPS (Redis >= 7; None si no está o no es calculable)"""
+        lag = group.get("lag")
+        return int(lag) if lag is not None else None
+    
     async def get_stream_info(self, stream: str) -> Dict[str, Any]:
         """
         Obtiene información del stream
@@ -246,13 +438,17 @@ class RedisStreamManager:
         try:
             length = await self.redis.xlen(stream)
             config = self.STREAM_CONFIGS.get(stream, {})
+            gauges = self.stream_gauges.get(stream, {})
             
             return {
                 "stream": stream,
                 "length": length,
                 "maxlen": config.get("maxlen"),
-                "threshold": config.get("threshold"),
-                "usage_percent": (length / config.get("maxlen", 1)) * 100 if config.get("maxlen") else None
+                "threshold": config.get("trim_threshold"),
+                "usage_percent": (length / config.get("maxlen", 1)) * 100 if config.get("maxlen") else None,
+                "memory_bytes": gauges.get("memory_bytes"),
+                "max_lag": gauges.get("max_lag"),
+                "slowest_group": gauges.get("slowest_group")
             }
         except Exception as e:
             logger.error("get_stream_info_failed", stream=stream, error=str(e))
@@ -274,11 +470,15 @@ class RedisStreamManager:
         """
         return {
             "is_running": self._is_running,
-            "active_trim_tasks": len(self._trim_tasks),
+            "active_trim_tasks": 1 if self._trim_task and not self._trim_task.done() else 0,
             "total_adds": self.stats["adds"],
             "total_trims": self.stats["trims"],
             "bytes_trimmed": self.stats["bytes_trimmed"],
-            "configured_streams": len(self.STREAM_CONFIGS)
+            "minid_trims": self.stats["minid_trims"],
+            "hard_cap_trims": self.stats["hard_cap_trims"],
+            "trim_checks": self.stats["trim_checks"],
+            "configured_streams": len(self.STREAM_CONFIGS),
+            "streams": self.stream_gauges
         }
 
 
@@ -0,0 +1,104 @@
+"""
+RVOL slot averages - query y cálculo compartidos
+
+Promedio del volumen ACUMULADO por slot en los últimos N días de trading de
+cada símbolo, para todo el universo en una pasada. Lo usan:
+    - analytics/rvol_baseline.py      (matriz residente en memoria)
+    - historical/rvol_hist_builder.py (hashes rvol:hist:avg:{SYM}:{DAYS})
+
+1. UNA query sobre volume_slots: últimos N días con datos de cada símbolo,
+   agregados por (símbolo, día) en arrays de slots/volúmenes
+2. Fill-forward por día con np.maximum.accumulate (slots antes del primero
+   con datos = 0, misma lógica que calculate_rvol_averages en data_maintenance)
+3. Promedio por slot sobre los días del símbolo, truncado a entero
+"""
+
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _slot_rows_query(filter_symbols: bool) -> str:
+    symbol_filter = "AND symbol = ANY($5::text[])" if filter_symbols else ""
+    return f"""
+        WITH day_rank AS (
+            SELECT symbol, date,
+                   ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY date DESC) AS rk
+            FROM (
+                SELECT DISTINCT symbol, date
+                FROM volume_slots
+                WHERE date < $1 AND date >= $2
+                {symbol_filter}
+            ) d
+        )
+        SELECT vs.symbol,
+               array_agg(vs.slot_number ORDER BY vs.slot_number) AS slots,
+               array_agg(vs.volume_accumulated ORDER BY vs.slot_number) AS volumes
+        FROM volume_slots vs
+        JOIN day_rank r ON r.symbol = vs.symbol AND r.date = vs.date
+        WHERE r.rk <= $3
+          AND vs.slot_number < $4
+        GROUP BY vs.symbol, vs.date
+    """
+
+
+async def fetch_slot_day_rows(
+    db,
+    as_of: date,
+    window_start: date,
+    days: int,
+    n_slots: int,
+    symbols: Optional[List[str]] = None
+) -> List[Any]:
+    """
+    Una fila por (símbolo, día) con arrays `slots` y `volumes`.
+
+    Args:
+        db: Cliente con `fetch(query, *args)` (TimescaleClient)
+        as_of: Se usan días estrictamente anteriores
+        window_start: Límite inferior natural para buscar los N días con datos
+        days: Días de trading por símbolo
+        n_slots: Slots 0..n_slots-1
+        symbols: Restringir a estos símbolos (None = todo volume_slots)
+    """
+    args = [as_of, window_start, days, n_slots]
+    if symbols:
+        args.append([s.upper() for s in symbols])
+    return await db.fetch(_slot_rows_query(bool(symbols)), *args)
+
+
+def average_slot_rows(
+    rows: Sequence[Any],
+    n_slots: int
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Fill-forward por día y promedio por slot sobre los días de cada símbolo.
+
+    Returns:
+        (símbolos en orden de aparición, matriz float64 (n_symbols, n_slots)
+        truncada a entero)
+    """
+    index: Dict[str, int] = {}
+    for row in rows:
+        if row["symbol"] not in index:
+            index[row["symbol"]] = len(index)
+
+    sums = np.zeros((len(index), n_slots), dtype=np.float64)
+    n_days = np.zeros(len(index), dtype=np.int64)
+    day = np.empty(n_slots, dtype=np.float64)
+
+    for row in rows:
+        i = index[row["symbol"]]
+        day.fill(0.0)
+        # volume_accumulated es nullable: NULL -> 0 para que el NaN no se
+        # propague por el MAX acumulado al resto del día
+        day[np.asarray(row["slots"], dtype=np.intp)] = np.asarray(
+            [v or 0 for v in row["volumes"]], dtype=np.float64
+        )
+        # Fill-forward: MAX acumulado; antes del primer slot queda 0
+        np.maximum.accumulate(day, out=day)
+        sums[i] += day
+        n_days[i] += 1
+
+    return list(index.keys()), np.floor(sums / np.maximum(n_days, 1)[:, None])